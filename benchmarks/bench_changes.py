@@ -0,0 +1,162 @@
+"""
+Benchmark commits from a recorded change set against ``git add -A``.
+
+Builds a synthetic repository of many small files and makes several
+commits, each creating, modifying and deleting a handful of files like a
+task step would. Compares staging everything with ``git add -A``,
+committing the recorded ChangeSet, and the same with the ``git status``
+verification of its paths. Also times a full ``git status --porcelain``
+next to one limited to the changed paths.
+
+Usage:
+    python -m benchmarks.bench_changes --files 100000 --commits 5
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from src.git.change_set import CREATED, DELETED, MODIFIED, ChangeSet
+from src.git.github_manager import GitHubManager
+
+
+SCENARIOS = [
+    # name, commit the change set, verify it
+    ("add_all", False, False),
+    ("change_set", True, False),
+    ("change_set_verified", True, True),
+]
+
+
+def git(*args: str, cwd: Path) -> str:
+    """Run a git command and return its output."""
+    return subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def build_fixture(root: Path, files: int) -> Path:
+    """Create ``<root>/seed``, a repository of ``files`` files."""
+    seed = root / "seed"
+    seed.mkdir(parents=True)
+    git("init", "-q", "-b", "main", cwd=seed)
+    
+    for index in range(files):
+        path = seed / f"pkg{index % 500}" / f"sub{index % 7}" / f"module_{index}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"VALUE = {index}\n")
+    
+    git("add", "-A", cwd=seed)
+    git("commit", "-q", "-m", "initial", cwd=seed)
+    git("config", "gc.auto", "0", cwd=seed)
+    return seed
+
+
+def make_changes(workspace: Path, commit: int) -> ChangeSet:
+    """Create, modify and delete files like a task step; return what changed."""
+    changes = ChangeSet()
+    
+    for index in range(4):
+        path = f"feature/commit_{commit}_{index}.py"
+        (workspace / path).parent.mkdir(parents=True, exist_ok=True)
+        (workspace / path).write_text(f"COMMIT = {commit}\n")
+        changes.record(path, CREATED)
+    
+    for index in range(4):
+        number = commit * 10 + index
+        path = f"pkg{number % 500}/sub{number % 7}/module_{number}.py"
+        (workspace / path).write_text(f"VALUE = {number} + {commit}\n")
+        changes.record(path, MODIFIED)
+    
+    for index in range(4, 6):
+        number = commit * 10 + index
+        path = f"pkg{number % 500}/sub{number % 7}/module_{number}.py"
+        (workspace / path).unlink()
+        changes.record(path, DELETED)
+    
+    return changes
+
+
+async def run_scenario(
+    name: str,
+    use_changes: bool,
+    verify: bool,
+    root: Path,
+    seed: Path,
+    commits: int,
+) -> dict:
+    """Make the commits of one scenario in a fresh clone."""
+    workspace = root / name
+    git("clone", "-q", str(seed), str(workspace), cwd=root)
+    git("config", "gc.auto", "0", cwd=workspace)
+    git("checkout", "-q", "-b", f"dev-task/{name}", cwd=workspace)
+    manager = GitHubManager(token="unused", workspace_path=root / ".manager")
+    
+    times = []
+    status_full = []
+    status_limited = []
+    
+    for commit in range(commits):
+        changes = make_changes(workspace, commit)
+        
+        start = time.perf_counter()
+        git("status", "--porcelain", cwd=workspace)
+        status_full.append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        git("status", "--porcelain", "--", *changes.paths(), cwd=workspace)
+        status_limited.append(time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        if use_changes:
+            await manager.commit_changes(workspace, f"Commit {commit}", changes=changes, verify=verify)
+        else:
+            await manager.commit_changes(workspace, f"Commit {commit}")
+        times.append(time.perf_counter() - start)
+    
+    # Every scenario must leave the same clean tree
+    leftover = git("status", "--porcelain", cwd=workspace)
+    manager.git.close()
+    
+    return {
+        "scenario": name,
+        "commit_avg_ms": round(sum(times) / len(times) * 1000, 1),
+        "status_full_ms": round(sum(status_full) / len(status_full) * 1000, 1),
+        "status_limited_ms": round(sum(status_limited) / len(status_limited) * 1000, 1),
+        "clean_after": not leftover,
+        "mismatches": manager.change_mismatches,
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--commits", type=int, default=5)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        seed = build_fixture(root, args.files)
+        print(json.dumps({
+            "fixture_files": args.files,
+            "commits": args.commits,
+            "build_s": round(time.perf_counter() - start, 1),
+        }))
+        
+        for name, use_changes, verify in SCENARIOS:
+            result = asyncio.run(run_scenario(name, use_changes, verify, root, seed, args.commits))
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
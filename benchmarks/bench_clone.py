@@ -0,0 +1,163 @@
+"""
+Benchmark per-task clones with and without the local mirror cache.
+
+Builds a large fixture repository, serves it through ``file://`` like a
+remote, and clones it for several consecutive tasks with each clone mode
+of GitHubManager. Between tasks a new commit is pushed upstream, so every
+mode also pays for an incremental update. Reports the first and the
+average later clone time, and the disk used by each task clone's ``.git``
+next to the shared mirror.
+
+Usage:
+    python -m benchmarks.bench_clone --files 20000 --commits 20 --tasks 4
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from src.git.github_manager import GitHubManager
+
+
+SCENARIOS = [
+    # name, clone mode, depth, filter
+    ("direct_full_clone", "direct", 0, None),
+    ("mirror_shared", "shared", 0, None),
+    ("mirror_local", "local", 0, None),
+    ("mirror_shared_shallow", "shared", 1, None),
+    ("mirror_shared_blobless", "shared", 0, "blob:none"),
+]
+
+
+def git(*args: str, cwd: Path) -> None:
+    """Run a git command quietly."""
+    subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def build_fixture(root: Path, files: int, commits: int) -> Path:
+    """Create ``<root>/bench/big.git``, a bare repository with history."""
+    work = root / "fixture-work"
+    remote = root / "bench" / "big.git"
+    work.mkdir(parents=True)
+    git("init", "-q", "-b", "main", cwd=work)
+    
+    for commit in range(commits):
+        # Each commit rewrites a slice of the files so history has weight
+        for index in range(commit, files, max(1, commits)):
+            path = work / f"pkg{index % 100}" / f"module_{index}.py"
+            path.parent.mkdir(exist_ok=True)
+            # Random payload: compresses like real source, not like repeated lines
+            path.write_text(f"# revision {commit}\nDATA = '{os.urandom(1024).hex()}'\n")
+        git("add", "-A", cwd=work)
+        git("commit", "-q", "-m", f"commit {commit}", cwd=work)
+    
+    remote.parent.mkdir(parents=True)
+    git("clone", "-q", "--bare", str(work), str(remote), cwd=root)
+    # Let partial clones request filtered packs, as GitHub does
+    git("config", "uploadpack.allowFilter", "true", cwd=remote)
+    git("config", "uploadpack.allowAnySHA1InWant", "true", cwd=remote)
+    git("remote", "add", "upstream", str(remote), cwd=work)
+    
+    return work
+
+
+def push_commit(work: Path, number: int) -> None:
+    """Add one upstream commit, like other developers do between tasks."""
+    (work / "CHANGELOG.md").write_text(f"change {number}\n")
+    git("add", "-A", cwd=work)
+    git("commit", "-q", "-m", f"change {number}", cwd=work)
+    git("push", "-q", "upstream", "main", cwd=work)
+
+
+def disk_usage(path: Path) -> int:
+    """Bytes used by a directory, counting hardlinked files once."""
+    seen: set[tuple[int, int]] = set()
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            stat = os.lstat(os.path.join(dirpath, name))
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                total += stat.st_blocks * 512
+    return total
+
+
+async def run_scenario(
+    name: str,
+    mode: str,
+    depth: int,
+    blob_filter: str | None,
+    root: Path,
+    work: Path,
+    tasks: int,
+) -> dict:
+    """Clone the fixture for consecutive tasks with one clone mode."""
+    workspace = root / name
+    manager = GitHubManager(
+        token="unused",
+        workspace_path=workspace,
+        clone_mode=mode,
+        clone_depth=depth,
+        clone_filter=blob_filter,
+        git_base_url=f"file://{root}",
+    )
+    
+    times = []
+    for task in range(tasks):
+        push_commit(work, f"{name}-{task}")
+        start = time.perf_counter()
+        await manager.clone_repository("bench/big", f"task-{task}")
+        times.append(time.perf_counter() - start)
+    
+    per_task = [disk_usage(workspace / f"task-{task}" / "big" / ".git") for task in range(tasks)]
+    mirrors = workspace / ".mirrors"
+    
+    return {
+        "mode": name,
+        "first_clone_s": round(times[0], 3),
+        "later_clone_avg_s": round(sum(times[1:]) / max(1, len(times) - 1), 3),
+        "task_git_mb": round(sum(per_task) / len(per_task) / 2**20, 1),
+        "mirror_mb": round(disk_usage(mirrors) / 2**20, 1) if mirrors.exists() else 0.0,
+        "total_mb": round(disk_usage(workspace) / 2**20, 1),
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--commits", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=4)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        work = build_fixture(root, args.files, args.commits)
+        print(json.dumps({
+            "fixture_files": args.files,
+            "fixture_commits": args.commits,
+            "fixture_mb": round(disk_usage(root / "bench") / 2**20, 1),
+            "build_s": round(time.perf_counter() - start, 1),
+        }))
+        
+        for name, mode, depth, blob_filter in SCENARIOS:
+            result = asyncio.run(run_scenario(
+                name, mode, depth, blob_filter, root, work, args.tasks,
+            ))
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark the git time of a task that commits after every step.
+
+Builds a large repository with a local bare remote, clones it as a task
+workspace on its own branch, and replays a task whose steps each write one
+file. Compares per-step ``git add -A`` commits pushed after every step
+(the naive integration), the same commits pushed once, and the executor's
+pipeline: index-only commits of the touched paths with a single push.
+
+Usage:
+    python -m benchmarks.bench_commit --files 50000 --steps 10
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from src.git.github_manager import GitHubManager
+
+
+SCENARIOS = [
+    # name, stage only touched paths, push after every step
+    ("add_all_push_per_step", False, True),
+    ("add_all_single_push", False, False),
+    ("touched_paths_single_push", True, False),
+]
+
+
+def git(*args: str, cwd: Path) -> None:
+    """Run a git command quietly."""
+    subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def build_fixture(root: Path, files: int) -> Path:
+    """Create ``<root>/remote.git`` holding a repository of ``files`` files."""
+    seed = root / "seed"
+    remote = root / "remote.git"
+    seed.mkdir(parents=True)
+    git("init", "-q", "-b", "main", cwd=seed)
+    
+    for index in range(files):
+        path = seed / f"pkg{index % 200}" / f"module_{index}.py"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(f"VALUE = {index}\n")
+    
+    git("add", "-A", cwd=seed)
+    git("commit", "-q", "-m", "initial", cwd=seed)
+    git("clone", "-q", "--bare", str(seed), str(remote), cwd=root)
+    # Background auto-gc would skew timings and race the cleanup
+    git("config", "gc.auto", "0", cwd=remote)
+    return remote
+
+
+async def run_scenario(
+    name: str,
+    touched_only: bool,
+    push_per_step: bool,
+    root: Path,
+    remote: Path,
+    steps: int,
+) -> dict:
+    """Replay one task's steps and time the git calls."""
+    workspace = root / name
+    git("clone", "-q", str(remote), str(workspace), cwd=root)
+    git("config", "gc.auto", "0", cwd=workspace)
+    git("checkout", "-q", "-b", f"dev-task/{name}", cwd=workspace)
+    manager = GitHubManager(token="unused", workspace_path=root / ".manager")
+    
+    commit_times = []
+    push_times = []
+    
+    for step in range(steps):
+        # Half the steps modify a file, half create one
+        if step % 2:
+            path = f"pkg{step}/module_{step}.py"
+        else:
+            path = f"new/feature_{step}.py"
+        (workspace / path).parent.mkdir(parents=True, exist_ok=True)
+        (workspace / path).write_text(f"STEP = {step}\n")
+        
+        start = time.perf_counter()
+        if touched_only:
+            await manager.commit_paths(workspace, f"Step {step}", [path])
+        else:
+            await manager.commit_changes(workspace, f"Step {step}")
+        commit_times.append(time.perf_counter() - start)
+        
+        if push_per_step:
+            start = time.perf_counter()
+            await manager.push_branch(workspace)
+            push_times.append(time.perf_counter() - start)
+    
+    if not push_per_step:
+        start = time.perf_counter()
+        await manager.push_branch(workspace)
+        push_times.append(time.perf_counter() - start)
+    
+    manager.git.close()
+    
+    return {
+        "scenario": name,
+        "git_time_per_task_s": round(sum(commit_times) + sum(push_times), 3),
+        "commit_avg_ms": round(sum(commit_times) / len(commit_times) * 1000, 1),
+        "pushes": len(push_times),
+        "push_total_s": round(sum(push_times), 3),
+        "git_commands": manager.git.commands,
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=50000)
+    parser.add_argument("--steps", type=int, default=10)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        remote = build_fixture(root, args.files)
+        print(json.dumps({
+            "fixture_files": args.files,
+            "steps": args.steps,
+            "build_s": round(time.perf_counter() - start, 1),
+        }))
+        
+        for name, touched_only, push_per_step in SCENARIOS:
+            result = asyncio.run(run_scenario(
+                name, touched_only, push_per_step, root, remote, args.steps,
+            ))
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark task persistence under many concurrent chats.
+
+Each simulated chat creates a task, moves it through its status and step
+updates and reads it back, like the bot does while planning and executing.
+Compares synchronous database calls on the event loop with the default
+rollback journal (the old behavior) against the async layer on the
+database worker pool with WAL journaling, with and without the
+write-behind buffer for task updates.
+
+Usage:
+    python -m benchmarks.bench_database --chats 50 --updates 10
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from src.models import async_database, database
+from src.models.task import Task, TaskStatus
+from src.models.write_buffer import TaskWriteBuffer
+
+
+def make_task(chat: int, iteration: int) -> Task:
+    """Build a task with a realistic plan payload."""
+    return Task(
+        id=f"task-{chat:04d}{iteration:04d}",
+        telegram_user_id=chat,
+        telegram_chat_id=chat,
+        description="benchmark task",
+        repo_url="https://github.com/test/repo",
+        status=TaskStatus.PENDING_APPROVAL,
+        plan={
+            "objetivo": "benchmark",
+            "pasos": [
+                {"paso": n, "descripcion": f"step {n} " * 20, "archivos": [f"src/m{n}.py"]}
+                for n in range(1, 11)
+            ],
+        },
+    )
+
+
+async def measure_lag(stop: asyncio.Event, samples: list[float], interval: float = 0.01) -> None:
+    """Record how late the event loop wakes a periodic timer."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def simulate_chat(
+    chat: int,
+    iterations: int,
+    updates: int,
+    think: float,
+    use_async: bool,
+    buffer: TaskWriteBuffer | None,
+) -> int:
+    """Run one chat's task lifecycle; returns the number of task writes requested."""
+    db = async_database if use_async else database
+    
+    async def call(func_name: str, *args):
+        if buffer is not None and func_name == "update_task":
+            return await buffer.update(*args)
+        result = getattr(db, func_name)(*args)
+        return await result if use_async else result
+    
+    writes = 0
+    
+    for iteration in range(iterations):
+        task = make_task(chat, iteration)
+        await call("save_task", task)
+        writes += 1
+        
+        task.status = TaskStatus.IN_PROGRESS
+        for step in range(1, updates + 1):
+            await asyncio.sleep(think)
+            task.current_step = step
+            await call("update_task", task)
+            writes += 1
+            await call("get_active_task", chat)
+        
+        task.status = TaskStatus.COMPLETED
+        await call("update_task", task)
+        writes += 1
+        await call("get_user_tasks", chat)
+    
+    return writes
+
+
+async def run_scenario(
+    name: str,
+    use_async: bool,
+    use_buffer: bool,
+    chats: int,
+    iterations: int,
+    updates: int,
+    think: float,
+) -> dict:
+    """Run all chats concurrently and collect throughput and lag."""
+    stop = asyncio.Event()
+    lag: list[float] = []
+    lag_task = asyncio.create_task(measure_lag(stop, lag))
+    buffer = TaskWriteBuffer(flush_interval=0.1) if use_buffer else None
+    
+    start = time.perf_counter()
+    writes = await asyncio.gather(*[
+        simulate_chat(chat, iterations, updates, think, use_async, buffer)
+        for chat in range(chats)
+    ])
+    if buffer is not None:
+        await buffer.close()
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    await lag_task
+    
+    lag_ms = sorted(x * 1000 for x in lag) or [0.0]
+    
+    result = {
+        "mode": name,
+        "chats": chats,
+        "writes": sum(writes),
+        "elapsed_s": round(elapsed, 3),
+        "writes_per_s": round(sum(writes) / elapsed, 1),
+        "loop_lag_p50_ms": round(statistics.median(lag_ms), 2),
+        "loop_lag_p95_ms": round(lag_ms[int(len(lag_ms) * 0.95) - 1], 2),
+        "loop_lag_max_ms": round(lag_ms[-1], 2),
+    }
+    
+    if buffer is not None:
+        stats = buffer.get_stats()
+        result.update({
+            "flushes": stats["flushes"],
+            "forced_flushes": stats["forced_flushes"],
+            "rows_written": stats["rows_written"],
+            "rows_written_per_s": round(stats["rows_written"] / elapsed, 1),
+        })
+    
+    return result
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chats", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=2)
+    parser.add_argument("--updates", type=int, default=10)
+    parser.add_argument("--think", type=float, default=0.001)
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args()
+    
+    scenarios = [
+        ("blocking_rollback_journal", False, False, False),
+        ("async_wal", True, True, False),
+        ("async_wal_write_behind", True, True, True),
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, use_async, wal, use_buffer in scenarios:
+            database.init_database(
+                f"sqlite:///{Path(tmp) / name}.db",
+                pool_size=args.pool_size,
+                sqlite_wal=wal,
+            )
+            try:
+                result = asyncio.run(run_scenario(
+                    name=name,
+                    use_async=use_async,
+                    use_buffer=use_buffer,
+                    chats=args.chats,
+                    iterations=args.iterations,
+                    updates=args.updates,
+                    think=args.think,
+                ))
+            finally:
+                database.close_database()
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
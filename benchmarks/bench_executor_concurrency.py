@@ -0,0 +1,186 @@
+"""
+Benchmark concurrent task execution and event-loop responsiveness.
+
+Runs many fake tasks through TaskExecutor in parallel, with a fake Gemini
+model that sleeps in a worker thread (the real SDK path), and compares it
+to a provider that blocks the event loop (the old behavior).
+
+Usage:
+    python -m benchmarks.bench_executor_concurrency --tasks 20 --steps 3
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from src.agents.executor import TaskExecutor
+from src.llm.client import LLMClient
+from src.llm.fake import FakeLLMClient
+from src.llm.gemini import GeminiClient
+from src.models.task import Task
+
+
+def step_response(step: int) -> str:
+    """Build a successful step result for the fake model."""
+    return json.dumps({
+        "success": True,
+        "action": "create",
+        "file_path": f"src/module_{step}.py",
+        "content": f"VALUE = {step}\n" * 50,
+        "explanation": "fake",
+    })
+
+
+class _FakeResponse:
+    """Minimal stand-in for a GenerateContentResponse."""
+    
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.usage_metadata = None
+
+
+class _FakeGenerativeModel:
+    """Synchronous fake model, like google.generativeai.GenerativeModel."""
+    
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+    
+    def generate_content(self, prompt: str, **kwargs: Any) -> _FakeResponse:
+        time.sleep(self.latency)
+        step = int(prompt.split("**Paso ", 1)[1].split(":", 1)[0])
+        return _FakeResponse(step_response(step))
+
+
+class ThreadedFakeGeminiClient(GeminiClient):
+    """GeminiClient whose model is a local sleeping fake."""
+    
+    def __init__(self, latency: float, max_concurrency: int) -> None:
+        super().__init__(api_key="offline", max_concurrency=max_concurrency)
+        self._fake_model = _FakeGenerativeModel(latency)
+    
+    def _get_model(self, model: str, system: str | None) -> Any:
+        return self._fake_model
+
+
+def make_task(index: int, steps: int) -> Task:
+    """Build a task with a simple plan."""
+    return Task(
+        id=f"task-bench-{index:04d}",
+        telegram_user_id=1,
+        telegram_chat_id=1,
+        description="benchmark task",
+        repo_url="https://github.com/test/repo",
+        plan={
+            "objetivo": "benchmark",
+            "archivos": [],
+            "pasos": [
+                {"paso": n, "descripcion": f"step {n}", "archivos": [f"src/module_{n}.py"]}
+                for n in range(1, steps + 1)
+            ],
+            "estimacion": "1 minuto",
+        },
+    )
+
+
+async def measure_lag(stop: asyncio.Event, samples: list[float], interval: float = 0.01) -> None:
+    """Record how late the event loop wakes a periodic timer."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - expected))
+
+
+async def run_scenario(
+    name: str,
+    client: LLMClient,
+    tasks: int,
+    steps: int,
+    max_concurrent_tasks: int,
+    workspace: Path,
+) -> dict:
+    """Execute all tasks concurrently and collect throughput and lag."""
+    executor = TaskExecutor(
+        workspace_path=workspace / name,
+        client=client,
+        max_concurrent_tasks=max_concurrent_tasks,
+    )
+    
+    stop = asyncio.Event()
+    lag: list[float] = []
+    lag_task = asyncio.create_task(measure_lag(stop, lag))
+    
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        executor.execute(make_task(i, steps)) for i in range(tasks)
+    ])
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    await lag_task
+    await client.aclose()
+    
+    lag_ms = sorted(x * 1000 for x in lag) or [0.0]
+    
+    return {
+        "mode": name,
+        "tasks": tasks,
+        "succeeded": sum(1 for r in results if r["success"]),
+        "elapsed_s": round(elapsed, 3),
+        "tasks_per_min": round(tasks / elapsed * 60, 1),
+        "loop_lag_p50_ms": round(statistics.median(lag_ms), 2),
+        "loop_lag_p95_ms": round(lag_ms[int(len(lag_ms) * 0.95) - 1], 2),
+        "loop_lag_max_ms": round(lag_ms[-1], 2),
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--steps", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--max-concurrent-tasks", type=int, default=8)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = Path(tmp)
+        scenarios = [
+            (
+                "blocking",
+                FakeLLMClient(
+                    responder=lambda m: step_response(
+                        int(m[0]["content"].split("**Paso ", 1)[1].split(":", 1)[0])
+                    ),
+                    latency=args.latency,
+                    blocking=True,
+                ),
+            ),
+            (
+                "threaded",
+                ThreadedFakeGeminiClient(
+                    latency=args.latency,
+                    max_concurrency=args.max_concurrent_tasks,
+                ),
+            ),
+        ]
+        
+        for name, client in scenarios:
+            result = asyncio.run(run_scenario(
+                name=name,
+                client=client,
+                tasks=args.tasks,
+                steps=args.steps,
+                max_concurrent_tasks=args.max_concurrent_tasks,
+                workspace=workspace,
+            ))
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Benchmark concurrent branch + commit + push cycles.
+
+Creates local bare repositories standing in for GitHub remotes, clones
+each for several tasks, and runs every task's cycle (create a branch off
+``main``, write a file, commit, push) concurrently. Compares the previous
+inline GitPython calls, which block the event loop, with GitHubManager's
+bounded GitRunner. Reports throughput and how late a 10ms ticker on the
+event loop fires while the cycles run.
+
+Usage:
+    python -m benchmarks.bench_git --repos 4 --tasks-per-repo 4 --cycles 5
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from git import Repo
+
+from src.git.github_manager import GitHubManager
+
+
+TICK = 0.01
+
+
+def git(*args: str, cwd: Path) -> None:
+    """Run a git command quietly."""
+    subprocess.run(
+        ["git", "-c", "user.name=bench", "-c", "user.email=bench@example.com", *args],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def build_fixture(root: Path, repos: int, tasks_per_repo: int, files: int) -> list[Path]:
+    """Create bare remotes and one clone per task; returns the clones."""
+    clones = []
+    
+    for repo in range(repos):
+        seed = root / f"seed-{repo}"
+        remote = root / "remotes" / f"repo-{repo}.git"
+        seed.mkdir(parents=True)
+        git("init", "-q", "-b", "main", cwd=seed)
+        for index in range(files):
+            path = seed / f"pkg{index % 20}" / f"module_{index}.py"
+            path.parent.mkdir(exist_ok=True)
+            path.write_text(f"VALUE = {index}\n")
+        git("add", "-A", cwd=seed)
+        git("commit", "-q", "-m", "initial", cwd=seed)
+        remote.parent.mkdir(parents=True, exist_ok=True)
+        git("clone", "-q", "--bare", str(seed), str(remote), cwd=root)
+        
+        for task in range(tasks_per_repo):
+            clone = root / "tasks" / f"repo-{repo}-task-{task}"
+            git("clone", "-q", str(remote), str(clone), cwd=root)
+            git("config", "user.name", "bench", cwd=clone)
+            git("config", "user.email", "bench@example.com", cwd=clone)
+            clones.append(clone)
+    
+    return clones
+
+
+def blocking_cycle(clone: Path, branch: str) -> None:
+    """One cycle with the previous inline GitPython calls."""
+    repo = Repo(clone)
+    repo.git.checkout("main")
+    repo.remotes.origin.pull()
+    repo.git.checkout("-b", branch)
+    (clone / f"{branch.replace('/', '_')}.txt").write_text(branch)
+    repo.git.add("-A")
+    repo.index.commit(f"Update {branch}")
+    repo.git.push("-u", "origin", branch)
+
+
+async def runner_cycle(manager: GitHubManager, clone: Path, branch: str) -> None:
+    """One cycle through GitHubManager."""
+    await manager.create_branch(clone, branch, "main")
+    (clone / f"{branch.replace('/', '_')}.txt").write_text(branch)
+    await manager.commit_changes(clone, f"Update {branch}")
+    await manager.push_branch(clone, branch)
+
+
+async def measure_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    """Record how late a periodic tick fires on the event loop."""
+    while not stop.is_set():
+        expected = time.perf_counter() + TICK
+        await asyncio.sleep(TICK)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_scenario(
+    name: str,
+    clones: list[Path],
+    cycles: int,
+    root: Path,
+    concurrency: int,
+) -> dict:
+    """Run all tasks' cycles concurrently with one implementation."""
+    manager = GitHubManager(
+        token="unused",
+        workspace_path=root / "workspace",
+        git_concurrency=concurrency,
+    )
+    
+    async def task_loop(index: int, clone: Path) -> None:
+        for cycle in range(cycles):
+            branch = f"{name}/task-{index}-{cycle}"
+            if name == "blocking_gitpython":
+                blocking_cycle(clone, branch)
+            else:
+                await runner_cycle(manager, clone, branch)
+            # Yield like a task doing LLM work between commits
+            await asyncio.sleep(0)
+    
+    stop = asyncio.Event()
+    lags: list[float] = []
+    ticker = asyncio.create_task(measure_lag(stop, lags))
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(task_loop(index, clone) for index, clone in enumerate(clones)))
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    await ticker
+    manager.git.close()
+    
+    total = len(clones) * cycles
+    return {
+        "scenario": name,
+        "cycles": total,
+        "elapsed_s": round(elapsed, 2),
+        "cycles_per_s": round(total / elapsed, 1),
+        "loop_lag_p50_ms": round(percentile(lags, 0.5) * 1000, 1),
+        "loop_lag_p95_ms": round(percentile(lags, 0.95) * 1000, 1),
+        "loop_lag_max_ms": round(max(lags, default=0.0) * 1000, 1),
+        "git": manager.git.get_stats() if name != "blocking_gitpython" else None,
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repos", type=int, default=4)
+    parser.add_argument("--tasks-per-repo", type=int, default=4)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    
+    for name in ("blocking_gitpython", "git_runner"):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            clones = build_fixture(root, args.repos, args.tasks_per_repo, args.files)
+            result = asyncio.run(run_scenario(name, clones, args.cycles, root, args.concurrency))
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark concurrent intent classification against the fake LLM provider.
+
+Compares a blocking provider (the old synchronous SDK behavior) with the
+async client layer, for N concurrent chats.
+
+Usage:
+    python -m benchmarks.bench_llm_client --chats 50 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from src.agents.intent_classifier import IntentClassifier
+from src.llm.fake import FakeLLMClient
+
+
+INTENT_RESPONSE = json.dumps({
+    "intent": "TASK_LIST",
+    "confidence": 0.95,
+    "needs_clarification": False,
+})
+
+
+async def run_scenario(
+    chats: int,
+    latency: float,
+    concurrency: int,
+    blocking: bool,
+) -> dict:
+    """Classify one message per chat concurrently and measure throughput."""
+    client = FakeLLMClient(
+        text=INTENT_RESPONSE,
+        latency=latency,
+        max_concurrency=concurrency,
+        blocking=blocking,
+    )
+    classifier = IntentClassifier(client=client)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        classifier.classify(f"lista mis tareas {i}") for i in range(chats)
+    ])
+    elapsed = time.perf_counter() - start
+    
+    return {
+        "mode": "blocking" if blocking else "async",
+        "chats": chats,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(chats / elapsed, 1),
+        "peak_in_flight": client.peak_in_flight,
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chats", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    
+    for blocking in (True, False):
+        result = asyncio.run(run_scenario(
+            chats=args.chats,
+            latency=args.latency,
+            concurrency=args.concurrency,
+            blocking=blocking,
+        ))
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
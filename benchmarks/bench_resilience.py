@@ -0,0 +1,209 @@
+"""
+Benchmark intent classification latency against a flaky provider.
+
+A fake provider answers most requests quickly but fails some with a 503
+and leaves others hanging for seconds, like an overloaded backend. Intent
+classification requests arrive at a steady rate through the interactive
+scheduler lane.
+
+Compares calling the lane directly (every 503 is a failed request, every
+hang a slow answer), with jittered exponential retries, and with retries
+plus hedged duplicates after the p95 latency and a per-attempt timeout.
+Reports failures and latency percentiles.
+
+Then takes the provider down for a while and counts the requests sent to
+it and the time callers waited, with and without the circuit breaker.
+
+Usage:
+    python -m benchmarks.bench_resilience --requests 400 --rate 10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from src.llm.client import LLMClient
+from src.llm.fake import FakeLLMClient
+from src.llm.resilience import CircuitBreaker, ResilientClient
+from src.llm.scheduler import LLMScheduler
+
+
+SCENARIOS = [
+    # name, attempts, hedge, attempt timeout
+    ("direct", 1, False, None),
+    ("retry", 3, False, None),
+    ("retry_hedge", 3, True, 2.0),
+]
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def classify(
+    client: LLMClient,
+    latencies: list[float],
+    failures: list[tuple[str, float]],
+) -> None:
+    """Send one intent classification request, recording how it went."""
+    start = time.perf_counter()
+    try:
+        await client.complete(
+            model="fake",
+            max_tokens=500,
+            messages=[{"role": "user", "content": "agrega tests al módulo de pagos"}],
+        )
+    except Exception as e:
+        failures.append((type(e).__name__, time.perf_counter() - start))
+    latencies.append(time.perf_counter() - start)
+
+
+def build_client(
+    provider: FakeLLMClient,
+    attempts: int,
+    hedge: bool,
+    timeout: float | None,
+    breaker: CircuitBreaker | None = None,
+) -> tuple[LLMScheduler, LLMClient]:
+    """Interactive lane of a scheduler, wrapped in the resilience layer."""
+    scheduler = LLMScheduler(provider)
+    lane = scheduler.lane("interactive")
+    if attempts == 1 and breaker is None:
+        return scheduler, lane
+    
+    return scheduler, ResilientClient(
+        lane,
+        breaker=breaker or CircuitBreaker(provider.provider, failure_threshold=10**9),
+        max_attempts=attempts,
+        base_delay=0.1,
+        max_delay=1.0,
+        attempt_timeout=timeout,
+        hedge=hedge,
+    )
+
+
+async def run_flaky(
+    name: str,
+    attempts: int,
+    hedge: bool,
+    timeout: float | None,
+    requests: int,
+    rate: float,
+    error_rate: float,
+    slow_rate: float,
+) -> dict:
+    """Replay the intent workload against the flaky provider."""
+    random.seed(name)
+    provider = FakeLLMClient(
+        latency=0.2,
+        jitter=0.1,
+        error_rate=error_rate,
+        slow_rate=slow_rate,
+        slow_latency=10.0,
+        max_concurrency=256,
+    )
+    scheduler, client = build_client(provider, attempts, hedge, timeout)
+    
+    latencies: list[float] = []
+    failures: list[tuple[str, float]] = []
+    calls = []
+    
+    # Poisson arrivals, the same sequence in every scenario
+    arrivals = random.Random("arrivals")
+    start = time.perf_counter()
+    for _ in range(requests):
+        calls.append(asyncio.create_task(classify(client, latencies, failures)))
+        await asyncio.sleep(arrivals.expovariate(rate))
+    await asyncio.gather(*calls)
+    elapsed = time.perf_counter() - start
+    await scheduler.aclose()
+    
+    summary = {
+        "scenario": name,
+        "elapsed_s": round(elapsed, 1),
+        "requests": requests,
+        "failed": len(failures),
+        "provider_calls": provider.requests + provider.errors,
+        "p50_s": round(percentile(latencies, 0.5), 2),
+        "p95_s": round(percentile(latencies, 0.95), 2),
+        "p99_s": round(percentile(latencies, 0.99), 2),
+        "max_s": round(max(latencies), 2),
+    }
+    if isinstance(client, ResilientClient):
+        stats = client.get_stats()["resilience"]
+        summary.update({key: stats[key] for key in ("retries", "timeouts", "hedges_sent", "hedges_won")})
+    return summary
+
+
+async def run_outage(name: str, use_breaker: bool, requests: int, rate: float, outage: float) -> dict:
+    """Take the provider down for ``outage`` seconds mid-run."""
+    random.seed(name)
+    provider = FakeLLMClient(latency=0.2, max_concurrency=256)
+    breaker = CircuitBreaker(
+        provider.provider,
+        failure_threshold=5 if use_breaker else 10**9,
+        reset_timeout=1.0,
+    )
+    scheduler, client = build_client(provider, 3, False, None, breaker)
+    
+    latencies: list[float] = []
+    failures: list[tuple[str, float]] = []
+    calls = []
+    
+    async def toggle() -> None:
+        await asyncio.sleep(requests / rate / 4)
+        provider.down = True
+        await asyncio.sleep(outage)
+        provider.down = False
+    
+    toggler = asyncio.create_task(toggle())
+    arrivals = random.Random("arrivals")
+    for _ in range(requests):
+        calls.append(asyncio.create_task(classify(client, latencies, failures)))
+        await asyncio.sleep(arrivals.expovariate(rate))
+    await asyncio.gather(toggler, *calls)
+    await scheduler.aclose()
+    
+    waits = [wait for _, wait in failures]
+    return {
+        "scenario": name,
+        "requests": requests,
+        "failed": len(failures),
+        "calls_during_outage": provider.failed,
+        "fast_failures": client.fast_failures,
+        "breaker_opened": breaker.opened,
+        "p95_s": round(percentile(latencies, 0.95), 2),
+        "failed_wait_avg_s": round(sum(waits) / len(waits), 2) if waits else 0.0,
+    }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--rate", type=float, default=10.0, help="Requests per second")
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.03)
+    parser.add_argument("--outage", type=float, default=10.0, help="Outage seconds")
+    args = parser.parse_args()
+    
+    for name, attempts, hedge, timeout in SCENARIOS:
+        result = asyncio.run(run_flaky(
+            name, attempts, hedge, timeout,
+            args.requests, args.rate, args.error_rate, args.slow_rate,
+        ))
+        print(json.dumps(result))
+    
+    for name, use_breaker in (("outage_retry", False), ("outage_breaker", True)):
+        result = asyncio.run(run_outage(name, use_breaker, args.requests, args.rate, args.outage))
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
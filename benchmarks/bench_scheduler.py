@@ -0,0 +1,127 @@
+"""
+Benchmark LLM request scheduling under a provider quota.
+
+A fake provider enforces a requests-per-minute quota and answers 429 when
+it is exceeded. After a warm-up uses up the burst allowance, background
+requests (task steps) arrive faster than the quota allows while
+interactive requests (intent classification) arrive once a second.
+
+Compares calling the provider directly (every 429 is a failed request,
+which users see as "Hubo un error"), the scheduler configured with the
+quota, and the scheduler without a configured quota relying only on 429
+backoff. Reports failures and queueing wait per lane.
+
+Usage:
+    python -m benchmarks.bench_scheduler --quota 120 --duration 20
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from src.llm.client import LLMClient
+from src.llm.fake import FakeLLMClient
+from src.llm.scheduler import LLMScheduler, QueueDeadlineExceeded
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def call(client: LLMClient, latencies: list[float], failures: list[str]) -> None:
+    """Send one request, recording its latency or why it failed."""
+    start = time.perf_counter()
+    try:
+        await client.complete(
+            model="fake",
+            max_tokens=200,
+            messages=[{"role": "user", "content": "hola " * 100}],
+        )
+    except QueueDeadlineExceeded:
+        failures.append("deadline")
+    except Exception as e:
+        failures.append(type(e).__name__)
+    else:
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_scenario(name: str, quota: int, duration: float, background_rate: float) -> dict:
+    """Replay the workload against one client setup."""
+    provider = FakeLLMClient(latency=0.1, requests_per_minute=quota, max_concurrency=64)
+    
+    scheduler = None
+    if name == "direct":
+        interactive = background = provider
+    else:
+        scheduler = LLMScheduler(
+            provider,
+            requests_per_minute=quota if name == "scheduled" else 0,
+            deadlines={"background": duration},
+        )
+        interactive = scheduler.lane("interactive")
+        background = scheduler.lane("background")
+    
+    # Use up the burst allowance so the run sees the sustained quota
+    for _ in range(quota):
+        await background.complete(model="fake", max_tokens=1, messages=[{"role": "user", "content": ""}])
+    
+    results = {lane: ([], []) for lane in ("interactive", "background")}
+    calls = []
+    
+    async def produce(lane: str, client: LLMClient, rate: float) -> None:
+        # Poisson arrivals, the same sequence in every scenario
+        arrivals = random.Random(lane)
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            calls.append(asyncio.create_task(call(client, *results[lane])))
+            await asyncio.sleep(arrivals.expovariate(rate))
+    
+    start = time.perf_counter()
+    await asyncio.gather(
+        produce("interactive", interactive, 1.0),
+        produce("background", background, background_rate),
+    )
+    await asyncio.gather(*calls)
+    elapsed = time.perf_counter() - start
+    
+    if scheduler is not None:
+        await scheduler.aclose()
+    
+    summary = {
+        "scenario": name,
+        "elapsed_s": round(elapsed, 1),
+        "provider_429s": provider.rate_limited,
+    }
+    for lane, (latencies, failures) in results.items():
+        summary[lane] = {
+            "ok": len(latencies),
+            "failed": len(failures),
+            "p50_s": round(percentile(latencies, 0.5), 2),
+            "p95_s": round(percentile(latencies, 0.95), 2),
+        }
+    if scheduler is not None:
+        summary["lanes"] = scheduler.get_stats()["lanes"]
+    return summary
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--quota", type=int, default=120, help="Provider requests per minute")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--background-rate", type=float, default=3.0, help="Requests per second")
+    args = parser.parse_args()
+    
+    for name in ("direct", "scheduled", "scheduled_429_only"):
+        result = asyncio.run(run_scenario(name, args.quota, args.duration, args.background_rate))
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark parallel DAG execution of plan steps with a mocked model.
+
+Runs a plan whose steps touch disjoint files through TaskExecutor with
+increasing step parallelism and reports wall time and speedup.
+
+Usage:
+    python -m benchmarks.bench_step_scheduler --steps 10 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from src.agents.executor import TaskExecutor
+from src.llm.fake import FakeLLMClient
+from src.models.task import Task
+
+
+def respond(messages: list[dict]) -> str:
+    """Fake model: create the file named in the step."""
+    prompt = messages[0]["content"]
+    step = int(prompt.split("**Paso ", 1)[1].split(":", 1)[0])
+    return json.dumps({
+        "success": True,
+        "action": "create",
+        "file_path": f"src/module_{step}.py",
+        "content": f"VALUE = {step}\n",
+        "explanation": "fake",
+    })
+
+
+def make_task(steps: int) -> Task:
+    """Build a task whose steps touch disjoint files."""
+    return Task(
+        telegram_user_id=1,
+        telegram_chat_id=1,
+        description="benchmark task",
+        repo_url="https://github.com/test/repo",
+        plan={
+            "objetivo": "benchmark",
+            "archivos": [f"src/module_{n}.py" for n in range(1, steps + 1)],
+            "pasos": [
+                {"paso": n, "descripcion": f"step {n}", "archivos": [f"src/module_{n}.py"]}
+                for n in range(1, steps + 1)
+            ],
+            "estimacion": "1 minuto",
+        },
+    )
+
+
+async def run_scenario(steps: int, latency: float, parallel: int, workspace: Path) -> float:
+    """Execute one task and return its wall time."""
+    executor = TaskExecutor(
+        workspace_path=workspace,
+        client=FakeLLMClient(responder=respond, latency=latency),
+        max_parallel_steps=parallel,
+    )
+    
+    start = time.perf_counter()
+    result = await executor.execute(make_task(steps))
+    elapsed = time.perf_counter() - start
+    
+    assert result["success"] and result["steps_completed"] == steps
+    return elapsed
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--parallel", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for parallel in args.parallel:
+            elapsed = asyncio.run(run_scenario(args.steps, args.latency, parallel, Path(tmp)))
+            baseline = baseline or elapsed
+            print(json.dumps({
+                "steps": args.steps,
+                "max_parallel_steps": parallel,
+                "elapsed_s": round(elapsed, 3),
+                "speedup": round(baseline / elapsed, 2),
+            }))
+
+
+if __name__ == "__main__":
+    main()
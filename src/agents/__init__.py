@@ -3,6 +3,7 @@
 from src.agents.intent_classifier import IntentClassifier
 from src.agents.plan_generator import PlanGenerator
 from src.agents.executor import TaskExecutor
+from src.agents.rule_classifier import RuleBasedClassifier
 
 
-__all__ = ["IntentClassifier", "PlanGenerator", "TaskExecutor"]
+__all__ = ["IntentClassifier", "PlanGenerator", "RuleBasedClassifier", "TaskExecutor"]
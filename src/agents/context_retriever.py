@@ -0,0 +1,367 @@
+"""Relevant-file retrieval for executor step prompts."""
+
+import logging
+import re
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel, Field
+
+from src.git.github_manager import parse_repo_url
+from src.models.task import Task
+from src.utils.async_utils import run_sync
+from src.utils.tokens import estimate_tokens
+
+
+if TYPE_CHECKING:
+    from src.git.repo_indexer import RepoIndexer
+
+
+logger = logging.getLogger(__name__)
+
+
+WORD_RE = re.compile(r"[a-z][a-z0-9]{2,}")
+
+# Score for a file directly importing or imported by a step file
+IMPORT_WEIGHT = 3.0
+
+
+class RetrievedContext(BaseModel):
+    """Files selected for a step prompt."""
+    
+    files: dict[str, str] = Field(default_factory=dict)
+    related: list[str] = Field(default_factory=list)
+    tokens: int = 0
+    latency: float = 0.0
+
+
+class ContextRetriever:
+    """
+    Selects and loads the files a step needs to see.
+    
+    The step's own ``archivos`` always come first; related files are ranked
+    by the repository index (import graph neighbours, then lexical overlap
+    between the step description and file paths/symbols) and added while
+    they fit the token budget. File reads are memoized per task and kept in
+    sync with the executor's writes.
+    
+    Files are read from the task workspace. Only when the workspace is not
+    a git checkout, missing files are read from the shared checkout, and
+    only while that checkout is at the commit the index was built from.
+    """
+    
+    def __init__(
+        self,
+        indexer: "RepoIndexer | None" = None,
+        repos_path: Path | None = None,
+        max_tokens: int = 6000,
+        top_k: int = 5,
+    ) -> None:
+        """
+        Initialize the retriever.
+        
+        Args:
+            indexer: Repository indexer providing file graphs and symbols
+            repos_path: Root of the shared read-only checkouts, used when a
+                file is not in a task workspace that is not a git checkout
+            max_tokens: Token budget for file contents in one prompt
+            top_k: Maximum related files added per step
+        """
+        self.indexer = indexer
+        self.repos_path = repos_path
+        self.max_tokens = max_tokens
+        self.top_k = top_k
+        
+        # Per-task state
+        self._reads: dict[str, dict[str, str | None]] = {}
+        self._graphs: dict[str, "_IndexGraph | None"] = {}
+        self._commits: dict[str, str] = {}
+        
+        # Metrics
+        self.steps = 0
+        self.read_hits = 0
+        self.read_misses = 0
+        self.stale_checkouts = 0
+        self.total_latency = 0.0
+        self.total_context_tokens = 0
+        self.total_prompt_tokens = 0
+        self.max_prompt_tokens = 0
+    
+    async def retrieve(
+        self,
+        task: Task,
+        paso: dict[str, Any],
+        workspace: Path,
+    ) -> RetrievedContext:
+        """
+        Load the step's files and the most related ones under the budget.
+        
+        Args:
+            task: Task being executed
+            paso: Plan step
+            workspace: Task workspace
+        
+        Returns:
+            Selected files with their contents
+        """
+        start = time.perf_counter()
+        targets = list(paso.get("archivos") or [])
+        
+        graph = await self._get_graph(task)
+        candidates = graph.rank(targets, paso.get("descripcion", "")) if graph else []
+        
+        context = await run_sync(self._pack, task, workspace, targets, candidates)
+        context.latency = time.perf_counter() - start
+        
+        self.steps += 1
+        self.total_latency += context.latency
+        self.total_context_tokens += context.tokens
+        
+        logger.debug(
+            "Retrieved %d files (%d related, %d tokens) for step %d in %.1fms",
+            len(context.files), len(context.related), context.tokens,
+            paso["paso"], context.latency * 1000,
+        )
+        
+        return context
+    
+    async def read_file(self, task: Task, workspace: Path, file_path: str) -> str | None:
+        """Read a file as the model saw it (memoized per task)."""
+        return await run_sync(self._read, task, workspace, file_path)
+    
+    def update_file(self, task: Task, file_path: str, content: str | None) -> None:
+        """Record a write (or deletion with None) made by the executor."""
+        self._reads.setdefault(task.id, {})[file_path] = content
+    
+    def record_prompt(self, tokens: int) -> None:
+        """Record the size of a step prompt built from retrieved context."""
+        self.total_prompt_tokens += tokens
+        self.max_prompt_tokens = max(self.max_prompt_tokens, tokens)
+    
+    def forget(self, task: Task) -> None:
+        """Drop the memoized state of a finished task."""
+        self._reads.pop(task.id, None)
+        self._graphs.pop(task.id, None)
+        self._commits.pop(task.id, None)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get retrieval metrics."""
+        reads = self.read_hits + self.read_misses
+        
+        return {
+            "steps": self.steps,
+            "avg_latency": self.total_latency / self.steps if self.steps else 0.0,
+            "avg_context_tokens": self.total_context_tokens / self.steps if self.steps else 0,
+            "avg_prompt_tokens": self.total_prompt_tokens / self.steps if self.steps else 0,
+            "max_prompt_tokens": self.max_prompt_tokens,
+            "read_hit_rate": self.read_hits / reads if reads else 0.0,
+            "stale_checkouts": self.stale_checkouts,
+        }
+    
+    async def _get_graph(self, task: Task) -> "_IndexGraph | None":
+        """Get (and memoize) the index graph of the task's repository."""
+        if task.id in self._graphs:
+            return self._graphs[task.id]
+        
+        graph = None
+        
+        if self.indexer is not None and task.repo_url:
+            try:
+                owner, repo_name = parse_repo_url(task.repo_url)
+                index = await self.indexer.latest(f"{owner}/{repo_name}")
+                if index is not None:
+                    graph = await run_sync(_IndexGraph, index)
+                    self._commits[task.id] = index["commit"]
+            except Exception as e:
+                logger.warning("Could not load index for %s: %s", task.repo_url, e)
+        
+        self._graphs[task.id] = graph
+        return graph
+    
+    def _pack(
+        self,
+        task: Task,
+        workspace: Path,
+        targets: list[str],
+        candidates: list[str],
+    ) -> RetrievedContext:
+        """Load step files, then related files while they fit the budget."""
+        context = RetrievedContext()
+        budget = self.max_tokens
+        
+        # Step files are always included; edits need their exact content
+        for file_path in targets:
+            content = self._read(task, workspace, file_path)
+            if content is not None:
+                context.files[file_path] = content
+                budget -= estimate_tokens(content)
+        
+        for file_path in candidates:
+            if len(context.related) >= self.top_k or budget <= 0:
+                break
+            if file_path in context.files:
+                continue
+            
+            content = self._read(task, workspace, file_path)
+            if content is None:
+                continue
+            
+            cost = estimate_tokens(content)
+            if cost > budget:
+                continue
+            
+            context.files[file_path] = content
+            context.related.append(file_path)
+            budget -= cost
+        
+        context.tokens = self.max_tokens - budget
+        return context
+    
+    def _read(self, task: Task, workspace: Path, file_path: str) -> str | None:
+        """Read a file from the task workspace or the shared checkout."""
+        reads = self._reads.setdefault(task.id, {})
+        
+        if file_path in reads:
+            self.read_hits += 1
+            return reads[file_path]
+        
+        self.read_misses += 1
+        content = None
+        
+        for root in self._roots(task, workspace):
+            try:
+                content = (root / file_path).read_text(encoding="utf-8")
+                break
+            except (FileNotFoundError, IsADirectoryError, NotADirectoryError, UnicodeDecodeError):
+                continue
+        
+        reads[file_path] = content
+        return content
+    
+    def _roots(self, task: Task, workspace: Path) -> list[Path]:
+        """Directories a repository file may be read from, in priority order."""
+        roots = [workspace]
+        
+        # A file missing from a task checkout does not exist at its commit
+        if (workspace / ".git").exists():
+            return roots
+        
+        commit = self._commits.get(task.id)
+        if self.repos_path is None or not task.repo_url or commit is None:
+            return roots
+        
+        try:
+            owner, repo_name = parse_repo_url(task.repo_url)
+        except ValueError:
+            return roots
+        
+        # The shared checkout moves with every indexed commit; only files at
+        # the commit the step was planned against may be used
+        checkout = self.repos_path / owner / repo_name
+        if _head_commit(checkout) == commit:
+            roots.append(checkout)
+        else:
+            self.stale_checkouts += 1
+            logger.debug("Shared checkout %s is not at %s", checkout, commit[:12])
+        
+        return roots
+
+
+class _IndexGraph:
+    """Import graph and lexical features derived from a repository index."""
+    
+    def __init__(self, index: dict[str, Any]) -> None:
+        """Build the graph from an index."""
+        files = index["files"]
+        modules = _module_map(files)
+        
+        self.neighbours: dict[str, set[str]] = {}
+        self.words: dict[str, set[str]] = {}
+        
+        for file_path, entry in files.items():
+            self.words[file_path] = _words(" ".join([file_path, *entry.get("symbols", [])]))
+            
+            for name in entry.get("imports", []):
+                target = _resolve_import(name, file_path, modules)
+                if target and target != file_path:
+                    self.neighbours.setdefault(file_path, set()).add(target)
+                    self.neighbours.setdefault(target, set()).add(file_path)
+    
+    def rank(self, targets: list[str], description: str) -> list[str]:
+        """Rank files by relation to the step's files and description."""
+        query = _words(description)
+        scores: dict[str, float] = {}
+        
+        for target in targets:
+            for neighbour in self.neighbours.get(target, ()):
+                scores[neighbour] = scores.get(neighbour, 0.0) + IMPORT_WEIGHT
+        
+        if query:
+            for file_path, words in self.words.items():
+                overlap = len(query & words)
+                if overlap:
+                    scores[file_path] = scores.get(file_path, 0.0) + overlap
+        
+        excluded = set(targets)
+        ranked = sorted(
+            (path for path in scores if path not in excluded),
+            key=lambda path: (-scores[path], path),
+        )
+        return ranked
+
+
+def _head_commit(checkout: Path) -> str | None:
+    """Commit a checkout is detached at, or None if unknown."""
+    try:
+        head = (checkout / ".git" / "HEAD").read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    
+    return head if not head.startswith("ref:") else None
+
+
+def _words(text: str) -> set[str]:
+    """Lowercase word features, splitting identifiers on _ and case changes."""
+    text = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", text).replace("_", " ")
+    return set(WORD_RE.findall(text.lower()))
+
+
+def _module_map(files: dict[str, Any]) -> dict[str, str]:
+    """Map dotted module names to Python file paths."""
+    modules = {}
+    
+    for file_path in files:
+        if not file_path.endswith(".py"):
+            continue
+        
+        module = file_path[:-3].replace("/", ".")
+        if module.endswith(".__init__"):
+            module = module[:-len(".__init__")]
+        
+        modules[module] = file_path
+        
+        # src-layout packages are imported without the "src." prefix
+        if module.startswith("src."):
+            modules.setdefault(module[len("src."):], file_path)
+    
+    return modules
+
+
+def _resolve_import(name: str, file_path: str, modules: dict[str, str]) -> str | None:
+    """Resolve an import recorded in the index to a repository file."""
+    if name.startswith("."):
+        level = len(name) - len(name.lstrip("."))
+        package = file_path.split("/")[:-1]
+        if level > 1:
+            package = package[:-(level - 1)]
+        rest = name[level:]
+        name = ".".join([*package, rest] if rest else package)
+    
+    # "from a.b import c" records "a.b"; "import a.b.c" may name a module or package
+    while name:
+        if name in modules:
+            return modules[name]
+        name = name.rpartition(".")[0]
+    
+    return None
@@ -1,14 +1,28 @@
 """Task execution agent using Gemini."""
 
+import asyncio
+import hashlib
 import json
 import logging
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
-import google.generativeai as genai
+from git.exc import GitCommandError
 
+from src.agents.context_retriever import ContextRetriever
+from src.agents.patching import PatchError, apply_patch
+from src.agents.step_scheduler import StepScheduler
+from src.git.change_set import CREATED, DELETED, MODIFIED, ChangeSet
+from src.llm.client import LLMClient
+from src.llm.resilience import is_transient_error
 from src.models.task import Task
+from src.utils.async_utils import run_sync
+from src.utils.tokens import estimate_tokens
+
+if TYPE_CHECKING:
+    from src.git.github_manager import GitHubManager
 
 
 logger = logging.getLogger(__name__)
@@ -23,14 +37,19 @@ Reglas:
 2. Sigue las convenciones del proyecto existente
 3. Incluye manejo de errores apropiado
 4. Agrega docstrings y comentarios donde sea necesario
-5. Si modificas un archivo, muestra el contenido completo resultante
+5. Si modificas un archivo existente, devuelve solo los cambios en "edits" como bloques
+   de búsqueda/reemplazo; "search" debe copiar literalmente un fragmento único del archivo
+6. Usa "content" con el archivo completo solo al crear un archivo nuevo
 
 Responde en formato JSON:
 {
     "success": true,
     "action": "create|modify|delete",
     "file_path": "src/example.py",
-    "content": "# Contenido completo del archivo...",
+    "edits": [
+        {"search": "líneas exactas a reemplazar", "replace": "líneas nuevas"}
+    ],
+    "content": "# Contenido completo (solo para action=create)",
     "explanation": "Explicación breve de los cambios"
 }
 
@@ -41,26 +60,117 @@ Si hay un error o no puedes completar el paso:
     "suggestion": "Sugerencia para resolver"
 }"""
 
+FULL_CONTENT_PROMPT = """No se pudieron aplicar tus cambios a `{file_path}`: {error}
+
+**Paso {paso}:** {descripcion}
+
+**Contenido actual de `{file_path}`:**
+```
+{original}
+```
+
+Responde en el mismo formato JSON con action "modify" y el contenido completo
+resultante del archivo en "content" (sin "edits")."""
+
+# Checkpoint location inside a task workspace
+CHECKPOINT_FILE = Path(".dev-tasks") / "checkpoint.json"
+
+# Bump when the checkpoint format changes; older checkpoints are ignored
+CHECKPOINT_VERSION = 1
+
+# Branch of a task that has none set
+BRANCH_PREFIX = "dev-task/"
+
+# Seconds before retrying a step whose model call failed, times the attempt
+STEP_RETRY_DELAY = 2.0
+
 
 class TaskExecutor:
     """Executes task steps using Gemini."""
     
     def __init__(
         self,
-        api_key: str,
         workspace_path: Path,
+        api_key: str | None = None,
+        client: LLMClient | None = None,
+        max_concurrent_tasks: int = 4,
+        max_parallel_steps: int = 1,
+        retriever: ContextRetriever | None = None,
+        checkpoint_interval: float = 300.0,
+        git: "GitHubManager | None" = None,
+        verify_changes: bool = False,
+        step_max_attempts: int = 2,
     ) -> None:
-        """Initialize with Google AI API key."""
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.0-flash")
+        """
+        Initialize the executor.
+        
+        Args:
+            workspace_path: Root directory for task workspaces
+            api_key: Google AI API key (used when no client is given)
+            client: Shared Gemini LLM client
+            max_concurrent_tasks: Tasks allowed to execute at once
+            max_parallel_steps: Independent steps of one task run at once
+            retriever: Selects the files shown to the model for each step
+            checkpoint_interval: Minimum seconds between checkpoints while
+                steps complete; 0 checkpoints after every step
+            git: Clones the task repository onto the task branch when
+                execution starts, commits the files of each step and pushes
+                them at checkpoints; None writes files to the task workspace
+                without git
+            verify_changes: Check recorded changes against ``git status`` of
+                their paths before committing
+            step_max_attempts: Attempts per step when the model call fails
+                transiently or its answer cannot be parsed
+        """
+        if client is None:
+            if api_key is None:
+                raise ValueError("Either api_key or client is required")
+            from src.llm.gemini import GeminiClient
+            client = GeminiClient(api_key=api_key)
+        
+        self.client = client
+        self.model = "gemini-2.0-flash"
         self.workspace_path = workspace_path
+        self.max_concurrent_tasks = max_concurrent_tasks
+        self._task_slots = asyncio.Semaphore(max_concurrent_tasks)
+        self.scheduler = StepScheduler(max_parallel=max_parallel_steps)
+        self.retriever = retriever or ContextRetriever()
+        self.checkpoint_interval = checkpoint_interval
+        self.git = git
+        self.verify_changes = verify_changes
+        self.step_max_attempts = max(1, step_max_attempts)
+        self.running_tasks = 0
+        self.step_retries = 0
+        
+        # Patch metrics
+        self.patches_applied = 0
+        self.patch_fallbacks = 0
+        self.tokens_saved = 0
+        
+        # Checkpoint metrics
+        self.checkpoints_written = 0
+        self.checkpoints_discarded = 0
+        self.steps_resumed = 0
+        
+        # Git metrics
+        self.step_commits = 0
+        self.pushes = 0
+        self.git_time = 0.0
     
-    async def execute(self, task: Task) -> dict[str, Any]:
+    async def execute(
+        self,
+        task: Task,
+        on_progress: Callable[[Task], Awaitable[None]] | None = None,
+    ) -> dict[str, Any]:
         """
         Execute all steps of a task.
         
+        Steps recorded in a valid checkpoint of the task workspace are not
+        executed again; their saved results are reused.
+        
         Args:
             task: Task with plan to execute
+            on_progress: Awaited with the task after each completed step
             
         Returns:
             Execution result with details
@@ -68,33 +178,140 @@ class TaskExecutor:
         if task.plan is None:
             raise ValueError("Task has no plan")
         
+        # Bound the number of tasks executing in this process
+        async with self._task_slots:
+            self.running_tasks += 1
+            try:
+                return await self._execute_steps(task, on_progress)
+            finally:
+                self.running_tasks -= 1
+                self.retriever.forget(task)
+    
+    async def _execute_steps(
+        self,
+        task: Task,
+        on_progress: Callable[[Task], Awaitable[None]] | None = None,
+    ) -> dict[str, Any]:
+        """Execute the plan steps of a task, independent steps in parallel."""
         logger.info("Executing task %s with %d steps", task.id, len(task.plan["pasos"]))
         
-        results = []
-        task.started_at = datetime.utcnow()
+        task.started_at = task.started_at or datetime.utcnow()
         task.total_steps = len(task.plan["pasos"])
+        task_workspace = self.workspace_path / task.id
+        work_path = self.checkout_path(task)
         
-        for paso in task.plan["pasos"]:
-            task.current_step = paso["paso"]
+        # Steps commit locally as they finish; commits are pushed at checkpoints
+        repo_path = None
+        git_time = 0.0
+        if work_path != task_workspace:
+            task.branch = task.branch or f"{BRANCH_PREFIX}{task.id}"
+            start = time.perf_counter()
+            repo_path = await self.git.prepare_task_checkout(task.repo_url, task.id, task.branch)
+            git_time += time.perf_counter() - start
+            self.git_time += time.perf_counter() - start
+        
+        # Results of successful steps, hashes of the files they wrote and
+        # the net changes of the task
+        checkpoint = await self.load_checkpoint(task)
+        completed: dict[int, dict[str, Any]] = checkpoint["steps"] if checkpoint else {}
+        file_hashes: dict[str, str | None] = checkpoint["files"] if checkpoint else {}
+        changes = checkpoint["changes"] if checkpoint else ChangeSet()
+        if completed:
+            logger.info(
+                "Resuming task %s: %d of %d steps already completed",
+                task.id, len(completed), task.total_steps,
+            )
+        
+        unpushed = bool(completed)
+        
+        if repo_path is not None and changes:
+            # Steps checkpointed before their commit ran
+            start = time.perf_counter()
+            await self._commit(task, repo_path, f"WIP: Resumed work of task {task.id}", changes)
+            git_time += time.perf_counter() - start
+        
+        checkpoint_lock = asyncio.Lock()
+        last_checkpoint = time.monotonic()
+        
+        async def save_checkpoint(push: bool = True) -> None:
+            nonlocal last_checkpoint, unpushed, git_time
+            async with checkpoint_lock:
+                await self.create_checkpoint(
+                    task, steps=completed, files=file_hashes, changes=changes
+                )
+                last_checkpoint = time.monotonic()
+                
+                if push and repo_path is not None and unpushed:
+                    start = time.perf_counter()
+                    if await self._push(task, repo_path):
+                        unpushed = False
+                    git_time += time.perf_counter() - start
+        
+        async def run_step(paso: dict[str, Any]) -> dict[str, Any]:
+            if paso["paso"] in completed:
+                logger.info("Skipping step %d, completed before", paso["paso"])
+                self.steps_resumed += 1
+                return {**completed[paso["paso"]], "resumed": True}
             
             logger.info("Executing step %d: %s", paso["paso"], paso["descripcion"])
+            result = await self._execute_step_with_retries(task, paso)
             
-            try:
-                result = await self._execute_step(task, paso)
-                results.append(result)
+            if result.get("success"):
+                file_path = result.get("file_path")
+                if file_path:
+                    file_hashes[file_path] = await run_sync(_hash_file, work_path / file_path)
+                if result.get("change"):
+                    changes.record(file_path, result["change"])
+                completed[paso["paso"]] = result
                 
-                if not result.get("success", False):
-                    logger.error("Step %d failed: %s", paso["paso"], result.get("error"))
-                    break
-                    
-            except Exception as e:
-                logger.exception("Step %d execution error: %s", paso["paso"], e)
-                results.append({
-                    "success": False,
-                    "step": paso["paso"],
-                    "error": str(e),
-                })
-                break
+                if time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+                    await save_checkpoint()
+            
+            return result
+        
+        async def on_step_complete(paso: dict[str, Any], result: dict[str, Any]) -> None:
+            nonlocal unpushed, git_time
+            # Called in plan order, whatever order steps finished in
+            task.current_step = paso["paso"]
+            
+            if not result.get("success", False):
+                logger.error("Step %d failed: %s", paso["paso"], result.get("error"))
+            elif repo_path is not None and result.get("change") and not result.get("resumed"):
+                step_changes = ChangeSet()
+                step_changes.record(result["file_path"], result["change"])
+                
+                start = time.perf_counter()
+                sha = await self._commit(
+                    task, repo_path, f"Step {paso['paso']}: {paso['descripcion']}", step_changes
+                )
+                git_time += time.perf_counter() - start
+                if sha is not None:
+                    result["commit"] = sha
+                    unpushed = True
+            
+            if on_progress is not None:
+                await on_progress(task)
+        
+        try:
+            results = await self.scheduler.run(
+                task.plan["pasos"],
+                run_step,
+                on_complete=on_step_complete,
+                plan_dependencies=task.plan.get("dependencias"),
+            )
+        except asyncio.CancelledError:
+            # Lost lease, abort or shutdown: another worker may own the branch
+            # already, and shutdown cannot wait for a push, so the finished
+            # steps are only checkpointed locally
+            await save_checkpoint(push=False)
+            raise
+        except Exception:
+            # Interrupted by an error or timeout: keep the finished steps
+            await save_checkpoint()
+            raise
+        
+        # Failed steps are not recorded, so a new run retries only those
+        await save_checkpoint()
         
         task.completed_at = datetime.utcnow()
         
@@ -106,8 +323,80 @@ class TaskExecutor:
             "steps_completed": task.current_step,
             "total_steps": task.total_steps,
             "results": results,
+            "changes": changes.to_dict(),
+            "git_time": git_time,
         }
     
+    async def _commit(
+        self,
+        task: Task,
+        repo_path: Path,
+        message: str,
+        changes: ChangeSet,
+    ) -> str | None:
+        """Commit changes of a task workspace; returns the SHA, or None if nothing was committed."""
+        start = time.perf_counter()
+        try:
+            sha = await self.git.commit_changes(
+                repo_path, message, changes=changes, verify=self.verify_changes
+            )
+        except (ValueError, GitCommandError, TimeoutError) as e:
+            logger.warning("Could not commit work of task %s: %s", task.id, e)
+            return None
+        finally:
+            self.git_time += time.perf_counter() - start
+        
+        if sha is not None:
+            self.step_commits += 1
+        return sha
+    
+    async def _push(self, task: Task, repo_path: Path) -> bool:
+        """Push the branch of a task workspace; returns whether it succeeded."""
+        start = time.perf_counter()
+        try:
+            await self.git.push_branch(repo_path)
+        except (ValueError, GitCommandError, TimeoutError) as e:
+            logger.warning("Could not push work of task %s: %s", task.id, e)
+            return False
+        finally:
+            self.git_time += time.perf_counter() - start
+        
+        self.pushes += 1
+        return True
+    
+    async def _execute_step_with_retries(
+        self,
+        task: Task,
+        paso: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Execute a step, retrying transient model failures and unparseable answers."""
+        attempt = 1
+        while True:
+            try:
+                result = await self._execute_step(task, paso)
+            except Exception as e:
+                if attempt >= self.step_max_attempts or not is_transient_error(e):
+                    raise
+                error = str(e)
+                delay = STEP_RETRY_DELAY * attempt
+            else:
+                if (
+                    result.get("success")
+                    or not result.get("retryable")
+                    or attempt >= self.step_max_attempts
+                ):
+                    return result
+                error = result.get("error")
+                delay = 0.0
+            
+            self.step_retries += 1
+            logger.warning(
+                "Step %d failed (attempt %d/%d), retrying: %s",
+                paso["paso"], attempt, self.step_max_attempts, error,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+    
     async def _execute_step(
         self,
         task: Task,
@@ -122,25 +411,48 @@ class TaskExecutor:
             "previous_steps": task.plan["pasos"][:paso["paso"] - 1],
         }
         
+        # Step files (and related ones) are shown so modifications can be sent as edits
+        retrieved = await self.retriever.retrieve(task, paso, self.checkout_path(task))
+        files_section = "".join(
+            f"\n**Contenido actual de `{path}`:**\n```\n{text}\n```\n"
+            for path, text in retrieved.files.items()
+        )
+        
         prompt = f"""Ejecuta el siguiente paso de desarrollo:
 
 **Paso {paso['paso']}:** {paso['descripcion']}
 
 **Contexto de la tarea:**
 {json.dumps(context, indent=2, ensure_ascii=False)}
-
+{files_section}
 Genera el código o cambios necesarios."""
 
-        response = self.model.generate_content(prompt)
+        prompt_tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt)
+        self.retriever.record_prompt(prompt_tokens)
+        
+        response = await self.client.complete(
+            model=self.model,
+            max_tokens=8192,
+            system=SYSTEM_PROMPT,
+            messages=[
+                {"role": "user", "content": prompt}
+            ],
+        )
         content = response.text
         
         # Parse and apply result
         result = self._parse_step_result(content)
         
-        if result.get("success") and result.get("content"):
-            await self._apply_changes(task, result)
+        if result.get("success"):
+            await self._apply_changes(task, paso, result)
         
         result["step"] = paso["paso"]
+        result["retrieval"] = {
+            "files": list(retrieved.files),
+            "context_tokens": retrieved.tokens,
+            "prompt_tokens": prompt_tokens,
+            "latency": retrieved.latency,
+        }
         return result
     
     def _parse_step_result(self, content: str) -> dict[str, Any]:
@@ -153,6 +465,7 @@ Genera el código o cambios necesarios."""
                 return {
                     "success": False,
                     "error": "No JSON found in response",
+                    "retryable": True,
                 }
             
             return json.loads(content[start:end])
@@ -161,11 +474,13 @@ Genera el código o cambios necesarios."""
             return {
                 "success": False,
                 "error": f"Invalid JSON: {e}",
+                "retryable": True,
             }
     
     async def _apply_changes(
         self,
         task: Task,
+        paso: dict[str, Any],
         result: dict[str, Any],
     ) -> None:
         """Apply file changes from step result."""
@@ -173,61 +488,307 @@ Genera el código o cambios necesarios."""
         content = result.get("content")
         action = result.get("action", "modify")
         
-        if not file_path or not content:
+        if not file_path:
             return
         
-        # Get task workspace
-        task_workspace = self.workspace_path / task.id
-        full_path = task_workspace / file_path
+        full_path = self.checkout_path(task) / file_path
         
         if action == "delete":
-            if full_path.exists():
-                full_path.unlink()
+            if await run_sync(full_path.exists):
+                await run_sync(full_path.unlink)
+                result["change"] = DELETED
                 logger.info("Deleted: %s", file_path)
-        else:
-            # Create or modify
-            full_path.parent.mkdir(parents=True, exist_ok=True)
-            full_path.write_text(content, encoding="utf-8")
-            logger.info("Written: %s", file_path)
+            self.retriever.update_file(task, file_path, None)
+            return
+        
+        if result.get("edits") or result.get("diff"):
+            content = await self._patch_file(task, paso, full_path, result)
+        
+        if not content:
+            return
+        
+        # Create or modify
+        result["change"] = MODIFIED if await run_sync(full_path.exists) else CREATED
+        await run_sync(_write_file, full_path, content)
+        self.retriever.update_file(task, file_path, content)
+        logger.info("Written: %s", file_path)
+    
+    async def _patch_file(
+        self,
+        task: Task,
+        paso: dict[str, Any],
+        full_path: Path,
+        result: dict[str, Any],
+    ) -> str | None:
+        """
+        Apply a step's edits to the current file content.
+        
+        Falls back to the full content in the result, or asks the model for
+        the complete file, when the patch does not apply.
+        """
+        file_path = result["file_path"]
+        edits = result.get("edits")
+        diff = result.get("diff")
+        # Patch the content the model was shown
+        original = await self.retriever.read_file(task, self.checkout_path(task), file_path)
+        
+        try:
+            if original is None:
+                raise PatchError("File does not exist")
+            
+            content = apply_patch(original, edits=edits, diff=diff)
+            
+        except PatchError as e:
+            logger.warning("Patch for %s failed (%s), using full content", file_path, e)
+            self.patch_fallbacks += 1
+            result["patch_fallback"] = True
+            
+            content = result.get("content") or await self._request_full_content(
+                paso, file_path, original or "", str(e)
+            )
+            
+            if not content:
+                result["success"] = False
+                result["error"] = f"Could not apply changes to {file_path}: {e}"
+            return content
+        
+        # Tokens the model would have spent returning the whole file
+        patch_tokens = estimate_tokens(json.dumps(edits, ensure_ascii=False) if edits else diff)
+        saved = max(0, estimate_tokens(content) - patch_tokens)
+        
+        self.patches_applied += 1
+        self.tokens_saved += saved
+        result["tokens_saved"] = saved
+        
+        return content
+    
+    async def _request_full_content(
+        self,
+        paso: dict[str, Any],
+        file_path: str,
+        original: str,
+        error: str,
+    ) -> str | None:
+        """Ask the model for the complete file after a failed patch."""
+        prompt = FULL_CONTENT_PROMPT.format(
+            file_path=file_path,
+            error=error,
+            paso=paso["paso"],
+            descripcion=paso["descripcion"],
+            original=original,
+        )
+        
+        try:
+            response = await self.client.complete(
+                model=self.model,
+                max_tokens=8192,
+                system=SYSTEM_PROMPT,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+            )
+        except Exception as e:
+            logger.error("Full content request for %s failed: %s", file_path, e)
+            return None
+        
+        return self._parse_step_result(response.text).get("content")
+    
+    def checkout_path(self, task: Task) -> Path:
+        """
+        Directory the files of a task are read from and written to.
+        
+        With git this is the checkout of the task repository,
+        ``<workspace>/<task_id>/<repo_name>``; otherwise the task workspace.
+        """
+        task_workspace = self.workspace_path / task.id
+        if self.git is None or not task.repo_url:
+            return task_workspace
+        
+        try:
+            _, repo_name = self.git.parse_repo_url(task.repo_url)
+        except ValueError:
+            return task_workspace
+        return task_workspace / repo_name
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get executor metrics."""
+        return {
+            "running_tasks": self.running_tasks,
+            "patches_applied": self.patches_applied,
+            "patch_fallbacks": self.patch_fallbacks,
+            "tokens_saved": self.tokens_saved,
+            "checkpoints_written": self.checkpoints_written,
+            "checkpoints_discarded": self.checkpoints_discarded,
+            "steps_resumed": self.steps_resumed,
+            "step_retries": self.step_retries,
+            "step_commits": self.step_commits,
+            "pushes": self.pushes,
+            "git_time": self.git_time,
+            "retrieval": self.retriever.get_stats(),
+        }
     
     async def commit_partial_work(self, task: Task) -> dict[str, Any] | None:
-        """Commit any partial work done on a task."""
+        """
+        Commit and push the work of an interrupted task.
+        
+        Completed steps were committed as they finished; this commits any
+        of the changes recorded in the task checkpoint that are still
+        uncommitted and pushes everything not pushed yet.
+        
+        Returns:
+            {"committed", "sha", "pushed", "message"}, or None if the task
+            has no repository checkout
+        """
         task_workspace = self.workspace_path / task.id
+        repo_path = self.checkout_path(task)
         
-        if not task_workspace.exists():
+        if repo_path == task_workspace or not await run_sync((repo_path / ".git").exists):
             return None
         
-        # TODO: Implement Git commit logic
         logger.info("Committing partial work for task %s", task.id)
         
+        checkpoint = task.checkpoint_data
+        checkpoint_file = task_workspace / CHECKPOINT_FILE
+        if checkpoint is None and await run_sync(checkpoint_file.exists):
+            try:
+                checkpoint = json.loads(await run_sync(checkpoint_file.read_text, encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                logger.warning("Unreadable checkpoint for task %s: %s", task.id, e)
+        
+        message = f"WIP: Partial work from task {task.id}"
+        changes = ChangeSet.from_dict((checkpoint or {}).get("changes"))
+        sha = await self._commit(task, repo_path, message, changes)
+        
         return {
-            "committed": True,
-            "message": f"WIP: Partial work from task {task.id}",
+            "committed": sha is not None,
+            "sha": sha,
+            "pushed": await self._push(task, repo_path),
+            "message": message,
         }
     
-    async def create_checkpoint(self, task: Task) -> dict[str, Any]:
-        """Create a checkpoint of current task state."""
+    async def create_checkpoint(
+        self,
+        task: Task,
+        steps: dict[int, dict[str, Any]] | None = None,
+        files: dict[str, str | None] | None = None,
+        changes: ChangeSet | None = None,
+    ) -> dict[str, Any]:
+        """
+        Create a checkpoint of current task state.
+        
+        Args:
+            task: Task being executed
+            steps: Results of the completed steps by step number
+            files: SHA-256 of each file the completed steps wrote (None if deleted)
+            changes: Net changes of the completed steps
+        """
         checkpoint = {
+            "version": CHECKPOINT_VERSION,
             "task_id": task.id,
             "timestamp": datetime.utcnow().isoformat(),
             "current_step": task.current_step,
             "status": task.status.value,
+            "plan_hash": _plan_hash(task.plan),
+            "steps": {str(number): result for number, result in (steps or {}).items()},
+            "files": dict(files or {}),
+            "changes": (changes or ChangeSet()).to_dict(),
         }
         
-        # Save checkpoint to .dev-tasks directory
-        task_workspace = self.workspace_path / task.id
-        checkpoint_dir = task_workspace / ".dev-tasks"
-        checkpoint_dir.mkdir(parents=True, exist_ok=True)
-        
-        checkpoint_file = checkpoint_dir / "checkpoint.json"
-        checkpoint_file.write_text(
-            json.dumps(checkpoint, indent=2),
-            encoding="utf-8",
+        # Save checkpoint to .dev-tasks directory; replaced atomically
+        checkpoint_file = self.workspace_path / task.id / CHECKPOINT_FILE
+        await run_sync(
+            _write_file_atomic,
+            checkpoint_file,
+            json.dumps(checkpoint, indent=2, ensure_ascii=False, default=str),
         )
         
         task.last_checkpoint_at = datetime.utcnow()
         task.checkpoint_data = checkpoint
+        self.checkpoints_written += 1
         
-        logger.info("Checkpoint created for task %s at step %d", task.id, task.current_step)
+        logger.info(
+            "Checkpoint created for task %s at step %d (%d steps completed)",
+            task.id, task.current_step, len(checkpoint["steps"]),
+        )
         
         return checkpoint
+    
+    async def load_checkpoint(self, task: Task) -> dict[str, Any] | None:
+        """
+        Load the checkpoint of a task if it can be resumed from.
+        
+        A checkpoint is ignored when it belongs to another plan or when a
+        file written by a completed step no longer matches its recorded
+        hash, since skipping steps would then lose or corrupt work.
+        
+        Returns:
+            {"steps": {number: result}, "files": {path: hash}, "changes": ChangeSet}
+            or None
+        """
+        checkpoint_file = self.workspace_path / task.id / CHECKPOINT_FILE
+        
+        if not await run_sync(checkpoint_file.exists):
+            return None
+        
+        try:
+            checkpoint = json.loads(await run_sync(checkpoint_file.read_text, encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Unreadable checkpoint for task %s: %s", task.id, e)
+            self.checkpoints_discarded += 1
+            return None
+        
+        if (
+            checkpoint.get("version") != CHECKPOINT_VERSION
+            or checkpoint.get("task_id") != task.id
+            or checkpoint.get("plan_hash") != _plan_hash(task.plan)
+        ):
+            logger.info("Checkpoint of task %s is for another plan, ignoring it", task.id)
+            self.checkpoints_discarded += 1
+            return None
+        
+        files = checkpoint.get("files", {})
+        for file_path, expected in files.items():
+            if await run_sync(_hash_file, self.checkout_path(task) / file_path) != expected:
+                logger.warning(
+                    "Workspace of task %s changed since its checkpoint (%s), starting over",
+                    task.id, file_path,
+                )
+                self.checkpoints_discarded += 1
+                return None
+        
+        task.checkpoint_data = checkpoint
+        
+        return {
+            "steps": {int(number): result for number, result in checkpoint.get("steps", {}).items()},
+            "files": files,
+            "changes": ChangeSet.from_dict(checkpoint.get("changes")),
+        }
+
+
+def _write_file(path: Path, content: str) -> None:
+    """Write a workspace file, creating parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+def _write_file_atomic(path: Path, content: str) -> None:
+    """Write a file so readers never see it half-written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(content, encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _hash_file(path: Path) -> str | None:
+    """SHA-256 of a file, or None if it does not exist."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _plan_hash(plan: dict[str, Any] | None) -> str:
+    """Stable hash of a plan, to tie checkpoints to the plan they ran."""
+    return hashlib.sha256(
+        json.dumps(plan, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
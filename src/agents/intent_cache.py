@@ -0,0 +1,133 @@
+"""Response cache for intent classification."""
+
+import hashlib
+import logging
+import time
+from typing import Any, Callable
+
+from src.models.task import IntentResult
+from src.utils.cache import TTLCache
+from src.utils.text import normalize_message
+
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds between deletions of expired rows from the intent_cache table
+PRUNE_INTERVAL = 600.0
+
+
+class IntentCache:
+    """
+    Caches IntentResults keyed on normalized message text.
+    
+    Lookups hit an in-memory TTL/LRU cache first and, when persistence is
+    enabled, fall back to the intent_cache table so results survive restarts.
+    A result loaded from the table keeps the lifetime it had left there, and
+    expired rows are deleted when read and every ``PRUNE_INTERVAL`` seconds.
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 3600.0,
+        persist: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum in-memory entries
+            ttl: Entry lifetime in seconds
+            persist: Also store entries in the database
+            clock: Time source for pruning (monotonic seconds)
+        """
+        self.ttl = ttl
+        self.persist = persist
+        self._clock = clock
+        self._memory: TTLCache[str, IntentResult] = TTLCache(
+            max_size=max_size, ttl=ttl, clock=clock
+        )
+        self._next_prune = 0.0
+        
+        # Metrics
+        self.db_hits = 0
+        self.stores = 0
+        self.pruned = 0
+    
+    @staticmethod
+    def make_key(message: str) -> tuple[str, str]:
+        """Get (key, normalized_text) for a message."""
+        normalized = normalize_message(message)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest(), normalized
+    
+    async def get(self, message: str) -> IntentResult | None:
+        """Get a cached result for a message, if any."""
+        key, _ = self.make_key(message)
+        
+        result = self._memory.get(key)
+        if result is not None:
+            return result.model_copy(deep=True)
+        
+        if not self.persist:
+            return None
+        
+        try:
+            from src.models.async_database import get_cached_intent
+            row = await get_cached_intent(key, self.ttl)
+        except Exception as e:
+            logger.warning("Intent cache lookup failed: %s", e)
+            return None
+        
+        if row is None:
+            return None
+        
+        data, ttl_left = row
+        result = IntentResult.model_validate_json(data)
+        self._memory.set(key, result, ttl=ttl_left)
+        self.db_hits += 1
+        
+        return result.model_copy(deep=True)
+    
+    async def set(self, message: str, result: IntentResult) -> None:
+        """Store a successful classification result."""
+        key, normalized = self.make_key(message)
+        
+        self._memory.set(key, result.model_copy(deep=True))
+        self.stores += 1
+        
+        if not self.persist:
+            return
+        
+        try:
+            from src.models.async_database import save_cached_intent
+            await save_cached_intent(key, normalized, result.model_dump_json())
+        except Exception as e:
+            logger.warning("Intent cache store failed: %s", e)
+        
+        await self._prune()
+    
+    async def _prune(self) -> None:
+        """Delete expired rows, at most once every ``PRUNE_INTERVAL`` seconds."""
+        now = self._clock()
+        if now < self._next_prune:
+            return
+        self._next_prune = now + PRUNE_INTERVAL
+        
+        try:
+            from src.models.async_database import prune_cached_intents
+            self.pruned += await prune_cached_intents(self.ttl)
+        except Exception as e:
+            logger.warning("Intent cache prune failed: %s", e)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache metrics."""
+        stats = self._memory.get_stats()
+        stats.update({
+            "persist": self.persist,
+            "db_hits": self.db_hits,
+            "stores": self.stores,
+            "pruned": self.pruned,
+        })
+        return stats
@@ -4,8 +4,8 @@ import json
 import logging
 from typing import Any
 
-import anthropic
-
+from src.agents.intent_cache import IntentCache
+from src.llm.client import AnthropicClient, LLMClient
 from src.models.task import Intent, IntentResult
 
 
@@ -20,6 +20,7 @@ Analiza el mensaje del usuario y clasifica su intención en una de las siguiente
 - TASK_NEW: El usuario quiere crear una nueva tarea de desarrollo
 - TASK_CONTINUE: El usuario quiere continuar o proporciona información adicional sobre una tarea existente
 - TASK_LIST: El usuario quiere ver sus tareas
+- TASK_STATUS: El usuario quiere saber el estado o progreso de su tarea activa
 - TASK_ABORT: El usuario quiere cancelar una tarea
 
 Responde SIEMPRE en formato JSON con esta estructura:
@@ -42,9 +43,27 @@ marca needs_clarification=true y proporciona una pregunta específica."""
 class IntentClassifier:
     """Classifies user message intent using Claude."""
     
-    def __init__(self, api_key: str) -> None:
-        """Initialize with Anthropic API key."""
-        self.client = anthropic.Anthropic(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str | None = None,
+        client: LLMClient | None = None,
+        cache: IntentCache | None = None,
+    ) -> None:
+        """
+        Initialize the classifier.
+        
+        Args:
+            api_key: Anthropic API key (used when no client is given)
+            client: Shared LLM client
+            cache: Optional response cache for repeated messages
+        """
+        if client is None:
+            if api_key is None:
+                raise ValueError("Either api_key or client is required")
+            client = AnthropicClient(api_key=api_key)
+        
+        self.client = client
+        self.cache = cache
         self.model = "claude-sonnet-4-20250514"
     
     async def classify(self, message: str) -> IntentResult:
@@ -59,8 +78,14 @@ class IntentClassifier:
         """
         logger.debug("Classifying intent for: %s", message[:100])
         
+        if self.cache is not None:
+            cached = await self.cache.get(message)
+            if cached is not None:
+                logger.debug("Intent cache hit: %s", cached.intent.value)
+                return cached
+        
         try:
-            response = self.client.messages.create(
+            response = await self.client.complete(
                 model=self.model,
                 max_tokens=500,
                 system=SYSTEM_PROMPT,
@@ -70,17 +95,9 @@ class IntentClassifier:
             )
             
             # Parse response
-            content = response.content[0].text
+            content = response.text
             result = self._parse_response(content)
             
-            logger.info(
-                "Intent classified: %s (confidence: %.2f)",
-                result.intent.value,
-                result.confidence,
-            )
-            
-            return result
-            
         except Exception as e:
             logger.exception("Intent classification failed: %s", e)
             # Default to clarification on error
@@ -90,9 +107,29 @@ class IntentClassifier:
                 needs_clarification=True,
                 clarification_question="Hubo un error procesando tu mensaje. ¿Puedes reformularlo?",
             )
+        
+        if result is None:
+            return IntentResult(
+                intent=Intent.QUERY,
+                confidence=0.5,
+                needs_clarification=True,
+                clarification_question="No pude entender tu solicitud. ¿Puedes ser más específico?",
+            )
+        
+        logger.info(
+            "Intent classified: %s (confidence: %.2f)",
+            result.intent.value,
+            result.confidence,
+        )
+        
+        # Only successful classifications are cached, never fallbacks
+        if self.cache is not None:
+            await self.cache.set(message, result)
+        
+        return result
     
-    def _parse_response(self, content: str) -> IntentResult:
-        """Parse Claude's response into IntentResult."""
+    def _parse_response(self, content: str) -> IntentResult | None:
+        """Parse Claude's response into IntentResult (None if unparseable)."""
         try:
             # Find JSON in response
             start = content.find("{")
@@ -113,9 +150,4 @@ class IntentClassifier:
             
         except (json.JSONDecodeError, KeyError, ValueError) as e:
             logger.warning("Failed to parse intent response: %s", e)
-            return IntentResult(
-                intent=Intent.QUERY,
-                confidence=0.5,
-                needs_clarification=True,
-                clarification_question="No pude entender tu solicitud. ¿Puedes ser más específico?",
-            )
+            return None
@@ -0,0 +1,213 @@
+"""Apply model-generated patches (search/replace blocks or unified diffs)."""
+
+import difflib
+import re
+from typing import Any
+
+
+HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Minimum similarity for a fuzzy block match
+FUZZY_THRESHOLD = 0.85
+
+
+class PatchError(ValueError):
+    """Raised when a patch cannot be applied to the current file."""
+
+
+def apply_patch(
+    original: str,
+    edits: list[dict[str, Any]] | None = None,
+    diff: str | None = None,
+) -> str:
+    """
+    Apply search/replace edits or a unified diff to a file's content.
+    
+    Args:
+        original: Current file content
+        edits: List of {"search": ..., "replace": ...} blocks
+        diff: Unified diff text
+    
+    Returns:
+        Patched content
+    
+    Raises:
+        PatchError: If the patch does not apply
+    """
+    if edits:
+        return apply_search_replace(original, edits)
+    if diff:
+        return apply_unified_diff(original, diff)
+    raise PatchError("Empty patch")
+
+
+def apply_search_replace(original: str, edits: list[dict[str, Any]]) -> str:
+    """
+    Apply search/replace blocks in order.
+    
+    Each block is matched exactly first; if that fails, line-based matching
+    ignoring trailing whitespace, then indentation, then a fuzzy similarity
+    match is attempted.
+    """
+    content = original
+    
+    for index, edit in enumerate(edits, start=1):
+        search = edit.get("search", "")
+        replace = edit.get("replace", "")
+        
+        if not search:
+            # Empty search means append
+            content = content + replace
+            continue
+        
+        occurrences = content.count(search)
+        
+        if occurrences == 1:
+            content = content.replace(search, replace, 1)
+            continue
+        
+        if occurrences > 1:
+            raise PatchError(f"Edit {index}: search block is ambiguous ({occurrences} matches)")
+        
+        lines = content.splitlines(keepends=True)
+        search_lines = search.splitlines()
+        start = _locate(lines, search_lines, hint=0)
+        
+        if start is None:
+            raise PatchError(f"Edit {index}: search block not found")
+        
+        replace_lines = _reindent(
+            replace.splitlines(),
+            from_indent=_indent(search_lines[0]),
+            to_indent=_indent(lines[start]),
+        )
+        end = start + len(search_lines)
+        newline = "\n" if end < len(lines) or content.endswith("\n") else ""
+        replacement = "\n".join(replace_lines) + newline if replace_lines else ""
+        
+        content = "".join(lines[:start]) + replacement + "".join(lines[end:])
+    
+    return content
+
+
+def apply_unified_diff(original: str, diff: str) -> str:
+    """
+    Apply a unified diff, tolerating shifted line numbers and whitespace drift.
+    """
+    lines = original.splitlines(keepends=True)
+    hunks = _parse_hunks(diff)
+    
+    if not hunks:
+        raise PatchError("No hunks found in diff")
+    
+    offset = 0
+    
+    for number, (old_start, old_lines, new_lines) in enumerate(hunks, start=1):
+        # For pure insertions old_start is the line *after* which to insert
+        expected = old_start + offset if not old_lines else old_start - 1 + offset
+        
+        if old_lines:
+            position = _locate(lines, old_lines, hint=max(expected, 0))
+            if position is None:
+                raise PatchError(f"Hunk {number} does not apply")
+        else:
+            position = min(max(expected, 0), len(lines))
+        
+        if position == len(lines) and lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+        
+        lines[position:position + len(old_lines)] = [f"{line}\n" for line in new_lines]
+        offset += (position - expected) + len(new_lines) - len(old_lines)
+    
+    content = "".join(lines)
+    
+    if not original.endswith("\n") and content.endswith("\n"):
+        content = content[:-1]
+    
+    return content
+
+
+def _parse_hunks(diff: str) -> list[tuple[int, list[str], list[str]]]:
+    """Parse unified diff hunks into (old_start, old_lines, new_lines)."""
+    hunks: list[tuple[int, list[str], list[str]]] = []
+    current: tuple[int, list[str], list[str]] | None = None
+    
+    for line in diff.splitlines():
+        header = HUNK_HEADER_RE.match(line)
+        
+        if header:
+            current = (int(header.group(1)), [], [])
+            hunks.append(current)
+            continue
+        
+        if current is None or line.startswith(("---", "+++", "\\")):
+            continue
+        
+        _, old_lines, new_lines = current
+        
+        if line.startswith("-"):
+            old_lines.append(line[1:])
+        elif line.startswith("+"):
+            new_lines.append(line[1:])
+        else:
+            # Context line (a bare empty line is an empty context line)
+            text = line[1:] if line.startswith(" ") else line
+            old_lines.append(text)
+            new_lines.append(text)
+    
+    return hunks
+
+
+def _locate(lines: list[str], block: list[str], hint: int) -> int | None:
+    """Find where block starts in lines, preferring matches close to hint."""
+    if not block:
+        return None
+    
+    size = len(block)
+    candidates = range(0, len(lines) - size + 1)
+    ordered = sorted(candidates, key=lambda i: abs(i - hint))
+    
+    normalizers = (
+        lambda s: s.rstrip("\r\n"),
+        lambda s: s.rstrip(),
+        lambda s: s.strip(),
+    )
+    
+    for normalize in normalizers:
+        target = [normalize(line) for line in block]
+        for start in ordered:
+            if [normalize(line) for line in lines[start:start + size]] == target:
+                return start
+    
+    # Fuzzy: best window above the similarity threshold
+    target_text = "\n".join(line.strip() for line in block)
+    best_start, best_ratio = None, FUZZY_THRESHOLD
+    
+    for start in ordered:
+        window = "\n".join(line.strip() for line in lines[start:start + size])
+        matcher = difflib.SequenceMatcher(None, window, target_text, autojunk=False)
+        
+        if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+            continue
+        
+        ratio = matcher.ratio()
+        if ratio > best_ratio:
+            best_start, best_ratio = start, ratio
+    
+    return best_start
+
+
+def _indent(line: str) -> str:
+    """Get a line's leading whitespace."""
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _reindent(lines: list[str], from_indent: str, to_indent: str) -> list[str]:
+    """Shift a block's base indentation."""
+    if from_indent == to_indent:
+        return lines
+    
+    return [
+        to_indent + line[len(from_indent):] if line.startswith(from_indent) else line
+        for line in lines
+    ]
@@ -0,0 +1,125 @@
+"""Content-addressed cache for generated plans."""
+
+import hashlib
+import json
+import logging
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+class PlanCache:
+    """
+    Caches plans in the database keyed by their inputs.
+    
+    The key combines the description hash, repository URL, repository HEAD
+    SHA and context hash, so a resubmitted task against an unchanged repo
+    returns the stored plan. When a repository's HEAD moves, plans built at
+    older commits are deleted.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._known_heads: dict[str, str] = {}
+        
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidated = 0
+    
+    @staticmethod
+    def make_key(
+        description: str,
+        repo_url: str | None,
+        head_sha: str | None,
+        context: dict[str, Any] | None,
+    ) -> str:
+        """Build the content-addressed cache key."""
+        description_hash = hashlib.sha256(description.strip().encode("utf-8")).hexdigest()
+        context_hash = hashlib.sha256(
+            json.dumps(context or {}, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        
+        parts = [description_hash, repo_url or "", head_sha or "", context_hash]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+    
+    async def get(
+        self,
+        description: str,
+        repo_url: str | None,
+        head_sha: str | None,
+        context: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | None:
+        """Get a cached plan for these inputs, if any."""
+        from src.models.async_database import get_cached_plan
+        
+        if repo_url and head_sha:
+            await self._invalidate_if_moved(repo_url, head_sha)
+        
+        key = self.make_key(description, repo_url, head_sha, context)
+        
+        try:
+            data = await get_cached_plan(key)
+        except Exception as e:
+            logger.warning("Plan cache lookup failed: %s", e)
+            data = None
+        
+        if data is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        logger.info("Plan cache hit for %s", repo_url or "task without repository")
+        return json.loads(data)
+    
+    async def set(
+        self,
+        description: str,
+        repo_url: str | None,
+        head_sha: str | None,
+        plan: dict[str, Any],
+        context: dict[str, Any] | None = None,
+    ) -> None:
+        """Store a generated plan."""
+        from src.models.async_database import save_cached_plan
+        
+        key = self.make_key(description, repo_url, head_sha, context)
+        
+        try:
+            await save_cached_plan(key, repo_url or "", head_sha or "", json.dumps(plan))
+            self.stores += 1
+        except Exception as e:
+            logger.warning("Plan cache store failed: %s", e)
+    
+    async def _invalidate_if_moved(self, repo_url: str, head_sha: str) -> None:
+        """Drop plans built at older commits the first time a new HEAD is seen."""
+        from src.models.async_database import invalidate_cached_plans
+        
+        if self._known_heads.get(repo_url) == head_sha:
+            return
+        
+        try:
+            deleted = await invalidate_cached_plans(repo_url, head_sha)
+        except Exception as e:
+            logger.warning("Plan cache invalidation failed: %s", e)
+            return
+        
+        self._known_heads[repo_url] = head_sha
+        
+        if deleted:
+            self.invalidated += deleted
+            logger.info("Invalidated %d cached plans for %s", deleted, repo_url)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache metrics."""
+        lookups = self.hits + self.misses
+        
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "invalidated": self.invalidated,
+        }
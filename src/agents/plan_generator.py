@@ -2,14 +2,20 @@
 
 import json
 import logging
-from typing import Any
+import time
+from typing import Any, Awaitable, Callable
 
-import anthropic
+from src.agents.plan_cache import PlanCache
+from src.agents.plan_stream import PlanStreamParser
+from src.llm.client import AnthropicClient, LLMClient
 
 
 logger = logging.getLogger(__name__)
 
 
+PlanProgressCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+
 SYSTEM_PROMPT = """Eres un arquitecto de software experto que genera planes de ejecución para tareas de desarrollo.
 
 Dado una descripción de tarea y contexto del repositorio, genera un plan detallado y ejecutable.
@@ -30,7 +36,8 @@ Responde SIEMPRE en formato JSON:
             "paso": 1,
             "descripcion": "Descripción del paso",
             "archivos": ["src/file1.py"],
-            "accion": "crear|modificar|eliminar"
+            "accion": "crear|modificar|eliminar",
+            "depende_de": []
         }
     ],
     "estimacion": "X minutos",
@@ -42,6 +49,7 @@ Cada paso debe ser:
 - Atómico (una sola acción)
 - Verificable (se puede confirmar que se completó)
 - Ordenado por dependencias
+- Explícito en "depende_de" con los números de pasos previos que necesita (pasos sin dependencias sobre archivos distintos pueden ejecutarse en paralelo)
 
 No asumas acceso a herramientas externas más allá de Git, Python y comandos básicos de shell."""
 
@@ -49,9 +57,27 @@ No asumas acceso a herramientas externas más allá de Git, Python y comandos b
 class PlanGenerator:
     """Generates execution plans for tasks using Claude."""
     
-    def __init__(self, api_key: str) -> None:
-        """Initialize with Anthropic API key."""
-        self.client = anthropic.Anthropic(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str | None = None,
+        client: LLMClient | None = None,
+        cache: PlanCache | None = None,
+    ) -> None:
+        """
+        Initialize the generator.
+        
+        Args:
+            api_key: Anthropic API key (used when no client is given)
+            client: Shared LLM client
+            cache: Optional plan cache keyed by repository snapshot
+        """
+        if client is None:
+            if api_key is None:
+                raise ValueError("Either api_key or client is required")
+            client = AnthropicClient(api_key=api_key)
+        
+        self.client = client
+        self.cache = cache
         self.model = "claude-sonnet-4-20250514"
     
     async def generate(
@@ -59,6 +85,8 @@ class PlanGenerator:
         description: str,
         repo_url: str | None = None,
         context: dict[str, Any] | None = None,
+        repo_sha: str | None = None,
+        on_progress: PlanProgressCallback | None = None,
     ) -> dict[str, Any]:
         """
         Generate execution plan for a task.
@@ -67,12 +95,24 @@ class PlanGenerator:
             description: Task description from user
             repo_url: Optional repository URL
             context: Optional additional context (file structure, etc.)
+            repo_sha: Repository HEAD commit; plans are only cached when
+                both ``repo_url`` and ``repo_sha`` are known
+            on_progress: Streaming mode; awaited with the partial plan
+                ({"objetivo", "pasos"}) each time a new step is parsed
             
         Returns:
             Plan dictionary with steps and details
         """
         logger.info("Generating plan for: %s", description[:100])
         
+        # Plans are only reusable when the repository snapshot is known
+        use_cache = self.cache is not None and bool(repo_url) and repo_sha is not None
+        
+        if use_cache:
+            cached = await self.cache.get(description, repo_url, repo_sha, context)
+            if cached is not None:
+                return cached
+        
         # Build user message with context
         user_message = f"**Tarea solicitada:**\n{description}"
         
@@ -83,16 +123,19 @@ class PlanGenerator:
             user_message += f"\n\n**Contexto adicional:**\n```json\n{json.dumps(context, indent=2)}\n```"
         
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                system=SYSTEM_PROMPT,
-                messages=[
-                    {"role": "user", "content": user_message}
-                ],
-            )
+            if on_progress is not None:
+                content = await self._stream_plan(user_message, on_progress)
+            else:
+                response = await self.client.complete(
+                    model=self.model,
+                    max_tokens=2000,
+                    system=SYSTEM_PROMPT,
+                    messages=[
+                        {"role": "user", "content": user_message}
+                    ],
+                )
+                content = response.text
             
-            content = response.content[0].text
             plan = self._parse_plan(content)
             
             logger.info(
@@ -101,12 +144,46 @@ class PlanGenerator:
                 plan.get("estimacion", "unknown"),
             )
             
+            if use_cache:
+                await self.cache.set(description, repo_url, repo_sha, plan, context)
+            
             return plan
             
         except Exception as e:
             logger.exception("Plan generation failed: %s", e)
             raise
     
+    async def _stream_plan(
+        self,
+        user_message: str,
+        on_progress: PlanProgressCallback,
+    ) -> str:
+        """Stream the plan, reporting each completed step as it arrives."""
+        parser = PlanStreamParser()
+        start = time.perf_counter()
+        first_step_at: float | None = None
+        
+        async for chunk in self.client.stream(
+            model=self.model,
+            max_tokens=2000,
+            system=SYSTEM_PROMPT,
+            messages=[
+                {"role": "user", "content": user_message}
+            ],
+        ):
+            if parser.feed(chunk):
+                if first_step_at is None and parser.steps:
+                    first_step_at = time.perf_counter() - start
+                await on_progress(parser.snapshot())
+        
+        logger.info(
+            "Plan streamed in %.2fs (first step after %.2fs)",
+            time.perf_counter() - start,
+            first_step_at if first_step_at is not None else 0.0,
+        )
+        
+        return parser.buffer
+    
     def _parse_plan(self, content: str) -> dict[str, Any]:
         """Parse Claude's response into plan dictionary."""
         try:
@@ -158,3 +235,24 @@ class PlanGenerator:
             lines.append(f"📝 **Notas:** {plan['notas']}")
         
         return "\n".join(lines)
+    
+    def format_plan_progress(self, partial: dict[str, Any]) -> str:
+        """Format a partially streamed plan for Telegram display."""
+        lines = [
+            "📋 **Generando plan...**",
+            "",
+        ]
+        
+        if partial.get("objetivo"):
+            lines.append(f"**Objetivo:** {partial['objetivo']}")
+            lines.append("")
+        
+        if partial.get("pasos"):
+            lines.append("**Pasos:**")
+            for paso in partial["pasos"]:
+                lines.append(f"  {paso.get('paso', '•')}. {paso.get('descripcion', '')}")
+            lines.append("")
+        
+        lines.append("⏳ _Pensando..._")
+        
+        return "\n".join(lines)
@@ -0,0 +1,108 @@
+"""Incremental parser for streamed JSON plans."""
+
+import json
+import re
+from typing import Any
+
+
+OBJECTIVE_RE = re.compile(r'"objetivo"\s*:\s*"((?:[^"\\]|\\.)*)"')
+STEPS_RE = re.compile(r'"pasos"\s*:\s*\[')
+
+
+class PlanStreamParser:
+    """
+    Extracts the objective and completed steps from a partial plan.
+    
+    Text is fed as it arrives; each step object inside ``"pasos"`` is
+    parsed as soon as its closing brace is received, without waiting for
+    the rest of the document.
+    """
+    
+    def __init__(self) -> None:
+        """Initialize an empty parser."""
+        self.buffer = ""
+        self.objective: str | None = None
+        self.steps: list[dict[str, Any]] = []
+        
+        # Scanner state inside the "pasos" array
+        self._pos: int | None = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._step_start: int | None = None
+        self._done = False
+    
+    def feed(self, chunk: str) -> bool:
+        """
+        Add streamed text.
+        
+        Args:
+            chunk: Next piece of the model output
+        
+        Returns:
+            True if the objective or a new step became available
+        """
+        self.buffer += chunk
+        changed = False
+        
+        if self.objective is None:
+            match = OBJECTIVE_RE.search(self.buffer)
+            if match:
+                self.objective = json.loads(f'"{match.group(1)}"')
+                changed = True
+        
+        if self._pos is None:
+            match = STEPS_RE.search(self.buffer)
+            if match is None:
+                return changed
+            self._pos = match.end()
+        
+        return self._scan_steps() or changed
+    
+    def snapshot(self) -> dict[str, Any]:
+        """Get the plan parsed so far."""
+        return {
+            "objetivo": self.objective,
+            "pasos": list(self.steps),
+        }
+    
+    def _scan_steps(self) -> bool:
+        """Advance through the steps array, parsing completed objects."""
+        found = False
+        buffer = self.buffer
+        i = self._pos
+        
+        while i < len(buffer) and not self._done:
+            char = buffer[i]
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 0 and char == "{":
+                    self._step_start = i
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    # End of the "pasos" array
+                    self._done = True
+                else:
+                    self._depth -= 1
+                    if self._depth == 0 and self._step_start is not None:
+                        try:
+                            self.steps.append(json.loads(buffer[self._step_start:i + 1]))
+                            found = True
+                        except json.JSONDecodeError:
+                            pass
+                        self._step_start = None
+            
+            i += 1
+        
+        self._pos = i
+        return found
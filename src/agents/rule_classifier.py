@@ -0,0 +1,194 @@
+"""Deterministic intent pre-classifier (fast path before Claude)."""
+
+import logging
+import re
+import time
+from collections import defaultdict
+from typing import Any
+
+from src.models.task import Intent, IntentResult
+from src.utils.text import normalize_message
+
+
+logger = logging.getLogger(__name__)
+
+
+GITHUB_URL_RE = re.compile(r"https?://(?:www\.)?github\.com/[\w.\-]+/[\w.\-]+", re.IGNORECASE)
+TASK_ID_RE = re.compile(r"\btask-[0-9a-f]{8}\b")
+
+COMMANDS: dict[str, Intent] = {
+    "/status": Intent.TASK_STATUS,
+    "/list": Intent.TASK_LIST,
+    "/abort": Intent.TASK_ABORT,
+    "/cancel": Intent.TASK_ABORT,
+}
+
+# Keyword patterns (matched against normalized text, Spanish and English)
+KEYWORD_PATTERNS: list[tuple[Intent, re.Pattern[str]]] = [
+    (Intent.TASK_LIST, re.compile(
+        r"^(?:(?:lista|listar|muestra|mostrar|ver|dame) )?(?:mis |las |todas las )?tareas$"
+        r"|^(?:list|show)(?: me)?(?: my| all)? tasks$"
+        r"|^my tasks$"
+    )),
+    (Intent.TASK_ABORT, re.compile(
+        r"^(?:cancela|cancelar|aborta|abortar|deten|detener|para|parar)"
+        r"(?: (?:la|esta|mi))?(?: tarea)?(?: por favor)?$"
+        r"|^(?:cancel|abort|stop)(?: (?:the|this|my))?(?: task)?(?: please)?$"
+    )),
+    (Intent.TASK_STATUS, re.compile(
+        r"^(?:como va|como vamos|que tal va|estado|progreso)(?: (?:la|mi) tarea)?$"
+        r"|^(?:status|progress|how is it going|hows it going)$"
+    )),
+]
+
+# Imperative openings of a change request, e.g. "agrega tests ..." or
+# "fix the login ..." (matched against the normalized description)
+TASK_VERB_RE = re.compile(
+    r"^(?:por favor )?(?:agrega|anade|implementa|crea|corrige|arregla|refactoriza"
+    r"|actualiza|elimina|quita|escribe|migra|optimiza|documenta|renombra)\b"
+    r"|^(?:please )?(?:add|implement|create|fix|refactor|update|remove|delete|write"
+    r"|migrate|optimize|document|rename)\b"
+)
+
+# Confidence assigned by each rule
+COMMAND_CONFIDENCE = 1.0
+REPLY_CONFIDENCE = 0.95
+KEYWORD_CONFIDENCE = 0.95
+NEW_TASK_CONFIDENCE = 0.9
+
+# Initial guess for an LLM round trip until real latencies are observed
+DEFAULT_LLM_LATENCY = 1.5
+
+
+class RuleBasedClassifier:
+    """
+    Resolves obvious intents without calling the LLM.
+    
+    Only results at or above ``threshold`` confidence are returned; anything
+    else falls back to IntentClassifier. Hit rate and latency saved are
+    tracked per intent so the threshold and patterns can be tuned.
+    """
+    
+    def __init__(self, threshold: float = 0.9) -> None:
+        """Initialize with the minimum confidence to skip the LLM."""
+        self.threshold = threshold
+        
+        # Metrics
+        self.hits: dict[str, int] = defaultdict(int)
+        self.misses = 0
+        self.rule_time: dict[str, float] = defaultdict(float)
+        self.llm_latency = DEFAULT_LLM_LATENCY
+    
+    def classify(
+        self,
+        message: str,
+        reply_to_text: str | None = None,
+    ) -> IntentResult | None:
+        """
+        Try to classify a message with deterministic rules.
+        
+        Args:
+            message: User's message text
+            reply_to_text: Text of the message being replied to, if any
+        
+        Returns:
+            IntentResult when a rule matched with enough confidence, else None
+        """
+        start = time.perf_counter()
+        result = self._match(message, reply_to_text)
+        elapsed = time.perf_counter() - start
+        
+        if result is None or result.confidence < self.threshold:
+            self.misses += 1
+            return None
+        
+        intent = result.intent.value
+        self.hits[intent] += 1
+        self.rule_time[intent] += elapsed
+        
+        logger.debug("Fast-path intent: %s (%.1f µs)", intent, elapsed * 1e6)
+        return result
+    
+    def record_llm_latency(self, seconds: float) -> None:
+        """Feed an observed LLM classification latency (moving average)."""
+        self.llm_latency = 0.8 * self.llm_latency + 0.2 * seconds
+    
+    def _match(self, message: str, reply_to_text: str | None) -> IntentResult | None:
+        """Apply rules in priority order."""
+        stripped = message.strip()
+        
+        # Commands
+        if stripped.startswith("/"):
+            command, _, argument = stripped.partition(" ")
+            command = command.split("@", 1)[0].lower()
+            
+            if command in COMMANDS:
+                return IntentResult(intent=COMMANDS[command], confidence=COMMAND_CONFIDENCE)
+            
+            if command == "/task":
+                return self._match_new_task(argument, COMMAND_CONFIDENCE)
+        
+        # Keywords, before the reply rule: "cancela" in reply to a task
+        # message still aborts it
+        normalized = normalize_message(stripped)
+        for intent, pattern in KEYWORD_PATTERNS:
+            if pattern.match(normalized):
+                return IntentResult(intent=intent, confidence=KEYWORD_CONFIDENCE)
+        
+        # Reply to a message that mentions a task
+        if reply_to_text:
+            task_match = TASK_ID_RE.search(reply_to_text)
+            if task_match:
+                return IntentResult(
+                    intent=Intent.TASK_CONTINUE,
+                    confidence=REPLY_CONFIDENCE,
+                    extracted_info={"task_id": task_match.group(0)},
+                )
+        
+        # A change request naming a GitHub repository is a new task;
+        # questions about a repository are left to the LLM
+        if "?" in stripped:
+            return None
+        return self._match_new_task(stripped, NEW_TASK_CONFIDENCE, require_verb=True)
+    
+    def _match_new_task(
+        self,
+        text: str,
+        confidence: float,
+        require_verb: bool = False,
+    ) -> IntentResult | None:
+        """Build a TASK_NEW result when the text names a GitHub repository."""
+        url_match = GITHUB_URL_RE.search(text)
+        if url_match is None:
+            return None
+        
+        repo = url_match.group(0).rstrip(".")
+        description = (text[:url_match.start()] + text[url_match.end():]).strip()
+        
+        if not description:
+            return None
+        if require_verb and not TASK_VERB_RE.match(normalize_message(description)):
+            return None
+        
+        return IntentResult(
+            intent=Intent.TASK_NEW,
+            confidence=confidence,
+            extracted_info={"repo": repo, "description": description},
+        )
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get hit rate and estimated latency saved per intent."""
+        total_hits = sum(self.hits.values())
+        total = total_hits + self.misses
+        
+        return {
+            "threshold": self.threshold,
+            "hits": dict(self.hits),
+            "misses": self.misses,
+            "hit_rate": total_hits / total if total else 0.0,
+            "llm_latency": self.llm_latency,
+            "latency_saved": {
+                intent: hits * self.llm_latency - self.rule_time[intent]
+                for intent, hits in self.hits.items()
+            },
+        }
@@ -0,0 +1,157 @@
+"""Dependency-aware parallel scheduler for plan steps."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+
+logger = logging.getLogger(__name__)
+
+
+StepRunner = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+StepCallback = Callable[[dict[str, Any], dict[str, Any]], Awaitable[None]]
+
+
+class StepScheduler:
+    """
+    Runs plan steps as a DAG with bounded parallelism.
+    
+    A step depends on every earlier step that touches one of its files, on
+    the steps it lists in ``depende_de``, and on every earlier step when it
+    declares no files at all (it could touch anything). Independent steps
+    run concurrently, up to ``max_parallel`` at a time.
+    
+    Completion callbacks are always delivered in plan order, so commits and
+    progress updates stay deterministic regardless of finishing order.
+    """
+    
+    def __init__(self, max_parallel: int = 4) -> None:
+        """Initialize with the maximum number of concurrent steps."""
+        self.max_parallel = max(1, max_parallel)
+    
+    @staticmethod
+    def build_dependencies(
+        pasos: list[dict[str, Any]],
+        plan_dependencies: list[Any] | None = None,
+    ) -> dict[int, set[int]]:
+        """
+        Build the dependency graph of a plan.
+        
+        Args:
+            pasos: Plan steps (each with "paso" and optional "archivos")
+            plan_dependencies: Plan-level "dependencias"; entries shaped as
+                {"paso": n, "depende_de": [...]} are honored, others ignored
+        
+        Returns:
+            Mapping of step number to the step numbers it waits for
+        """
+        order = [paso["paso"] for paso in pasos]
+        position = {number: index for index, number in enumerate(order)}
+        deps: dict[int, set[int]] = {number: set() for number in order}
+        
+        explicit: dict[int, list[int]] = {}
+        for entry in plan_dependencies or []:
+            if isinstance(entry, dict) and "paso" in entry:
+                explicit.setdefault(entry["paso"], []).extend(entry.get("depende_de", []))
+        
+        for index, paso in enumerate(pasos):
+            number = paso["paso"]
+            files = set(paso.get("archivos") or [])
+            
+            for required in [*paso.get("depende_de", []), *explicit.get(number, [])]:
+                # Only earlier steps can be waited for; anything else would deadlock
+                if required in position and position[required] < index:
+                    deps[number].add(required)
+            
+            for earlier in pasos[:index]:
+                earlier_files = set(earlier.get("archivos") or [])
+                if not files or not earlier_files or files & earlier_files:
+                    deps[number].add(earlier["paso"])
+        
+        return deps
+    
+    async def run(
+        self,
+        pasos: list[dict[str, Any]],
+        run_step: StepRunner,
+        on_complete: StepCallback | None = None,
+        plan_dependencies: list[Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Execute steps respecting dependencies.
+        
+        Scheduling stops after the first failed step; steps already running
+        are allowed to finish.
+        
+        Args:
+            pasos: Plan steps in plan order
+            run_step: Coroutine function executing one step
+            on_complete: Awaited with (step, result) in plan order
+            plan_dependencies: Plan-level "dependencias"
+        
+        Returns:
+            Results of the executed steps, in plan order
+        """
+        deps = self.build_dependencies(pasos, plan_dependencies)
+        by_number = {paso["paso"]: paso for paso in pasos}
+        order = [paso["paso"] for paso in pasos]
+        
+        pending = list(order)
+        running: dict[asyncio.Task[dict[str, Any]], int] = {}
+        completed: set[int] = set()
+        results: dict[int, dict[str, Any]] = {}
+        released = 0
+        failed = False
+        
+        try:
+            while running or (pending and not failed):
+                if not failed:
+                    for number in list(pending):
+                        if len(running) >= self.max_parallel:
+                            break
+                        if deps[number] <= completed:
+                            pending.remove(number)
+                            task = asyncio.create_task(run_step(by_number[number]))
+                            running[task] = number
+                    
+                    if not running and pending:
+                        # Unsatisfiable graph; fall back to plan order
+                        logger.warning("Step dependencies cannot be satisfied, running in order")
+                        number = pending.pop(0)
+                        running[asyncio.create_task(run_step(by_number[number]))] = number
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    number = running.pop(task)
+                    
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.exception("Step %d execution error: %s", number, e)
+                        result = {"success": False, "step": number, "error": str(e)}
+                    
+                    results[number] = result
+                    
+                    if result.get("success", False):
+                        completed.add(number)
+                    else:
+                        failed = True
+                
+                # Deliver completions in plan order
+                while released < len(order) and order[released] in results:
+                    number = order[released]
+                    if on_complete is not None:
+                        await on_complete(by_number[number], results[number])
+                    released += 1
+        
+        finally:
+            for task in running:
+                task.cancel()
+        
+        # Steps finished after a gap left by a skipped step
+        for number in order[released:]:
+            if number in results and on_complete is not None:
+                await on_complete(by_number[number], results[number])
+        
+        return [results[number] for number in order if number in results]
@@ -1,9 +1,10 @@
 """Telegram bot implementation."""
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Message, Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -21,6 +22,117 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class ThrottledMessageEditor:
+    """
+    Progressively edits a single Telegram message.
+    
+    The first update sends a new reply; later updates edit it, at most once
+    per ``min_interval`` seconds. Updates arriving in between are coalesced
+    so only the latest text is sent, keeping under Telegram's edit limits.
+    """
+    
+    def __init__(self, reply_to: Message, min_interval: float = 1.5) -> None:
+        """Initialize with the message to reply to and the edit interval."""
+        self.reply_to = reply_to
+        self.min_interval = min_interval
+        self.message: Message | None = None
+        
+        self._pending: str | None = None
+        self._last_text: str | None = None
+        self._last_edit = 0.0
+        self._flush_task: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+        
+        # Metrics
+        self.edits = 0
+        self.coalesced = 0
+    
+    async def update(self, text: str) -> None:
+        """Show new progress text (sent now or at the next allowed edit)."""
+        if self._pending is not None:
+            self.coalesced += 1
+        self._pending = text
+        
+        if self._flush_task is not None:
+            return
+        
+        wait = self.min_interval - (asyncio.get_running_loop().time() - self._last_edit)
+        
+        if self.message is None or wait <= 0:
+            await self._send_pending()
+        else:
+            self._flush_task = asyncio.create_task(self._delayed_flush(wait))
+    
+    async def finish(
+        self,
+        text: str,
+        reply_markup: InlineKeyboardMarkup | None = None,
+    ) -> bool:
+        """
+        Replace the progress message with its final content.
+        
+        Returns:
+            False if no progress message was ever sent or the edit failed,
+            so the caller should send the content as a new message
+        """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._pending = None
+        
+        if self.message is None:
+            return False
+        if text == self._last_text and reply_markup is None:
+            return True
+        
+        wait = self.min_interval - (asyncio.get_running_loop().time() - self._last_edit)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        
+        async with self._lock:
+            try:
+                await self.message.edit_text(
+                    text,
+                    parse_mode="Markdown",
+                    reply_markup=reply_markup,
+                )
+            except Exception as e:
+                logger.warning("Final progress edit failed: %s", e)
+                return False
+            
+            self.edits += 1
+            self._last_text = text
+        
+        return True
+    
+    async def _delayed_flush(self, delay: float) -> None:
+        """Send the pending text once the edit interval has passed."""
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        await self._send_pending()
+    
+    async def _send_pending(self) -> None:
+        """Send or edit the message with the latest pending text."""
+        async with self._lock:
+            text, self._pending = self._pending, None
+            
+            if text is None or text == self._last_text:
+                return
+            
+            try:
+                if self.message is None:
+                    self.message = await self.reply_to.reply_text(text, parse_mode="Markdown")
+                else:
+                    await self.message.edit_text(text, parse_mode="Markdown")
+                    self.edits += 1
+            except Exception as e:
+                # Progress is best effort; never break the request over it
+                logger.warning("Progress update failed: %s", e)
+            
+            self._last_text = text
+            self._last_edit = asyncio.get_running_loop().time()
+
+
 class TelegramBot:
     """Telegram bot for Dev Task Orchestrator."""
     
@@ -234,12 +346,28 @@ class TelegramBot:
         # Show typing indicator
         await update.message.chat.send_action("typing")
         
-        result = await self.orchestrator.handle_message(
-            user_id=update.effective_user.id,
-            chat_id=update.effective_chat.id,
-            message=message,
+        reply_to = update.message.reply_to_message
+        plan_generator = self.orchestrator.plan_generator
+        editor = ThrottledMessageEditor(
+            update.message,
+            min_interval=self.orchestrator.config.telegram_edit_interval,
         )
         
+        async def on_progress(partial: dict[str, Any]) -> None:
+            await editor.update(plan_generator.format_plan_progress(partial))
+        
+        try:
+            result = await self.orchestrator.handle_message(
+                user_id=update.effective_user.id,
+                chat_id=update.effective_chat.id,
+                message=message,
+                reply_to_text=reply_to.text if reply_to is not None else None,
+                on_progress=on_progress,
+            )
+        except Exception:
+            await editor.finish("❌ No pude generar el plan. Intenta de nuevo.")
+            raise
+        
         action = result.get("action")
         
         if action == "clarify":
@@ -250,11 +378,7 @@ class TelegramBot:
         
         elif action == "approve_plan":
             # Show plan with approval buttons
-            from src.agents.plan_generator import PlanGenerator
-            
-            plan_text = PlanGenerator(
-                api_key=self.orchestrator.config.anthropic_api_key
-            ).format_plan_for_display(result["plan"])
+            plan_text = plan_generator.format_plan_for_display(result["plan"])
             
             keyboard = InlineKeyboardMarkup([
                 [
@@ -266,11 +390,13 @@ class TelegramBot:
                 ],
             ])
             
-            await update.message.reply_text(
-                plan_text,
-                parse_mode="Markdown",
-                reply_markup=keyboard,
-            )
+            # Turn the streamed progress message into the final plan
+            if not await editor.finish(plan_text, reply_markup=keyboard):
+                await update.message.reply_text(
+                    plan_text,
+                    parse_mode="Markdown",
+                    reply_markup=keyboard,
+                )
         
         elif action == "completed":
             await update.message.reply_text(
@@ -305,21 +431,17 @@ class TelegramBot:
         action, task_id = data.split(":", 1)
         
         if action == "approve":
-            await query.edit_message_text(
-                "✅ Plan aprobado. Iniciando ejecución...",
-                parse_mode="Markdown",
-            )
-            
             result = await self.orchestrator.approve_task(task_id)
             
-            if result.get("action") == "completed":
+            if "error" in result:
                 await query.message.reply_text(
-                    "✅ **Tarea completada exitosamente!**",
+                    f"❌ Error: {result['error']}",
                     parse_mode="Markdown",
                 )
-            elif "error" in result:
-                await query.message.reply_text(
-                    f"❌ Error: {result['error']}",
+            else:
+                # Execution continues in the worker pool; see notify_task_finished
+                await query.edit_message_text(
+                    "✅ Plan aprobado. La tarea está en cola para ejecución.",
                     parse_mode="Markdown",
                 )
         
@@ -335,6 +457,18 @@ class TelegramBot:
                 parse_mode="Markdown",
             )
     
+    async def notify_task_finished(self, result: dict[str, Any]) -> None:
+        """Tell the user that a queued task finished."""
+        chat_id = result.get("chat_id")
+        if chat_id is None:
+            return
+        
+        await self.app.bot.send_message(
+            chat_id=chat_id,
+            text=format_task_finished(result),
+            parse_mode="Markdown",
+        )
+    
     async def run_polling(self) -> None:
         """Start the bot with polling."""
         logger.info("Starting Telegram bot...")
@@ -355,6 +489,14 @@ class TelegramBot:
         await self.app.shutdown()
 
 
+def format_task_finished(result: dict[str, Any]) -> str:
+    """Build the message announcing a finished task."""
+    if result.get("action") == "completed":
+        return f"✅ **Tarea `{result['task_id']}` completada exitosamente!**"
+    
+    return f"❌ Tarea `{result['task_id']}` falló: {result.get('error', 'error desconocido')}"
+
+
 def create_bot(
     token: str,
     allowed_users: list[int],
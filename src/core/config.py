@@ -26,6 +26,7 @@ class Config(BaseSettings):
         default_factory=list,
         alias="TELEGRAM_ALLOWED_USERS",
     )
+    telegram_edit_interval: float = Field(default=1.5, alias="TELEGRAM_EDIT_INTERVAL")
     
     # AI Providers
     anthropic_api_key: str = Field(alias="ANTHROPIC_API_KEY")
@@ -43,6 +44,72 @@ class Config(BaseSettings):
     )
     workspace_path: str = Field(default="/app/workspace", alias="WORKSPACE_PATH")
     
+    # Database
+    db_pool_size: int = Field(default=8, alias="DB_POOL_SIZE")
+    db_busy_timeout: int = Field(default=5000, alias="DB_BUSY_TIMEOUT")
+    db_sqlite_wal: bool = Field(default=True, alias="DB_SQLITE_WAL")
+    task_write_flush_interval: float = Field(default=1.0, alias="TASK_WRITE_FLUSH_INTERVAL")
+    
+    # LLM client pool
+    llm_max_concurrency: int = Field(default=16, alias="LLM_MAX_CONCURRENCY")
+    llm_timeout: float = Field(default=60.0, alias="LLM_TIMEOUT")
+    gemini_max_concurrency: int = Field(default=8, alias="GEMINI_MAX_CONCURRENCY")
+    llm_requests_per_minute: int = Field(default=0, alias="LLM_REQUESTS_PER_MINUTE")
+    llm_tokens_per_minute: int = Field(default=0, alias="LLM_TOKENS_PER_MINUTE")
+    gemini_requests_per_minute: int = Field(default=0, alias="GEMINI_REQUESTS_PER_MINUTE")
+    gemini_tokens_per_minute: int = Field(default=0, alias="GEMINI_TOKENS_PER_MINUTE")
+    llm_quota_processes: int = Field(default=1, alias="LLM_QUOTA_PROCESSES")
+    llm_retry_attempts: int = Field(default=3, alias="LLM_RETRY_ATTEMPTS")
+    llm_retry_base_delay: float = Field(default=0.5, alias="LLM_RETRY_BASE_DELAY")
+    llm_retry_max_delay: float = Field(default=8.0, alias="LLM_RETRY_MAX_DELAY")
+    llm_interactive_timeout: float = Field(default=20.0, alias="LLM_INTERACTIVE_TIMEOUT")
+    llm_hedge_interactive: bool = Field(default=True, alias="LLM_HEDGE_INTERACTIVE")
+    llm_breaker_threshold: int = Field(default=5, alias="LLM_BREAKER_THRESHOLD")
+    llm_breaker_reset: float = Field(default=30.0, alias="LLM_BREAKER_RESET")
+    
+    # Intent classification
+    intent_fast_path_threshold: float = Field(
+        default=0.9,
+        alias="INTENT_FAST_PATH_THRESHOLD",
+    )
+    intent_cache_size: int = Field(default=1024, alias="INTENT_CACHE_SIZE")
+    intent_cache_ttl: int = Field(default=3600, alias="INTENT_CACHE_TTL")
+    intent_cache_persist: bool = Field(default=False, alias="INTENT_CACHE_PERSIST")
+    
+    # Plan generation
+    plan_cache_enabled: bool = Field(default=True, alias="PLAN_CACHE_ENABLED")
+    repo_index_enabled: bool = Field(default=True, alias="REPO_INDEX_ENABLED")
+    repo_index_token_budget: int = Field(default=2000, alias="REPO_INDEX_TOKEN_BUDGET")
+    
+    # Git
+    git_clone_mode: str = Field(default="shared", alias="GIT_CLONE_MODE")
+    git_clone_depth: int = Field(default=0, alias="GIT_CLONE_DEPTH")
+    git_clone_filter: str | None = Field(default=None, alias="GIT_CLONE_FILTER")
+    git_concurrency: int = Field(default=4, alias="GIT_CONCURRENCY")
+    git_timeout: float = Field(default=300.0, alias="GIT_TIMEOUT")
+    git_verify_changes: bool = Field(default=False, alias="GIT_VERIFY_CHANGES")
+    github_cache_size: int = Field(default=1024, alias="GITHUB_CACHE_SIZE")
+    github_cache_ttl: float = Field(default=60.0, alias="GITHUB_CACHE_TTL")
+    github_rate_limit_reserve: int = Field(default=100, alias="GITHUB_RATE_LIMIT_RESERVE")
+    
+    # Execution
+    max_concurrent_tasks: int = Field(default=4, alias="MAX_CONCURRENT_TASKS")
+    max_parallel_steps: int = Field(default=3, alias="MAX_PARALLEL_STEPS")
+    step_max_attempts: int = Field(default=2, alias="STEP_MAX_ATTEMPTS")
+    task_workers: int = Field(default=2, alias="TASK_WORKERS")
+    job_lease_seconds: float = Field(default=120.0, alias="JOB_LEASE_SECONDS")
+    job_poll_interval: float = Field(default=2.0, alias="JOB_POLL_INTERVAL")
+    job_max_attempts: int = Field(default=3, alias="JOB_MAX_ATTEMPTS")
+    worker_stats_interval: float = Field(default=30.0, alias="WORKER_STATS_INTERVAL")
+    retrieval_token_budget: int = Field(default=6000, alias="RETRIEVAL_TOKEN_BUDGET")
+    retrieval_top_k: int = Field(default=5, alias="RETRIEVAL_TOP_K")
+    
+    # Workspace cleanup
+    workspace_gc_interval: float = Field(default=600.0, alias="WORKSPACE_GC_INTERVAL")
+    workspace_retention: float = Field(default=86400.0, alias="WORKSPACE_RETENTION")
+    workspace_quota_mb: int = Field(default=0, alias="WORKSPACE_QUOTA_MB")
+    workspace_min_retention: float = Field(default=600.0, alias="WORKSPACE_MIN_RETENTION")
+    
     # Optional settings
     checkpoint_interval: int = Field(default=300, alias="CHECKPOINT_INTERVAL")
     max_clarification_rounds: int = Field(default=10, alias="MAX_CLARIFICATION_ROUNDS")
@@ -1,69 +1,204 @@
 """Main orchestrator - coordinates all components."""
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 from src.core.config import Config
 from src.models.task import Task, TaskStatus, Intent
 
 
 if TYPE_CHECKING:
+    from src.agents.intent_cache import IntentCache
+    from src.agents.plan_cache import PlanCache
     from src.agents.intent_classifier import IntentClassifier
     from src.agents.plan_generator import PlanGenerator
     from src.agents.executor import TaskExecutor
+    from src.agents.rule_classifier import RuleBasedClassifier
+    from src.core.workspace_gc import WorkspaceGC
+    from src.git.github_manager import GitHubManager
+    from src.git.repo_indexer import RepoIndexer
+    from src.llm.client import LLMClient
+    from src.models.write_buffer import TaskWriteBuffer
 
 
 logger = logging.getLogger(__name__)
 
 
+class TaskAbortedError(Exception):
+    """Raised between steps when the job of the running task was cancelled."""
+
+
 class DevTaskOrchestrator:
     """Main orchestrator that coordinates all system components."""
     
     def __init__(self, config: Config) -> None:
         """Initialize the orchestrator."""
         self.config = config
+        self._llm_client: "LLMClient | None" = None
+        self._fast_path: "RuleBasedClassifier | None" = None
+        self._intent_cache: "IntentCache | None" = None
+        self._plan_cache: "PlanCache | None" = None
+        self._github_manager: "GitHubManager | None" = None
+        self._repo_indexer: "RepoIndexer | None" = None
         self._intent_classifier: "IntentClassifier | None" = None
         self._plan_generator: "PlanGenerator | None" = None
         self._executor: "TaskExecutor | None" = None
+        self._task_writes: "TaskWriteBuffer | None" = None
+        self._workspace_gc: "WorkspaceGC | None" = None
+        
+        # Set when a task is queued so idle workers in this process wake up
+        self.jobs_queued = asyncio.Event()
         
         logger.info("DevTaskOrchestrator initialized")
     
+    @property
+    def llm_client(self) -> "LLMClient":
+        """Lazy-load the shared Claude client."""
+        if self._llm_client is None:
+            from src.llm.client import get_llm_client
+            self._llm_client = get_llm_client(self.config)
+        return self._llm_client
+    
+    @property
+    def fast_path(self) -> "RuleBasedClassifier":
+        """Lazy-load the rule-based intent pre-classifier."""
+        if self._fast_path is None:
+            from src.agents.rule_classifier import RuleBasedClassifier
+            self._fast_path = RuleBasedClassifier(
+                threshold=self.config.intent_fast_path_threshold,
+            )
+        return self._fast_path
+    
+    @property
+    def intent_cache(self) -> "IntentCache":
+        """Lazy-load the intent response cache."""
+        if self._intent_cache is None:
+            from src.agents.intent_cache import IntentCache
+            self._intent_cache = IntentCache(
+                max_size=self.config.intent_cache_size,
+                ttl=self.config.intent_cache_ttl,
+                persist=self.config.intent_cache_persist,
+            )
+        return self._intent_cache
+    
     @property
     def intent_classifier(self) -> "IntentClassifier":
         """Lazy-load intent classifier."""
         if self._intent_classifier is None:
             from src.agents.intent_classifier import IntentClassifier
+            from src.llm.client import get_llm_client
             self._intent_classifier = IntentClassifier(
-                api_key=self.config.anthropic_api_key,
+                client=get_llm_client(self.config, lane="interactive"),
+                cache=self.intent_cache,
             )
         return self._intent_classifier
     
+    @property
+    def plan_cache(self) -> "PlanCache":
+        """Lazy-load the plan cache."""
+        if self._plan_cache is None:
+            from src.agents.plan_cache import PlanCache
+            self._plan_cache = PlanCache()
+        return self._plan_cache
+    
     @property
     def plan_generator(self) -> "PlanGenerator":
         """Lazy-load plan generator."""
         if self._plan_generator is None:
             from src.agents.plan_generator import PlanGenerator
             self._plan_generator = PlanGenerator(
-                api_key=self.config.anthropic_api_key,
+                client=self.llm_client,
+                cache=self.plan_cache if self.config.plan_cache_enabled else None,
             )
         return self._plan_generator
     
+    @property
+    def github_manager(self) -> "GitHubManager":
+        """Lazy-load GitHub manager."""
+        if self._github_manager is None:
+            from src.git.github_manager import GitHubManager
+            self._github_manager = GitHubManager(
+                token=self.config.github_token,
+                workspace_path=self.config.workspace_dir,
+                clone_mode=self.config.git_clone_mode,
+                clone_depth=self.config.git_clone_depth,
+                clone_filter=self.config.git_clone_filter,
+                api_cache_size=self.config.github_cache_size,
+                api_cache_ttl=self.config.github_cache_ttl,
+                rate_limit_reserve=self.config.github_rate_limit_reserve,
+                git_concurrency=self.config.git_concurrency,
+                git_timeout=self.config.git_timeout,
+            )
+        return self._github_manager
+    
+    @property
+    def repo_indexer(self) -> "RepoIndexer":
+        """Lazy-load repository indexer."""
+        if self._repo_indexer is None:
+            from src.git.repo_indexer import RepoIndexer
+            self._repo_indexer = RepoIndexer(
+                index_path=self.config.workspace_dir / ".index",
+            )
+        return self._repo_indexer
+    
     @property
     def executor(self) -> "TaskExecutor":
         """Lazy-load task executor."""
         if self._executor is None:
+            from src.agents.context_retriever import ContextRetriever
             from src.agents.executor import TaskExecutor
+            from src.llm.client import get_gemini_client
             self._executor = TaskExecutor(
-                api_key=self.config.google_ai_api_key,
                 workspace_path=self.config.workspace_dir,
+                client=get_gemini_client(self.config, lane="background"),
+                max_concurrent_tasks=self.config.max_concurrent_tasks,
+                max_parallel_steps=self.config.max_parallel_steps,
+                step_max_attempts=self.config.step_max_attempts,
+                checkpoint_interval=self.config.checkpoint_interval,
+                git=self.github_manager,
+                verify_changes=self.config.git_verify_changes,
+                retriever=ContextRetriever(
+                    indexer=self.repo_indexer,
+                    repos_path=self.config.workspace_dir / ".repos",
+                    max_tokens=self.config.retrieval_token_budget,
+                    top_k=self.config.retrieval_top_k,
+                ),
             )
         return self._executor
     
+    @property
+    def task_writes(self) -> "TaskWriteBuffer":
+        """Lazy-load the write-behind buffer for task updates."""
+        if self._task_writes is None:
+            from src.models.write_buffer import TaskWriteBuffer
+            self._task_writes = TaskWriteBuffer(
+                flush_interval=self.config.task_write_flush_interval,
+            )
+        return self._task_writes
+    
+    @property
+    def workspace_gc(self) -> "WorkspaceGC":
+        """Lazy-load the task workspace garbage collector."""
+        if self._workspace_gc is None:
+            from src.core.workspace_gc import WorkspaceGC
+            self._workspace_gc = WorkspaceGC(
+                workspace_path=self.config.workspace_dir,
+                interval=self.config.workspace_gc_interval,
+                retention=self.config.workspace_retention,
+                quota_bytes=self.config.workspace_quota_mb * 2**20,
+                min_retention=self.config.workspace_min_retention,
+            )
+        return self._workspace_gc
+    
     async def handle_message(
         self,
         user_id: int,
         chat_id: int,
         message: str,
+        reply_to_text: str | None = None,
+        on_progress: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
     ) -> dict:
         """
         Handle incoming message from Telegram.
@@ -72,21 +207,31 @@ class DevTaskOrchestrator:
             user_id: Telegram user ID
             chat_id: Telegram chat ID
             message: User's message text
+            reply_to_text: Text of the message being replied to, if any
+            on_progress: Optional callback receiving the partial plan while
+                it streams (new tasks only)
             
         Returns:
             Response dict with action and data
         """
         logger.info("Handling message from user %d: %s", user_id, message[:50])
         
-        # Classify intent
-        intent_result = await self.intent_classifier.classify(message)
+        # Classify intent (deterministic fast path first, then Claude)
+        intent_result = self.fast_path.classify(message, reply_to_text)
+        
+        if intent_result is None:
+            start = time.perf_counter()
+            intent_result = await self.intent_classifier.classify(message)
+            self.fast_path.record_llm_latency(time.perf_counter() - start)
         
         match intent_result.intent:
             case Intent.QUERY:
                 return await self._handle_query(message, intent_result)
             
             case Intent.TASK_NEW:
-                return await self._handle_new_task(user_id, chat_id, message, intent_result)
+                return await self._handle_new_task(
+                    user_id, chat_id, message, intent_result, on_progress
+                )
             
             case Intent.TASK_CONTINUE:
                 return await self._handle_continue_task(user_id, message)
@@ -94,6 +239,9 @@ class DevTaskOrchestrator:
             case Intent.TASK_LIST:
                 return await self._handle_list_tasks(user_id)
             
+            case Intent.TASK_STATUS:
+                return await self._handle_task_status(user_id)
+            
             case Intent.TASK_ABORT:
                 return await self._handle_abort_task(user_id)
             
@@ -117,6 +265,7 @@ class DevTaskOrchestrator:
         chat_id: int,
         message: str,
         intent_result: dict,
+        on_progress: Callable[[dict[str, Any]], Awaitable[None]] | None = None,
     ) -> dict:
         """Handle new task creation."""
         # Check if info is complete
@@ -126,10 +275,27 @@ class DevTaskOrchestrator:
                 "message": intent_result.clarification_question,
             }
         
+        repo_url = intent_result.extracted_info.get("repo")
+        
+        # Resolve the repository snapshot so identical requests reuse plans
+        repo_sha = None
+        if repo_url:
+            try:
+                repo_sha = await self.github_manager.resolve_head_sha(repo_url)
+            except Exception as e:
+                logger.warning("Could not resolve HEAD of %s: %s", repo_url, e)
+        
+        context = None
+        if repo_url and repo_sha and self.config.repo_index_enabled:
+            context = await self._get_repo_context(repo_url, repo_sha)
+        
         # Generate plan
         plan = await self.plan_generator.generate(
             description=message,
-            repo_url=intent_result.extracted_info.get("repo"),
+            repo_url=repo_url,
+            context=context,
+            repo_sha=repo_sha,
+            on_progress=on_progress,
         )
         
         # Create task
@@ -143,8 +309,8 @@ class DevTaskOrchestrator:
         )
         
         # Save task
-        from src.models.database import save_task
-        save_task(task)
+        from src.models.async_database import save_task
+        await save_task(task)
         
         return {
             "action": "approve_plan",
@@ -152,6 +318,28 @@ class DevTaskOrchestrator:
             "plan": plan,
         }
     
+    async def _get_repo_context(self, repo_url: str, repo_sha: str) -> dict | None:
+        """Get the indexed repository summary for plan generation."""
+        try:
+            owner, repo_name = self.github_manager.parse_repo_url(repo_url)
+            repo_key = f"{owner}/{repo_name}"
+            
+            index = await self.repo_indexer.get(repo_key, repo_sha)
+            if index is None:
+                # Read from the mirror; a checkout would delay the plan
+                repo_path = await self.github_manager.sync_commit(repo_url, repo_sha)
+                index = await self.repo_indexer.index(repo_key, repo_path, repo_sha)
+            
+        except Exception as e:
+            logger.warning("Could not index %s: %s", repo_url, e)
+            return None
+        
+        return {
+            "repositorio": self.repo_indexer.summarize(
+                index, max_tokens=self.config.repo_index_token_budget
+            ),
+        }
+    
     async def _handle_continue_task(self, user_id: int, message: str) -> dict:
         """Handle continuation of existing task."""
         # TODO: Implement task continuation
@@ -162,20 +350,42 @@ class DevTaskOrchestrator:
     
     async def _handle_list_tasks(self, user_id: int) -> dict:
         """Handle request to list tasks."""
-        from src.models.database import get_user_tasks
+        from src.models.async_database import get_user_tasks
         
-        tasks = get_user_tasks(user_id)
+        tasks = await get_user_tasks(user_id)
         
         return {
             "action": "list",
             "tasks": [t.to_summary() for t in tasks],
         }
     
+    async def _handle_task_status(self, user_id: int) -> dict:
+        """Handle request for the active task status."""
+        from src.models.async_database import get_active_task
+        
+        task = await get_active_task(user_id, include_payload=False)
+        
+        if task is None:
+            return {
+                "action": "respond",
+                "message": "Sin tareas activas.",
+            }
+        
+        summary = task.to_summary()
+        
+        return {
+            "action": "respond",
+            "message": (
+                f"🔄 Tarea `{summary['id']}`: {summary['description']}\n"
+                f"Estado: {summary['status']} ({summary['progress']})"
+            ),
+        }
+    
     async def _handle_abort_task(self, user_id: int) -> dict:
         """Handle task abort request."""
-        from src.models.database import get_active_task, update_task
+        from src.models.async_database import cancel_job, get_active_task
         
-        task = get_active_task(user_id)
+        task = await get_active_task(user_id, include_payload=False)
         
         if task is None:
             return {
@@ -183,13 +393,16 @@ class DevTaskOrchestrator:
                 "message": "No tienes tareas activas para cancelar.",
             }
         
-        # Commit partial work if any
-        if task.current_step > 0:
-            await self.executor.commit_partial_work(task)
+        # Stop the job first so no worker claims or continues it
+        job_status = await cancel_job(task.id)
         
-        # Update status
+        # Terminal: written immediately, and never overwritten by the worker
         task.status = TaskStatus.ABORTED
-        update_task(task)
+        await self.task_writes.update(task, columns=["status"])
+        
+        # A running worker pushes its finished steps itself when it stops
+        if job_status != "running" and task.current_step > 0:
+            await self.executor.commit_partial_work(task)
         
         return {
             "action": "respond",
@@ -198,9 +411,9 @@ class DevTaskOrchestrator:
     
     async def approve_task(self, task_id: str) -> dict:
         """Approve a task for execution."""
-        from src.models.database import get_task, update_task
+        from src.models.async_database import get_task
         
-        task = get_task(task_id)
+        task = await get_task(task_id)
         
         if task is None:
             return {"error": "Task not found"}
@@ -208,43 +421,71 @@ class DevTaskOrchestrator:
         if task.status != TaskStatus.PENDING_APPROVAL:
             return {"error": "Task is not pending approval"}
         
+        from src.models.async_database import enqueue_job
+        
         task.status = TaskStatus.APPROVED
-        update_task(task)
+        await self.task_writes.update(task, columns=["status"])
+        # A worker may load the task as soon as the job is queued, and write it
+        await self.task_writes.release(task_id)
         
-        # Start execution
-        return await self.execute_task(task_id)
+        # Execution runs in the worker pool, not in the caller
+        await enqueue_job(task_id)
+        self.jobs_queued.set()
+        
+        return {
+            "action": "queued",
+            "task_id": task_id,
+        }
     
     async def execute_task(self, task_id: str) -> dict:
         """Execute an approved task."""
-        from src.models.database import get_task, update_task
+        from src.models.async_database import get_task, is_job_cancelled
         
-        task = get_task(task_id)
+        task = await get_task(task_id)
         
         if task is None:
             return {"error": "Task not found"}
         
         task.status = TaskStatus.IN_PROGRESS
-        update_task(task)
+        await self.task_writes.update(task)
+        
+        async def on_progress(task: Task) -> None:
+            await self.task_writes.update(
+                task, columns=["current_step", "total_steps", "started_at"]
+            )
+            if await is_job_cancelled(task.id):
+                raise TaskAbortedError(task.id)
         
         try:
-            result = await self.executor.execute(task)
+            result = await self.executor.execute(task, on_progress=on_progress)
             
             task.status = TaskStatus.COMPLETED
             task.result = result
-            update_task(task)
+            await self.task_writes.update(task)
             
             return {
                 "action": "completed",
                 "task_id": task_id,
+                "chat_id": task.telegram_chat_id,
                 "result": result,
             }
+        
+        except TaskAbortedError:
+            # Finished steps were committed and pushed; the status stays ABORTED
+            logger.info("Task %s aborted after step %d", task_id, task.current_step)
+            
+            return {
+                "action": "aborted",
+                "task_id": task_id,
+                "chat_id": task.telegram_chat_id,
+            }
             
         except Exception as e:
             logger.exception("Task execution failed: %s", e)
             
             task.status = TaskStatus.FAILED
             task.error = str(e)
-            update_task(task)
+            await self.task_writes.update(task)
             
             # Try to commit partial work
             await self.executor.commit_partial_work(task)
@@ -252,5 +493,53 @@ class DevTaskOrchestrator:
             return {
                 "action": "failed",
                 "task_id": task_id,
+                "chat_id": task.telegram_chat_id,
                 "error": str(e),
             }
+    
+    async def commit_partial_work(self, task_id: str) -> None:
+        """Commit and push the finished steps of a task stopped mid-step."""
+        from src.models.async_database import get_task
+        
+        task = await get_task(task_id)
+        
+        if task is not None:
+            await self.executor.commit_partial_work(task)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get performance metrics for the orchestrator components."""
+        stats = {
+            "intent_fast_path": self.fast_path.get_stats(),
+            "intent_cache": self.intent_cache.get_stats(),
+            "plan_cache": self.plan_cache.get_stats(),
+            "llm": self.llm_client.get_stats(),
+        }
+        
+        if self._github_manager is not None:
+            stats["git"] = self._github_manager.get_stats()
+        
+        if self._repo_indexer is not None:
+            stats["repo_indexer"] = self._repo_indexer.get_stats()
+        
+        if self._executor is not None:
+            stats["executor"] = self._executor.get_stats()
+            stats["gemini"] = self._executor.client.get_stats()
+        
+        if self._task_writes is not None:
+            stats["task_writes"] = self._task_writes.get_stats()
+        
+        if self._workspace_gc is not None:
+            stats["workspace_gc"] = self._workspace_gc.get_stats()
+        
+        return stats
+    
+    async def shutdown(self) -> None:
+        """Flush buffered state before the process exits."""
+        if self._workspace_gc is not None:
+            await self._workspace_gc.stop()
+        
+        if self._github_manager is not None:
+            self._github_manager.close()
+        
+        if self._task_writes is not None:
+            await self._task_writes.close()
@@ -0,0 +1,212 @@
+"""Executor worker processes coordinating through the database."""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import signal
+from datetime import datetime
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any
+
+from src.utils.async_utils import run_sync
+
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds a stopping worker gets to release its jobs before it is killed
+SHUTDOWN_TIMEOUT = 30.0
+
+
+class WorkerProcessManager:
+    """
+    Starts and supervises executor processes.
+    
+    Each process runs its own event loop and TaskWorkerPool and claims jobs
+    from the shared database, so execution scales past one core. Processes
+    that exit unexpectedly are restarted; ``stop()`` sends SIGTERM so
+    workers release their jobs before exiting.
+    """
+    
+    def __init__(self, count: int, check_interval: float = 5.0) -> None:
+        """Initialize with the number of executor processes."""
+        self.count = count
+        self.check_interval = check_interval
+        
+        # Spawn: children never inherit the parent's connections or loop
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: dict[int, BaseProcess] = {}
+        self._supervisor: asyncio.Task[None] | None = None
+        
+        # Metrics
+        self.restarts = 0
+    
+    def start(self) -> None:
+        """Start all executor processes and their supervisor."""
+        for index in range(self.count):
+            self._spawn(index)
+        
+        self._supervisor = asyncio.create_task(self._supervise())
+        logger.info("Started %d executor processes", self.count)
+    
+    async def stop(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Ask every process to shut down gracefully, killing stragglers."""
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        
+        for index, process in self._processes.items():
+            await run_sync(process.join, timeout)
+            if process.is_alive():
+                logger.warning("Executor %d did not stop in time, killing it", index)
+                process.kill()
+                await run_sync(process.join)
+        
+        self._processes.clear()
+        logger.info("Executor processes stopped")
+    
+    async def get_stats(self, max_age_seconds: float = 300.0) -> dict[str, Any]:
+        """Get process state and the metrics each worker reported."""
+        from src.models.async_database import get_worker_stats
+        
+        return {
+            "processes": {
+                index: {"pid": process.pid, "alive": process.is_alive()}
+                for index, process in self._processes.items()
+            },
+            "restarts": self.restarts,
+            "workers": await get_worker_stats(max_age_seconds),
+        }
+    
+    def _spawn(self, index: int) -> None:
+        """Start executor process number index."""
+        process = self._context.Process(
+            target=run_worker_process,
+            args=(index,),
+            name=f"executor-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+    
+    async def _supervise(self) -> None:
+        """Restart processes that exited on their own."""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            
+            for index, process in list(self._processes.items()):
+                if not process.is_alive():
+                    logger.error(
+                        "Executor %d exited with code %s, restarting",
+                        index, process.exitcode,
+                    )
+                    self.restarts += 1
+                    self._spawn(index)
+
+
+async def report_stats(name: str, started_at: datetime, stats: dict[str, Any]) -> None:
+    """Save the metrics of a process to the workers table, logging failures."""
+    from src.models.async_database import save_worker_stats
+    
+    try:
+        await save_worker_stats(name, started_at, json.dumps(stats, default=str))
+    except Exception as e:
+        logger.warning("Could not report worker stats: %s", e)
+
+
+def run_worker_process(index: int) -> None:
+    """Entry point of an executor process."""
+    asyncio.run(worker_main(index))
+
+
+async def worker_main(index: int) -> None:
+    """Run a TaskWorkerPool until SIGTERM/SIGINT."""
+    from src.core.config import get_config
+    from src.core.logging_config import setup_logging
+    from src.core.orchestrator import DevTaskOrchestrator
+    from src.core.workers import TaskWorkerPool
+    from src.llm.client import close_llm_clients
+    from src.models.database import close_database, init_database
+    
+    config = get_config()
+    
+    # Separate log files; processes must not rotate the same file
+    setup_logging(
+        log_level=config.log_level,
+        log_dir=Path(config.log_dir) / f"executor-{index}",
+    )
+    
+    init_database(
+        config.database_url,
+        pool_size=config.db_pool_size,
+        busy_timeout=config.db_busy_timeout,
+        sqlite_wal=config.db_sqlite_wal,
+    )
+    
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    
+    orchestrator = DevTaskOrchestrator(config=config)
+    notifier = TelegramNotifier(config.telegram_token)
+    pool = TaskWorkerPool(
+        orchestrator=orchestrator,
+        workers=config.task_workers,
+        lease_seconds=config.job_lease_seconds,
+        poll_interval=config.job_poll_interval,
+        max_attempts=config.job_max_attempts,
+        on_finished=notifier.task_finished,
+    )
+    started_at = datetime.utcnow()
+    
+    async def report_pool_stats() -> None:
+        stats = {"executor": index, **pool.get_stats(), **orchestrator.get_stats()}
+        await report_stats(pool.name, started_at, stats)
+    
+    pool.start()
+    logger.info("Executor %d (%s) started", index, pool.name)
+    
+    try:
+        while not stop.is_set():
+            await report_pool_stats()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=config.worker_stats_interval)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        logger.info("Executor %d stopping", index)
+        await pool.stop()
+        await orchestrator.shutdown()
+        await report_pool_stats()
+        await close_llm_clients()
+        close_database()
+
+
+class TelegramNotifier:
+    """Sends task results to chats without running the bot's update loop."""
+    
+    def __init__(self, token: str) -> None:
+        """Initialize with the bot token."""
+        from telegram import Bot
+        
+        self.bot = Bot(token)
+    
+    async def task_finished(self, result: dict[str, Any]) -> None:
+        """Tell the user that a queued task finished."""
+        from src.chat.telegram_bot import format_task_finished
+        
+        chat_id = result.get("chat_id")
+        if chat_id is None:
+            return
+        
+        await self.bot.send_message(
+            chat_id=chat_id,
+            text=format_task_finished(result),
+            parse_mode="Markdown",
+        )
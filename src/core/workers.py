@@ -0,0 +1,290 @@
+"""Worker pool executing queued tasks."""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from src.models.task import TaskStatus
+
+
+if TYPE_CHECKING:
+    from src.core.orchestrator import DevTaskOrchestrator
+
+
+logger = logging.getLogger(__name__)
+
+
+TaskFinishedCallback = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class TaskWorkerPool:
+    """
+    Async workers pulling approved tasks from the persistent job queue.
+    
+    Each worker claims a job with a lease and keeps extending it while the
+    task runs. If the process dies, the lease expires and another worker
+    (in this or another process) claims the job again, up to
+    ``max_attempts`` times. A cancelled job (task aborted) is stopped at
+    its next step or heartbeat.
+    """
+    
+    def __init__(
+        self,
+        orchestrator: "DevTaskOrchestrator",
+        workers: int = 2,
+        lease_seconds: float = 120.0,
+        poll_interval: float = 2.0,
+        max_attempts: int = 3,
+        on_finished: TaskFinishedCallback | None = None,
+    ) -> None:
+        """
+        Initialize the pool.
+        
+        Args:
+            orchestrator: Orchestrator executing the tasks
+            workers: Number of concurrent workers
+            lease_seconds: Lease duration; heartbeats renew it every third
+            poll_interval: Maximum seconds between queue polls when idle
+            max_attempts: Claims allowed per job before it is failed
+            on_finished: Awaited with the execution result of each task
+        """
+        self.orchestrator = orchestrator
+        self.workers = workers
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.on_finished = on_finished
+        
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: list[asyncio.Task[None]] = []
+        self._stopping = asyncio.Event()
+        
+        # Metrics
+        self.claimed = 0
+        self.completed = 0
+        self.failed = 0
+        self.released = 0
+        self.aborted = 0
+        self.lost_leases = 0
+        self.busy_workers = 0
+        self.total_execution_time = 0.0
+    
+    def start(self) -> None:
+        """Start the workers."""
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{self.name}:{index}"))
+            for index in range(self.workers)
+        ]
+        logger.info("Started %d task workers", self.workers)
+    
+    async def stop(self) -> None:
+        """Stop the workers, releasing running jobs back to the queue."""
+        self._stopping.set()
+        
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+        logger.info("Task workers stopped")
+    
+    async def _worker(self, worker_id: str) -> None:
+        """Claim and run jobs until stopped."""
+        from src.models.async_database import claim_job
+        
+        while not self._stopping.is_set():
+            try:
+                task_id = await claim_job(worker_id, self.lease_seconds, self.max_attempts)
+            except Exception as e:
+                logger.error("Job claim failed: %s", e)
+                task_id = None
+            
+            if task_id is None:
+                try:
+                    await self._fail_exhausted()
+                except Exception as e:
+                    logger.exception("Exhausted job sweep failed: %s", e)
+                await self._wait_for_jobs()
+                continue
+            
+            self.claimed += 1
+            try:
+                await self._run_job(worker_id, task_id)
+            except Exception as e:
+                # The worker keeps claiming jobs whatever one of them raised
+                logger.exception("Worker %s failed running task %s: %s", worker_id, task_id, e)
+    
+    async def _run_job(self, worker_id: str, task_id: str) -> None:
+        """
+        Execute one claimed job while heartbeating its lease.
+        
+        The job is finished in any case but a lost lease or a cancelled job:
+        done or failed with the execution result, failed if the execution
+        raised, or queued again on shutdown.
+        """
+        from src.models.async_database import finish_job
+        
+        logger.info("Worker %s running task %s", worker_id, task_id)
+        
+        execution = asyncio.create_task(self.orchestrator.execute_task(task_id))
+        heartbeat = asyncio.create_task(self._heartbeat(worker_id, task_id, execution))
+        
+        self.busy_workers += 1
+        start = time.perf_counter()
+        job_status: str | None = "failed"
+        error: str | None = None
+        
+        try:
+            result = await execution
+        except asyncio.CancelledError:
+            if not self._stopping.is_set():
+                job_status = None
+                if heartbeat.done() and not heartbeat.cancelled() and heartbeat.result() == "cancelled":
+                    # Aborted mid-step: nobody else owns the branch, so the
+                    # finished steps are pushed now
+                    await self.orchestrator.commit_partial_work(task_id)
+                # Otherwise the lease was lost; another worker owns the job now
+                return
+            
+            # Shutdown: hand the job back without counting an attempt
+            job_status = "queued"
+            self.released += 1
+            raise
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            self.failed += 1
+            raise
+        else:
+            if result.get("action") == "aborted":
+                # The job is already cancelled, and the user was answered
+                job_status = None
+            elif result.get("action") == "completed":
+                job_status = "done"
+            else:
+                error = result.get("error")
+        finally:
+            heartbeat.cancel()
+            self.busy_workers -= 1
+            self.total_execution_time += time.perf_counter() - start
+            
+            if job_status is not None:
+                try:
+                    await finish_job(task_id, worker_id, job_status, error)
+                except Exception as e:
+                    logger.error("Could not finish the job of %s: %s", task_id, e)
+        
+        if job_status is None:
+            self.aborted += 1
+            return
+        
+        if job_status == "failed":
+            self.failed += 1
+        else:
+            self.completed += 1
+        
+        await self._notify(result)
+    
+    async def _heartbeat(
+        self,
+        worker_id: str,
+        task_id: str,
+        execution: "asyncio.Task[dict[str, Any]]",
+    ) -> str:
+        """
+        Renew the lease; cancel the execution if the lease was lost or the job cancelled.
+        
+        Returns:
+            Why the execution was cancelled: "cancelled" or "lost"
+        """
+        from src.models.async_database import heartbeat_job, is_job_cancelled
+        
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            
+            try:
+                held = await heartbeat_job(task_id, worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning("Heartbeat for %s failed: %s", task_id, e)
+                continue
+            
+            if not held:
+                try:
+                    cancelled = await is_job_cancelled(task_id)
+                except Exception:
+                    cancelled = False
+                
+                if cancelled:
+                    logger.info("Job of %s cancelled, worker %s stopping it", task_id, worker_id)
+                    self.aborted += 1
+                else:
+                    logger.error("Worker %s lost the lease of %s, stopping it", worker_id, task_id)
+                    self.lost_leases += 1
+                execution.cancel()
+                return "cancelled" if cancelled else "lost"
+    
+    async def _fail_exhausted(self) -> None:
+        """Fail tasks whose jobs ran out of attempts."""
+        from src.models.async_database import fail_exhausted_jobs, get_task
+        
+        try:
+            task_ids = await fail_exhausted_jobs(self.max_attempts)
+        except Exception as e:
+            logger.error("Could not check exhausted jobs: %s", e)
+            return
+        
+        for task_id in task_ids:
+            task = await get_task(task_id)
+            if task is None:
+                continue
+            
+            task.status = TaskStatus.FAILED
+            task.error = "La ejecución se interrumpió demasiadas veces"
+            await self.orchestrator.task_writes.update(task, columns=["status", "error"])
+            self.failed += 1
+            
+            await self._notify({
+                "action": "failed",
+                "task_id": task_id,
+                "chat_id": task.telegram_chat_id,
+                "error": task.error,
+            })
+    
+    async def _wait_for_jobs(self) -> None:
+        """Sleep until a job is queued in this process or the poll interval ends."""
+        event = self.orchestrator.jobs_queued
+        
+        try:
+            await asyncio.wait_for(event.wait(), timeout=self.poll_interval)
+            event.clear()
+        except asyncio.TimeoutError:
+            pass
+    
+    async def _notify(self, result: dict[str, Any]) -> None:
+        """Report a finished task."""
+        if self.on_finished is None:
+            return
+        
+        try:
+            await self.on_finished(result)
+        except Exception as e:
+            logger.error("Task finished callback failed: %s", e)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get worker pool metrics."""
+        finished = self.completed + self.failed
+        
+        return {
+            "workers": self.workers,
+            "busy_workers": self.busy_workers,
+            "claimed": self.claimed,
+            "completed": self.completed,
+            "failed": self.failed,
+            "released": self.released,
+            "aborted": self.aborted,
+            "lost_leases": self.lost_leases,
+            "avg_execution_time": self.total_execution_time / finished if finished else 0.0,
+        }
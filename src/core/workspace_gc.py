@@ -0,0 +1,250 @@
+"""Garbage collection of task workspaces."""
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from pathlib import Path
+from typing import Any
+
+from src.models.write_buffer import TERMINAL_STATUSES
+from src.utils.async_utils import run_in_pool
+
+
+logger = logging.getLogger(__name__)
+
+
+# Walks and deletions run one at a time, off the shared run_sync pool that
+# index builds and file reads queue on
+_gc_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="workspace_gc")
+
+
+class WorkspaceGC:
+    """
+    Periodically deletes the workspaces of finished tasks.
+    
+    Each sweep measures every task directory under the workspace. Workspaces
+    of terminal tasks (or of tasks no longer in the database) are deleted
+    once unused for ``retention`` seconds; then, while total usage is above
+    ``quota_bytes``, the least recently used remaining ones are deleted
+    too, if unused for at least ``min_retention`` seconds. Workspaces of
+    active tasks, and of tasks whose job lease is live (an aborted task's
+    worker may still be pushing its finished steps), are never deleted.
+    
+    Directories starting with a dot (repository mirrors, shared checkouts,
+    indexes) are shared by all tasks and never touched.
+    """
+    
+    def __init__(
+        self,
+        workspace_path: Path,
+        interval: float = 600.0,
+        retention: float = 86400.0,
+        quota_bytes: int = 0,
+        min_retention: float = 600.0,
+    ) -> None:
+        """
+        Initialize the collector.
+        
+        Args:
+            workspace_path: Root directory of task workspaces
+            interval: Seconds between sweeps
+            retention: Seconds a finished task's workspace is kept
+            quota_bytes: Maximum workspace usage; 0 for no quota
+            min_retention: Seconds a finished task's workspace is kept even
+                over the quota
+        """
+        self.workspace_path = workspace_path
+        self.interval = interval
+        self.retention = retention
+        self.quota_bytes = quota_bytes
+        self.min_retention = min_retention
+        
+        self._sweeper: asyncio.Task[None] | None = None
+        
+        # Metrics
+        self.sweeps = 0
+        self.workspaces_evicted = 0
+        self.bytes_reclaimed = 0
+        self.usage_bytes = 0
+        self.shared_bytes = 0
+        self.task_bytes: dict[str, int] = {}
+        self.last_sweep_time = 0.0
+    
+    def start(self) -> None:
+        """Start periodic sweeps."""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop periodic sweeps."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+    
+    async def sweep(self) -> int:
+        """
+        Measure the workspace and delete evictable task workspaces.
+        
+        Returns:
+            Bytes reclaimed
+        """
+        from src.models.async_database import get_leased_tasks, get_task_states
+        
+        start = time.perf_counter()
+        usage = await run_in_pool(_gc_pool, _measure_workspace, self.workspace_path)
+        states = await get_task_states(usage["tasks"])
+        leased = await get_leased_tasks(usage["tasks"])
+        now = time.time()
+        
+        # (last used, task ID, reclaimable bytes) of workspaces that may go
+        evictable = []
+        for task_id, (size, last_modified) in usage["tasks"].items():
+            status, updated_at = states.get(task_id, (None, None))
+            if task_id in leased or (status is not None and status not in TERMINAL_STATUSES):
+                continue
+            
+            last_used = last_modified
+            if updated_at is not None:
+                last_used = max(last_used, updated_at.replace(tzinfo=timezone.utc).timestamp())
+            evictable.append((last_used, task_id, size))
+        
+        evictable.sort()
+        total = usage["total"]
+        reclaimed = 0
+        
+        for last_used, task_id, size in evictable:
+            expired = now - last_used >= self.retention
+            over_quota = (
+                self.quota_bytes
+                and total > self.quota_bytes
+                and now - last_used >= self.min_retention
+            )
+            if not expired and not over_quota:
+                continue
+            
+            if await run_in_pool(_gc_pool, _remove_workspace, self.workspace_path / task_id):
+                logger.info(
+                    "Evicted workspace of task %s (%d bytes, %s)",
+                    task_id, size, "expired" if expired else "over quota",
+                )
+                total -= size
+                reclaimed += size
+                self.workspaces_evicted += 1
+                usage["tasks"].pop(task_id)
+        
+        if self.quota_bytes and total > self.quota_bytes:
+            logger.warning(
+                "Workspace usage %d bytes is over the %d byte quota; the rest is in use or recent",
+                total, self.quota_bytes,
+            )
+        
+        self.sweeps += 1
+        self.bytes_reclaimed += reclaimed
+        self.usage_bytes = total
+        self.shared_bytes = usage["shared"]
+        self.task_bytes = {task_id: size for task_id, (size, _) in usage["tasks"].items()}
+        self.last_sweep_time = time.perf_counter() - start
+        
+        return reclaimed
+    
+    async def _run(self) -> None:
+        """Sweep every interval until stopped."""
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error("Workspace sweep failed: %s", e)
+            
+            await asyncio.sleep(self.interval)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get collector metrics."""
+        return {
+            "sweeps": self.sweeps,
+            "usage_bytes": self.usage_bytes,
+            "shared_bytes": self.shared_bytes,
+            "quota_bytes": self.quota_bytes,
+            "task_workspaces": len(self.task_bytes),
+            "largest_workspaces": sorted(
+                self.task_bytes.items(), key=lambda item: item[1], reverse=True
+            )[:5],
+            "workspaces_evicted": self.workspaces_evicted,
+            "bytes_reclaimed": self.bytes_reclaimed,
+            "last_sweep_time": self.last_sweep_time,
+        }
+
+
+def _measure_workspace(workspace_path: Path) -> dict[str, Any]:
+    """
+    Measure disk usage of the workspace.
+    
+    Files hardlinked elsewhere (e.g. objects of local clones) count toward
+    the total once but not toward any task, since deleting the task would
+    not free them.
+    
+    Returns:
+        {"total": bytes, "shared": bytes in dot directories,
+         "tasks": {task_id: (reclaimable bytes, newest mtime)}}
+    """
+    seen: set[tuple[int, int]] = set()
+    total = 0
+    shared = 0
+    tasks: dict[str, tuple[int, float]] = {}
+    
+    if not workspace_path.exists():
+        return {"total": 0, "shared": 0, "tasks": tasks}
+    
+    # Shared directories first, so files hardlinked into tasks count as shared
+    entries = sorted(os.scandir(workspace_path), key=lambda entry: not entry.name.startswith("."))
+    
+    for entry in entries:
+        if not entry.is_dir(follow_symlinks=False):
+            continue
+        
+        is_shared = entry.name.startswith(".")
+        size = 0
+        last_modified = entry.stat(follow_symlinks=False).st_mtime
+        
+        for dirpath, _, filenames in os.walk(entry.path):
+            for name in filenames:
+                try:
+                    stat = os.lstat(os.path.join(dirpath, name))
+                except FileNotFoundError:
+                    continue
+                
+                last_modified = max(last_modified, stat.st_mtime)
+                blocks = stat.st_blocks * 512
+                
+                if stat.st_nlink > 1:
+                    if (stat.st_dev, stat.st_ino) in seen:
+                        continue
+                    seen.add((stat.st_dev, stat.st_ino))
+                else:
+                    size += blocks
+                total += blocks
+                
+                if is_shared:
+                    shared += blocks
+        
+        if not is_shared:
+            tasks[entry.name] = (size, last_modified)
+    
+    return {"total": total, "shared": shared, "tasks": tasks}
+
+
+def _remove_workspace(path: Path) -> bool:
+    """Delete a task workspace; returns whether it was removed."""
+    try:
+        shutil.rmtree(path)
+    except OSError as e:
+        logger.error("Could not remove workspace %s: %s", path, e)
+        return False
+    return True
@@ -1,6 +1,11 @@
 """Git operations module."""
 
+from src.git.change_set import ChangeSet
+from src.git.git_runner import GitRunner
 from src.git.github_manager import GitHubManager
+from src.git.mirror_cache import MirrorCache
+from src.git.repo_indexer import RepoIndexer
+from src.git.repo_tree import RepoTree, TreeEntry
 
 
-__all__ = ["GitHubManager"]
+__all__ = ["ChangeSet", "GitHubManager", "GitRunner", "MirrorCache", "RepoIndexer", "RepoTree", "TreeEntry"]
@@ -0,0 +1,199 @@
+"""Cached, rate-limit-aware GitHub API reads."""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Callable
+
+from github.Requester import Requester
+
+from src.utils.async_utils import run_sync
+from src.utils.cache import TTLCache
+
+
+logger = logging.getLogger(__name__)
+
+
+# Longest single wait for the rate limit to reset
+MAX_BACKOFF = 60.0
+
+
+class GitHubApiCache:
+    """
+    Caches GitHub API GET responses keyed by (repo, ref, path).
+    
+    Entries are served without a request for ``ttl`` seconds. After that
+    they are revalidated with ``If-None-Match``; a ``304 Not Modified``
+    reuses the cached body and does not count against the rate limit.
+    Stale entries are kept (LRU-bounded) for ``max_age`` seconds so they
+    can be revalidated.
+    
+    When fewer than ``rate_limit_reserve`` requests remain in the current
+    window, stale entries are served as they are and new requests wait for
+    the window to reset (at most ``MAX_BACKOFF`` seconds at a time).
+    """
+    
+    def __init__(
+        self,
+        requester: Requester,
+        max_size: int = 1024,
+        ttl: float = 60.0,
+        max_age: float = 86400.0,
+        rate_limit_reserve: int = 100,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the cache.
+        
+        Args:
+            requester: PyGithub requester used for the HTTP calls
+            max_size: Maximum number of cached responses
+            ttl: Seconds a response is used without revalidation
+            max_age: Seconds a response is kept for revalidation
+            rate_limit_reserve: Remaining requests below which to back off
+            clock: Wall-clock time source (rate limit resets are epoch times)
+        """
+        self.requester = requester
+        self.ttl = ttl
+        self.rate_limit_reserve = rate_limit_reserve
+        self._clock = clock
+        # Values: (fetched at, ETag, data)
+        self._cache: TTLCache[tuple[str, str, str], tuple[float, str | None, Any]] = TTLCache(
+            max_size=max_size,
+            ttl=max_age,
+        )
+        
+        # Last rate limit seen in a response
+        self.rate_limit_remaining: int | None = None
+        self.rate_limit_reset: float | None = None
+        
+        # Metrics
+        self.requests = 0
+        self.fresh_hits = 0
+        self.revalidated = 0
+        self.stale_served = 0
+        self.backoffs = 0
+        self.backoff_time = 0.0
+    
+    async def get(
+        self,
+        key: tuple[str, str, str],
+        url: str,
+        parameters: dict[str, Any] | None = None,
+    ) -> Any:
+        """
+        Get a decoded JSON response, from the cache when possible.
+        
+        Args:
+            key: (repository full name, ref, path) identifying the response
+            url: API path, e.g. ``/repos/owner/repo``
+            parameters: Query parameters
+        
+        Returns:
+            The decoded JSON body
+        
+        Raises:
+            GithubException: On error responses
+        """
+        cached = self._cache.get(key)
+        now = self._clock()
+        
+        if cached is not None:
+            fetched_at, etag, data = cached
+            
+            if now - fetched_at < self.ttl:
+                self.fresh_hits += 1
+                return data
+            
+            if self._near_rate_limit(now):
+                self.stale_served += 1
+                return data
+        else:
+            etag = None
+            await self._wait_for_rate_limit()
+        
+        headers = {"If-None-Match": etag} if etag else {}
+        status, response_headers, output = await self._request(url, parameters, headers)
+        
+        if status == 304 and cached is not None:
+            self.revalidated += 1
+            self._cache.set(key, (self._clock(), etag, cached[2]))
+            return cached[2]
+        
+        if status in (403, 429) and self._near_rate_limit(self._clock()):
+            # Limit hit anyway (e.g. by another process)
+            if cached is not None:
+                self.stale_served += 1
+                return cached[2]
+            await self._wait_for_rate_limit()
+            status, response_headers, output = await self._request(url, parameters, {})
+        
+        data = json.loads(output) if output else None
+        
+        if status >= 400:
+            raise Requester.createException(status, response_headers, data)
+        
+        self._cache.set(key, (self._clock(), response_headers.get("etag"), data))
+        return data
+    
+    async def _request(
+        self,
+        url: str,
+        parameters: dict[str, Any] | None,
+        headers: dict[str, str],
+    ) -> tuple[int, dict[str, str], str]:
+        """Send a GET request and record the rate limit it reports."""
+        self.requests += 1
+        status, response_headers, output = await run_sync(
+            self.requester.requestJson, "GET", url, parameters, headers
+        )
+        response_headers = {name.lower(): value for name, value in response_headers.items()}
+        
+        if "x-ratelimit-remaining" in response_headers:
+            self.rate_limit_remaining = int(response_headers["x-ratelimit-remaining"])
+            self.rate_limit_reset = float(response_headers.get("x-ratelimit-reset", 0))
+        
+        return status, response_headers, output
+    
+    def _near_rate_limit(self, now: float) -> bool:
+        """Whether the current window is (almost) exhausted."""
+        return (
+            self.rate_limit_remaining is not None
+            and self.rate_limit_remaining <= self.rate_limit_reserve
+            and self.rate_limit_reset is not None
+            and self.rate_limit_reset > now
+        )
+    
+    async def _wait_for_rate_limit(self) -> None:
+        """Sleep until the rate limit window resets if it is nearly used up."""
+        now = self._clock()
+        if not self._near_rate_limit(now):
+            return
+        
+        delay = min(self.rate_limit_reset - now, MAX_BACKOFF)
+        logger.warning(
+            "GitHub rate limit low (%d left), waiting %.1fs",
+            self.rate_limit_remaining, delay,
+        )
+        self.backoffs += 1
+        self.backoff_time += delay
+        await asyncio.sleep(delay)
+        
+        if self.rate_limit_reset <= self._clock():
+            # The next response reports the new window
+            self.rate_limit_remaining = None
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache metrics."""
+        return {
+            **self._cache.get_stats(),
+            "requests": self.requests,
+            "fresh_hits": self.fresh_hits,
+            "revalidated": self.revalidated,
+            "stale_served": self.stale_served,
+            "backoffs": self.backoffs,
+            "backoff_time": self.backoff_time,
+            "rate_limit_remaining": self.rate_limit_remaining,
+        }
+
@@ -0,0 +1,103 @@
+"""Files a task changed in its working tree."""
+
+from typing import Iterator
+
+
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+
+CHANGE_KINDS = (CREATED, MODIFIED, DELETED)
+
+
+class ChangeSet:
+    """
+    Paths created, modified and deleted, relative to the repository root.
+    
+    Recorded as files are written, so committing them needs no scan of the
+    working tree. Successive changes to one path collapse into the net
+    change against the starting tree: a file created and then deleted
+    disappears, a file deleted and then written again is modified.
+    """
+    
+    def __init__(
+        self,
+        created: set[str] | None = None,
+        modified: set[str] | None = None,
+        deleted: set[str] | None = None,
+    ) -> None:
+        """Initialize with already known changes."""
+        self.created = set(created or ())
+        self.modified = set(modified or ())
+        self.deleted = set(deleted or ())
+    
+    def record(self, path: str, kind: str) -> None:
+        """
+        Record a change of a path.
+        
+        Args:
+            path: File path relative to the repository root
+            kind: CREATED (did not exist), MODIFIED (existed) or DELETED
+        """
+        if kind not in CHANGE_KINDS:
+            raise ValueError(f"Unknown change kind: {kind}")
+        
+        if kind == DELETED:
+            if path in self.created:
+                self.created.discard(path)
+                return
+            self.modified.discard(path)
+            self.deleted.add(path)
+        elif path in self.deleted:
+            self.deleted.discard(path)
+            self.modified.add(path)
+        elif kind == CREATED:
+            self.created.add(path)
+        elif path not in self.created:
+            self.modified.add(path)
+    
+    def update(self, other: "ChangeSet") -> None:
+        """Apply the changes of a later change set."""
+        for kind, path in other.items():
+            self.record(path, kind)
+    
+    def kind(self, path: str) -> str | None:
+        """Net change of a path, or None if unchanged."""
+        if path in self.created:
+            return CREATED
+        if path in self.modified:
+            return MODIFIED
+        if path in self.deleted:
+            return DELETED
+        return None
+    
+    def paths(self) -> list[str]:
+        """All changed paths, sorted."""
+        return sorted(self.created | self.modified | self.deleted)
+    
+    def items(self) -> Iterator[tuple[str, str]]:
+        """(kind, path) of every change."""
+        for kind, paths in zip(CHANGE_KINDS, (self.created, self.modified, self.deleted)):
+            for path in sorted(paths):
+                yield kind, path
+    
+    def to_dict(self) -> dict[str, list[str]]:
+        """Serializable form, for checkpoints and task results."""
+        return {
+            CREATED: sorted(self.created),
+            MODIFIED: sorted(self.modified),
+            DELETED: sorted(self.deleted),
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict[str, list[str]] | None) -> "ChangeSet":
+        """Rebuild from ``to_dict()`` output."""
+        data = data or {}
+        return cls(
+            set(data.get(CREATED, ())),
+            set(data.get(MODIFIED, ())),
+            set(data.get(DELETED, ())),
+        )
+    
+    def __len__(self) -> int:
+        return len(self.created) + len(self.modified) + len(self.deleted)
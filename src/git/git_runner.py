@@ -0,0 +1,198 @@
+"""Bounded, cancellable execution of git commands."""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from git.exc import GitCommandError
+
+from src.utils.async_utils import run_in_pool
+
+
+logger = logging.getLogger(__name__)
+
+
+T = TypeVar("T")
+
+# Repositories whose lock the current task holds through GitRunner.locked()
+_held_locks: ContextVar[frozenset[Path]] = ContextVar("held_git_locks", default=frozenset())
+
+
+class GitRunner:
+    """
+    Runs git commands off the event loop with bounded concurrency.
+    
+    Commands run as asyncio subprocesses, at most ``max_concurrency`` at a
+    time. A command that times out or whose caller is cancelled has its
+    git process killed, so no git keeps running (or holding index and ref
+    locks) after the caller gave up. Its ``index.lock`` is removed only
+    when the command ran under ``locked()`` and the lock appeared after it
+    started; otherwise the lock may belong to another git.
+    
+    Multi-command sequences on one repository hold ``locked(path)`` so
+    two tasks never interleave operations on the same checkout. GitPython
+    work that cannot be a single command (mirror maintenance) runs on a
+    dedicated thread pool of the same size via ``call()``; a thread cannot
+    be killed, so that work has to bound its own commands (``MirrorCache``
+    passes ``kill_after_timeout``).
+    """
+    
+    def __init__(self, max_concurrency: int = 4, timeout: float = 300.0) -> None:
+        """
+        Initialize the runner.
+        
+        Args:
+            max_concurrency: Git commands (and GitPython calls) run at once
+            timeout: Default seconds before a command is killed
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="git_worker")
+        self._locks: defaultdict[Path, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Never ask for credentials on a terminal nobody is watching
+        self._env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        
+        # Metrics
+        self.commands = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.total_time = 0.0
+        self.total_wait = 0.0
+    
+    async def run(
+        self,
+        repo_path: Path | None,
+        *args: str,
+        timeout: float | None = None,
+    ) -> str:
+        """
+        Run a git command.
+        
+        Args:
+            repo_path: Working directory, or None for commands without a repository
+            *args: Git arguments, e.g. ``"push", "-u", "origin", branch``
+            timeout: Seconds before the command is killed (default: runner timeout)
+        
+        Returns:
+            Standard output without the trailing newline
+        
+        Raises:
+            GitCommandError: If git exits with an error
+            asyncio.TimeoutError: If the command timed out (it was killed)
+        """
+        command = ["git", *args]
+        queued_at = time.perf_counter()
+        
+        index_lock = None
+        if repo_path is not None and repo_path.resolve() in _held_locks.get():
+            index_lock = repo_path / ".git" / "index.lock"
+            if index_lock.exists():
+                # Left by someone else; not ours to remove
+                index_lock = None
+        
+        async with self._slots:
+            started_at = time.perf_counter()
+            self.total_wait += started_at - queued_at
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command,
+                    cwd=repo_path,
+                    env=self._env,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    # Own process group, so helpers (ssh, remote-https) die with git
+                    start_new_session=True,
+                )
+                
+                try:
+                    stdout, stderr = await asyncio.wait_for(
+                        process.communicate(),
+                        timeout=self.timeout if timeout is None else timeout,
+                    )
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    logger.error("git %s timed out in %s, killing it", args[0], repo_path)
+                    await _kill(process, index_lock)
+                    raise
+                except asyncio.CancelledError:
+                    self.cancelled += 1
+                    await _kill(process, index_lock)
+                    raise
+            finally:
+                self.in_flight -= 1
+                self.commands += 1
+                self.total_time += time.perf_counter() - started_at
+        
+        if process.returncode != 0:
+            self.failures += 1
+            raise GitCommandError(command, process.returncode, stderr, stdout)
+        
+        return stdout.decode("utf-8", errors="replace").rstrip("\n")
+    
+    async def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking GitPython function on the git thread pool.
+        
+        Cancelling the caller does not stop the function; it must kill its
+        own git commands after a timeout.
+        """
+        return await run_in_pool(self._pool, func, *args, **kwargs)
+    
+    @asynccontextmanager
+    async def locked(self, repo_path: Path) -> AsyncIterator[None]:
+        """Hold the lock of a repository for a sequence of commands."""
+        path = repo_path.resolve()
+        async with self._locks[path]:
+            token = _held_locks.set(_held_locks.get() | {path})
+            try:
+                yield
+            finally:
+                _held_locks.reset(token)
+    
+    def close(self) -> None:
+        """Release the thread pool."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get runner metrics."""
+        return {
+            "commands": self.commands,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "avg_time": self.total_time / self.commands if self.commands else 0.0,
+            "avg_wait": self.total_wait / self.commands if self.commands else 0.0,
+        }
+
+
+async def _kill(process: asyncio.subprocess.Process, index_lock: Path | None) -> None:
+    """Kill a git process with its helpers, reap it and drop the index lock it made."""
+    if process.returncode is None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    await process.wait()
+    
+    # A killed git cannot remove its lock; later commands would fail on it
+    if index_lock is not None:
+        index_lock.unlink(missing_ok=True)
@@ -1,17 +1,60 @@
 """GitHub and Git operations manager."""
 
+import asyncio
+import base64
 import logging
 import re
+import time
 from pathlib import Path
+from urllib.parse import quote
 from typing import Any
 
-from git import Repo
+from git.exc import GitCommandError
 from github import Github, GithubException
 
+from src.git.api_cache import GitHubApiCache
+from src.git.change_set import CREATED, DELETED, MODIFIED, ChangeSet
+from src.git.git_runner import GitRunner
+from src.git.mirror_cache import MirrorCache
+from src.git.repo_tree import RepoTree
+
 
 logger = logging.getLogger(__name__)
 
 
+SHA_RE = re.compile(r"[0-9a-f]{40}")
+
+# Commit identity used when the repository has none configured
+DEFAULT_AUTHOR = ("Dev Task Orchestrator", "dev-tasks@localhost")
+
+# Minimum seconds between background fetches of a mirror for HEAD lookups
+HEAD_REFRESH_INTERVAL = 60.0
+
+
+def parse_repo_url(url: str) -> tuple[str, str]:
+    """
+    Parse repository URL to get owner and repo name.
+    
+    Args:
+        url: GitHub repository URL
+        
+    Returns:
+        Tuple of (owner, repo_name)
+    """
+    # Handle various URL formats
+    patterns = [
+        r"github\.com[/:]([^/]+)/([^/\.]+)",  # HTTPS or SSH
+        r"^([^/]+)/([^/]+)$",  # owner/repo format
+    ]
+    
+    for pattern in patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1), match.group(2).removesuffix(".git")
+    
+    raise ValueError(f"Invalid GitHub URL: {url}")
+
+
 class GitHubManager:
     """Manages Git and GitHub operations."""
     
@@ -21,11 +64,59 @@ class GitHubManager:
         self,
         token: str,
         workspace_path: Path,
+        clone_mode: str = "shared",
+        clone_depth: int = 0,
+        clone_filter: str | None = None,
+        git_base_url: str = "https://github.com",
+        api_url: str = "https://api.github.com",
+        api_cache_size: int = 1024,
+        api_cache_ttl: float = 60.0,
+        rate_limit_reserve: int = 100,
+        git_concurrency: int = 4,
+        git_timeout: float = 300.0,
     ) -> None:
-        """Initialize with GitHub token and workspace path."""
-        self.github = Github(token)
+        """
+        Initialize with GitHub token and workspace path.
+        
+        Args:
+            token: GitHub token
+            workspace_path: Root directory for clones and mirrors
+            clone_mode: "shared", "local" or "direct" (see ``MirrorCache``)
+            clone_depth: Shallow clone depth; 0 for full history
+            clone_filter: Partial clone filter such as "blob:none"
+            git_base_url: Base URL repositories are cloned from
+            api_url: GitHub API base URL
+            api_cache_size: Maximum cached API responses
+            api_cache_ttl: Seconds API responses are used without revalidation
+            rate_limit_reserve: Remaining API requests below which to back off
+            git_concurrency: Git commands run at once
+            git_timeout: Seconds before a git command is killed
+        """
+        self.github = Github(token, base_url=api_url)
+        self.api = GitHubApiCache(
+            self.github.requester,
+            max_size=api_cache_size,
+            ttl=api_cache_ttl,
+            rate_limit_reserve=rate_limit_reserve,
+        )
         self.workspace_path = workspace_path
         self.workspace_path.mkdir(parents=True, exist_ok=True)
+        self.git_base_url = git_base_url.rstrip("/")
+        self.git = GitRunner(max_concurrency=git_concurrency, timeout=git_timeout)
+        self.change_mismatches = 0
+        self.mirrors = MirrorCache(
+            workspace_path / ".mirrors",
+            mode=clone_mode,
+            depth=clone_depth,
+            blob_filter=clone_filter,
+            timeout=git_timeout,
+        )
+        
+        # Background mirror fetches started by resolve_head_sha(), per repository
+        self._head_refreshes: dict[str, asyncio.Task] = {}
+        self._head_refreshed_at: dict[str, float] = {}
+        self.head_lookups_local = 0
+        self.head_lookups_remote = 0
     
     def parse_repo_url(self, url: str) -> tuple[str, str]:
         """
@@ -37,18 +128,102 @@ class GitHubManager:
         Returns:
             Tuple of (owner, repo_name)
         """
-        # Handle various URL formats
-        patterns = [
-            r"github\.com[/:]([^/]+)/([^/\.]+)",  # HTTPS or SSH
-            r"^([^/]+)/([^/]+)$",  # owner/repo format
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1), match.group(2).rstrip(".git")
-        
-        raise ValueError(f"Invalid GitHub URL: {url}")
+        return parse_repo_url(url)
+    
+    def clone_url(self, owner: str, repo_name: str) -> str:
+        """Git URL of a repository."""
+        return f"{self.git_base_url}/{owner}/{repo_name}.git"
+    
+    async def get_head_sha(
+        self,
+        repo_url: str,
+        branch: str | None = None,
+    ) -> str:
+        """
+        Get the remote HEAD commit of a repository without cloning it.
+        
+        Uses ``git ls-remote`` so it does not consume GitHub API rate limit.
+        
+        Args:
+            repo_url: Repository URL
+            branch: Branch name, or None for the default branch
+            
+        Returns:
+            Commit SHA
+        """
+        owner, repo_name = self.parse_repo_url(repo_url)
+        ref = f"refs/heads/{branch}" if branch else "HEAD"
+        
+        output = await self.git.run(None, "ls-remote", self.clone_url(owner, repo_name), ref)
+        
+        if not output:
+            raise ValueError(f"Ref not found: {ref} in {owner}/{repo_name}")
+        
+        return output.split()[0]
+    
+    async def resolve_head_sha(self, repo_url: str) -> str:
+        """
+        Get the HEAD commit of a repository, preferring its local mirror.
+        
+        When the repository is mirrored, the mirror's HEAD is returned
+        without touching the network and the mirror is fetched in the
+        background (at most once every ``HEAD_REFRESH_INTERVAL`` seconds),
+        so the result may lag the remote by about that long. Without a
+        mirror this falls back to ``get_head_sha()``.
+        
+        Args:
+            repo_url: Repository URL
+            
+        Returns:
+            Commit SHA
+        """
+        owner, repo_name = self.parse_repo_url(repo_url)
+        mirror = self.mirrors.mirror_path(owner, repo_name)
+        
+        if (mirror / "HEAD").exists():
+            try:
+                sha = await self.git.run(mirror, "rev-parse", "--verify", "-q", "HEAD^{commit}")
+            except GitCommandError:
+                sha = ""
+            
+            if sha:
+                self.head_lookups_local += 1
+                self._refresh_mirror(owner, repo_name)
+                return sha
+        
+        self.head_lookups_remote += 1
+        return await self.get_head_sha(repo_url)
+    
+    def _refresh_mirror(self, owner: str, repo_name: str) -> None:
+        """Start a background fetch of a mirror unless one ran recently."""
+        key = f"{owner}/{repo_name}"
+        now = time.monotonic()
+        
+        if key in self._head_refreshes:
+            return
+        if now - self._head_refreshed_at.get(key, -HEAD_REFRESH_INTERVAL) < HEAD_REFRESH_INTERVAL:
+            return
+        
+        self._head_refreshed_at[key] = now
+        task = asyncio.create_task(self._fetch_mirror(owner, repo_name))
+        self._head_refreshes[key] = task
+        task.add_done_callback(lambda _: self._head_refreshes.pop(key, None))
+    
+    async def _fetch_mirror(self, owner: str, repo_name: str) -> None:
+        """Fetch new commits into a mirror, logging failures."""
+        try:
+            async with self.git.locked(self.mirrors.mirror_path(owner, repo_name)):
+                await self.git.call(
+                    self.mirrors.update, self.clone_url(owner, repo_name), owner, repo_name
+                )
+        except Exception as e:
+            logger.warning("Background fetch of %s/%s failed: %s", owner, repo_name, e)
+    
+    def close(self) -> None:
+        """Cancel background mirror fetches and release the git runner."""
+        for task in list(self._head_refreshes.values()):
+            task.cancel()
+        self.git.close()
     
     async def clone_repository(
         self,
@@ -58,6 +233,10 @@ class GitHubManager:
         """
         Clone a repository for a task.
         
+        The clone is made from the local mirror of the repository, which is
+        only fetched incrementally, so later tasks on the same repository
+        do not download it again.
+        
         Args:
             repo_url: Repository URL
             task_id: Task ID for workspace organization
@@ -66,28 +245,87 @@ class GitHubManager:
             Path to cloned repository
         """
         owner, repo_name = self.parse_repo_url(repo_url)
-        
-        # Get repo info from GitHub API
-        try:
-            gh_repo = self.github.get_repo(f"{owner}/{repo_name}")
-        except GithubException as e:
-            logger.error("Failed to get repo %s/%s: %s", owner, repo_name, e)
-            raise
-        
-        # Clone to workspace
         clone_path = self.workspace_path / task_id / repo_name
         
         if clone_path.exists():
             logger.info("Repository already exists, pulling latest...")
-            repo = Repo(clone_path)
-            repo.remotes.origin.pull()
+            async with self.git.locked(clone_path):
+                await self.git.run(clone_path, "pull")
         else:
             logger.info("Cloning %s to %s", repo_url, clone_path)
-            clone_path.parent.mkdir(parents=True, exist_ok=True)
-            Repo.clone_from(gh_repo.clone_url, clone_path)
+            async with self.git.locked(self.mirrors.mirror_path(owner, repo_name)):
+                await self.git.call(
+                    self.mirrors.clone,
+                    self.clone_url(owner, repo_name),
+                    owner,
+                    repo_name,
+                    clone_path,
+                )
         
         return clone_path
     
+    async def sync_repository(
+        self,
+        repo_url: str,
+        sha: str,
+    ) -> Path:
+        """
+        Update the shared read-only checkout of a repository to a commit.
+        
+        The checkout lives under ``.repos/<owner>/<repo>`` in the workspace
+        and is reused across tasks; it is used for indexing, not for edits.
+        
+        Args:
+            repo_url: Repository URL
+            sha: Commit to check out
+            
+        Returns:
+            Path to the checkout
+        """
+        owner, repo_name = self.parse_repo_url(repo_url)
+        checkout_path = self.workspace_path / ".repos" / owner / repo_name
+        
+        async with self.git.locked(self.mirrors.mirror_path(owner, repo_name)):
+            await self.git.call(
+                self.mirrors.checkout,
+                self.clone_url(owner, repo_name),
+                owner,
+                repo_name,
+                checkout_path,
+                sha,
+            )
+        return checkout_path
+    
+    async def sync_commit(
+        self,
+        repo_url: str,
+        sha: str,
+    ) -> Path:
+        """
+        Get a local repository containing a commit, for reading its files.
+        
+        Full mirrors are read directly (fetched only if the commit is
+        missing), so nothing is checked out. Partial mirrors would fetch
+        their blobs one by one and direct mode has no mirror; both use the
+        shared checkout of ``sync_repository()`` instead.
+        
+        Args:
+            repo_url: Repository URL
+            sha: Commit that is needed
+            
+        Returns:
+            Path to the mirror or checkout
+        """
+        if self.mirrors.mode == "direct" or self.mirrors.blob_filter:
+            return await self.sync_repository(repo_url, sha)
+        
+        owner, repo_name = self.parse_repo_url(repo_url)
+        
+        async with self.git.locked(self.mirrors.mirror_path(owner, repo_name)):
+            return await self.git.call(
+                self.mirrors.update, self.clone_url(owner, repo_name), owner, repo_name, sha
+            )
+    
     async def create_branch(
         self,
         repo_path: Path,
@@ -105,18 +343,76 @@ class GitHubManager:
         Returns:
             Created branch name
         """
-        repo = Repo(repo_path)
-        
-        # Ensure we're on base branch and up to date
-        repo.git.checkout(base_branch)
-        repo.remotes.origin.pull()
-        
-        # Create and checkout new branch
-        repo.git.checkout("-b", branch_name)
+        async with self.git.locked(repo_path):
+            # Ensure we're on base branch and up to date
+            await self.git.run(repo_path, "checkout", base_branch)
+            await self.git.run(repo_path, "pull", "origin", base_branch)
+            
+            # Create and checkout new branch
+            await self.git.run(repo_path, "checkout", "-b", branch_name)
         
         logger.info("Created branch: %s", branch_name)
         return branch_name
     
+    async def prepare_task_checkout(
+        self,
+        repo_url: str,
+        task_id: str,
+        branch_name: str,
+    ) -> Path:
+        """
+        Get the checkout of a task on its branch, cloning it the first time.
+        
+        An existing checkout (a resumed task) is kept with its commits; the
+        task branch is checked out, or created from the checked out default
+        branch when it does not exist yet.
+        
+        Args:
+            repo_url: Repository URL
+            task_id: Task ID for workspace organization
+            branch_name: Branch the task commits to
+            
+        Returns:
+            Path to the checkout
+        """
+        if self.is_protected_branch(branch_name):
+            raise ValueError(f"Cannot use protected branch for a task: {branch_name}")
+        
+        _, repo_name = self.parse_repo_url(repo_url)
+        clone_path = self.workspace_path / task_id / repo_name
+        
+        if not (clone_path / ".git").exists():
+            await self.clone_repository(repo_url, task_id)
+        
+        async with self.git.locked(clone_path):
+            current_branch = await self.git.run(clone_path, "rev-parse", "--abbrev-ref", "HEAD")
+            
+            if current_branch != branch_name:
+                try:
+                    await self.git.run(
+                        clone_path, "rev-parse", "--verify", "--quiet", f"refs/heads/{branch_name}"
+                    )
+                except GitCommandError:
+                    await self.git.run(clone_path, "checkout", "-q", "-b", branch_name)
+                    logger.info("Created branch: %s", branch_name)
+                else:
+                    await self.git.run(clone_path, "checkout", "-q", branch_name)
+        
+        return clone_path
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get Git operation metrics."""
+        return {
+            "runner": self.git.get_stats(),
+            "change_mismatches": self.change_mismatches,
+            "head_lookups": {
+                "local": self.head_lookups_local,
+                "remote": self.head_lookups_remote,
+            },
+            "mirrors": self.mirrors.get_stats(),
+            "api_cache": self.api.get_stats(),
+        }
+    
     def is_protected_branch(self, branch_name: str) -> bool:
         """Check if branch is protected."""
         return branch_name.lower() in self.PROTECTED_BRANCHES
@@ -126,36 +422,149 @@ class GitHubManager:
         repo_path: Path,
         message: str,
         files: list[str] | None = None,
-    ) -> str:
+        changes: ChangeSet | None = None,
+        verify: bool = False,
+    ) -> str | None:
         """
         Commit changes to repository.
         
+        With a change set, exactly its paths are committed through
+        ``commit_paths()`` and the working tree is never scanned. Without
+        one, ``files`` (or every change, via ``git add -A``) are committed.
+        
         Args:
             repo_path: Path to local repository
             message: Commit message
             files: Specific files to commit, or None for all changes
+            changes: Recorded changes to commit instead of ``files``
+            verify: Check the change set against ``git status`` of its paths
             
         Returns:
-            Commit SHA
+            Commit SHA, or None if the change set had no changes
         """
-        repo = Repo(repo_path)
+        if changes is not None:
+            if verify:
+                await self.verify_changes(repo_path, changes)
+            return await self.commit_paths(repo_path, message, changes.paths())
         
-        # Check we're not on protected branch
-        current_branch = repo.active_branch.name
-        if self.is_protected_branch(current_branch):
-            raise ValueError(f"Cannot commit directly to protected branch: {current_branch}")
+        async with self.git.locked(repo_path):
+            # Check we're not on protected branch
+            current_branch = await self.git.run(repo_path, "rev-parse", "--abbrev-ref", "HEAD")
+            if self.is_protected_branch(current_branch):
+                raise ValueError(f"Cannot commit directly to protected branch: {current_branch}")
+            
+            # Stage files
+            if files:
+                await self.git.run(repo_path, "add", "--", *files)
+            else:
+                await self.git.run(repo_path, "add", "-A")
+            
+            # Commit
+            identity = await self._commit_identity(repo_path)
+            await self.git.run(repo_path, *identity, "commit", "-q", "-m", message)
+            sha = await self.git.run(repo_path, "rev-parse", "HEAD")
         
-        # Stage files
-        if files:
-            repo.index.add(files)
-        else:
-            repo.git.add("-A")
+        logger.info("Created commit: %s", sha[:8])
+        return sha
+    
+    async def commit_paths(
+        self,
+        repo_path: Path,
+        message: str,
+        paths: list[str],
+    ) -> str | None:
+        """
+        Commit exactly the given paths without scanning the working tree.
+        
+        The paths are staged with ``update-index`` (missing files are
+        removed from the index) and the commit is written from the index
+        with ``commit-tree``, so the cost depends on the number of paths,
+        not on the size of the repository. Commit hooks do not run.
+        
+        Args:
+            repo_path: Path to local repository
+            message: Commit message
+            paths: Files to commit, relative to the repository root
+            
+        Returns:
+            Commit SHA, or None if the paths had no changes
+        """
+        if not paths:
+            return None
         
-        # Commit
-        commit = repo.index.commit(message)
+        async with self.git.locked(repo_path):
+            current_branch = await self.git.run(repo_path, "rev-parse", "--abbrev-ref", "HEAD")
+            if self.is_protected_branch(current_branch):
+                raise ValueError(f"Cannot commit directly to protected branch: {current_branch}")
+            
+            await self.git.run(repo_path, "update-index", "--add", "--remove", "--", *paths)
+            tree = await self.git.run(repo_path, "write-tree")
+            parent, parent_tree = (
+                await self.git.run(repo_path, "rev-parse", "HEAD", "HEAD^{tree}")
+            ).split("\n")
+            
+            if tree == parent_tree:
+                return None
+            
+            identity = await self._commit_identity(repo_path)
+            sha = await self.git.run(
+                repo_path, *identity, "commit-tree", tree, "-p", parent, "-m", message
+            )
+            # Only moves HEAD if nobody committed in between
+            await self.git.run(
+                repo_path, "update-ref", "-m", f"commit: {message.splitlines()[0]}", "HEAD", sha, parent
+            )
         
-        logger.info("Created commit: %s", commit.hexsha[:8])
-        return commit.hexsha
+        logger.info("Created commit: %s", sha[:8])
+        return sha
+    
+    async def verify_changes(self, repo_path: Path, changes: ChangeSet) -> dict[str, str]:
+        """
+        Compare a change set with the working tree state of its paths.
+        
+        Runs ``git status --porcelain`` limited to the recorded paths, so
+        only those files are examined.
+        
+        Args:
+            repo_path: Path to local repository
+            changes: Recorded changes
+            
+        Returns:
+            {path: actual change} for changed paths that differ from the record
+        """
+        paths = changes.paths()
+        if not paths:
+            return {}
+        
+        output = await self.git.run(
+            repo_path,
+            "status", "--porcelain", "-z", "--untracked-files=all", "--no-renames",
+            "--", *paths,
+        )
+        
+        actual: dict[str, str] = {}
+        for entry in output.split("\0"):
+            if not entry:
+                continue
+            status, path = entry[:2], entry[3:]
+            if "D" in status:
+                actual[path] = DELETED
+            elif status == "??" or "A" in status:
+                actual[path] = CREATED
+            else:
+                actual[path] = MODIFIED
+        
+        # Unchanged paths (rewritten with the same content) are not mismatches
+        mismatches = {
+            path: kind for path, kind in actual.items() if kind != changes.kind(path)
+        }
+        
+        if mismatches:
+            self.change_mismatches += len(mismatches)
+            logger.warning(
+                "Recorded changes of %s differ from git status: %s", repo_path, mismatches
+            )
+        return mismatches
     
     async def push_branch(
         self,
@@ -169,16 +578,15 @@ class GitHubManager:
             repo_path: Path to local repository
             branch_name: Branch to push, or None for current branch
         """
-        repo = Repo(repo_path)
-        
-        if branch_name is None:
-            branch_name = repo.active_branch.name
-        
-        if self.is_protected_branch(branch_name):
-            raise ValueError(f"Cannot push to protected branch: {branch_name}")
-        
-        # Push with upstream tracking
-        repo.git.push("-u", "origin", branch_name)
+        async with self.git.locked(repo_path):
+            if branch_name is None:
+                branch_name = await self.git.run(repo_path, "rev-parse", "--abbrev-ref", "HEAD")
+            
+            if self.is_protected_branch(branch_name):
+                raise ValueError(f"Cannot push to protected branch: {branch_name}")
+            
+            # Push with upstream tracking
+            await self.git.run(repo_path, "push", "-u", "origin", branch_name)
         
         logger.info("Pushed branch: %s", branch_name)
     
@@ -206,7 +614,8 @@ class GitHubManager:
         owner, repo_name = self.parse_repo_url(repo_url)
         
         try:
-            gh_repo = self.github.get_repo(f"{owner}/{repo_name}")
+            # Lazy: creating the PR needs only the repository URL
+            gh_repo = self.github.get_repo(f"{owner}/{repo_name}", lazy=True)
             
             pr = gh_repo.create_pull(
                 title=title,
@@ -233,15 +642,15 @@ class GitHubManager:
         owner, repo_name = self.parse_repo_url(repo_url)
         
         try:
-            gh_repo = self.github.get_repo(f"{owner}/{repo_name}")
+            data = await self._get_repo_data(owner, repo_name)
             
             return {
-                "full_name": gh_repo.full_name,
-                "default_branch": gh_repo.default_branch,
-                "private": gh_repo.private,
-                "description": gh_repo.description,
-                "language": gh_repo.language,
-                "topics": gh_repo.get_topics(),
+                "full_name": data["full_name"],
+                "default_branch": data["default_branch"],
+                "private": data["private"],
+                "description": data["description"],
+                "language": data["language"],
+                "topics": data.get("topics", []),
             }
             
         except GithubException as e:
@@ -258,20 +667,73 @@ class GitHubManager:
         owner, repo_name = self.parse_repo_url(repo_url)
         
         try:
-            gh_repo = self.github.get_repo(f"{owner}/{repo_name}")
-            
-            ref = branch or gh_repo.default_branch
-            content = gh_repo.get_contents(file_path, ref=ref)
+            content = await self._get_contents(owner, repo_name, file_path, branch)
             
             if isinstance(content, list):
                 raise ValueError(f"Path is a directory: {file_path}")
             
-            return content.decoded_content.decode("utf-8")
+            return base64.b64decode(content["content"]).decode("utf-8")
             
         except GithubException as e:
             logger.error("Failed to get file content: %s", e)
             raise
     
+    async def get_tree(
+        self,
+        repo_url: str,
+        ref: str | None = None,
+    ) -> RepoTree:
+        """
+        Get every path of a ref in one call.
+        
+        Commits already in the local mirror are listed with ``git ls-tree``
+        without API requests. Other refs use the recursive trees API, cached
+        like other reads; if GitHub truncates the tree, the mirror is
+        updated and listed instead.
+        
+        Args:
+            repo_url: Repository URL
+            ref: Branch, tag or commit, or None for the default branch
+            
+        Returns:
+            The recursive tree
+        """
+        owner, repo_name = self.parse_repo_url(repo_url)
+        full_name = f"{owner}/{repo_name}"
+        
+        if (
+            ref is not None
+            and SHA_RE.fullmatch(ref)
+            and not self.mirrors.blob_filter
+            and await self.git.call(self.mirrors.has_commit, owner, repo_name, ref)
+        ):
+            return await self.git.call(self.mirrors.list_tree, owner, repo_name, ref)
+        
+        if ref is None:
+            ref = (await self._get_repo_data(owner, repo_name))["default_branch"]
+        
+        try:
+            # "**": the whole tree, not a single path
+            data = await self.api.get(
+                (full_name, ref, "**"),
+                f"/repos/{full_name}/git/trees/{quote(ref, safe='')}",
+                {"recursive": "1"},
+            )
+        except GithubException as e:
+            logger.error("Failed to get tree: %s", e)
+            raise
+        
+        tree = RepoTree.from_api(data)
+        if not tree.truncated:
+            return tree
+        
+        logger.info("Tree of %s at %s truncated by the API, listing the mirror", full_name, ref)
+        async with self.git.locked(self.mirrors.mirror_path(owner, repo_name)):
+            await self.git.call(
+                self.mirrors.update, self.clone_url(owner, repo_name), owner, repo_name
+            )
+        return await self.git.call(self.mirrors.list_tree, owner, repo_name, ref)
+    
     async def list_directory(
         self,
         repo_url: str,
@@ -282,20 +744,17 @@ class GitHubManager:
         owner, repo_name = self.parse_repo_url(repo_url)
         
         try:
-            gh_repo = self.github.get_repo(f"{owner}/{repo_name}")
-            
-            ref = branch or gh_repo.default_branch
-            contents = gh_repo.get_contents(path, ref=ref)
+            contents = await self._get_contents(owner, repo_name, path, branch)
             
             if not isinstance(contents, list):
                 contents = [contents]
             
             return [
                 {
-                    "name": c.name,
-                    "path": c.path,
-                    "type": c.type,  # "file" or "dir"
-                    "size": c.size,
+                    "name": c["name"],
+                    "path": c["path"],
+                    "type": c["type"],  # "file" or "dir"
+                    "size": c["size"],
                 }
                 for c in contents
             ]
@@ -303,3 +762,36 @@ class GitHubManager:
         except GithubException as e:
             logger.error("Failed to list directory: %s", e)
             raise
+    
+    async def _get_repo_data(self, owner: str, repo_name: str) -> dict[str, Any]:
+        """Get the repository object from the API cache."""
+        full_name = f"{owner}/{repo_name}"
+        return await self.api.get((full_name, "", ""), f"/repos/{full_name}")
+    
+    async def _get_contents(
+        self,
+        owner: str,
+        repo_name: str,
+        path: str,
+        ref: str | None,
+    ) -> dict[str, Any] | list[dict[str, Any]]:
+        """Get a file or directory listing from the API cache."""
+        full_name = f"{owner}/{repo_name}"
+        
+        if ref is None:
+            ref = (await self._get_repo_data(owner, repo_name))["default_branch"]
+        
+        return await self.api.get(
+            (full_name, ref, path),
+            f"/repos/{full_name}/contents/{quote(path.strip('/'))}",
+            {"ref": ref},
+        )
+    
+    async def _commit_identity(self, repo_path: Path) -> list[str]:
+        """Config overrides giving commits an author when none is configured."""
+        try:
+            await self.git.run(repo_path, "config", "user.email")
+        except GitCommandError:
+            name, email = DEFAULT_AUTHOR
+            return ["-c", f"user.name={name}", "-c", f"user.email={email}"]
+        return []
@@ -0,0 +1,316 @@
+"""Local bare-mirror cache of remote repositories."""
+
+import fcntl
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from git import Git, GitCommandError, Repo
+
+from src.git.repo_tree import RepoTree
+
+
+logger = logging.getLogger(__name__)
+
+
+# How task clones are created:
+#   shared: borrow the mirror's objects through alternates (instant, no copy)
+#   local:  hardlink the mirror's objects (independent of later mirror changes)
+#   direct: clone from the remote every time, without the cache
+CLONE_MODES = ("shared", "local", "direct")
+
+
+class MirrorCache:
+    """
+    Bare mirrors of remote repositories shared by all task clones.
+    
+    Each repository is cloned once into ``<mirrors_path>/<owner>/<repo>.git``
+    and afterwards only fetched incrementally, so later tasks on the same
+    repository download just the new commits. Mirrors can be shallow
+    (``depth``) or partial (``blob_filter``, e.g. ``"blob:none"``); task
+    clones of a partial mirror fetch the blobs they check out on demand.
+    
+    A file lock per mirror serializes updates across processes. Commands
+    that may reach the remote are killed after ``timeout`` seconds, so a
+    hung fetch cannot hold that lock. Mirrors never prune unreachable
+    objects, since shared clones may still use them.
+    """
+    
+    def __init__(
+        self,
+        mirrors_path: Path,
+        mode: str = "shared",
+        depth: int = 0,
+        blob_filter: str | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+        
+        Args:
+            mirrors_path: Directory holding the mirrors
+            mode: How task clones are created (see ``CLONE_MODES``)
+            depth: Fetch only this many commits per branch; 0 for full history
+            blob_filter: Partial clone filter, or None to fetch all objects
+            timeout: Seconds before a git command is killed; None for no limit
+        """
+        if mode not in CLONE_MODES:
+            raise ValueError(f"Invalid clone mode: {mode}")
+        
+        self.mirrors_path = mirrors_path
+        self.mode = mode
+        self.depth = depth
+        self.blob_filter = blob_filter or None
+        self.timeout = timeout
+        
+        # Metrics
+        self.mirrors_created = 0
+        self.fetches = 0
+        self.fetches_skipped = 0
+        self.clones = 0
+        self.fetch_time = 0.0
+        self.clone_time = 0.0
+    
+    def mirror_path(self, owner: str, repo_name: str) -> Path:
+        """Path of the mirror of a repository."""
+        return self.mirrors_path / owner / f"{repo_name}.git"
+    
+    def update(
+        self,
+        url: str,
+        owner: str,
+        repo_name: str,
+        sha: str | None = None,
+    ) -> Path:
+        """
+        Create the mirror of a repository or fetch new commits into it.
+        
+        Args:
+            url: Remote URL
+            owner: Repository owner
+            repo_name: Repository name
+            sha: Commit that is needed; no fetch happens if it is present
+        
+        Returns:
+            Path to the mirror
+        """
+        path = self.mirror_path(owner, repo_name)
+        
+        with self._locked(path):
+            start = time.perf_counter()
+            
+            if not (path / "HEAD").exists():
+                logger.info("Creating mirror of %s/%s", owner, repo_name)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                repo = self._clone_from(url, path, bare=True, **self._fetch_options())
+                
+                with repo.config_writer() as config:
+                    # Bare clones have no fetch refspec; keep branches in sync
+                    config.set_value('remote "origin"', "fetch", "+refs/heads/*:refs/heads/*")
+                    config.set_value("gc", "pruneExpire", "never")
+                self.mirrors_created += 1
+            
+            elif sha is not None and _has_commit(path, sha):
+                self.fetches_skipped += 1
+                return path
+            
+            else:
+                repo = Repo(path)
+                repo.git.fetch(
+                    "origin",
+                    "--prune",
+                    "--tags",
+                    *self._fetch_args(),
+                    kill_after_timeout=self.timeout,
+                )
+                self.fetches += 1
+            
+            self.fetch_time += time.perf_counter() - start
+        
+        return path
+    
+    def clone(
+        self,
+        url: str,
+        owner: str,
+        repo_name: str,
+        dest: Path,
+        sha: str | None = None,
+    ) -> Repo:
+        """
+        Create a working clone of a repository.
+        
+        The clone's ``origin`` points to the remote, so pulls and pushes
+        work as with a direct clone.
+        
+        Args:
+            url: Remote URL
+            owner: Repository owner
+            repo_name: Repository name
+            dest: Directory for the clone
+            sha: Commit to check out detached, or None for the default branch
+        
+        Returns:
+            The cloned repository
+        """
+        start = time.perf_counter()
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        
+        if self.mode == "direct":
+            repo = self._clone_from(url, dest, no_checkout=True, **self._fetch_options())
+        else:
+            mirror = self.update(url, owner, repo_name, sha)
+            repo = self._clone_from(
+                str(mirror),
+                dest,
+                no_checkout=True,
+                shared=self.mode == "shared",
+                local=self.mode == "local",
+            )
+            
+            with repo.config_writer() as config:
+                config.set_value('remote "origin"', "url", url)
+                
+                if self.blob_filter:
+                    # Blobs missing from the mirror are fetched from the remote
+                    config.set_value("core", "repositoryformatversion", "1")
+                    config.set_value("extensions", "partialClone", "origin")
+                    config.set_value('remote "origin"', "promisor", "true")
+                    config.set_value('remote "origin"', "partialclonefilter", self.blob_filter)
+        
+        # Checkouts of partial clones fetch the missing blobs from the remote
+        if sha is not None:
+            repo.git.checkout("--force", "--detach", sha, kill_after_timeout=self.timeout)
+        else:
+            repo.git.checkout("--force", "HEAD", kill_after_timeout=self.timeout)
+        
+        self.clones += 1
+        self.clone_time += time.perf_counter() - start
+        logger.info("Cloned %s/%s to %s (%s)", owner, repo_name, dest, self.mode)
+        
+        return repo
+    
+    def checkout(
+        self,
+        url: str,
+        owner: str,
+        repo_name: str,
+        dest: Path,
+        sha: str,
+    ) -> Repo:
+        """
+        Move a clone to a commit, creating the clone if needed.
+        
+        Args:
+            url: Remote URL
+            owner: Repository owner
+            repo_name: Repository name
+            dest: Directory of the clone
+            sha: Commit to check out detached
+        
+        Returns:
+            The repository
+        """
+        if not dest.exists():
+            return self.clone(url, owner, repo_name, dest, sha)
+        
+        repo = Repo(dest)
+        
+        if self.mode == "direct":
+            repo.git.fetch("origin", kill_after_timeout=self.timeout)
+        else:
+            mirror = self.update(url, owner, repo_name, sha)
+            if self.mode == "local" or not _has_commit(dest, sha):
+                # Shared clones already see the mirror's objects
+                repo.git.fetch(
+                    str(mirror),
+                    "+refs/heads/*:refs/remotes/origin/*",
+                    kill_after_timeout=self.timeout,
+                )
+        
+        repo.git.checkout("--force", "--detach", sha, kill_after_timeout=self.timeout)
+        return repo
+    
+    def has_commit(self, owner: str, repo_name: str, sha: str) -> bool:
+        """Whether the mirror of a repository exists and contains a commit."""
+        path = self.mirror_path(owner, repo_name)
+        return (path / "HEAD").exists() and _has_commit(path, sha)
+    
+    def list_tree(self, owner: str, repo_name: str, ref: str) -> RepoTree:
+        """
+        List every path of a commit in the mirror.
+        
+        Partial mirrors do not report file sizes (all 0): reading them
+        would download every blob.
+        """
+        repo = Repo(self.mirror_path(owner, repo_name))
+        sha = repo.git.rev_parse("--verify", f"{ref}^{{commit}}")
+        
+        size_flag = [] if self.blob_filter else ["-l"]
+        output = repo.git.ls_tree("-r", "-t", *size_flag, "-z", "--full-tree", sha)
+        
+        if self.blob_filter:
+            # Without -l there is no size column; add one for the parser
+            output = "\0".join(
+                line.replace("\t", " -\t", 1) for line in output.split("\0") if line
+            )
+        
+        return RepoTree.from_ls_tree(sha, output)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache metrics."""
+        return {
+            "mode": self.mode,
+            "mirrors_created": self.mirrors_created,
+            "fetches": self.fetches,
+            "fetches_skipped": self.fetches_skipped,
+            "clones": self.clones,
+            "avg_fetch_time": self.fetch_time / (self.mirrors_created + self.fetches or 1),
+            "avg_clone_time": self.clone_time / self.clones if self.clones else 0.0,
+        }
+    
+    def _clone_from(self, url: str, dest: Path, **options: Any) -> Repo:
+        """
+        Clone a repository, killing git after the timeout.
+        
+        ``Repo.clone_from`` ignores ``kill_after_timeout``, so the clone
+        runs as a plain command taking the same options.
+        """
+        Git(dest.parent).clone("--", url, str(dest), kill_after_timeout=self.timeout, **options)
+        return Repo(dest)
+    
+    def _fetch_options(self) -> dict[str, Any]:
+        """Clone options for shallow or partial mode."""
+        options: dict[str, Any] = {}
+        if self.depth:
+            options["depth"] = self.depth
+        if self.blob_filter:
+            options["filter"] = self.blob_filter
+        return options
+    
+    def _fetch_args(self) -> list[str]:
+        """Fetch arguments for shallow mode (the filter is kept in the config)."""
+        return [f"--depth={self.depth}"] if self.depth else []
+    
+    @contextmanager
+    def _locked(self, path: Path) -> Iterator[None]:
+        """Hold the cross-process lock of a mirror."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(path.with_name(path.name + ".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _has_commit(path: Path, sha: str) -> bool:
+    """Whether a repository contains a commit."""
+    try:
+        Repo(path).git.cat_file("-e", f"{sha}^{{commit}}")
+    except GitCommandError:
+        return False
+    return True
@@ -0,0 +1,301 @@
+"""Repository indexing: file tree, Python symbols and size stats per commit."""
+
+import ast
+import json
+import logging
+import os
+import tempfile
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+from git import Repo
+
+from src.utils.async_utils import run_sync
+from src.utils.tokens import estimate_tokens
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when the entry format changes so stale indexes are rebuilt
+INDEX_VERSION = 1
+
+# Larger Python files are listed but not parsed
+MAX_PARSE_SIZE = 512 * 1024
+
+
+class RepoIndexer:
+    """
+    Builds and stores a compact index of a repository checkout.
+    
+    Indexes are JSON files stored per commit SHA under
+    ``<index_path>/<owner>/<repo>/<sha>.json``. Building an index for a new
+    commit starts from the most recent one of the same repository and only
+    reparses files whose blob changed.
+    """
+    
+    def __init__(self, index_path: Path) -> None:
+        """Initialize with the directory where indexes are stored."""
+        self.index_path = index_path
+        
+        # Metrics
+        self.full_builds = 0
+        self.incremental_builds = 0
+        self.files_parsed = 0
+        self.files_reused = 0
+    
+    async def get(self, repo_key: str, sha: str) -> dict[str, Any] | None:
+        """Get the stored index of a commit, if any."""
+        return await run_sync(self.load, repo_key, sha)
+    
+    async def index(self, repo_key: str, repo_path: Path, sha: str) -> dict[str, Any]:
+        """
+        Index a repository checkout at a commit.
+        
+        Args:
+            repo_key: Repository identifier ("owner/repo")
+            repo_path: Local clone containing the commit
+            sha: Commit to index
+        
+        Returns:
+            Repository index
+        """
+        return await run_sync(self.build, repo_key, repo_path, sha)
+    
+    async def latest(self, repo_key: str) -> dict[str, Any] | None:
+        """Get the most recently built index of a repository, if any."""
+        return await run_sync(self._load_latest, repo_key)
+    
+    def load(self, repo_key: str, sha: str) -> dict[str, Any] | None:
+        """Load a stored index from disk."""
+        path = self.index_path / repo_key / f"{sha}.json"
+        
+        try:
+            index = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        
+        return index if index.get("version") == INDEX_VERSION else None
+    
+    def build(self, repo_key: str, repo_path: Path, sha: str) -> dict[str, Any]:
+        """Build (or load) the index of a commit."""
+        existing = self.load(repo_key, sha)
+        if existing is not None:
+            return existing
+        
+        previous = self._load_latest(repo_key)
+        previous_files = previous["files"] if previous else {}
+        repo = Repo(repo_path)
+        
+        files: dict[str, dict[str, Any]] = {}
+        parsed = reused = 0
+        
+        # "<mode> <type> <blob> <size>\t<path>" for every file at the commit
+        for line in repo.git.ls_tree("-r", "-l", "-z", "--full-tree", sha).split("\0"):
+            if not line:
+                continue
+            
+            meta, _, file_path = line.partition("\t")
+            _, object_type, blob, size = meta.split()
+            
+            if object_type != "blob":
+                continue
+            
+            cached = previous_files.get(file_path)
+            if cached is not None and cached["blob"] == blob:
+                files[file_path] = cached
+                reused += 1
+                continue
+            
+            entry: dict[str, Any] = {"blob": blob, "size": int(size) if size.isdigit() else 0}
+            
+            if file_path.endswith(".py") and entry["size"] <= MAX_PARSE_SIZE:
+                # Read from the object database (persistent cat-file process)
+                source = repo.odb.stream(bytes.fromhex(blob)).read()
+                entry.update(_parse_python(source))
+                parsed += 1
+            
+            files[file_path] = entry
+        
+        index = {
+            "version": INDEX_VERSION,
+            "repo": repo_key,
+            "commit": sha,
+            "files": files,
+            "stats": _compute_stats(files),
+        }
+        
+        self._store(repo_key, sha, index)
+        
+        if previous:
+            self.incremental_builds += 1
+        else:
+            self.full_builds += 1
+        self.files_parsed += parsed
+        self.files_reused += reused
+        
+        logger.info(
+            "Indexed %s at %s: %d files (%d parsed, %d reused)",
+            repo_key, sha[:8], len(files), parsed, reused,
+        )
+        
+        return index
+    
+    def summarize(self, index: dict[str, Any], max_tokens: int = 2000) -> dict[str, Any]:
+        """
+        Build a compact, token-budgeted summary for plan prompts.
+        
+        Stats always fit; the directory tree and then per-file symbols are
+        added until the budget is used up.
+        
+        Args:
+            index: Repository index
+            max_tokens: Approximate token budget
+        
+        Returns:
+            Summary dict suitable for the plan generator context
+        """
+        stats = index["stats"]
+        summary: dict[str, Any] = {
+            "commit": index["commit"][:12],
+            "archivos": stats["files"],
+            "bytes": stats["bytes"],
+            "lenguajes": stats["extensions"],
+        }
+        budget = max_tokens - estimate_tokens(json.dumps(summary, ensure_ascii=False))
+        
+        tree: list[str] = []
+        for entry in _directory_tree(index["files"]):
+            cost = estimate_tokens(entry) + 2
+            if cost > budget:
+                break
+            tree.append(entry)
+            budget -= cost
+        summary["estructura"] = tree
+        
+        symbols: dict[str, list[str]] = {}
+        for file_path, entry in sorted(index["files"].items()):
+            if not entry.get("symbols"):
+                continue
+            cost = estimate_tokens(json.dumps({file_path: entry["symbols"]}))
+            if cost > budget:
+                continue
+            symbols[file_path] = entry["symbols"]
+            budget -= cost
+        summary["simbolos"] = symbols
+        
+        return summary
+    
+    def _load_latest(self, repo_key: str) -> dict[str, Any] | None:
+        """Load the most recently built index of a repository."""
+        try:
+            sha = (self.index_path / repo_key / "LATEST").read_text().strip()
+        except FileNotFoundError:
+            return None
+        
+        return self.load(repo_key, sha)
+    
+    def _store(self, repo_key: str, sha: str, index: dict[str, Any]) -> None:
+        """Persist an index and mark it as the latest for the repository."""
+        directory = self.index_path / repo_key
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        _write_atomic(directory / f"{sha}.json", json.dumps(index))
+        _write_atomic(directory / "LATEST", sha)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get indexer metrics."""
+        return {
+            "full_builds": self.full_builds,
+            "incremental_builds": self.incremental_builds,
+            "files_parsed": self.files_parsed,
+            "files_reused": self.files_reused,
+        }
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    """
+    Replace a file with new contents in one rename.
+    
+    Each write goes through its own temporary file, so concurrent writers
+    (threads or processes indexing the same repository) never interleave
+    and readers never see a partial file.
+    """
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        suffix=".tmp",
+        delete=False,
+    ) as tmp:
+        try:
+            tmp.write(text)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    
+    try:
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
+def _parse_python(source: bytes) -> dict[str, Any]:
+    """Extract top-level symbols and imports from Python source."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return {"symbols": [], "imports": []}
+    
+    symbols = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            methods = [
+                item.name for item in node.body
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+            ]
+            symbols.append(f"class {node.name}: {', '.join(methods)}" if methods else f"class {node.name}")
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            symbols.append(f"def {node.name}()")
+    
+    imports = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.add("." * node.level + (node.module or ""))
+    
+    return {"symbols": symbols, "imports": sorted(imports)}
+
+
+def _compute_stats(files: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Compute file count, total size and the most common extensions."""
+    extensions = Counter(Path(path).suffix or Path(path).name for path in files)
+    
+    return {
+        "files": len(files),
+        "bytes": sum(entry["size"] for entry in files.values()),
+        "extensions": dict(extensions.most_common(10)),
+    }
+
+
+def _directory_tree(files: dict[str, Any], max_depth: int = 2) -> list[str]:
+    """Summarize the tree as directories (up to max_depth) with file counts."""
+    counts: Counter[str] = Counter()
+    root_files = []
+    
+    for path in files:
+        parts = path.split("/")
+        if len(parts) == 1:
+            root_files.append(path)
+            continue
+        for depth in range(1, min(len(parts), max_depth + 1)):
+            counts["/".join(parts[:depth]) + "/"] += 1
+    
+    entries = sorted(root_files)
+    entries += [f"{directory} ({count} archivos)" for directory, count in sorted(counts.items())]
+    return entries
@@ -0,0 +1,120 @@
+"""Compact recursive file tree of a repository commit."""
+
+import re
+from functools import lru_cache
+from typing import Any, Iterator, NamedTuple
+
+
+class TreeEntry(NamedTuple):
+    """One path of a repository tree."""
+    
+    path: str
+    type: str  # "blob" (file), "tree" (directory) or "commit" (submodule)
+    size: int  # bytes; 0 for directories and submodules
+
+
+class RepoTree:
+    """
+    Every path of a commit, fetched in one call.
+    
+    Built from a single recursive trees API response or a local
+    ``git ls-tree``, so exploring a repository costs O(1) requests instead
+    of one listing per directory.
+    """
+    
+    def __init__(self, sha: str, entries: list[TreeEntry], truncated: bool = False) -> None:
+        """
+        Initialize the tree.
+        
+        Args:
+            sha: Tree or commit SHA the entries belong to
+            entries: Entries sorted by path
+            truncated: Whether the source returned only part of the tree
+        """
+        self.sha = sha
+        self.entries = entries
+        self.truncated = truncated
+    
+    @classmethod
+    def from_api(cls, data: dict[str, Any]) -> "RepoTree":
+        """Build from a ``GET /repos/{repo}/git/trees/{ref}?recursive=1`` response."""
+        entries = [
+            TreeEntry(item["path"], item["type"], item.get("size", 0))
+            for item in data.get("tree", [])
+        ]
+        entries.sort()
+        return cls(data["sha"], entries, data.get("truncated", False))
+    
+    @classmethod
+    def from_ls_tree(cls, sha: str, output: str) -> "RepoTree":
+        """Build from ``git ls-tree -r -t -l -z --full-tree`` output."""
+        entries = []
+        
+        # "<mode> <type> <object> <size>\t<path>", size "-" for trees
+        for line in output.split("\0"):
+            if not line:
+                continue
+            
+            meta, _, path = line.partition("\t")
+            _, object_type, _, size = meta.split()
+            entries.append(TreeEntry(path, object_type, int(size) if size.isdigit() else 0))
+        
+        entries.sort()
+        return cls(sha, entries)
+    
+    def files(self) -> list[TreeEntry]:
+        """File entries only."""
+        return [entry for entry in self.entries if entry.type == "blob"]
+    
+    def glob(self, pattern: str, object_type: str | None = "blob") -> list[TreeEntry]:
+        """
+        Entries whose path matches a glob pattern.
+        
+        ``*`` and ``?`` do not cross directories; ``**`` matches any number
+        of directories, e.g. ``src/**/*.py`` or ``**/test_*.py``.
+        
+        Args:
+            pattern: Glob pattern relative to the repository root
+            object_type: Only entries of this type, or None for all
+        """
+        regex = _compile_glob(pattern)
+        return [
+            entry for entry in self.entries
+            if (object_type is None or entry.type == object_type) and regex.match(entry.path)
+        ]
+    
+    def total_size(self) -> int:
+        """Bytes of all files."""
+        return sum(entry.size for entry in self.entries if entry.type == "blob")
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def __iter__(self) -> Iterator[TreeEntry]:
+        return iter(self.entries)
+
+
+@lru_cache(maxsize=128)
+def _compile_glob(pattern: str) -> re.Pattern[str]:
+    """Translate a path glob into an anchored regular expression."""
+    parts = []
+    index = 0
+    
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            parts.append("(?:.*/)?")
+            index += 3
+        elif pattern.startswith("**", index):
+            parts.append(".*")
+            index += 2
+        elif pattern[index] == "*":
+            parts.append("[^/]*")
+            index += 1
+        elif pattern[index] == "?":
+            parts.append("[^/]")
+            index += 1
+        else:
+            parts.append(re.escape(pattern[index]))
+            index += 1
+    
+    return re.compile("".join(parts) + r"\Z")
@@ -0,0 +1,32 @@
+"""LLM provider clients module."""
+
+from src.llm.client import (
+    AnthropicClient,
+    LLMClient,
+    LLMResponse,
+    close_llm_clients,
+    get_gemini_client,
+    get_llm_client,
+)
+from src.llm.fake import FakeLLMClient
+from src.llm.gemini import GeminiClient
+from src.llm.resilience import CircuitBreaker, CircuitOpenError, ResilientClient
+from src.llm.scheduler import LLMScheduler, QueueDeadlineExceeded, ScheduledClient
+
+
+__all__ = [
+    "AnthropicClient",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "FakeLLMClient",
+    "GeminiClient",
+    "LLMClient",
+    "LLMResponse",
+    "LLMScheduler",
+    "QueueDeadlineExceeded",
+    "ResilientClient",
+    "ScheduledClient",
+    "close_llm_clients",
+    "get_gemini_client",
+    "get_llm_client",
+]
@@ -0,0 +1,430 @@
+"""Async LLM client layer shared by all agents."""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING, Any
+
+import anthropic
+from pydantic import BaseModel
+
+
+if TYPE_CHECKING:
+    from src.core.config import Config
+    from src.llm.resilience import CircuitBreaker
+    from src.llm.scheduler import LLMScheduler, ScheduledClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponse(BaseModel):
+    """Normalized response from an LLM provider."""
+    
+    text: str
+    model: str = ""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency: float = 0.0
+
+
+class LLMClient(ABC):
+    """
+    Base class for async LLM provider clients.
+    
+    A client owns the provider connection pool and bounds the number of
+    in-flight requests with a semaphore, so concurrent chats overlap their
+    requests instead of queueing behind each other on the event loop.
+    """
+    
+    provider: str = "unknown"
+    
+    def __init__(self, max_concurrency: int = 16) -> None:
+        """Initialize with the maximum number of concurrent requests."""
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # Metrics
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_latency = 0.0
+    
+    async def complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None = None,
+    ) -> LLMResponse:
+        """
+        Send a completion request to the provider.
+        
+        Args:
+            model: Provider model name
+            messages: Conversation messages ({"role": ..., "content": ...})
+            max_tokens: Maximum output tokens
+            system: Optional system prompt
+        
+        Returns:
+            LLMResponse with text, token usage and latency
+        """
+        async with self._semaphore:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            start = time.perf_counter()
+            
+            try:
+                response = await self._complete(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    system=system,
+                )
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self.in_flight -= 1
+            
+            response.latency = time.perf_counter() - start
+            self.requests += 1
+            self.total_latency += response.latency
+            
+            return response
+    
+    async def stream(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion from the provider as text chunks.
+        
+        Args:
+            model: Provider model name
+            messages: Conversation messages ({"role": ..., "content": ...})
+            max_tokens: Maximum output tokens
+            system: Optional system prompt
+            
+        Yields:
+            Text chunks in arrival order
+        """
+        async with self._semaphore:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            start = time.perf_counter()
+            
+            try:
+                async for chunk in self._stream(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    system=system,
+                ):
+                    yield chunk
+            except Exception:
+                self.errors += 1
+                raise
+            finally:
+                self.in_flight -= 1
+            
+            self.requests += 1
+            self.total_latency += time.perf_counter() - start
+    
+    @abstractmethod
+    async def _complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None,
+    ) -> LLMResponse:
+        """Provider-specific completion call."""
+    
+    async def _stream(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None,
+    ) -> AsyncIterator[str]:
+        """Provider-specific streaming call (default: a single chunk)."""
+        response = await self._complete(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            system=system,
+        )
+        yield response.text
+    
+    async def aclose(self) -> None:
+        """Release provider connections."""
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get client metrics."""
+        return {
+            "provider": self.provider,
+            "requests": self.requests,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_concurrency": self.max_concurrency,
+            "avg_latency": self.total_latency / self.requests if self.requests else 0.0,
+        }
+
+
+class AnthropicClient(LLMClient):
+    """Claude client backed by a single pooled AsyncAnthropic instance."""
+    
+    provider = "anthropic"
+    
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int = 16,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+    ) -> None:
+        """Initialize with Anthropic API key and pool settings."""
+        super().__init__(max_concurrency=max_concurrency)
+        
+        # One AsyncAnthropic instance keeps its httpx pool (and keep-alive
+        # connections) alive for the lifetime of the process.
+        self._client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            timeout=timeout,
+            max_retries=max_retries,
+        )
+    
+    async def _complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None,
+    ) -> LLMResponse:
+        """Call the Anthropic Messages API."""
+        kwargs: dict[str, Any] = {}
+        if system is not None:
+            kwargs["system"] = system
+        
+        response = await self._client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            messages=messages,
+            **kwargs,
+        )
+        
+        return LLMResponse(
+            text=response.content[0].text,
+            model=model,
+            input_tokens=response.usage.input_tokens,
+            output_tokens=response.usage.output_tokens,
+        )
+    
+    async def _stream(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None,
+    ) -> AsyncIterator[str]:
+        """Stream text deltas from the Anthropic Messages API."""
+        kwargs: dict[str, Any] = {}
+        if system is not None:
+            kwargs["system"] = system
+        
+        async with self._client.messages.stream(
+            model=model,
+            max_tokens=max_tokens,
+            messages=messages,
+            **kwargs,
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP pool."""
+        await self._client.close()
+
+
+# Process-wide client registry (one pooled client, scheduler and circuit
+# breaker per provider)
+_clients: dict[str, LLMClient] = {}
+_schedulers: dict[str, "LLMScheduler"] = {}
+_breakers: dict[str, "CircuitBreaker"] = {}
+_resilient: dict[tuple[str, str], LLMClient] = {}
+
+
+def get_llm_client(config: "Config", lane: str = "standard") -> LLMClient:
+    """
+    Get the shared Claude client for this process.
+    
+    Args:
+        config: Application configuration
+        lane: Scheduler lane of the caller ("interactive", "standard", "background")
+    
+    Returns:
+        Shared LLMClient instance, scheduled in the lane with retries
+    """
+    client = _clients.get(AnthropicClient.provider)
+    
+    if client is None:
+        client = AnthropicClient(
+            api_key=config.anthropic_api_key,
+            max_concurrency=config.llm_max_concurrency,
+            timeout=config.llm_timeout,
+            # Retries happen in the scheduler (429) and ResilientClient
+            max_retries=0,
+        )
+        _clients[AnthropicClient.provider] = client
+        logger.info(
+            "LLM client created: %s (max concurrency %d)",
+            client.provider,
+            client.max_concurrency,
+        )
+    
+    scheduler = _get_scheduler(
+        client,
+        config.llm_requests_per_minute,
+        config.llm_tokens_per_minute,
+        config.llm_quota_processes,
+    )
+    return _get_resilient(config, scheduler.lane(lane))
+
+
+def get_gemini_client(config: "Config", lane: str = "background") -> LLMClient:
+    """
+    Get the shared Gemini client for this process.
+    
+    Args:
+        config: Application configuration
+        lane: Scheduler lane of the caller ("interactive", "standard", "background")
+    
+    Returns:
+        Shared LLMClient instance, scheduled in the lane with retries
+    """
+    from src.llm.gemini import GeminiClient
+    
+    client = _clients.get(GeminiClient.provider)
+    
+    if client is None:
+        client = GeminiClient(
+            api_key=config.google_ai_api_key,
+            max_concurrency=config.gemini_max_concurrency,
+        )
+        _clients[GeminiClient.provider] = client
+        logger.info(
+            "LLM client created: %s (max concurrency %d)",
+            client.provider,
+            client.max_concurrency,
+        )
+    
+    scheduler = _get_scheduler(
+        client,
+        config.gemini_requests_per_minute,
+        config.gemini_tokens_per_minute,
+        config.llm_quota_processes,
+    )
+    return _get_resilient(config, scheduler.lane(lane))
+
+
+def _get_scheduler(
+    client: LLMClient,
+    requests_per_minute: int,
+    tokens_per_minute: int,
+    processes: int = 1,
+) -> "LLMScheduler":
+    """
+    Get the shared scheduler of a provider client.
+    
+    Schedulers only see their own process, so each of the ``processes``
+    sharing the provider quotas schedules within an equal share of them.
+    """
+    from src.llm.scheduler import LLMScheduler
+    
+    scheduler = _schedulers.get(client.provider)
+    
+    if scheduler is None:
+        scheduler = LLMScheduler(
+            client,
+            requests_per_minute=quota_share(requests_per_minute, processes),
+            tokens_per_minute=quota_share(tokens_per_minute, processes),
+        )
+        _schedulers[client.provider] = scheduler
+    
+    return scheduler
+
+
+def _get_resilient(config: "Config", lane_client: "ScheduledClient") -> LLMClient:
+    """
+    Get the shared resilience layer of a scheduler lane.
+    
+    Lanes of one provider share its circuit breaker; the interactive lane
+    gets a per-attempt timeout and, if enabled, hedged requests.
+    """
+    from src.llm.resilience import CircuitBreaker, ResilientClient
+    
+    key = (lane_client.provider, lane_client.lane)
+    client = _resilient.get(key)
+    
+    if client is None:
+        breaker = _breakers.get(lane_client.provider)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                lane_client.provider,
+                failure_threshold=config.llm_breaker_threshold,
+                reset_timeout=config.llm_breaker_reset,
+            )
+            _breakers[lane_client.provider] = breaker
+        
+        interactive = lane_client.lane == "interactive"
+        client = ResilientClient(
+            lane_client,
+            breaker=breaker,
+            max_attempts=config.llm_retry_attempts,
+            base_delay=config.llm_retry_base_delay,
+            max_delay=config.llm_retry_max_delay,
+            attempt_timeout=config.llm_interactive_timeout if interactive else None,
+            hedge=interactive and config.llm_hedge_interactive,
+        )
+        _resilient[key] = client
+    
+    return client
+
+
+def quota_share(quota: int, processes: int) -> int:
+    """Per-process part of a per-minute quota (0: no limit)."""
+    if not quota:
+        return 0
+    return max(1, quota // max(1, processes))
+
+
+async def close_llm_clients() -> None:
+    """Close all shared LLM clients and their schedulers."""
+    _resilient.clear()
+    _breakers.clear()
+    
+    for scheduler in _schedulers.values():
+        await scheduler.aclose()
+    _schedulers.clear()
+    
+    for provider, client in list(_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning("Failed to close LLM client %s: %s", provider, e)
+    
+    _clients.clear()
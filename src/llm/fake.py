@@ -0,0 +1,162 @@
+"""Local fake LLM provider for offline benchmarks and development."""
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator
+from typing import Any, Callable
+
+from src.llm.client import LLMClient, LLMResponse
+from src.llm.scheduler import TokenBucket
+
+
+Responder = Callable[[list[dict[str, Any]]], str]
+
+
+class FakeRateLimitError(Exception):
+    """429 response of the fake provider."""
+    
+    status_code = 429
+    
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Rate limit exceeded, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class FakeProviderError(Exception):
+    """503 response of the fake provider (overloaded or down)."""
+    
+    status_code = 503
+
+
+class FakeLLMClient(LLMClient):
+    """
+    LLM client that answers locally after a simulated latency.
+    
+    With ``blocking=True`` the latency is spent in ``time.sleep`` on the
+    event loop, reproducing the behavior of a synchronous SDK call.
+    """
+    
+    provider = "fake"
+    
+    def __init__(
+        self,
+        text: str = "{}",
+        responder: Responder | None = None,
+        latency: float = 0.5,
+        jitter: float = 0.0,
+        max_concurrency: int = 16,
+        blocking: bool = False,
+        chunk_size: int = 32,
+        requests_per_minute: int = 0,
+        error_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 10.0,
+    ) -> None:
+        """
+        Initialize the fake provider.
+        
+        Args:
+            text: Fixed response text
+            responder: Optional callable building the response from messages
+            latency: Simulated response latency in seconds
+            jitter: Random extra latency (0..jitter seconds)
+            max_concurrency: Maximum concurrent requests
+            blocking: Block the event loop while "waiting" for the provider
+            chunk_size: Characters per chunk when streaming
+            requests_per_minute: Provider quota, replenished continuously up
+                to a minute's worth; requests over it fail with
+                FakeRateLimitError (0 for no quota)
+            error_rate: Fraction of requests failing with FakeProviderError
+            slow_rate: Fraction of requests taking ``slow_latency`` instead
+            slow_latency: Latency of the slow requests in seconds
+        
+        Setting ``down`` makes every request fail, simulating an outage.
+        """
+        super().__init__(max_concurrency=max_concurrency)
+        self.text = text
+        self.responder = responder
+        self.latency = latency
+        self.jitter = jitter
+        self.blocking = blocking
+        self.chunk_size = chunk_size
+        self._quota = (
+            TokenBucket(requests_per_minute / 60, requests_per_minute)
+            if requests_per_minute else None
+        )
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.down = False
+        self.rate_limited = 0
+        self.failed = 0
+    
+    def _check_quota(self) -> None:
+        """Reject the request with a 429 if the quota is used up."""
+        if self._quota is None:
+            return
+        
+        delay = self._quota.delay(1)
+        if delay > 0:
+            self.rate_limited += 1
+            raise FakeRateLimitError(delay)
+        self._quota.consume(1)
+    
+    def _delay(self) -> float:
+        """Latency of one request, failing it if errors are injected."""
+        if self.down or random.random() < self.error_rate:
+            self.failed += 1
+            raise FakeProviderError("Service unavailable")
+        
+        if random.random() < self.slow_rate:
+            return self.slow_latency
+        return self.latency + random.uniform(0.0, self.jitter)
+    
+    async def _complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None,
+    ) -> LLMResponse:
+        """Return the canned response after the simulated latency."""
+        self._check_quota()
+        delay = self._delay()
+        
+        if self.blocking:
+            time.sleep(delay)
+        else:
+            await asyncio.sleep(delay)
+        
+        text = self.responder(messages) if self.responder else self.text
+        prompt = "".join(str(m.get("content", "")) for m in messages)
+        
+        return LLMResponse(
+            text=text,
+            model=model,
+            input_tokens=len(prompt) // 4,
+            output_tokens=min(len(text) // 4, max_tokens),
+        )
+    
+    async def _stream(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None,
+    ) -> AsyncIterator[str]:
+        """Yield the canned response in chunks, spreading the latency."""
+        self._check_quota()
+        delay = self._delay()
+        text = self.responder(messages) if self.responder else self.text
+        chunks = [
+            text[i:i + self.chunk_size]
+            for i in range(0, len(text), self.chunk_size)
+        ] or [""]
+        delay /= len(chunks)
+        
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield chunk
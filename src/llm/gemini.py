@@ -0,0 +1,84 @@
+"""Gemini client running the synchronous SDK off the event loop."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import google.generativeai as genai
+
+from src.llm.client import LLMClient, LLMResponse
+from src.utils.async_utils import run_in_pool
+
+
+logger = logging.getLogger(__name__)
+
+
+class GeminiClient(LLMClient):
+    """
+    Gemini client backed by a dedicated bounded thread pool.
+    
+    ``google.generativeai`` is synchronous, so every call runs in this
+    client's own pool; long generations never block the event loop or
+    starve the shared ``run_sync`` pool used for other blocking I/O.
+    """
+    
+    provider = "gemini"
+    
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int = 8,
+    ) -> None:
+        """Initialize with Google AI API key and pool size."""
+        super().__init__(max_concurrency=max_concurrency)
+        genai.configure(api_key=api_key)
+        
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="gemini_worker",
+        )
+        self._models: dict[tuple[str, str | None], Any] = {}
+    
+    def _get_model(self, model: str, system: str | None) -> Any:
+        """Get (or build) a GenerativeModel for a model/system prompt pair."""
+        key = (model, system)
+        
+        if key not in self._models:
+            self._models[key] = genai.GenerativeModel(
+                model,
+                system_instruction=system,
+            )
+        
+        return self._models[key]
+    
+    async def _complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None,
+    ) -> LLMResponse:
+        """Run generate_content in the Gemini pool."""
+        generative_model = self._get_model(model, system)
+        prompt = "\n\n".join(str(m["content"]) for m in messages)
+        
+        response = await run_in_pool(
+            self._pool,
+            generative_model.generate_content,
+            prompt,
+            generation_config={"max_output_tokens": max_tokens},
+        )
+        
+        usage = getattr(response, "usage_metadata", None)
+        
+        return LLMResponse(
+            text=response.text,
+            model=model,
+            input_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+            output_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+        )
+    
+    async def aclose(self) -> None:
+        """Shut down the worker pool."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,419 @@
+"""Retries, hedging and circuit breaking around LLM provider calls."""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any, Awaitable, Callable
+
+from src.llm.client import LLMClient, LLMResponse
+from src.llm.scheduler import QueueDeadlineExceeded, retry_after
+
+
+logger = logging.getLogger(__name__)
+
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# HTTP statuses worth another attempt (timeouts, conflicts, server errors
+# and Anthropic's 529 "overloaded"). 429s are not: the scheduler already
+# queued them again up to its limit
+TRANSIENT_STATUSES = {408, 409, 500, 502, 503, 504, 529}
+
+# Provider SDK errors without a status code that are worth another attempt
+TRANSIENT_ERRORS = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "DeadlineExceeded",
+    "InternalServerError",
+    "ServiceUnavailable",
+}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider that is failing."""
+    
+    def __init__(self, provider: str, retry_in: float) -> None:
+        super().__init__(f"Provider {provider} unavailable, retry in {retry_in:.0f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Stops calling a provider after consecutive transient failures.
+    
+    After ``failure_threshold`` failures in a row the circuit opens and
+    calls fail immediately with CircuitOpenError. Once ``reset_timeout``
+    has passed one probe call is let through (half-open): its success
+    closes the circuit, its failure opens it again. A probe that never
+    reports back (e.g. a cancelled hedge) is replaced after another
+    ``reset_timeout``.
+    """
+    
+    def __init__(
+        self,
+        provider: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the breaker.
+        
+        Args:
+            provider: Provider name, for errors and logs
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a probe
+            clock: Monotonic time source
+        """
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        
+        self.state = CLOSED
+        self._failures = 0
+        self._changed_at = 0.0
+        
+        # Metrics
+        self.opened = 0
+        self.rejected = 0
+    
+    def allow(self) -> bool:
+        """Whether a call may be sent now (claims the probe when half-open)."""
+        if self.state == CLOSED:
+            return True
+        
+        now = self.clock()
+        if now - self._changed_at < self.reset_timeout:
+            self.rejected += 1
+            return False
+        
+        if self.state == OPEN:
+            logger.info("Circuit half-open for %s, probing", self.provider)
+        self.state = HALF_OPEN
+        self._changed_at = now
+        return True
+    
+    def retry_in(self) -> float:
+        """Seconds until the next call may be let through."""
+        if self.state == CLOSED:
+            return 0.0
+        return max(0.0, self._changed_at + self.reset_timeout - self.clock())
+    
+    def check(self) -> None:
+        """Raise CircuitOpenError unless a call may be sent now."""
+        if not self.allow():
+            raise CircuitOpenError(self.provider, self.retry_in())
+    
+    def record_success(self) -> None:
+        """The provider answered: close the circuit."""
+        if self.state != CLOSED:
+            logger.info("Circuit closed for %s", self.provider)
+        self.state = CLOSED
+        self._failures = 0
+    
+    def record_failure(self) -> None:
+        """A call failed transiently: open the circuit past the threshold."""
+        self._failures += 1
+        
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self._failures >= self.failure_threshold
+        ):
+            if self.state == CLOSED:
+                logger.warning(
+                    "Circuit opened for %s after %d failures",
+                    self.provider,
+                    self._failures,
+                )
+            self.state = OPEN
+            self._changed_at = self.clock()
+            self.opened += 1
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get breaker metrics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class ResilientClient(LLMClient):
+    """
+    LLMClient that retries, hedges and circuit-breaks another client.
+    
+    Transient errors are retried up to ``max_attempts`` times with full
+    jitter exponential backoff (or the provider's ``retry-after`` when
+    longer). Every attempt goes through the provider's CircuitBreaker, so
+    once a provider is down callers fail fast with CircuitOpenError.
+    
+    With ``hedge=True`` a completion still running after the p95 latency
+    of recent calls is sent again; the first answer wins and the other
+    request is cancelled. ``attempt_timeout`` bounds each attempt. Both
+    apply to ``complete()`` only: streams are retried only before their
+    first chunk.
+    """
+    
+    def __init__(
+        self,
+        client: LLMClient,
+        breaker: CircuitBreaker | None = None,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        attempt_timeout: float | None = None,
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+    ) -> None:
+        """
+        Initialize the resilience layer.
+        
+        Args:
+            client: Client the calls are sent with (usually a scheduler lane)
+            breaker: Circuit breaker shared by all clients of the provider
+            max_attempts: Attempts per call, including the first
+            base_delay: Backoff cap of the first retry in seconds
+            max_delay: Maximum backoff in seconds
+            attempt_timeout: Seconds before an attempt is abandoned
+                (None for no limit)
+            hedge: Send a duplicate of slow completions
+            hedge_quantile: Latency quantile after which to hedge
+            hedge_min_samples: Latencies to observe before hedging
+        """
+        super().__init__(max_concurrency=client.max_concurrency)
+        self.client = client
+        self.provider = client.provider
+        self.breaker = breaker or CircuitBreaker(client.provider)
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.attempt_timeout = attempt_timeout
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies: deque[float] = deque(maxlen=200)
+        
+        # Metrics
+        self.retries = 0
+        self.timeouts = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.fast_failures = 0
+    
+    async def complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None = None,
+    ) -> LLMResponse:
+        """Send a completion request, retrying and hedging as configured."""
+        async def send() -> LLMResponse:
+            return await self.client.complete(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                system=system,
+            )
+        
+        attempt = 1
+        while True:
+            try:
+                return await self._hedged(send)
+            except CircuitOpenError:
+                self.fast_failures += 1
+                raise
+            except Exception as e:
+                if attempt >= self.max_attempts or not is_transient_error(e):
+                    raise
+                await self._backoff(attempt, e)
+                attempt += 1
+    
+    async def stream(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream a completion, retrying failures before the first chunk."""
+        attempt = 1
+        while True:
+            try:
+                self.breaker.check()
+            except CircuitOpenError:
+                self.fast_failures += 1
+                raise
+            
+            started = False
+            try:
+                async for chunk in self.client.stream(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    system=system,
+                ):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                self._record(e)
+                # Only retry before any text reached the caller
+                if started or attempt >= self.max_attempts or not is_transient_error(e):
+                    raise
+                await self._backoff(attempt, e)
+                attempt += 1
+                continue
+            
+            self.breaker.record_success()
+            return
+    
+    async def _hedged(self, send: Callable[[], Awaitable[LLMResponse]]) -> LLMResponse:
+        """One attempt, duplicated if it runs past the hedging threshold."""
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._attempt(send)
+        
+        first = asyncio.ensure_future(self._attempt(send))
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done and self.breaker.state == CLOSED:
+                self.hedges_sent += 1
+                tasks.append(asyncio.ensure_future(self._attempt(send)))
+            
+            error: BaseException | None = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Retrieve every outcome so no exception goes unobserved
+                outcomes = [(task, task.exception()) for task in done]
+                for task, exception in outcomes:
+                    if exception is None:
+                        if task is not first:
+                            self.hedges_won += 1
+                        return task.result()
+                    error = exception
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _attempt(self, send: Callable[[], Awaitable[LLMResponse]]) -> LLMResponse:
+        """Send one request through the breaker, within the attempt timeout."""
+        self.breaker.check()
+        start = time.perf_counter()
+        
+        try:
+            if self.attempt_timeout is None:
+                response = await send()
+            else:
+                response = await asyncio.wait_for(send(), self.attempt_timeout)
+        except TimeoutError as e:
+            if not isinstance(e, QueueDeadlineExceeded):
+                self.timeouts += 1
+            self._record(e)
+            raise
+        except Exception as e:
+            self._record(e)
+            raise
+        
+        self.breaker.record_success()
+        self._latencies.append(time.perf_counter() - start)
+        return response
+    
+    def _record(self, error: BaseException) -> None:
+        """Report a failed attempt to the breaker."""
+        if isinstance(error, (CircuitOpenError, QueueDeadlineExceeded)):
+            # Nothing reached the provider
+            return
+        if is_transient_error(error):
+            self.breaker.record_failure()
+        else:
+            # The provider answered, if only to reject the request
+            self.breaker.record_success()
+    
+    async def _backoff(self, attempt: int, error: BaseException) -> None:
+        """Wait before retry number ``attempt``."""
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay = random.uniform(0.0, cap)
+        
+        asked = retry_after(error)
+        if asked is not None:
+            delay = min(self.max_delay, max(delay, asked))
+        
+        self.retries += 1
+        logger.warning(
+            "%s call failed (attempt %d/%d), retrying in %.1fs: %s",
+            self.provider,
+            attempt,
+            self.max_attempts,
+            delay,
+            error,
+        )
+        await asyncio.sleep(delay)
+    
+    def hedge_delay(self) -> float | None:
+        """Seconds after which to hedge a completion, or None not to."""
+        if not self.hedge or len(self._latencies) < self.hedge_min_samples:
+            return None
+        
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(self.hedge_quantile * len(ordered)))]
+    
+    async def _complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None,
+    ) -> LLMResponse:
+        """Unused: ``complete()`` delegates to the wrapped client."""
+        return await self.complete(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            system=system,
+        )
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get wrapped client and resilience metrics."""
+        return {
+            **self.client.get_stats(),
+            "resilience": {
+                "retries": self.retries,
+                "timeouts": self.timeouts,
+                "hedges_sent": self.hedges_sent,
+                "hedges_won": self.hedges_won,
+                "hedge_delay": self.hedge_delay(),
+                "fast_failures": self.fast_failures,
+                "breaker": self.breaker.get_stats(),
+            },
+        }
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether a failed provider call may succeed if sent again."""
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, QueueDeadlineExceeded):
+        # Already waited as long as its lane allows
+        return False
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status in TRANSIENT_STATUSES:
+        return True
+    return type(error).__name__ in TRANSIENT_ERRORS
@@ -0,0 +1,560 @@
+"""Quota-aware scheduling of LLM requests per provider."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any, Callable
+
+from src.llm.client import LLMClient, LLMResponse
+from src.utils.tokens import estimate_tokens
+
+
+logger = logging.getLogger(__name__)
+
+
+# Lanes in priority order, with the longest a request may wait to be sent
+# (None: no limit)
+LANES = {
+    "interactive": 30.0,   # intent classification, a user is waiting
+    "standard": 120.0,     # plan generation
+    "background": None,    # task execution
+}
+
+# Adaptive backoff after 429 responses
+BACKOFF_BASE = 1.0
+MAX_BACKOFF = 60.0
+MIN_RATE_FACTOR = 0.1
+RATE_RECOVERY = 0.05
+
+# 429 responses after which a request fails instead of queueing again
+MAX_REQUEUES = 6
+
+
+class QueueDeadlineExceeded(TimeoutError):
+    """A request could not be sent before its lane deadline."""
+
+
+class TokenBucket:
+    """Refills ``rate`` units per second up to ``capacity``; may go into debt."""
+    
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize a full bucket.
+        
+        Args:
+            rate: Units added per second
+            capacity: Maximum units (the allowed burst)
+            clock: Monotonic time source
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+    
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def delay(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 if they are now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+    
+    def consume(self, amount: float) -> None:
+        """Take units, going into debt if needed."""
+        self._refill()
+        self.tokens -= amount
+    
+    def refund(self, amount: float) -> None:
+        """Return units (negative to charge more)."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class _Lane:
+    """Queue metrics of one lane."""
+    
+    def __init__(self, name: str, priority: int, deadline: float | None) -> None:
+        self.name = name
+        self.priority = priority
+        self.deadline = deadline
+        
+        self.depth = 0
+        self.max_depth = 0
+        self.admitted = 0
+        self.expired = 0
+        self.rate_limit_failures = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+    
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "admitted": self.admitted,
+            "expired": self.expired,
+            "rate_limit_failures": self.rate_limit_failures,
+            "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class LLMScheduler:
+    """
+    Sends the requests of one provider within its rate limits.
+    
+    Requests wait for a request token and for an estimate of their tokens
+    (prompt plus ``max_tokens``) in two token buckets sized from the
+    provider's per-minute quotas; the estimate is corrected with the
+    reported usage afterwards. Waiting requests are admitted strictly by
+    lane priority, FIFO within a lane, and fail with
+    ``QueueDeadlineExceeded`` when their lane deadline passes first.
+    
+    A 429 response pauses the provider for its ``retry-after`` (or an
+    exponential backoff) and halves the admission rate, which then
+    recovers gradually with each success; the request is queued again at
+    the front of its lane, up to ``max_requeues`` times before the 429 is
+    raised to the caller.
+    """
+    
+    def __init__(
+        self,
+        client: LLMClient,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        deadlines: dict[str, float | None] | None = None,
+        max_requeues: int = MAX_REQUEUES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the scheduler.
+        
+        Args:
+            client: Provider client the requests are sent with
+            requests_per_minute: Request quota; 0 for no limit
+            tokens_per_minute: Token quota (input + output); 0 for no limit
+            deadlines: Queueing deadline per lane, overriding LANES
+            max_requeues: 429 responses after which a request fails
+            clock: Monotonic time source
+        """
+        self.client = client
+        self.clock = clock
+        self._requests = (
+            TokenBucket(requests_per_minute / 60, requests_per_minute, clock)
+            if requests_per_minute else None
+        )
+        self._tokens = (
+            TokenBucket(tokens_per_minute / 60, tokens_per_minute, clock)
+            if tokens_per_minute else None
+        )
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_requeues = max_requeues
+        
+        deadlines = {**LANES, **(deadlines or {})}
+        self._lanes = {
+            name: _Lane(name, priority, deadlines[name])
+            for priority, name in enumerate(LANES)
+        }
+        self._clients: dict[str, ScheduledClient] = {}
+        
+        # Heap of (priority, sequence, tokens, future)
+        self._queue: list[tuple[int, int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: asyncio.Task[None] | None = None
+        
+        # Adaptive backoff state
+        self._request_quota = requests_per_minute
+        self.rate_factor = 1.0
+        self._max_rate_factor = 1.0
+        self._paused_until = 0.0
+        self._slowed_at = float("-inf")
+        self._consecutive_limited = 0
+        self._recent: deque[float] = deque()  # success times of the last minute
+        
+        # Metrics
+        self.rate_limited = 0
+        self.backoff_time = 0.0
+    
+    def lane(self, name: str) -> "ScheduledClient":
+        """Client whose requests are scheduled in a lane."""
+        if name not in self._lanes:
+            raise ValueError(f"Unknown lane: {name}")
+        
+        if name not in self._clients:
+            self._clients[name] = ScheduledClient(self, name)
+        return self._clients[name]
+    
+    async def acquire(
+        self,
+        lane: str,
+        tokens: int,
+        deadline: float | None = None,
+        sequence: int | None = None,
+    ) -> int:
+        """
+        Wait until a request may be sent.
+        
+        Args:
+            lane: Lane of the request
+            tokens: Estimated tokens of the request
+            deadline: Clock time by which it must be admitted (None: no limit)
+            sequence: Queue position of a request being sent again
+        
+        Returns:
+            The queue position, to pass back when the request is retried
+        
+        Raises:
+            QueueDeadlineExceeded: If the deadline passed while queued
+        """
+        state = self._lanes[lane]
+        queued_at = self.clock()
+        if sequence is None:
+            sequence = next(self._sequence)
+        
+        if not self._queue and self._delay(tokens) <= 0:
+            self._consume(tokens)
+        else:
+            future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._queue, (state.priority, sequence, tokens, future))
+            self._start()
+            self._wakeup.set()
+            
+            state.depth += 1
+            state.max_depth = max(state.max_depth, state.depth)
+            try:
+                timeout = None if deadline is None else max(0.0, deadline - self.clock())
+                # Cancels the future on timeout, so the dispatcher skips it
+                await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                state.expired += 1
+                raise QueueDeadlineExceeded(
+                    f"{self.client.provider} request waited {self.clock() - queued_at:.1f}s "
+                    f"in lane {lane} without being sent"
+                ) from None
+            finally:
+                state.depth -= 1
+        
+        wait = self.clock() - queued_at
+        state.admitted += 1
+        state.total_wait += wait
+        state.max_wait = max(state.max_wait, wait)
+        return sequence
+    
+    def deadline(self, lane: str) -> float | None:
+        """Clock time by which a request queued now in a lane must be sent."""
+        timeout = self._lanes[lane].deadline
+        return None if timeout is None else self.clock() + timeout
+    
+    def settle(self, estimated: int, actual: int) -> None:
+        """Record a successful response and correct the token bucket with its usage."""
+        if self._tokens is not None and actual:
+            self._tokens.refund(estimated - actual)
+        
+        now = self.clock()
+        self._recent.append(now)
+        while now - self._recent[0] > 60:
+            self._recent.popleft()
+        
+        self._consecutive_limited = 0
+        if self._max_rate_factor > 1.0:
+            # Learned quota: follow the throughput reached while probing
+            self._request_quota = max(self._request_quota, len(self._recent))
+        if self.rate_factor < self._max_rate_factor:
+            self._set_rate_factor(self.rate_factor + RATE_RECOVERY)
+    
+    def on_rate_limited(self, error: BaseException, sent_at: float) -> None:
+        """
+        Pause the provider and slow down after a 429 response.
+        
+        Args:
+            error: The provider's rate limit error
+            sent_at: Clock time the request was admitted; requests sent
+                before the last slowdown extend the pause but do not slow
+                down again, so one burst of 429s halves the rate once
+        """
+        self.rate_limited += 1
+        now = self.clock()
+        new_episode = sent_at >= self._slowed_at
+        
+        if new_episode:
+            self._consecutive_limited += 1
+        
+        delay = retry_after(error)
+        if delay is None:
+            delay = min(MAX_BACKOFF, BACKOFF_BASE * 2 ** max(0, self._consecutive_limited - 1))
+        
+        if now + delay > self._paused_until:
+            self.backoff_time += now + delay - max(now, self._paused_until)
+            self._paused_until = now + delay
+        
+        if not new_episode:
+            return
+        self._slowed_at = now
+        
+        if not self.requests_per_minute:
+            # No configured quota: assume the recent throughput is the limit,
+            # and let the rate probe above it until the next 429
+            self._request_quota = max(1, len(self._recent))
+            self._requests = TokenBucket(
+                self._request_quota / 60, max(1.0, self._request_quota / 60), self.clock
+            )
+            self._requests.tokens = 0
+            self._max_rate_factor = 2.0
+        
+        self._set_rate_factor(max(MIN_RATE_FACTOR, self.rate_factor / 2))
+        
+        logger.warning(
+            "%s rate limited, pausing %.1fs (rate at %.0f%% of %d requests/min)",
+            self.client.provider, delay, self.rate_factor * 100, self._request_quota,
+        )
+    
+    def rate_limit_failed(self, lane: str) -> None:
+        """Record a request that failed after ``max_requeues`` 429 responses."""
+        self._lanes[lane].rate_limit_failures += 1
+        logger.error(
+            "%s request in lane %s still rate limited after %d retries",
+            self.client.provider, lane, self.max_requeues,
+        )
+    
+    def _set_rate_factor(self, factor: float) -> None:
+        self.rate_factor = min(self._max_rate_factor, factor)
+        if self._requests is not None:
+            self._requests.rate = self._request_quota / 60 * self.rate_factor
+        if self._tokens is not None:
+            self._tokens.rate = self.tokens_per_minute / 60 * min(1.0, self.rate_factor)
+    
+    def _delay(self, tokens: int) -> float:
+        """Seconds until a request of ``tokens`` may be sent."""
+        delay = self._paused_until - self.clock()
+        if self._requests is not None:
+            delay = max(delay, self._requests.delay(1))
+        if self._tokens is not None:
+            delay = max(delay, self._tokens.delay(tokens))
+        return delay
+    
+    def _consume(self, tokens: int) -> None:
+        if self._requests is not None:
+            self._requests.consume(1)
+        if self._tokens is not None:
+            self._tokens.consume(tokens)
+    
+    def _start(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+    
+    async def _dispatch(self) -> None:
+        """Admit queued requests in priority order as capacity allows."""
+        while True:
+            # Drop requests whose caller gave up
+            while self._queue and self._queue[0][3].done():
+                heapq.heappop(self._queue)
+            
+            if not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            _, _, tokens, future = self._queue[0]
+            delay = self._delay(tokens)
+            
+            if delay <= 0:
+                heapq.heappop(self._queue)
+                self._consume(tokens)
+                future.set_result(None)
+                continue
+            
+            # Sleep until capacity frees up or a new request arrives
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def aclose(self) -> None:
+        """Stop the dispatcher."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get scheduler metrics."""
+        return {
+            "provider": self.client.provider,
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "request_quota": self._request_quota,
+            "rate_factor": self.rate_factor,
+            "rate_limited": self.rate_limited,
+            "backoff_time": self.backoff_time,
+            "lanes": {name: lane.get_stats() for name, lane in self._lanes.items()},
+        }
+
+
+class ScheduledClient(LLMClient):
+    """
+    LLMClient whose requests go through a provider scheduler lane.
+    
+    Drop-in replacement for the provider client: agents keep calling
+    ``complete()`` and ``stream()``; concurrency and request metrics stay
+    with the provider client.
+    """
+    
+    def __init__(self, scheduler: LLMScheduler, lane: str) -> None:
+        """Initialize with the scheduler and the lane to queue in."""
+        super().__init__(max_concurrency=scheduler.client.max_concurrency)
+        self.scheduler = scheduler
+        self.client = scheduler.client
+        self.lane = lane
+        self.provider = scheduler.client.provider
+    
+    async def complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None = None,
+    ) -> LLMResponse:
+        """Send a completion request once the scheduler admits it."""
+        estimated = _estimate_request(messages, system, max_tokens)
+        deadline = self.scheduler.deadline(self.lane)
+        sequence = None
+        requeues = 0
+        
+        while True:
+            sequence = await self.scheduler.acquire(self.lane, estimated, deadline, sequence)
+            sent_at = self.scheduler.clock()
+            try:
+                response = await self.client.complete(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    system=system,
+                )
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                self.scheduler.on_rate_limited(e, sent_at)
+                requeues += 1
+                if requeues > self.scheduler.max_requeues:
+                    self.scheduler.rate_limit_failed(self.lane)
+                    raise
+                continue
+            
+            self.scheduler.settle(estimated, response.input_tokens + response.output_tokens)
+            return response
+    
+    async def stream(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream a completion once the scheduler admits it."""
+        estimated = _estimate_request(messages, system, max_tokens)
+        deadline = self.scheduler.deadline(self.lane)
+        sequence = None
+        requeues = 0
+        
+        while True:
+            sequence = await self.scheduler.acquire(self.lane, estimated, deadline, sequence)
+            sent_at = self.scheduler.clock()
+            started = False
+            try:
+                async for chunk in self.client.stream(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    system=system,
+                ):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                # Only retry before any text reached the caller
+                if started or not is_rate_limit_error(e):
+                    raise
+                self.scheduler.on_rate_limited(e, sent_at)
+                requeues += 1
+                if requeues > self.scheduler.max_requeues:
+                    self.scheduler.rate_limit_failed(self.lane)
+                    raise
+                continue
+            
+            # Streams report no usage; keep the estimate
+            self.scheduler.settle(estimated, 0)
+            return
+    
+    async def _complete(
+        self,
+        *,
+        model: str,
+        messages: list[dict[str, Any]],
+        max_tokens: int,
+        system: str | None,
+    ) -> LLMResponse:
+        """Unused: ``complete()`` delegates to the provider client."""
+        return await self.complete(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            system=system,
+        )
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get provider client and scheduler metrics."""
+        return {
+            **self.client.get_stats(),
+            "scheduler": self.scheduler.get_stats(),
+        }
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether a provider error is a 429 (quota or rate limit) response."""
+    status = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if status == 429:
+        return True
+    # google.api_core reports quota errors as ResourceExhausted
+    return type(error).__name__ in ("RateLimitError", "ResourceExhausted")
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Seconds a 429 response asked to wait, if it said."""
+    value = getattr(error, "retry_after", None)
+    
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if value is None and headers is not None:
+        value = headers.get("retry-after")
+    
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _estimate_request(messages: list[dict[str, Any]], system: str | None, max_tokens: int) -> int:
+    """Tokens a request may use: its prompt plus all allowed output."""
+    prompt = "".join(str(message.get("content", "")) for message in messages)
+    return estimate_tokens(prompt) + estimate_tokens(system or "") + max_tokens
@@ -1,8 +1,11 @@
 """Dev Task Orchestrator - Main entry point."""
 
 import asyncio
+import json
 import logging
+import os
 import sys
+from datetime import datetime
 from pathlib import Path
 
 from src.core.config import get_config
@@ -12,8 +15,19 @@ from src.core.logging_config import setup_logging
 logger = logging.getLogger(__name__)
 
 
-async def main() -> None:
-    """Main application entry point."""
+async def main(workers: int = 0) -> None:
+    """
+    Main application entry point.
+    
+    Args:
+        workers: Executor processes to start; 0 runs execution in this process
+    """
+    if workers > 0:
+        # The bot and its executor processes (which inherit the environment)
+        # split the provider quotas between them
+        os.environ.setdefault("LLM_QUOTA_PROCESSES", str(workers + 1))
+        get_config.cache_clear()
+    
     # Load configuration
     config = get_config()
     
@@ -28,10 +42,17 @@ async def main() -> None:
     # Import here to avoid circular imports
     from src.chat.telegram_bot import create_bot
     from src.core.orchestrator import DevTaskOrchestrator
-    from src.models.database import init_database
+    from src.core.worker_process import WorkerProcessManager, report_stats
+    from src.core.workers import TaskWorkerPool
+    from src.models.database import close_database, init_database
     
     # Initialize database
-    init_database(config.database_url)
+    init_database(
+        config.database_url,
+        pool_size=config.db_pool_size,
+        busy_timeout=config.db_busy_timeout,
+        sqlite_wal=config.db_sqlite_wal,
+    )
     logger.info("Database initialized")
     
     # Create orchestrator
@@ -44,10 +65,48 @@ async def main() -> None:
         orchestrator=orchestrator,
     )
     
+    # Start task execution: in separate processes, or in this one
+    processes = WorkerProcessManager(workers) if workers > 0 else None
+    pool = TaskWorkerPool(
+        orchestrator=orchestrator,
+        workers=0 if processes else config.task_workers,
+        lease_seconds=config.job_lease_seconds,
+        poll_interval=config.job_poll_interval,
+        max_attempts=config.job_max_attempts,
+        on_finished=bot.notify_task_finished,
+    )
+    
+    started_at = datetime.utcnow()
+    
+    async def report_pool_stats() -> None:
+        # Logged and stored like the executor processes' metrics; without
+        # executor processes nothing else exposes the orchestrator's
+        while True:
+            stats = {**pool.get_stats(), **orchestrator.get_stats()}
+            logger.info("Stats: %s", json.dumps(stats, default=str))
+            await report_stats(pool.name, started_at, stats)
+            await asyncio.sleep(config.worker_stats_interval)
+    
+    if processes is not None:
+        processes.start()
+    pool.start()
+    orchestrator.workspace_gc.start()
+    reporter = asyncio.create_task(report_pool_stats())
+    
     logger.info("Bot started. Listening for messages...")
     
     # Run the bot
-    await bot.run_polling()
+    try:
+        await bot.run_polling()
+    finally:
+        reporter.cancel()
+        await pool.stop()
+        if processes is not None:
+            await processes.stop()
+        await orchestrator.shutdown()
+        from src.llm.client import close_llm_clients
+        await close_llm_clients()
+        close_database()
 
 
 def cli_main() -> None:
@@ -60,6 +119,13 @@ def cli_main() -> None:
         action="store_true",
         help="Enable debug mode",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Run task execution in N separate processes",
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -69,11 +135,10 @@ def cli_main() -> None:
     args = parser.parse_args()
     
     if args.debug:
-        import os
         os.environ["LOG_LEVEL"] = "DEBUG"
     
     try:
-        asyncio.run(main())
+        asyncio.run(main(workers=args.workers))
     except KeyboardInterrupt:
         logger.info("Shutting down...")
         sys.exit(0)
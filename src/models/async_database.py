@@ -0,0 +1,53 @@
+"""Async access to the database.
+
+Each function mirrors the synchronous one in ``src.models.database`` with
+the same name and arguments, but runs it on the database worker pool so
+event-loop handlers never block on queries or disk syncs.
+"""
+
+import functools
+from typing import Any, Awaitable, Callable, TypeVar
+
+from src.models import database
+from src.utils.async_utils import run_in_pool
+
+
+T = TypeVar("T")
+
+
+def _offload(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    """Build an async variant of a database function."""
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        return await run_in_pool(database.get_db_pool(), func, *args, **kwargs)
+    
+    return wrapper
+
+
+save_task = _offload(database.save_task)
+get_task = _offload(database.get_task)
+update_task = _offload(database.update_task)
+update_task_status = _offload(database.update_task_status)
+apply_task_updates = _offload(database.apply_task_updates)
+get_user_tasks = _offload(database.get_user_tasks)
+get_active_task = _offload(database.get_active_task)
+get_task_states = _offload(database.get_task_states)
+
+get_cached_intent = _offload(database.get_cached_intent)
+save_cached_intent = _offload(database.save_cached_intent)
+prune_cached_intents = _offload(database.prune_cached_intents)
+get_cached_plan = _offload(database.get_cached_plan)
+save_cached_plan = _offload(database.save_cached_plan)
+invalidate_cached_plans = _offload(database.invalidate_cached_plans)
+
+enqueue_job = _offload(database.enqueue_job)
+claim_job = _offload(database.claim_job)
+heartbeat_job = _offload(database.heartbeat_job)
+finish_job = _offload(database.finish_job)
+cancel_job = _offload(database.cancel_job)
+is_job_cancelled = _offload(database.is_job_cancelled)
+get_leased_tasks = _offload(database.get_leased_tasks)
+fail_exhausted_jobs = _offload(database.fail_exhausted_jobs)
+count_jobs = _offload(database.count_jobs)
+save_worker_stats = _offload(database.save_worker_stats)
+get_worker_stats = _offload(database.get_worker_stats)
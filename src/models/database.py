@@ -1,19 +1,23 @@
 """Database models and session management."""
 
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime
-from typing import Generator
+from typing import Any, Generator, Iterable
 
 from sqlalchemy import (
     Column,
     DateTime,
     Enum,
+    Index,
     Integer,
     String,
     Text,
     create_engine,
+    event,
 )
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from src.models.task import Task, TaskStatus
 
@@ -24,6 +28,9 @@ Base = declarative_base()
 _engine = None
 _SessionLocal = None
 
+# Threads running database calls for async callers, one per pooled connection
+_db_pool: ThreadPoolExecutor | None = None
+
 
 class TaskModel(Base):
     """SQLAlchemy model for tasks."""
@@ -47,6 +54,38 @@ class TaskModel(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        # Serves active-task lookups and per-user listings
+        Index("ix_tasks_user_status_created", "telegram_user_id", "status", "created_at"),
+    )
+
+
+# Every task column except the large plan/result JSON payloads
+TASK_SUMMARY_COLUMNS = (
+    TaskModel.id,
+    TaskModel.telegram_user_id,
+    TaskModel.telegram_chat_id,
+    TaskModel.description,
+    TaskModel.repo_url,
+    TaskModel.branch,
+    TaskModel.status,
+    TaskModel.current_step,
+    TaskModel.total_steps,
+    TaskModel.error,
+    TaskModel.clarification_round,
+    TaskModel.created_at,
+    TaskModel.updated_at,
+    TaskModel.started_at,
+    TaskModel.completed_at,
+)
+
+ACTIVE_STATUSES = (
+    TaskStatus.PENDING_APPROVAL,
+    TaskStatus.APPROVED,
+    TaskStatus.IN_PROGRESS,
+    TaskStatus.PAUSED,
+)
 
 
 class TaskLogModel(Base):
@@ -75,19 +114,137 @@ class ConversationModel(Base):
     content = Column(Text, nullable=False)
 
 
-def init_database(database_url: str) -> None:
-    """Initialize database connection and create tables."""
-    global _engine, _SessionLocal
+class IntentCacheModel(Base):
+    """SQLAlchemy model for cached intent classifications."""
+    
+    __tablename__ = "intent_cache"
+    
+    key = Column(String(64), primary_key=True)  # sha256 of normalized text
+    normalized_text = Column(Text, nullable=False)
+    result = Column(Text, nullable=False)  # JSON string
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class PlanCacheModel(Base):
+    """SQLAlchemy model for cached execution plans."""
+    
+    __tablename__ = "plan_cache"
+    
+    key = Column(String(64), primary_key=True)  # sha256 of plan inputs
+    repo_url = Column(String(500), nullable=False, index=True)
+    head_sha = Column(String(40), nullable=False, default="")
+    plan = Column(Text, nullable=False)  # JSON string
+    hits = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_used_at = Column(DateTime, default=datetime.utcnow)
+
+
+class JobModel(Base):
+    """SQLAlchemy model for queued task executions."""
+    
+    __tablename__ = "jobs"
+    
+    task_id = Column(String(50), primary_key=True)
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, done, failed, cancelled
+    attempts = Column(Integer, default=0)
+    worker_id = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class WorkerModel(Base):
+    """SQLAlchemy model for executor worker metrics."""
+    
+    __tablename__ = "workers"
+    
+    name = Column(String(100), primary_key=True)  # host:pid
+    started_at = Column(DateTime, default=datetime.utcnow)
+    last_seen_at = Column(DateTime, default=datetime.utcnow, index=True)
+    stats = Column(Text, nullable=True)  # JSON string
+
+
+def init_database(
+    database_url: str,
+    pool_size: int = 8,
+    busy_timeout: int = 5000,
+    sqlite_wal: bool = True,
+) -> None:
+    """
+    Initialize database connection and create tables.
+    
+    Args:
+        database_url: SQLAlchemy database URL
+        pool_size: Pooled connections (and database worker threads)
+        busy_timeout: SQLite lock wait in milliseconds
+        sqlite_wal: Use SQLite WAL journaling with synchronous=NORMAL
+    """
+    global _engine, _SessionLocal, _db_pool
+    
+    is_sqlite = database_url.startswith("sqlite")
+    engine_kwargs: dict[str, Any] = {"echo": False}
+    
+    if is_sqlite:
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+    
+    if _is_memory_database(database_url):
+        # Each connection would open its own empty database: share one
+        # between the database worker threads
+        engine_kwargs["poolclass"] = StaticPool
+    else:
+        engine_kwargs["pool_size"] = pool_size
+        engine_kwargs["max_overflow"] = pool_size
+        engine_kwargs["pool_pre_ping"] = not is_sqlite
+    
+    _engine = create_engine(database_url, **engine_kwargs)
+    
+    if is_sqlite:
+        @event.listens_for(_engine, "connect")
+        def _configure_sqlite(dbapi_connection: Any, connection_record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            if sqlite_wal and not _is_memory_database(database_url):
+                # Readers no longer block the writer; fsync only at checkpoints
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout)}")
+            cursor.close()
     
-    _engine = create_engine(
-        database_url,
-        echo=False,
-        connect_args={"check_same_thread": False} if "sqlite" in database_url else {},
-    )
     _SessionLocal = sessionmaker(bind=_engine)
     
-    # Create tables
+    if _db_pool is not None:
+        _db_pool.shutdown(wait=False)
+    _db_pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="db_worker")
+    
+    # Create tables, plus indexes added after a table was first created
     Base.metadata.create_all(_engine)
+    for index in TaskModel.__table__.indexes:
+        index.create(_engine, checkfirst=True)
+
+
+def close_database() -> None:
+    """Stop the database workers and close pooled connections."""
+    global _db_pool
+    
+    if _db_pool is not None:
+        _db_pool.shutdown(wait=True)
+        _db_pool = None
+    
+    if _engine is not None:
+        _engine.dispose()
+
+
+def get_db_pool() -> ThreadPoolExecutor:
+    """Get the thread pool that runs database calls for async callers."""
+    if _db_pool is None:
+        raise RuntimeError("Database not initialized. Call init_database() first.")
+    
+    return _db_pool
+
+
+def _is_memory_database(database_url: str) -> bool:
+    """Check whether a URL points to an in-memory SQLite database."""
+    return database_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in database_url
 
 
 @contextmanager
@@ -129,33 +286,43 @@ def save_task(task: Task) -> None:
         session.add(model)
 
 
-def get_task(task_id: str) -> Task | None:
-    """Get task by ID."""
+def _row_to_task(row: Any) -> Task:
+    """Build a Task from a model or a projected row (plan/result optional)."""
     import json
     
+    plan = getattr(row, "plan", None)
+    result = getattr(row, "result", None)
+    
+    return Task(
+        id=row.id,
+        telegram_user_id=row.telegram_user_id,
+        telegram_chat_id=row.telegram_chat_id,
+        description=row.description,
+        repo_url=row.repo_url,
+        branch=row.branch or "",
+        status=row.status,
+        current_step=row.current_step or 0,
+        total_steps=row.total_steps or 0,
+        plan=json.loads(plan) if plan else None,
+        result=json.loads(result) if result else None,
+        error=row.error,
+        clarification_round=row.clarification_round or 0,
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        started_at=row.started_at,
+        completed_at=row.completed_at,
+    )
+
+
+def get_task(task_id: str) -> Task | None:
+    """Get task by ID."""
     with get_session() as session:
         model = session.query(TaskModel).filter(TaskModel.id == task_id).first()
         
         if model is None:
             return None
         
-        return Task(
-            id=model.id,
-            telegram_user_id=model.telegram_user_id,
-            telegram_chat_id=model.telegram_chat_id,
-            description=model.description,
-            repo_url=model.repo_url,
-            branch=model.branch,
-            status=model.status,
-            current_step=model.current_step,
-            total_steps=model.total_steps,
-            plan=json.loads(model.plan) if model.plan else None,
-            result=json.loads(model.result) if model.result else None,
-            error=model.error,
-            clarification_round=model.clarification_round,
-            created_at=model.created_at,
-            updated_at=model.updated_at,
-        )
+        return _row_to_task(model)
 
 
 def update_task(task: Task) -> None:
@@ -180,54 +347,488 @@ def update_task(task: Task) -> None:
         model.completed_at = task.completed_at
 
 
-def get_user_tasks(user_id: int, limit: int = 10) -> list[Task]:
-    """Get tasks for a user."""
+# Columns written by update_task (and the write-behind buffer)
+TASK_UPDATE_COLUMNS = (
+    "status",
+    "current_step",
+    "total_steps",
+    "plan",
+    "result",
+    "error",
+    "clarification_round",
+    "started_at",
+    "completed_at",
+)
+
+
+def task_column_values(task: Task, columns: Iterable[str] | None = None) -> dict[str, Any]:
+    """Get the stored representation of a task's updatable columns."""
     import json
     
+    values = {}
+    
+    for column in columns or TASK_UPDATE_COLUMNS:
+        value = getattr(task, column)
+        if column in ("plan", "result"):
+            value = json.dumps(value) if value else None
+        values[column] = value
+    
+    return values
+
+
+def apply_task_updates(updates: dict[str, dict[str, Any]]) -> int:
+    """
+    Write column updates for several tasks in one transaction.
+    
+    Args:
+        updates: Mapping of task ID to {column: value}
+    
+    Returns:
+        Number of rows updated
+    """
+    now = datetime.utcnow()
+    rows = 0
+    
     with get_session() as session:
-        models = (
+        for task_id, values in updates.items():
+            query = session.query(TaskModel).filter(TaskModel.id == task_id)
+            if "status" in values:
+                # An aborted task stays aborted, whatever its worker reports
+                query = query.filter(TaskModel.status != TaskStatus.ABORTED)
+            rows += query.update({**values, "updated_at": now}, synchronize_session=False)
+    
+    return rows
+
+
+def update_task_status(task_id: str, status: TaskStatus, error: str | None = None) -> bool:
+    """Update only the status (and error) of a task; returns False if missing."""
+    values = {TaskModel.status: status, TaskModel.updated_at: datetime.utcnow()}
+    if error is not None:
+        values[TaskModel.error] = error
+    
+    with get_session() as session:
+        updated = (
             session.query(TaskModel)
+            .filter(TaskModel.id == task_id)
+            .update(values, synchronize_session=False)
+        )
+        return updated > 0
+
+
+def get_user_tasks(user_id: int, limit: int = 10) -> list[Task]:
+    """
+    Get recent tasks for a user.
+    
+    Only summary columns are loaded; plan and result are left as None.
+    """
+    with get_session() as session:
+        rows = (
+            session.query(*TASK_SUMMARY_COLUMNS)
             .filter(TaskModel.telegram_user_id == user_id)
             .order_by(TaskModel.created_at.desc())
             .limit(limit)
             .all()
         )
         
-        return [
-            Task(
-                id=m.id,
-                telegram_user_id=m.telegram_user_id,
-                telegram_chat_id=m.telegram_chat_id,
-                description=m.description,
-                repo_url=m.repo_url,
-                status=m.status,
-                created_at=m.created_at,
-            )
-            for m in models
-        ]
+        return [_row_to_task(row) for row in rows]
 
 
-def get_active_task(user_id: int) -> Task | None:
-    """Get currently active task for user."""
-    active_statuses = [
-        TaskStatus.PENDING_APPROVAL,
-        TaskStatus.APPROVED,
-        TaskStatus.IN_PROGRESS,
-        TaskStatus.PAUSED,
-    ]
+def get_task_states(task_ids: Iterable[str]) -> dict[str, tuple[TaskStatus, datetime | None]]:
+    """Get status and last update time of tasks, keyed by task ID."""
+    task_ids = list(task_ids)
+    if not task_ids:
+        return {}
     
     with get_session() as session:
-        model = (
-            session.query(TaskModel)
+        rows = (
+            session.query(TaskModel.id, TaskModel.status, TaskModel.updated_at)
+            .filter(TaskModel.id.in_(task_ids))
+            .all()
+        )
+        
+        return {row.id: (row.status, row.updated_at) for row in rows}
+
+
+def get_active_task(user_id: int, include_payload: bool = True) -> Task | None:
+    """
+    Get currently active task for user in a single query.
+    
+    Args:
+        user_id: Telegram user ID
+        include_payload: Also load the plan and result JSON
+    """
+    columns = TASK_SUMMARY_COLUMNS
+    if include_payload:
+        columns = (*columns, TaskModel.plan, TaskModel.result)
+    
+    with get_session() as session:
+        row = (
+            session.query(*columns)
             .filter(
                 TaskModel.telegram_user_id == user_id,
-                TaskModel.status.in_(active_statuses),
+                TaskModel.status.in_(ACTIVE_STATUSES),
             )
             .order_by(TaskModel.created_at.desc())
             .first()
         )
         
+        return _row_to_task(row) if row is not None else None
+
+
+def get_cached_intent(key: str, max_age_seconds: float) -> tuple[str, float] | None:
+    """
+    Get a cached intent result if younger than max_age_seconds.
+    
+    An expired row is deleted when it is read.
+    
+    Returns:
+        (result JSON, seconds left to live), or None
+    """
+    with get_session() as session:
+        model = session.query(IntentCacheModel).filter(IntentCacheModel.key == key).first()
+        
         if model is None:
             return None
         
-        return get_task(model.id)
+        age = (datetime.utcnow() - model.created_at).total_seconds()
+        if age >= max_age_seconds:
+            session.delete(model)
+            return None
+        
+        return model.result, max_age_seconds - age
+
+
+def save_cached_intent(key: str, normalized_text: str, result: str) -> None:
+    """Insert or refresh a cached intent result (JSON)."""
+    with get_session() as session:
+        session.merge(IntentCacheModel(
+            key=key,
+            normalized_text=normalized_text,
+            result=result,
+            created_at=datetime.utcnow(),
+        ))
+
+
+def prune_cached_intents(max_age_seconds: float) -> int:
+    """Delete cached intent results older than max_age_seconds."""
+    from datetime import timedelta
+    
+    min_created_at = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+    
+    with get_session() as session:
+        return (
+            session.query(IntentCacheModel)
+            .filter(IntentCacheModel.created_at < min_created_at)
+            .delete(synchronize_session=False)
+        )
+
+
+def get_cached_plan(key: str) -> str | None:
+    """Get a cached plan (JSON) and record the hit."""
+    with get_session() as session:
+        model = session.query(PlanCacheModel).filter(PlanCacheModel.key == key).first()
+        
+        if model is None:
+            return None
+        
+        model.hits = (model.hits or 0) + 1
+        model.last_used_at = datetime.utcnow()
+        
+        return model.plan
+
+
+def save_cached_plan(key: str, repo_url: str, head_sha: str, plan: str) -> None:
+    """Insert or replace a cached plan (JSON)."""
+    now = datetime.utcnow()
+    
+    with get_session() as session:
+        session.merge(PlanCacheModel(
+            key=key,
+            repo_url=repo_url,
+            head_sha=head_sha,
+            plan=plan,
+            hits=0,
+            created_at=now,
+            last_used_at=now,
+        ))
+
+
+def invalidate_cached_plans(repo_url: str, current_sha: str) -> int:
+    """Delete cached plans for a repository built at another commit."""
+    with get_session() as session:
+        return (
+            session.query(PlanCacheModel)
+            .filter(
+                PlanCacheModel.repo_url == repo_url,
+                PlanCacheModel.head_sha != current_sha,
+            )
+            .delete(synchronize_session=False)
+        )
+
+
+def enqueue_job(task_id: str) -> None:
+    """Queue a task for execution (re-queueing it if it already has a job)."""
+    now = datetime.utcnow()
+    
+    with get_session() as session:
+        session.merge(JobModel(
+            task_id=task_id,
+            status="queued",
+            attempts=0,
+            worker_id=None,
+            lease_expires_at=None,
+            last_error=None,
+            created_at=now,
+            updated_at=now,
+        ))
+
+
+def claim_job(worker_id: str, lease_seconds: float, max_attempts: int) -> str | None:
+    """
+    Claim the oldest runnable job.
+    
+    A job is runnable when queued, or when running with an expired lease
+    (its worker died) and attempts remain. The claim is a conditional
+    UPDATE, so concurrent workers never get the same job.
+    
+    Returns:
+        Task ID of the claimed job, or None if there is nothing to run
+    """
+    from datetime import timedelta
+    
+    from sqlalchemy import and_, or_
+    
+    now = datetime.utcnow()
+    runnable = or_(
+        JobModel.status == "queued",
+        and_(
+            JobModel.status == "running",
+            JobModel.lease_expires_at < now,
+            JobModel.attempts < max_attempts,
+        ),
+    )
+    
+    with get_session() as session:
+        candidates = (
+            session.query(JobModel.task_id)
+            .filter(runnable)
+            .order_by(JobModel.created_at)
+            .limit(5)
+            .all()
+        )
+        
+        for (task_id,) in candidates:
+            claimed = (
+                session.query(JobModel)
+                .filter(JobModel.task_id == task_id, runnable)
+                .update({
+                    JobModel.status: "running",
+                    JobModel.worker_id: worker_id,
+                    JobModel.lease_expires_at: now + timedelta(seconds=lease_seconds),
+                    JobModel.attempts: JobModel.attempts + 1,
+                    JobModel.updated_at: now,
+                }, synchronize_session=False)
+            )
+            if claimed:
+                return task_id
+    
+    return None
+
+
+def heartbeat_job(task_id: str, worker_id: str, lease_seconds: float) -> bool:
+    """Extend a job lease; returns False if the worker no longer holds it."""
+    from datetime import timedelta
+    
+    now = datetime.utcnow()
+    
+    with get_session() as session:
+        updated = (
+            session.query(JobModel)
+            .filter(
+                JobModel.task_id == task_id,
+                JobModel.worker_id == worker_id,
+                JobModel.status == "running",
+            )
+            .update({
+                JobModel.lease_expires_at: now + timedelta(seconds=lease_seconds),
+                JobModel.updated_at: now,
+            }, synchronize_session=False)
+        )
+        return updated > 0
+
+
+def finish_job(task_id: str, worker_id: str, status: str, error: str | None = None) -> bool:
+    """
+    Mark a claimed job as done, failed, or queued again (released).
+    
+    Returns:
+        False if the worker no longer held the job
+    """
+    values = {
+        JobModel.status: status,
+        JobModel.last_error: error,
+        JobModel.lease_expires_at: None,
+        JobModel.updated_at: datetime.utcnow(),
+    }
+    if status == "queued":
+        # A released job is not counted as a failed attempt
+        values[JobModel.attempts] = JobModel.attempts - 1
+    
+    with get_session() as session:
+        updated = (
+            session.query(JobModel)
+            .filter(
+                JobModel.task_id == task_id,
+                JobModel.worker_id == worker_id,
+                JobModel.status == "running",
+            )
+            .update(values, synchronize_session=False)
+        )
+        return updated > 0
+
+
+def cancel_job(task_id: str) -> str | None:
+    """
+    Cancel the queued or running job of a task.
+    
+    Cancelled jobs are never claimed; a worker running one stops at its
+    next step or heartbeat.
+    
+    Returns:
+        Status the job had ("queued" or "running"), or None if there was
+        no job to cancel
+    """
+    with get_session() as session:
+        job = (
+            session.query(JobModel.status)
+            .filter(JobModel.task_id == task_id, JobModel.status.in_(("queued", "running")))
+            .first()
+        )
+        if job is None:
+            return None
+        
+        # The lease is kept: its worker may still be pushing finished steps
+        updated = (
+            session.query(JobModel)
+            .filter(JobModel.task_id == task_id, JobModel.status == job.status)
+            .update({
+                JobModel.status: "cancelled",
+                JobModel.updated_at: datetime.utcnow(),
+            }, synchronize_session=False)
+        )
+        return job.status if updated else None
+
+
+def is_job_cancelled(task_id: str) -> bool:
+    """Whether the job of a task was cancelled."""
+    with get_session() as session:
+        status = (
+            session.query(JobModel.status)
+            .filter(JobModel.task_id == task_id)
+            .scalar()
+        )
+        return status == "cancelled"
+
+
+def get_leased_tasks(task_ids: Iterable[str]) -> set[str]:
+    """
+    Get the tasks whose job lease has not expired.
+    
+    A worker may still use the workspace of such a task, even when its job
+    was cancelled meanwhile.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return set()
+    
+    with get_session() as session:
+        rows = (
+            session.query(JobModel.task_id)
+            .filter(JobModel.task_id.in_(task_ids), JobModel.lease_expires_at > datetime.utcnow())
+            .all()
+        )
+        return {task_id for (task_id,) in rows}
+
+
+def fail_exhausted_jobs(max_attempts: int) -> list[str]:
+    """
+    Fail jobs whose lease expired after their last allowed attempt.
+    
+    Each job is failed with a conditional UPDATE, like ``claim_job()``, so
+    a job its worker finished or heartbeated meanwhile is left alone.
+    
+    Returns:
+        Task IDs of the jobs this call failed
+    """
+    from sqlalchemy import and_
+    
+    now = datetime.utcnow()
+    exhausted = and_(
+        JobModel.status == "running",
+        JobModel.lease_expires_at < now,
+        JobModel.attempts >= max_attempts,
+    )
+    
+    with get_session() as session:
+        candidates = session.query(JobModel.task_id).filter(exhausted).all()
+        
+        failed = []
+        for (task_id,) in candidates:
+            updated = (
+                session.query(JobModel)
+                .filter(JobModel.task_id == task_id, exhausted)
+                .update({
+                    JobModel.status: "failed",
+                    JobModel.last_error: "Lease expired after the last attempt",
+                    JobModel.updated_at: now,
+                }, synchronize_session=False)
+            )
+            if updated == 1:
+                failed.append(task_id)
+        
+        return failed
+
+
+def count_jobs() -> dict[str, int]:
+    """Count jobs by status."""
+    from sqlalchemy import func
+    
+    with get_session() as session:
+        rows = session.query(JobModel.status, func.count()).group_by(JobModel.status).all()
+        return dict(rows)
+
+
+def save_worker_stats(name: str, started_at: datetime, stats: str) -> None:
+    """Insert or refresh a worker's metrics (JSON)."""
+    with get_session() as session:
+        session.merge(WorkerModel(
+            name=name,
+            started_at=started_at,
+            last_seen_at=datetime.utcnow(),
+            stats=stats,
+        ))
+
+
+def get_worker_stats(max_age_seconds: float) -> dict[str, dict[str, Any]]:
+    """Get metrics of workers seen within max_age_seconds, by worker name."""
+    import json
+    from datetime import timedelta
+    
+    min_seen_at = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+    
+    with get_session() as session:
+        models = (
+            session.query(WorkerModel)
+            .filter(WorkerModel.last_seen_at >= min_seen_at)
+            .order_by(WorkerModel.name)
+            .all()
+        )
+        
+        return {
+            model.name: {
+                "started_at": model.started_at.isoformat(),
+                "last_seen_at": model.last_seen_at.isoformat(),
+                **(json.loads(model.stats) if model.stats else {}),
+            }
+            for model in models
+        }
@@ -39,6 +39,7 @@ class Intent(str, Enum):
     TASK_NEW = "task_new"
     TASK_CONTINUE = "task_continue"
     TASK_LIST = "task_list"
+    TASK_STATUS = "task_status"
     TASK_ABORT = "task_abort"
 
 
@@ -0,0 +1,204 @@
+"""Write-behind buffer for task state updates."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from src.models.task import Task, TaskStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+TERMINAL_STATUSES = frozenset({
+    TaskStatus.COMPLETED,
+    TaskStatus.FAILED,
+    TaskStatus.ABORTED,
+})
+
+# Tasks whose last written values are remembered to skip unchanged columns
+MAX_TRACKED_TASKS = 1024
+
+
+class TaskWriteBuffer:
+    """
+    Coalesces task updates and writes them periodically.
+    
+    Updates to the same task within a flush window are merged, and only
+    columns that differ from what this buffer last wrote are persisted, in
+    a single transaction per flush. Terminal states are written immediately
+    so they are never lost, and ``close()`` flushes everything on shutdown.
+    
+    What was written is only remembered while this buffer owns the task:
+    a task is forgotten once terminal or handed to the job queue (another
+    process may write it next), and at most ``max_tracked`` tasks are kept.
+    """
+    
+    def __init__(self, flush_interval: float = 1.0, max_tracked: int = MAX_TRACKED_TASKS) -> None:
+        """
+        Initialize the buffer.
+        
+        Args:
+            flush_interval: Maximum delay before an update is written
+            max_tracked: Tasks whose written values are remembered
+        """
+        self.flush_interval = flush_interval
+        self.max_tracked = max_tracked
+        
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._persisted: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._flusher: asyncio.Task[None] | None = None
+        self._started_at = time.monotonic()
+        
+        # Metrics
+        self.updates = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.forced_flushes = 0
+        self.rows_written = 0
+        self.columns_written = 0
+    
+    async def update(self, task: Task, columns: Iterable[str] | None = None) -> None:
+        """
+        Queue a task update.
+        
+        Args:
+            task: Task with the new state
+            columns: Columns to update, or None for all updatable columns
+        """
+        from src.models.database import task_column_values
+        
+        columns = list(columns) if columns is not None else None
+        values = task_column_values(task, columns)
+        
+        if task.id in self._pending:
+            self.coalesced += 1
+        self._pending.setdefault(task.id, {}).update(values)
+        self.updates += 1
+        
+        if "status" in values and task.status in TERMINAL_STATUSES:
+            self.forced_flushes += 1
+            await self.release(task.id)
+        else:
+            self._ensure_flusher()
+    
+    async def flush(self, task_id: str | None = None) -> int:
+        """
+        Write pending updates.
+        
+        Args:
+            task_id: Flush only this task, or None for all
+        
+        Returns:
+            Number of rows written
+        """
+        from src.models.async_database import apply_task_updates
+        
+        async with self._lock:
+            if task_id is None:
+                batch, self._pending = self._pending, {}
+            elif task_id in self._pending:
+                batch = {task_id: self._pending.pop(task_id)}
+            else:
+                return 0
+            
+            changes = {}
+            for pending_id, values in batch.items():
+                persisted = self._persisted.get(pending_id, {})
+                changed = {
+                    column: value for column, value in values.items()
+                    if column not in persisted or persisted[column] != value
+                }
+                if changed:
+                    changes[pending_id] = changed
+            
+            if not changes:
+                return 0
+            
+            try:
+                rows = await apply_task_updates(changes)
+            except Exception:
+                # Keep the updates for the next flush; newer values win
+                for pending_id, values in batch.items():
+                    self._pending[pending_id] = {**values, **self._pending.get(pending_id, {})}
+                raise
+            
+            for pending_id, changed in changes.items():
+                self._persisted.setdefault(pending_id, {}).update(changed)
+                self._persisted.move_to_end(pending_id)
+            while len(self._persisted) > self.max_tracked:
+                self._persisted.popitem(last=False)
+            
+            if rows < len(changes):
+                logger.warning("%d buffered task updates matched no row", len(changes) - rows)
+            
+            self.flushes += 1
+            self.rows_written += rows
+            self.columns_written += sum(len(changed) for changed in changes.values())
+            
+            return rows
+    
+    async def release(self, task_id: str) -> int:
+        """
+        Write the pending updates of a task and forget what was written.
+        
+        Later updates of the task write every column they carry, so values
+        changed meanwhile by someone else are not mistaken for unchanged.
+        
+        Returns:
+            Number of rows written
+        """
+        try:
+            return await self.flush(task_id)
+        finally:
+            self._persisted.pop(task_id, None)
+    
+    async def close(self) -> None:
+        """Stop the periodic flusher and write everything pending."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        
+        await self.flush()
+    
+    def _ensure_flusher(self) -> None:
+        """Start the periodic flusher if it is not running."""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run())
+    
+    async def _run(self) -> None:
+        """Flush pending updates every flush interval until none are left."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Task write flush failed: %s", e)
+                continue
+            
+            if not self._pending:
+                return
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get buffer metrics."""
+        elapsed = time.monotonic() - self._started_at
+        
+        return {
+            "pending": len(self._pending),
+            "tracked": len(self._persisted),
+            "updates": self.updates,
+            "coalesced": self.coalesced,
+            "flushes": self.flushes,
+            "forced_flushes": self.forced_flushes,
+            "rows_written": self.rows_written,
+            "columns_written": self.columns_written,
+            "rows_per_second": self.rows_written / elapsed if elapsed else 0.0,
+        }
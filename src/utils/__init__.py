@@ -1,6 +1,6 @@
 """Utility functions and helpers."""
 
-from src.utils.async_utils import run_sync
+from src.utils.async_utils import run_in_pool, run_sync
 
 
-__all__ = ["run_sync"]
+__all__ = ["run_in_pool", "run_sync"]
@@ -1,7 +1,7 @@
 """Async utility functions."""
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ThreadPoolExecutor
 from functools import partial, wraps
 from typing import Any, Callable, TypeVar
 
@@ -29,12 +29,36 @@ async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
     Example:
         result = await run_sync(some_blocking_io, param1, param2)
     """
-    loop = asyncio.get_event_loop()
+    return await run_in_pool(_executor, func, *args, **kwargs)
+
+
+async def run_in_pool(
+    pool: Executor,
+    func: Callable[..., T],
+    *args: Any,
+    **kwargs: Any,
+) -> T:
+    """
+    Run a synchronous function in a specific executor.
+    
+    Use this instead of run_sync for subsystems that need their own
+    bounded pool (e.g. model calls) so they cannot starve the shared one.
+    
+    Args:
+        pool: Executor to run the function in
+        func: Synchronous function to run
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+        
+    Returns:
+        Result of the function call
+    """
+    loop = asyncio.get_running_loop()
     
     if kwargs:
         func = partial(func, **kwargs)
     
-    return await loop.run_in_executor(_executor, func, *args)
+    return await loop.run_in_executor(pool, func, *args)
 
 
 def async_wrap(func: Callable[..., T]) -> Callable[..., T]:
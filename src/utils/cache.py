@@ -0,0 +1,102 @@
+"""In-memory caches."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, TypeVar
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded LRU cache with per-entry time-to-live.
+    
+    Entries expire ``ttl`` seconds after being set; when the cache is full
+    the least recently used entry is evicted.
+    """
+    
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries
+            ttl: Entry lifetime in seconds
+            clock: Time source (monotonic seconds)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: K) -> V | None:
+        """Get a live entry, refreshing its LRU position."""
+        entry = self._data.get(key)
+        
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store an entry, evicting the least recently used if full."""
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+    
+    def delete(self, key: K) -> None:
+        """Remove an entry if present."""
+        self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __contains__(self, key: object) -> bool:
+        entry = self._data.get(key)  # type: ignore[call-overload]
+        return entry is not None and entry[0] > self._clock()
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache metrics."""
+        lookups = self.hits + self.misses
+        
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,28 @@
+"""Text normalization helpers."""
+
+import re
+import unicodedata
+
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s/:.\-]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_message(text: str) -> str:
+    """
+    Normalize a chat message for matching.
+    
+    Lowercases, strips accents and punctuation (keeping URL characters)
+    and collapses whitespace, so "¿Cómo va?" and "como va" compare equal.
+    
+    Args:
+        text: Raw message text
+    
+    Returns:
+        Normalized text
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    without_accents = "".join(c for c in decomposed if not unicodedata.combining(c))
+    without_punctuation = _PUNCTUATION_RE.sub(" ", without_accents)
+    collapsed = _WHITESPACE_RE.sub(" ", without_punctuation).strip()
+    return collapsed.rstrip(".")
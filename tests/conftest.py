@@ -42,6 +42,34 @@ def db_engine():
     engine.dispose()
 
 
+@pytest.fixture
+def database(tmp_path: Path) -> Generator[str, None, None]:
+    """Initialize the application database in a temporary SQLite file."""
+    from src.models.database import close_database, init_database
+    
+    url = f"sqlite:///{tmp_path / 'tasks.db'}"
+    init_database(url, pool_size=2)
+    yield url
+    close_database()
+
+
+@pytest.fixture
+def config(tmp_path: Path, database: str):
+    """Application configuration with dummy credentials and temporary paths."""
+    from src.core.config import Config
+    
+    return Config(
+        _env_file=None,
+        TELEGRAM_BOT_TOKEN="test-token",
+        ANTHROPIC_API_KEY="test-key",
+        GOOGLE_AI_API_KEY="test-key",
+        GITHUB_TOKEN="test-token",
+        DATABASE_URL=database,
+        WORKSPACE_PATH=str(tmp_path / "workspace"),
+        LOG_DIR=str(tmp_path / "logs"),
+    )
+
+
 @pytest.fixture
 def db_session(db_engine) -> Generator[Session, None, None]:
     """Create database session for tests."""
@@ -125,6 +153,27 @@ def git_repo(tmp_path: Path) -> Generator[Path, None, None]:
     yield repo_path
 
 
+@pytest.fixture
+def github_remote(tmp_path: Path, git_repo: Path) -> Generator[tuple[str, Path], None, None]:
+    """
+    Bare copy of ``git_repo`` served as ``test/repo`` from a local base URL.
+    
+    Returns:
+        (git base URL for GitHubManager, path of the bare repository)
+    """
+    import subprocess
+    
+    remotes = tmp_path / "remotes"
+    bare = remotes / "test" / "repo.git"
+    bare.parent.mkdir(parents=True)
+    subprocess.run(
+        ["git", "clone", "-q", "--bare", str(git_repo), str(bare)],
+        check=True, capture_output=True
+    )
+    
+    yield f"file://{remotes}", bare
+
+
 @pytest.fixture
 def dev_tasks_dir(git_repo: Path) -> Path:
     """Create .dev-tasks directory in repo."""
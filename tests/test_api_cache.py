@@ -0,0 +1,242 @@
+"""Tests for the cached GitHub API reads against a local HTTP server."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Generator
+
+import pytest
+from github import Github, GithubException
+
+from src.git.api_cache import MAX_BACKOFF, GitHubApiCache
+
+
+KEY = ("owner/repo", "", "")
+URL = "/repos/owner/repo"
+
+
+class Clock:
+    """Manually advanced wall clock."""
+    
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeGitHub:
+    """State of the local API server: one JSON body per path, with ETags."""
+    
+    def __init__(self) -> None:
+        self.bodies: dict[str, Any] = {URL: {"default_branch": "main"}}
+        self.version = 1
+        self.status: int | None = None
+        self.rate_limit_remaining = 5000
+        self.rate_limit_reset = 0.0
+        # (path, If-None-Match) of every request
+        self.requests: list[tuple[str, str | None]] = []
+    
+    def etag(self) -> str:
+        return f'"v{self.version}"'
+
+
+def make_handler(state: FakeGitHub) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            path = self.path.split("?")[0]
+            if_none_match = self.headers.get("If-None-Match")
+            state.requests.append((path, if_none_match))
+            
+            if state.status is not None:
+                status, body = state.status, {"message": "API rate limit exceeded"}
+            elif path not in state.bodies:
+                status, body = 404, {"message": "Not Found"}
+            elif if_none_match == state.etag():
+                status, body = 304, None
+            else:
+                status, body = 200, state.bodies[path]
+            
+            payload = json.dumps(body).encode() if body is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("ETag", state.etag())
+            self.send_header("X-RateLimit-Remaining", str(state.rate_limit_remaining))
+            self.send_header("X-RateLimit-Reset", str(int(state.rate_limit_reset)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+    
+    return Handler
+
+
+@pytest.fixture
+def github_api() -> Generator[tuple[FakeGitHub, str], None, None]:
+    """Local GitHub API server; yields its state and base URL."""
+    state = FakeGitHub()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    try:
+        yield state, f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Record asyncio.sleep delays instead of waiting them out."""
+    recorded: list[float] = []
+    
+    async def fake_sleep(delay: float, result=None):
+        recorded.append(delay)
+        return result
+    
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def make_cache(base_url: str, clock: Clock, **kwargs) -> GitHubApiCache:
+    github = Github(base_url=base_url, retry=None)
+    return GitHubApiCache(github.requester, ttl=60.0, clock=clock, **kwargs)
+
+
+async def test_fresh_entry_served_without_request(github_api):
+    state, base_url = github_api
+    cache = make_cache(base_url, Clock())
+    
+    assert await cache.get(KEY, URL) == {"default_branch": "main"}
+    assert await cache.get(KEY, URL) == {"default_branch": "main"}
+    
+    assert state.requests == [(URL, None)]
+    assert cache.fresh_hits == 1
+    assert cache.rate_limit_remaining == 5000
+
+
+async def test_expired_entry_revalidated_with_etag(github_api):
+    state, base_url = github_api
+    clock = Clock()
+    cache = make_cache(base_url, clock)
+    await cache.get(KEY, URL)
+    
+    clock.now += 61
+    assert await cache.get(KEY, URL) == {"default_branch": "main"}
+    
+    assert state.requests == [(URL, None), (URL, '"v1"')]
+    assert cache.revalidated == 1
+    
+    # The 304 renewed the entry for another TTL
+    clock.now += 30
+    await cache.get(KEY, URL)
+    assert len(state.requests) == 2
+
+
+async def test_expired_entry_replaced_when_changed(github_api):
+    state, base_url = github_api
+    clock = Clock()
+    cache = make_cache(base_url, clock)
+    await cache.get(KEY, URL)
+    
+    state.bodies[URL] = {"default_branch": "develop"}
+    state.version = 2
+    clock.now += 61
+    assert await cache.get(KEY, URL) == {"default_branch": "develop"}
+    assert cache.revalidated == 0
+    
+    clock.now += 61
+    await cache.get(KEY, URL)
+    assert state.requests[-1] == (URL, '"v2"')
+    assert cache.revalidated == 1
+
+
+async def test_stale_entry_served_near_rate_limit(github_api):
+    state, base_url = github_api
+    clock = Clock()
+    cache = make_cache(base_url, clock, rate_limit_reserve=10)
+    state.rate_limit_remaining = 5
+    state.rate_limit_reset = clock.now + 600
+    await cache.get(KEY, URL)
+    
+    clock.now += 61
+    assert await cache.get(KEY, URL) == {"default_branch": "main"}
+    
+    assert len(state.requests) == 1
+    assert cache.stale_served == 1
+
+
+async def test_stale_entry_revalidated_after_window_reset(github_api):
+    state, base_url = github_api
+    clock = Clock()
+    cache = make_cache(base_url, clock, rate_limit_reserve=10)
+    state.rate_limit_remaining = 5
+    state.rate_limit_reset = clock.now + 30
+    await cache.get(KEY, URL)
+    
+    clock.now += 61
+    await cache.get(KEY, URL)
+    
+    assert len(state.requests) == 2
+    assert cache.revalidated == 1
+
+
+async def test_new_request_waits_for_rate_limit_reset(github_api, sleeps):
+    state, base_url = github_api
+    clock = Clock()
+    cache = make_cache(base_url, clock, rate_limit_reserve=10)
+    state.rate_limit_remaining = 5
+    state.rate_limit_reset = clock.now + 30
+    state.bodies["/repos/owner/other"] = {"default_branch": "main"}
+    await cache.get(KEY, URL)
+    
+    await cache.get(("owner/other", "", ""), "/repos/owner/other")
+    
+    assert sleeps == [30.0]
+    assert cache.backoffs == 1
+    assert len(state.requests) == 2
+
+
+async def test_rate_limit_wait_is_capped(github_api, sleeps):
+    state, base_url = github_api
+    clock = Clock()
+    cache = make_cache(base_url, clock, rate_limit_reserve=10)
+    state.rate_limit_remaining = 0
+    state.rate_limit_reset = clock.now + 3600
+    state.bodies["/repos/owner/other"] = {"default_branch": "main"}
+    await cache.get(KEY, URL)
+    
+    await cache.get(("owner/other", "", ""), "/repos/owner/other")
+    
+    assert sleeps == [MAX_BACKOFF]
+
+
+async def test_limit_hit_during_revalidation_serves_stale(github_api):
+    state, base_url = github_api
+    clock = Clock()
+    cache = make_cache(base_url, clock, rate_limit_reserve=10)
+    await cache.get(KEY, URL)
+    
+    # Another process used up the window
+    state.status = 403
+    state.rate_limit_remaining = 0
+    state.rate_limit_reset = clock.now + 600
+    clock.now += 61
+    assert await cache.get(KEY, URL) == {"default_branch": "main"}
+    
+    assert cache.stale_served == 1
+
+
+async def test_error_responses_raise(github_api):
+    _, base_url = github_api
+    cache = make_cache(base_url, Clock())
+    
+    with pytest.raises(GithubException) as excinfo:
+        await cache.get(("owner/missing", "", ""), "/repos/owner/missing")
+    assert excinfo.value.status == 404
+    assert cache.get_stats()["requests"] == 1
@@ -0,0 +1,147 @@
+"""Tests for recorded change sets and committing them."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.git.change_set import CREATED, DELETED, MODIFIED, ChangeSet
+from src.git.github_manager import GitHubManager
+
+
+def git(*args: str, cwd: Path) -> str:
+    """Run a git command and return its output."""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.rstrip()
+
+
+class TestChangeSet:
+    """Net-change bookkeeping."""
+    
+    def test_created_then_deleted_disappears(self) -> None:
+        changes = ChangeSet()
+        changes.record("a.py", CREATED)
+        changes.record("a.py", MODIFIED)
+        changes.record("a.py", DELETED)
+        
+        assert len(changes) == 0
+    
+    def test_deleted_then_written_is_modified(self) -> None:
+        changes = ChangeSet()
+        changes.record("a.py", DELETED)
+        changes.record("a.py", CREATED)
+        
+        assert changes.kind("a.py") == MODIFIED
+    
+    def test_update_applies_later_changes(self) -> None:
+        changes = ChangeSet(created={"new.py"}, modified={"old.py"})
+        later = ChangeSet(deleted={"new.py", "old.py"})
+        
+        changes.update(later)
+        
+        assert changes.to_dict() == {CREATED: [], MODIFIED: [], DELETED: ["old.py"]}
+    
+    def test_round_trips_through_dict(self) -> None:
+        changes = ChangeSet(created={"b.py"}, modified={"a.py"}, deleted={"c.py"})
+        
+        restored = ChangeSet.from_dict(changes.to_dict())
+        
+        assert list(restored.items()) == list(changes.items())
+        assert restored.paths() == ["a.py", "b.py", "c.py"]
+        assert ChangeSet.from_dict(None).paths() == []
+    
+    def test_unknown_kind_is_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            ChangeSet().record("a.py", "renamed")
+
+
+@pytest.fixture
+async def manager(tmp_path: Path) -> GitHubManager:
+    """GitHubManager with an empty workspace."""
+    manager = GitHubManager(token="unused", workspace_path=tmp_path / "workspace")
+    yield manager
+    manager.git.close()
+
+
+@pytest.fixture
+def task_repo(git_repo: Path) -> Path:
+    """``git_repo`` with more tracked files, on a task branch."""
+    (git_repo / "keep.py").write_text("KEEP = 1\n")
+    (git_repo / "gone.py").write_text("GONE = 1\n")
+    git("add", "-A", cwd=git_repo)
+    git("commit", "-q", "-m", "more files", cwd=git_repo)
+    git("checkout", "-q", "-b", "dev-task/changes", cwd=git_repo)
+    return git_repo
+
+
+async def test_commit_contains_exactly_the_recorded_paths(
+    manager: GitHubManager,
+    task_repo: Path,
+) -> None:
+    # Recorded changes
+    (task_repo / "new.py").write_text("NEW = 1\n")
+    (task_repo / "README.md").write_text("# Changed\n")
+    (task_repo / "gone.py").unlink()
+    changes = ChangeSet()
+    changes.record("new.py", CREATED)
+    changes.record("README.md", MODIFIED)
+    changes.record("gone.py", DELETED)
+    
+    # Changes the task did not make
+    (task_repo / "keep.py").write_text("KEEP = 2\n")
+    (task_repo / "stray.txt").write_text("untracked\n")
+    
+    commands: list[tuple[str, ...]] = []
+    run = manager.git.run
+    
+    async def recording_run(repo_path: Path | None, *args: str, **kwargs: object) -> str:
+        commands.append(args)
+        return await run(repo_path, *args, **kwargs)
+    
+    manager.git.run = recording_run
+    
+    sha = await manager.commit_changes(task_repo, "Recorded changes", changes=changes)
+    
+    assert sha == git("rev-parse", "HEAD", cwd=task_repo)
+    committed = git("diff-tree", "--no-commit-id", "--name-status", "-r", sha, cwd=task_repo)
+    assert committed.splitlines() == ["M\tREADME.md", "D\tgone.py", "A\tnew.py"]
+    
+    # The working tree was never scanned
+    assert not any(args[0] in ("status", "add", "commit", "diff") for args in commands)
+    
+    # Unrecorded changes are left uncommitted
+    status = git("status", "--porcelain", cwd=task_repo)
+    assert status.splitlines() == [" M keep.py", "?? stray.txt"]
+
+
+async def test_unchanged_paths_make_no_commit(manager: GitHubManager, task_repo: Path) -> None:
+    head = git("rev-parse", "HEAD", cwd=task_repo)
+    (task_repo / "keep.py").write_text("KEEP = 1\n")
+    
+    sha = await manager.commit_changes(
+        task_repo, "Nothing", changes=ChangeSet(modified={"keep.py"})
+    )
+    
+    assert sha is None
+    assert git("rev-parse", "HEAD", cwd=task_repo) == head
+
+
+async def test_verify_reports_mismatches(manager: GitHubManager, task_repo: Path) -> None:
+    (task_repo / "new.py").write_text("NEW = 1\n")
+    (task_repo / "keep.py").write_text("KEEP = 2\n")
+    
+    mismatches = await manager.verify_changes(
+        task_repo, ChangeSet(created={"new.py"}, deleted={"keep.py"})
+    )
+    
+    assert mismatches == {"keep.py": MODIFIED}
+    assert manager.change_mismatches == 1
+
+
+async def test_protected_branch_is_refused(manager: GitHubManager, task_repo: Path) -> None:
+    git("checkout", "-q", "-b", "main", cwd=task_repo)
+    (task_repo / "new.py").write_text("NEW = 1\n")
+    
+    with pytest.raises(ValueError, match="protected"):
+        await manager.commit_changes(task_repo, "No", changes=ChangeSet(created={"new.py"}))
@@ -0,0 +1,135 @@
+"""Tests for selecting the files a step prompt sees."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.agents.context_retriever import ContextRetriever
+from src.git.repo_indexer import RepoIndexer
+from src.models.task import Task
+
+
+REPO_KEY = "test/repo"
+FILES = {
+    "src/app.py": "from src.models import User\n\ndef run():\n    return User()\n",
+    "src/models.py": "class User:\n    pass\n",
+    "src/billing.py": "def charge_invoice():\n    pass\n",
+    "docs/notes.md": "notas\n",
+}
+
+
+def git(*args: str, cwd: Path) -> str:
+    """Run a git command and return its output."""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.rstrip()
+
+
+def commit(repo: Path, files: dict[str, str], message: str) -> str:
+    for name, content in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    git("add", ".", cwd=repo)
+    git("commit", "-qm", message, cwd=repo)
+    return git("rev-parse", "HEAD", cwd=repo)
+
+
+@pytest.fixture
+def repos_path(tmp_path: Path) -> Path:
+    return tmp_path / "workspace" / ".repos"
+
+
+@pytest.fixture
+def checkout(git_repo: Path, repos_path: Path) -> Path:
+    """Shared checkout of the repository, detached like sync_repository leaves it."""
+    path = repos_path / REPO_KEY
+    path.parent.mkdir(parents=True)
+    git("clone", "-q", str(git_repo), str(path), cwd=git_repo.parent)
+    return path
+
+
+@pytest.fixture
+def task() -> Task:
+    return Task(
+        id="task-ctx-001",
+        telegram_user_id=1,
+        telegram_chat_id=1,
+        description="Add billing",
+        repo_url="https://github.com/test/repo",
+    )
+
+
+async def make_retriever(tmp_path: Path, repos_path: Path, checkout: Path, sha: str):
+    """Retriever whose index and shared checkout are at ``sha``."""
+    git("fetch", "-q", "origin", cwd=checkout)
+    git("checkout", "-q", "--detach", sha, cwd=checkout)
+    indexer = RepoIndexer(tmp_path / "index")
+    await indexer.index(REPO_KEY, checkout, sha)
+    return ContextRetriever(indexer=indexer, repos_path=repos_path, max_tokens=1000)
+
+
+async def test_step_files_come_first_then_related(tmp_path, git_repo, repos_path, checkout, task):
+    sha = commit(git_repo, FILES, "Add app")
+    retriever = await make_retriever(tmp_path, repos_path, checkout, sha)
+    workspace = tmp_path / "task"
+    workspace.mkdir()
+    
+    paso = {"paso": 1, "descripcion": "Charge the invoice", "archivos": ["src/app.py"]}
+    context = await retriever.retrieve(task, paso, workspace)
+    
+    assert list(context.files) == ["src/app.py", "src/models.py", "src/billing.py"]
+    assert context.related == ["src/models.py", "src/billing.py"]
+    assert context.tokens > 0
+
+
+async def test_shared_checkout_at_another_commit_is_not_read(
+    tmp_path, git_repo, repos_path, checkout, task
+):
+    sha = commit(git_repo, FILES, "Add app")
+    retriever = await make_retriever(tmp_path, repos_path, checkout, sha)
+    workspace = tmp_path / "task"
+    workspace.mkdir()
+    
+    # Another plan request moves the shared checkout
+    later = commit(git_repo, {"src/models.py": "class Account:\n    pass\n"}, "Rename")
+    git("fetch", "-q", "origin", cwd=checkout)
+    git("checkout", "-q", "--detach", later, cwd=checkout)
+    
+    paso = {"paso": 1, "descripcion": "Use the user", "archivos": ["src/app.py"]}
+    context = await retriever.retrieve(task, paso, workspace)
+    
+    assert context.files == {}
+    assert retriever.get_stats()["stale_checkouts"] > 0
+
+
+async def test_task_checkout_is_never_completed_from_shared_checkout(
+    tmp_path, git_repo, repos_path, checkout, task
+):
+    sha = commit(git_repo, FILES, "Add app")
+    retriever = await make_retriever(tmp_path, repos_path, checkout, sha)
+    workspace = tmp_path / "task" / "repo"
+    git("clone", "-q", str(git_repo), str(workspace), cwd=tmp_path)
+    git("rm", "-q", "src/billing.py", cwd=workspace)
+    
+    paso = {"paso": 1, "descripcion": "Charge the invoice", "archivos": ["src/billing.py"]}
+    context = await retriever.retrieve(task, paso, workspace)
+    
+    assert "src/billing.py" not in context.files
+    assert await retriever.read_file(task, workspace, "src/app.py") == FILES["src/app.py"]
+
+
+async def test_writes_are_seen_by_later_reads(tmp_path, task):
+    retriever = ContextRetriever()
+    workspace = tmp_path / "task"
+    workspace.mkdir()
+    (workspace / "a.py").write_text("x = 1\n")
+    
+    assert await retriever.read_file(task, workspace, "a.py") == "x = 1\n"
+    retriever.update_file(task, "a.py", "x = 2\n")
+    assert await retriever.read_file(task, workspace, "a.py") == "x = 2\n"
+    
+    retriever.forget(task)
+    assert await retriever.read_file(task, workspace, "a.py") == "x = 1\n"
+    assert retriever.get_stats()["read_hit_rate"] == pytest.approx(1 / 3)
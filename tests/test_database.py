@@ -0,0 +1,125 @@
+"""Tests for database setup and task persistence."""
+
+import asyncio
+import re
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+
+from src.models import async_database
+from src.models import database as db
+from src.models.task import TaskStatus
+
+
+@pytest.fixture
+def memory_database() -> Generator[None, None, None]:
+    """Initialize the application database in memory."""
+    db.init_database("sqlite://", pool_size=4)
+    yield
+    db.close_database()
+
+
+@pytest.mark.parametrize("url", [
+    "sqlite://",
+    "sqlite:///:memory:",
+    "sqlite:///file:db?mode=memory",
+])
+def test_memory_urls_are_detected(url):
+    assert db._is_memory_database(url)
+
+
+def test_file_url_is_not_memory(tmp_path):
+    assert not db._is_memory_database(f"sqlite:///{tmp_path / 'tasks.db'}")
+
+
+def test_memory_database_uses_one_shared_connection(memory_database):
+    assert isinstance(db._engine.pool, StaticPool)
+
+
+async def test_memory_database_is_shared_by_worker_threads(memory_database, sample_task):
+    # Written and read from different database worker threads
+    await async_database.save_task(sample_task)
+    tasks = await asyncio.gather(*(async_database.get_task(sample_task.id) for _ in range(8)))
+    
+    assert all(task is not None and task.id == sample_task.id for task in tasks)
+
+
+def test_task_round_trip(database, sample_task_with_plan):
+    db.save_task(sample_task_with_plan)
+    
+    task = db.get_task(sample_task_with_plan.id)
+    
+    assert task.plan == sample_task_with_plan.plan
+    assert task.status == TaskStatus.PENDING_APPROVAL
+    assert db.get_task("task-missing") is None
+
+
+def test_update_task_writes_all_columns(database, sample_task):
+    db.save_task(sample_task)
+    sample_task.status = TaskStatus.COMPLETED
+    sample_task.current_step = 3
+    sample_task.result = {"success": True}
+    
+    db.update_task(sample_task)
+    task = db.get_task(sample_task.id)
+    
+    assert task.status == TaskStatus.COMPLETED
+    assert task.current_step == 3
+    assert task.result == {"success": True}
+    
+    with pytest.raises(ValueError):
+        db.update_task(sample_task.model_copy(update={"id": "task-missing"}))
+
+
+def test_active_task_is_the_newest_unfinished(database, sample_task):
+    done = sample_task.model_copy(update={"id": "task-done", "status": TaskStatus.COMPLETED})
+    db.save_task(done)
+    db.save_task(sample_task.model_copy(update={"status": TaskStatus.IN_PROGRESS}))
+    
+    task = db.get_active_task(sample_task.telegram_user_id, include_payload=False)
+    
+    assert task.id == sample_task.id
+    assert task.plan is None
+    assert db.get_active_task(42) is None
+
+
+def test_task_listings_do_not_load_plan_or_result(database, sample_task_with_plan):
+    task = sample_task_with_plan.model_copy(update={
+        "status": TaskStatus.IN_PROGRESS,
+        "current_step": 1,
+        "total_steps": 2,
+        "result": {"success": True},
+    })
+    db.save_task(task)
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+    
+    event.listen(db._engine, "before_cursor_execute", record)
+    try:
+        listed = db.get_user_tasks(task.telegram_user_id)
+        active = db.get_active_task(task.telegram_user_id, include_payload=False)
+    finally:
+        event.remove(db._engine, "before_cursor_execute", record)
+    
+    selects = [statement for statement in statements if statement.lstrip().startswith("SELECT")]
+    assert len(selects) == 2
+    assert not any(re.search(r"\btasks\.(plan|result)\b", statement) for statement in selects)
+    for loaded in (listed[0], active):
+        assert (loaded.plan, loaded.result) == (None, None)
+        assert loaded.to_summary() == task.to_summary()
+
+
+def test_task_states(database, sample_task):
+    db.save_task(sample_task)
+    assert db.update_task_status(sample_task.id, TaskStatus.FAILED, error="boom")
+    assert not db.update_task_status("task-missing", TaskStatus.FAILED)
+    
+    states = db.get_task_states([sample_task.id, "task-missing"])
+    
+    assert list(states) == [sample_task.id]
+    assert states[sample_task.id][0] == TaskStatus.FAILED
+    assert db.get_task(sample_task.id).error == "boom"
@@ -0,0 +1,215 @@
+"""Tests for the executor's git pipeline against a local remote."""
+
+import json
+import re
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.agents.executor import TaskExecutor
+from src.git.github_manager import GitHubManager
+from src.llm.fake import FakeLLMClient
+from src.models.task import Task
+
+
+STEP_RE = re.compile(r"\*\*Paso (\d+):\*\*")
+
+
+def git(*args: str, cwd: Path) -> str:
+    """Run a git command and return its output."""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.rstrip()
+
+
+def create_file_responder(messages: list[dict]) -> str:
+    """Answer each step by creating ``step_<n>.py``."""
+    step = STEP_RE.search(messages[-1]["content"]).group(1)
+    return json.dumps({
+        "success": True,
+        "action": "create",
+        "file_path": f"src/step_{step}.py",
+        "content": f"STEP = {step}\n",
+    })
+
+
+@pytest.fixture
+def manager(tmp_path: Path, github_remote: tuple[str, Path]) -> GitHubManager:
+    """GitHubManager cloning from the local remote."""
+    base_url, _ = github_remote
+    manager = GitHubManager(
+        token="unused",
+        workspace_path=tmp_path / "workspace",
+        git_base_url=base_url,
+    )
+    yield manager
+    manager.git.close()
+
+
+@pytest.fixture
+def task() -> Task:
+    """Task with three independent steps on the local remote's repository."""
+    task = Task(
+        id="task-git-001",
+        telegram_user_id=1,
+        telegram_chat_id=1,
+        description="Add three modules",
+        repo_url="https://github.com/test/repo",
+    )
+    task.plan = {
+        "pasos": [
+            {"paso": n, "descripcion": f"Crear step_{n}", "archivos": [f"src/step_{n}.py"]}
+            for n in (1, 2, 3)
+        ],
+    }
+    return task
+
+
+async def test_steps_commit_in_task_checkout_and_push_once(
+    tmp_path: Path,
+    github_remote: tuple[str, Path],
+    manager: GitHubManager,
+    task: Task,
+) -> None:
+    _, bare = github_remote
+    executor = TaskExecutor(
+        workspace_path=tmp_path / "workspace",
+        client=FakeLLMClient(responder=create_file_responder, latency=0.0),
+        git=manager,
+        checkpoint_interval=3600,
+    )
+    
+    result = await executor.execute(task)
+    
+    assert result["success"]
+    assert task.branch == "dev-task/task-git-001"
+    
+    # Files were written into the clone, not next to it
+    checkout = executor.checkout_path(task)
+    assert checkout == tmp_path / "workspace" / task.id / "repo"
+    assert (checkout / "src" / "step_1.py").read_text() == "STEP = 1\n"
+    assert not (tmp_path / "workspace" / task.id / "src").exists()
+    
+    # One commit per step on the task branch, all pushed in a single push
+    assert executor.step_commits == 3
+    assert executor.pushes == 1
+    commits = [
+        (
+            git("log", "-1", "--format=%s", f"{task.branch}~{n}", cwd=bare),
+            git("diff-tree", "--no-commit-id", "--name-only", "-r", f"{task.branch}~{n}", cwd=bare),
+        )
+        for n in (2, 1, 0)
+    ]
+    assert commits == [
+        ("Step 1: Crear step_1", "src/step_1.py"),
+        ("Step 2: Crear step_2", "src/step_2.py"),
+        ("Step 3: Crear step_3", "src/step_3.py"),
+    ]
+    assert git("rev-parse", task.branch, cwd=bare) == git("rev-parse", "HEAD", cwd=checkout)
+
+
+async def test_resumed_task_reuses_checkout_and_branch(
+    tmp_path: Path,
+    github_remote: tuple[str, Path],
+    manager: GitHubManager,
+    task: Task,
+) -> None:
+    checkout = await manager.prepare_task_checkout(task.repo_url, task.id, "dev-task/resume")
+    (checkout / "local.txt").write_text("kept\n")
+    git("checkout", "-q", "-", cwd=checkout)
+    
+    again = await manager.prepare_task_checkout(task.repo_url, task.id, "dev-task/resume")
+    
+    assert again == checkout
+    assert git("rev-parse", "--abbrev-ref", "HEAD", cwd=checkout) == "dev-task/resume"
+    assert (checkout / "local.txt").exists()
+
+
+async def test_protected_branch_is_refused(manager: GitHubManager, task: Task) -> None:
+    with pytest.raises(ValueError, match="protected"):
+        await manager.prepare_task_checkout(task.repo_url, task.id, "main")
+
+
+async def test_without_git_files_go_to_task_workspace(tmp_path: Path, task: Task) -> None:
+    executor = TaskExecutor(
+        workspace_path=tmp_path,
+        client=FakeLLMClient(responder=create_file_responder, latency=0.0),
+    )
+    
+    result = await executor.execute(task)
+    
+    assert result["success"]
+    assert (tmp_path / task.id / "src" / "step_2.py").exists()
+    assert await executor.commit_partial_work(task) is None
+
+
+async def test_git_timeouts_do_not_fail_the_task(
+    tmp_path: Path,
+    manager: GitHubManager,
+    task: Task,
+    monkeypatch,
+) -> None:
+    async def time_out(*args, **kwargs):
+        raise TimeoutError()
+    
+    monkeypatch.setattr(manager, "push_branch", time_out)
+    executor = TaskExecutor(
+        workspace_path=tmp_path / "workspace",
+        client=FakeLLMClient(responder=create_file_responder, latency=0.0),
+        git=manager,
+        checkpoint_interval=3600,
+    )
+    
+    result = await executor.execute(task)
+    monkeypatch.setattr(manager, "commit_changes", time_out)
+    partial = await executor.commit_partial_work(task)
+    
+    assert result["success"]
+    assert executor.pushes == 0
+    assert partial["committed"] is False
+    assert partial["pushed"] is False
+
+
+async def test_cancelled_execution_checkpoints_without_pushing(
+    tmp_path: Path,
+    github_remote: tuple[str, Path],
+    manager: GitHubManager,
+    task: Task,
+) -> None:
+    import asyncio
+    
+    _, bare = github_remote
+    started = asyncio.Event()
+    
+    def responder(messages: list[dict]) -> str:
+        if "Paso 3" in messages[-1]["content"]:
+            started.set()
+        return create_file_responder(messages)
+    
+    task.plan["pasos"][2]["depende_de"] = [1, 2]
+    executor = TaskExecutor(
+        workspace_path=tmp_path / "workspace",
+        client=FakeLLMClient(responder=responder, latency=0.2),
+        git=manager,
+        checkpoint_interval=3600,
+        max_parallel_steps=2,
+    )
+    
+    execution = asyncio.create_task(executor.execute(task))
+    await asyncio.wait_for(started.wait(), 10)
+    execution.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await execution
+    
+    # Finished steps are committed and checkpointed, but nothing is pushed
+    assert executor.pushes == 0
+    assert sorted(task.checkpoint_data["steps"]) == ["1", "2"]
+    branches = git("branch", "--list", task.branch, cwd=bare)
+    assert branches == ""
+    
+    partial = await executor.commit_partial_work(task)
+    assert partial["pushed"]
+    assert git("rev-parse", task.branch, cwd=bare) == git(
+        "rev-parse", "HEAD", cwd=executor.checkout_path(task)
+    )
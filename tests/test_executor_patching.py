@@ -0,0 +1,126 @@
+"""Tests for applying step answers sent as edits to task files."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.agents.executor import TaskExecutor
+from src.llm.fake import FakeLLMClient
+from src.models.task import Task
+
+
+SOURCE = "def add(a, b):\n    return a + b\n"
+
+
+class Answers:
+    """Responder replying with the queued answers, recording each prompt."""
+    
+    def __init__(self, *answers: dict | str | Exception) -> None:
+        self.answers = list(answers)
+        self.prompts: list[str] = []
+    
+    def __call__(self, messages: list[dict]) -> str:
+        self.prompts.append(messages[-1]["content"])
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer if isinstance(answer, str) else json.dumps(answer)
+
+
+def modify(**fields) -> dict:
+    return {"success": True, "action": "modify", "file_path": "app.py", **fields}
+
+
+@pytest.fixture
+def task() -> Task:
+    """Task with one step on ``app.py``, without a repository."""
+    task = Task(
+        id="task-patch-001",
+        telegram_user_id=1,
+        telegram_chat_id=1,
+        description="Swap operands",
+        repo_url="",
+    )
+    task.plan = {"pasos": [{"paso": 1, "descripcion": "Cambiar add", "archivos": ["app.py"]}]}
+    return task
+
+
+@pytest.fixture
+def app_file(tmp_path: Path, task: Task) -> Path:
+    path = tmp_path / task.id / "app.py"
+    path.parent.mkdir(parents=True)
+    path.write_text(SOURCE)
+    return path
+
+
+def make_executor(tmp_path: Path, answers: Answers, attempts: int = 1) -> TaskExecutor:
+    return TaskExecutor(
+        workspace_path=tmp_path,
+        client=FakeLLMClient(responder=answers, latency=0.0),
+        step_max_attempts=attempts,
+    )
+
+
+async def test_edits_are_applied_to_the_file_shown(tmp_path, task, app_file):
+    answers = Answers(modify(edits=[{"search": "a + b", "replace": "b + a"}]))
+    executor = make_executor(tmp_path, answers)
+    
+    result = await executor.execute(task)
+    
+    assert result["success"]
+    assert app_file.read_text() == SOURCE.replace("a + b", "b + a")
+    assert SOURCE in answers.prompts[0]
+    assert executor.patches_applied == 1
+    assert result["results"][0]["change"] == "modified"
+
+
+async def test_failed_patch_uses_content_sent_along(tmp_path, task, app_file):
+    answers = Answers(modify(edits=[{"search": "import os", "replace": ""}], content="X = 1\n"))
+    executor = make_executor(tmp_path, answers)
+    
+    result = await executor.execute(task)
+    
+    assert result["results"][0]["patch_fallback"]
+    assert app_file.read_text() == "X = 1\n"
+    assert executor.patch_fallbacks == 1
+
+
+async def test_failed_patch_asks_for_the_full_file(tmp_path, task, app_file):
+    answers = Answers(
+        modify(diff="@@ -1,1 +1,1 @@\n-import os\n+import sys\n"),
+        modify(content="def add(a, b):\n    return b + a\n"),
+    )
+    executor = make_executor(tmp_path, answers)
+    
+    result = await executor.execute(task)
+    
+    assert result["success"]
+    assert "No se pudieron aplicar tus cambios a `app.py`" in answers.prompts[1]
+    assert app_file.read_text().endswith("return b + a\n")
+
+
+async def test_step_fails_when_full_file_cannot_be_obtained(tmp_path, task, app_file):
+    answers = Answers(
+        modify(edits=[{"search": "import os", "replace": ""}]),
+        RuntimeError("provider down"),
+    )
+    executor = make_executor(tmp_path, answers)
+    
+    result = await executor.execute(task)
+    
+    assert not result["success"]
+    assert result["results"][0]["error"].startswith("Could not apply changes to app.py")
+    assert app_file.read_text() == SOURCE
+
+
+async def test_unparseable_answer_is_retried(tmp_path, task, app_file):
+    answers = Answers("Lo siento", {"success": True, "action": "delete", "file_path": "app.py"})
+    executor = make_executor(tmp_path, answers, attempts=2)
+    
+    result = await executor.execute(task)
+    
+    assert result["success"]
+    assert result["results"][0]["change"] == "deleted"
+    assert not app_file.exists()
+    assert executor.get_stats()["step_retries"] == 1
@@ -0,0 +1,135 @@
+"""Tests for resuming task execution from workspace checkpoints."""
+
+import asyncio
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from src.agents.executor import CHECKPOINT_FILE, TaskExecutor
+from src.llm.fake import FakeLLMClient
+from src.models.task import Task
+
+
+STEP_RE = re.compile(r"\*\*Paso (\d+):\*\*")
+
+
+class StepCounter:
+    """Responder creating ``step_<n>.py`` and counting model calls per step."""
+    
+    def __init__(self, stop_at: int | None = None) -> None:
+        self.calls: Counter[int] = Counter()
+        self.stop_at = stop_at
+        self.reached = asyncio.Event()
+    
+    def __call__(self, messages: list[dict]) -> str:
+        step = int(STEP_RE.search(messages[-1]["content"]).group(1))
+        self.calls[step] += 1
+        if step == self.stop_at:
+            self.reached.set()
+        return json.dumps({
+            "success": True,
+            "action": "create",
+            "file_path": f"step_{step}.py",
+            "content": f"STEP = {step}\n",
+        })
+
+
+def make_executor(workspace: Path, responder: StepCounter) -> TaskExecutor:
+    """A fresh executor, as a restarted process would have."""
+    return TaskExecutor(
+        workspace_path=workspace,
+        client=FakeLLMClient(responder=responder, latency=0.05),
+    )
+
+
+@pytest.fixture
+def task() -> Task:
+    """Task with four sequential steps."""
+    task = Task(
+        id="task-resume-001",
+        telegram_user_id=1,
+        telegram_chat_id=1,
+        description="Four steps",
+        repo_url="",
+    )
+    task.plan = {
+        "pasos": [
+            {"paso": n, "descripcion": f"Crear step_{n}", "archivos": [f"step_{n}.py"]}
+            for n in (1, 2, 3, 4)
+        ],
+    }
+    return task
+
+
+async def interrupt_at(executor: TaskExecutor, task: Task, responder: StepCounter) -> None:
+    """Run the task and cancel it while the model answers step ``stop_at``."""
+    run = asyncio.create_task(executor.execute(task))
+    await responder.reached.wait()
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+
+
+async def test_resumed_run_calls_model_only_for_remaining_steps(
+    tmp_path: Path,
+    task: Task,
+) -> None:
+    first = StepCounter(stop_at=3)
+    await interrupt_at(make_executor(tmp_path, first), task, first)
+    
+    assert first.calls == {1: 1, 2: 1, 3: 1}
+    assert (tmp_path / task.id / CHECKPOINT_FILE).exists()
+    
+    second = StepCounter()
+    executor = make_executor(tmp_path, second)
+    result = await executor.execute(task)
+    
+    assert result["success"]
+    assert second.calls == {3: 1, 4: 1}
+    assert executor.steps_resumed == 2
+    assert [r["step"] for r in result["results"]] == [1, 2, 3, 4]
+    assert [bool(r.get("resumed")) for r in result["results"]] == [True, True, False, False]
+    assert result["changes"]["created"] == ["step_1.py", "step_2.py", "step_3.py", "step_4.py"]
+
+
+async def test_checkpoint_is_discarded_when_workspace_changed(
+    tmp_path: Path,
+    task: Task,
+) -> None:
+    first = StepCounter(stop_at=3)
+    await interrupt_at(make_executor(tmp_path, first), task, first)
+    (tmp_path / task.id / "step_1.py").write_text("EDITED = True\n")
+    
+    second = StepCounter()
+    executor = make_executor(tmp_path, second)
+    await executor.execute(task)
+    
+    assert second.calls == {1: 1, 2: 1, 3: 1, 4: 1}
+    assert executor.checkpoints_discarded == 1
+
+
+async def test_checkpoint_of_another_plan_is_ignored(tmp_path: Path, task: Task) -> None:
+    first = StepCounter(stop_at=3)
+    await interrupt_at(make_executor(tmp_path, first), task, first)
+    task.plan["pasos"][0]["descripcion"] = "Otro paso"
+    
+    second = StepCounter()
+    await make_executor(tmp_path, second).execute(task)
+    
+    assert second.calls == {1: 1, 2: 1, 3: 1, 4: 1}
+
+
+async def test_unreadable_checkpoint_starts_over(tmp_path: Path, task: Task) -> None:
+    checkpoint = tmp_path / task.id / CHECKPOINT_FILE
+    checkpoint.parent.mkdir(parents=True)
+    checkpoint.write_text("{not json")
+    
+    responder = StepCounter()
+    executor = make_executor(tmp_path, responder)
+    await executor.execute(task)
+    
+    assert responder.calls == {1: 1, 2: 1, 3: 1, 4: 1}
+    assert executor.checkpoints_discarded == 1
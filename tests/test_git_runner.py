@@ -0,0 +1,105 @@
+"""Tests for bounded, cancellable git commands."""
+
+import asyncio
+import time
+
+import pytest
+from git.exc import GitCommandError
+
+from src.git.git_runner import GitRunner
+
+
+def hang(seconds: float, lock: bool = False) -> tuple[str, ...]:
+    """Git arguments for a command sleeping in a child shell, optionally taking the index lock."""
+    command = f"touch .git/index.lock; sleep {seconds}" if lock else f"sleep {seconds}"
+    return ("-c", f"alias.hang=!{command}", "hang")
+
+
+@pytest.fixture
+def runner() -> GitRunner:
+    runner = GitRunner(max_concurrency=2, timeout=10.0)
+    yield runner
+    runner.close()
+
+
+async def test_command_output_is_returned(runner, git_repo):
+    output = await runner.run(git_repo, "log", "--format=%s")
+    
+    assert output == "Initial commit"
+    assert runner.get_stats()["commands"] == 1
+
+
+async def test_failed_command_raises(runner, git_repo):
+    with pytest.raises(GitCommandError) as error:
+        await runner.run(git_repo, "rev-parse", "--verify", "missing-branch")
+    
+    assert error.value.status != 0
+    assert runner.failures == 1
+
+
+async def test_timed_out_command_is_killed_and_unlocks_index(runner, git_repo):
+    lock = git_repo / ".git" / "index.lock"
+    start = time.perf_counter()
+    
+    async with runner.locked(git_repo):
+        with pytest.raises(asyncio.TimeoutError):
+            await runner.run(git_repo, *hang(30, lock=True), timeout=0.2)
+    
+    assert time.perf_counter() - start < 5
+    assert runner.timeouts == 1
+    assert runner.in_flight == 0
+    assert not lock.exists()
+
+
+async def test_killed_command_keeps_index_lock_it_does_not_own(runner, git_repo):
+    lock = git_repo / ".git" / "index.lock"
+    
+    # Outside locked(), the lock may belong to a sequence running meanwhile
+    with pytest.raises(asyncio.TimeoutError):
+        await runner.run(git_repo, *hang(30, lock=True), timeout=0.2)
+    assert lock.exists()
+    
+    # Under locked(), a lock that predates the command is not its own
+    async with runner.locked(git_repo):
+        with pytest.raises(asyncio.TimeoutError):
+            await runner.run(git_repo, *hang(30), timeout=0.2)
+    assert lock.exists()
+
+
+async def test_cancelled_command_is_killed(runner):
+    command = asyncio.create_task(runner.run(None, *hang(30)))
+    await asyncio.sleep(0.2)
+    command.cancel()
+    
+    with pytest.raises(asyncio.CancelledError):
+        await command
+    
+    assert runner.cancelled == 1
+    assert runner.in_flight == 0
+
+
+async def test_concurrency_is_bounded(runner):
+    await asyncio.gather(*(runner.run(None, *hang(0.1)) for _ in range(5)))
+    
+    stats = runner.get_stats()
+    assert stats["commands"] == 5
+    assert stats["max_in_flight"] == 2
+    assert stats["avg_wait"] > 0
+
+
+async def test_locked_sequences_do_not_interleave(runner, git_repo):
+    events = []
+    
+    async def sequence(name: str) -> None:
+        async with runner.locked(git_repo / "."):
+            events.append(f"{name} start")
+            await runner.run(git_repo, "status", "--short")
+            events.append(f"{name} end")
+    
+    await asyncio.gather(sequence("a"), sequence("b"))
+    
+    assert events == ["a start", "a end", "b start", "b end"]
+
+
+async def test_blocking_calls_run_on_the_git_pool(runner):
+    assert await runner.call(sorted, [3, 1, 2], reverse=True) == [3, 2, 1]
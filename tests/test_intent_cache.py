@@ -0,0 +1,113 @@
+"""Tests for the intent classification cache."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.agents.intent_cache import PRUNE_INTERVAL, IntentCache
+from src.models import database as db
+from src.models.task import Intent, IntentResult
+
+
+MESSAGE = "¿Cómo va mi tarea?"
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self) -> None:
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def age_rows(seconds: float) -> None:
+    """Make every cached intent row ``seconds`` older."""
+    with db.get_session() as session:
+        for model in session.query(db.IntentCacheModel):
+            model.created_at -= timedelta(seconds=seconds)
+
+
+def row_count() -> int:
+    with db.get_session() as session:
+        return session.query(db.IntentCacheModel).count()
+
+
+@pytest.fixture
+def result() -> IntentResult:
+    return IntentResult(intent=Intent.TASK_STATUS, confidence=0.9)
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def cache(database, clock) -> IntentCache:
+    return IntentCache(ttl=100.0, persist=True, clock=clock)
+
+
+async def test_memory_hit_returns_a_copy(clock, result):
+    cache = IntentCache(ttl=100.0, clock=clock)
+    await cache.set(MESSAGE, result)
+    
+    cached = await cache.get("  ¿cómo   va mi tarea? ")
+    cached.extracted_info["task_id"] = "task-1"
+    
+    assert (await cache.get(MESSAGE)).extracted_info == {}
+    
+    clock.now = 100.0
+    assert await cache.get(MESSAGE) is None
+
+
+async def test_database_hit_keeps_the_remaining_ttl(database, cache, clock, result):
+    await cache.set(MESSAGE, result)
+    age_rows(60)
+    
+    restarted = IntentCache(ttl=100.0, persist=True, clock=clock)
+    assert (await restarted.get(MESSAGE)).intent == Intent.TASK_STATUS
+    assert restarted.db_hits == 1
+    
+    # 40 seconds were left in the table, not a fresh 100
+    clock.now = 39.0
+    assert await restarted.get(MESSAGE) is not None
+    clock.now = 41.0
+    restarted.persist = False
+    assert await restarted.get(MESSAGE) is None
+
+
+async def test_expired_row_is_deleted_on_read(cache, result):
+    await cache.set(MESSAGE, result)
+    age_rows(100)
+    cache._memory.clear()
+    
+    assert await cache.get(MESSAGE) is None
+    assert row_count() == 0
+
+
+async def test_expired_rows_are_pruned_periodically(cache, clock, result):
+    await cache.set("mensaje viejo", result)
+    age_rows(200)
+    
+    # Pruned at most once per interval
+    await cache.set(MESSAGE, result)
+    assert row_count() == 2
+    
+    clock.now = PRUNE_INTERVAL
+    await cache.set(MESSAGE, result)
+    
+    assert row_count() == 1
+    assert cache.get_stats()["pruned"] == 1
+
+
+def test_prune_keeps_live_rows(database):
+    db.save_cached_intent("old", "viejo", "{}")
+    db.save_cached_intent("new", "nuevo", "{}")
+    with db.get_session() as session:
+        model = session.get(db.IntentCacheModel, "old")
+        model.created_at = datetime.utcnow() - timedelta(hours=2)
+    
+    assert db.prune_cached_intents(3600) == 1
+    assert db.get_cached_intent("new", 3600)[0] == "{}"
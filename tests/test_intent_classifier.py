@@ -0,0 +1,67 @@
+"""Tests for intent classification and its response cache."""
+
+import json
+
+import pytest
+
+from src.agents.intent_cache import IntentCache
+from src.agents.intent_classifier import IntentClassifier
+from src.llm.fake import FakeLLMClient
+from src.models.task import Intent
+
+
+MESSAGE = "Agrega tests a https://github.com/test/repo"
+RESPONSE = {
+    "intent": "TASK_NEW",
+    "confidence": 0.95,
+    "needs_clarification": False,
+    "clarification_question": None,
+    "extracted_info": {"repo": "https://github.com/test/repo"},
+}
+
+
+def make_classifier(text: str, cache: IntentCache | None = None) -> IntentClassifier:
+    client = FakeLLMClient(text=text, latency=0.0)
+    return IntentClassifier(client=client, cache=cache)
+
+
+def test_client_or_api_key_is_required():
+    with pytest.raises(ValueError):
+        IntentClassifier()
+
+
+async def test_response_is_parsed_and_cached():
+    cache = IntentCache()
+    classifier = make_classifier(f"Claro:\n{json.dumps(RESPONSE)}\n", cache)
+    
+    result = await classifier.classify(MESSAGE)
+    classifier.client.down = True
+    again = await classifier.classify(MESSAGE)
+    
+    assert result.intent == Intent.TASK_NEW
+    assert result.extracted_info["repo"] == "https://github.com/test/repo"
+    assert again == result
+
+
+@pytest.mark.parametrize("text", ["No sé", '{"confidence": 0.9}', '{"intent": "OTHER"}'])
+async def test_unparseable_response_asks_for_clarification(text):
+    cache = IntentCache()
+    classifier = make_classifier(text, cache)
+    
+    result = await classifier.classify(MESSAGE)
+    
+    assert result.needs_clarification
+    assert result.confidence == 0.5
+    # Fallbacks are never cached
+    assert await cache.get(MESSAGE) is None
+
+
+async def test_provider_error_asks_to_rephrase():
+    classifier = make_classifier(json.dumps(RESPONSE))
+    classifier.client.down = True
+    
+    result = await classifier.classify(MESSAGE)
+    
+    assert result.intent == Intent.QUERY
+    assert result.confidence == 0.0
+    assert result.needs_clarification
@@ -0,0 +1,168 @@
+"""Tests for the local mirror cache task clones are made from."""
+
+import fcntl
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+from git.exc import GitCommandError
+
+from src.git.mirror_cache import MirrorCache
+
+
+def git(*args: str, cwd: Path) -> str:
+    """Run a git command and return its output."""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.rstrip()
+
+
+def push_commit(git_repo: Path, bare: Path, name: str) -> str:
+    """Commit a file in ``git_repo`` and push it to the bare remote."""
+    path = git_repo / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"{name}\n")
+    git("add", ".", cwd=git_repo)
+    git("commit", "-qm", f"Add {name}", cwd=git_repo)
+    git("push", "-q", str(bare), "HEAD", cwd=git_repo)
+    return git("rev-parse", "HEAD", cwd=git_repo)
+
+
+@pytest.fixture
+def remote(github_remote: tuple[str, Path]) -> str:
+    """URL of the bare remote repository."""
+    base_url, _ = github_remote
+    return f"{base_url}/test/repo.git"
+
+
+def make_cache(tmp_path: Path, **kwargs) -> MirrorCache:
+    return MirrorCache(tmp_path / "mirrors", **kwargs)
+
+
+def test_invalid_mode_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        make_cache(tmp_path, mode="copy")
+
+
+def test_mirror_is_fetched_only_for_missing_commits(tmp_path, git_repo, github_remote, remote):
+    _, bare = github_remote
+    cache = make_cache(tmp_path)
+    head = git("rev-parse", "HEAD", cwd=git_repo)
+    
+    path = cache.update(remote, "test", "repo")
+    assert path == cache.mirror_path("test", "repo")
+    assert cache.has_commit("test", "repo", head)
+    
+    cache.update(remote, "test", "repo", head)
+    new = push_commit(git_repo, bare, "new.py")
+    assert not cache.has_commit("test", "repo", new)
+    cache.update(remote, "test", "repo", new)
+    
+    assert cache.has_commit("test", "repo", new)
+    stats = cache.get_stats()
+    assert (stats["mirrors_created"], stats["fetches_skipped"], stats["fetches"]) == (1, 1, 1)
+
+
+def test_shared_clone_borrows_mirror_objects(tmp_path, git_repo, remote):
+    cache = make_cache(tmp_path)
+    head = git("rev-parse", "HEAD", cwd=git_repo)
+    
+    repo = cache.clone(remote, "test", "repo", tmp_path / "task", head)
+    
+    assert repo.head.is_detached and repo.head.commit.hexsha == head
+    assert repo.remotes.origin.url == remote
+    assert (tmp_path / "task" / ".git" / "objects" / "info" / "alternates").exists()
+    assert (tmp_path / "task" / "README.md").exists()
+
+
+def test_local_clone_is_independent_of_the_mirror(tmp_path, remote):
+    cache = make_cache(tmp_path, mode="local")
+    
+    repo = cache.clone(remote, "test", "repo", tmp_path / "task")
+    
+    assert not (tmp_path / "task" / ".git" / "objects" / "info" / "alternates").exists()
+    assert not repo.head.is_detached
+    assert cache.clones == 1
+
+
+def test_direct_clone_skips_the_mirror(tmp_path, remote):
+    cache = make_cache(tmp_path, mode="direct")
+    
+    cache.clone(remote, "test", "repo", tmp_path / "task")
+    
+    assert not cache.mirror_path("test", "repo").exists()
+    assert cache.get_stats()["mirrors_created"] == 0
+
+
+@pytest.mark.parametrize("mode", ["shared", "local", "direct"])
+def test_checkout_moves_existing_clone(tmp_path, git_repo, github_remote, remote, mode):
+    _, bare = github_remote
+    cache = make_cache(tmp_path, mode=mode)
+    dest = tmp_path / "checkout"
+    first = git("rev-parse", "HEAD", cwd=git_repo)
+    
+    cache.checkout(remote, "test", "repo", dest, first)
+    second = push_commit(git_repo, bare, "later.py")
+    repo = cache.checkout(remote, "test", "repo", dest, second)
+    
+    assert repo.head.commit.hexsha == second
+    assert (dest / "later.py").exists()
+
+
+def test_shallow_mirror(tmp_path, git_repo, github_remote, remote):
+    _, bare = github_remote
+    push_commit(git_repo, bare, "second.py")
+    cache = make_cache(tmp_path, depth=1)
+    
+    path = cache.update(remote, "test", "repo")
+    
+    assert (path / "shallow").exists()
+    assert git("rev-list", "--count", "HEAD", cwd=path) == "1"
+    
+    push_commit(git_repo, bare, "third.py")
+    cache.update(remote, "test", "repo")
+    assert git("rev-list", "--count", "HEAD", cwd=path) == "1"
+
+
+def test_partial_mirror_lists_tree_without_sizes(tmp_path, git_repo, github_remote, remote):
+    _, bare = github_remote
+    git("config", "uploadpack.allowFilter", "true", cwd=bare)
+    cache = make_cache(tmp_path, blob_filter="blob:none")
+    head = git("rev-parse", "HEAD", cwd=git_repo)
+    
+    cache.update(remote, "test", "repo")
+    tree = cache.list_tree("test", "repo", head)
+    repo = cache.clone(remote, "test", "repo", tmp_path / "task", head)
+    
+    assert tree.sha == head
+    assert [(entry.path, entry.size) for entry in tree] == [("README.md", 0)]
+    assert repo.git.config("remote.origin.partialclonefilter") == "blob:none"
+    assert (tmp_path / "task" / "README.md").read_text() == "# Test Repository\n"
+
+
+def test_full_mirror_lists_tree_with_sizes(tmp_path, git_repo, github_remote, remote):
+    _, bare = github_remote
+    head = push_commit(git_repo, bare, "pkg/mod.py")
+    cache = make_cache(tmp_path)
+    cache.update(remote, "test", "repo")
+    
+    tree = cache.list_tree("test", "repo", head)
+    
+    assert [entry.path for entry in tree] == ["README.md", "pkg", "pkg/mod.py"]
+    assert tree.total_size() == len("# Test Repository\n") + len("pkg/mod.py\n")
+
+
+def test_hung_mirror_clone_is_killed_and_releases_the_lock(tmp_path, monkeypatch):
+    # The ssh transport never answers
+    monkeypatch.setenv("GIT_SSH_COMMAND", "sleep 30;")
+    cache = make_cache(tmp_path, timeout=0.5)
+    start = time.perf_counter()
+    
+    with pytest.raises(GitCommandError):
+        cache.update("ssh://example.invalid/test/repo.git", "test", "repo")
+    
+    assert time.perf_counter() - start < 10
+    path = cache.mirror_path("test", "repo")
+    with open(path.with_name(path.name + ".lock")) as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
@@ -0,0 +1,234 @@
+"""Tests for routing messages and running tasks through the orchestrator."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.agents.intent_classifier import IntentClassifier
+from src.agents.plan_generator import PlanGenerator
+from src.core.orchestrator import DevTaskOrchestrator
+from src.git.github_manager import GitHubManager
+from src.llm.client import close_llm_clients
+from src.llm.fake import FakeLLMClient
+from src.models import database as db
+from src.models.task import Task, TaskStatus
+
+
+REPO = "https://github.com/test/repo"
+USER = 42
+PLAN = {
+    "objetivo": "Agregar tests",
+    "archivos": ["tests/test_app.py"],
+    "pasos": [{"paso": 1, "descripcion": "Crear tests"}],
+    "estimacion": "5 minutos",
+}
+
+
+class StubExecutor:
+    """Executor finishing at once, or failing with ``error``."""
+    
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.partial_commits = 0
+    
+    async def execute(self, task: Task, on_progress=None) -> dict:
+        if self.error is not None:
+            raise self.error
+        task.current_step = 1
+        await on_progress(task)
+        return {"success": True, "steps_completed": 1}
+    
+    async def commit_partial_work(self, task: Task) -> str | None:
+        self.partial_commits += 1
+        return None
+
+
+def intent(name: str, **fields) -> str:
+    """Classifier response for intent ``name``."""
+    return json.dumps({"intent": name, "confidence": 0.9, **fields})
+
+
+@pytest.fixture
+async def orchestrator(config, github_remote: tuple[str, Path]) -> DevTaskOrchestrator:
+    """Orchestrator with fake LLM providers and the local remote."""
+    base_url, _ = github_remote
+    orchestrator = DevTaskOrchestrator(config)
+    orchestrator._intent_classifier = IntentClassifier(
+        client=FakeLLMClient(text=intent("QUERY"), latency=0.0)
+    )
+    orchestrator._plan_generator = PlanGenerator(
+        client=FakeLLMClient(text=json.dumps(PLAN), latency=0.0),
+        cache=orchestrator.plan_cache,
+    )
+    orchestrator._github_manager = GitHubManager(
+        token="unused",
+        workspace_path=config.workspace_dir,
+        git_base_url=base_url,
+    )
+    orchestrator._executor = StubExecutor()
+    yield orchestrator
+    await orchestrator.shutdown()
+
+
+def save(task: Task, status: TaskStatus, user_id: int = USER) -> Task:
+    task.status = status
+    task.telegram_user_id = user_id
+    db.save_task(task)
+    return task
+
+
+# ============================================================================
+# Messages
+# ============================================================================
+
+async def test_unmatched_message_is_classified_by_llm(orchestrator):
+    response = await orchestrator.handle_message(USER, USER, "hola")
+    
+    assert response == {"action": "respond", "message": "Esta funcionalidad está en desarrollo."}
+    assert orchestrator.fast_path.get_stats()["misses"] == 1
+
+
+async def test_new_task_is_planned_with_repository_context(orchestrator, config):
+    message = f"Agrega tests al módulo de pagos en {REPO}"
+    
+    response = await orchestrator.handle_message(USER, USER, message)
+    again = await orchestrator.handle_message(USER, USER, message)
+    
+    assert response["action"] == "approve_plan"
+    assert response["plan"] == PLAN
+    task = db.get_task(response["task_id"])
+    assert task.status == TaskStatus.PENDING_APPROVAL
+    assert task.repo_url == REPO
+    assert orchestrator.repo_indexer.get_stats()["full_builds"] == 1
+    # Indexed from the mirror, without checking the repository out
+    assert not (config.workspace_dir / ".repos").exists()
+    # The same request on the same HEAD reuses the plan
+    assert again["task_id"] != response["task_id"]
+    assert orchestrator.plan_cache.get_stats()["hits"] == 1
+
+
+async def test_new_task_is_planned_without_reachable_repository(orchestrator):
+    response = await orchestrator.handle_message(
+        USER, USER, "Agrega tests al módulo de pagos en https://github.com/test/missing"
+    )
+    
+    assert response["action"] == "approve_plan"
+    assert orchestrator.plan_cache.get_stats()["stores"] == 0
+
+
+async def test_incomplete_new_task_asks_for_clarification(orchestrator):
+    orchestrator.intent_classifier.client.text = intent(
+        "TASK_NEW", needs_clarification=True, clarification_question="¿Qué repositorio?"
+    )
+    
+    response = await orchestrator.handle_message(USER, USER, "haz una tarea")
+    
+    assert response == {"action": "clarify", "message": "¿Qué repositorio?"}
+
+
+async def test_continuation_is_acknowledged(orchestrator):
+    orchestrator.intent_classifier.client.text = intent("TASK_CONTINUE")
+    
+    response = await orchestrator.handle_message(USER, USER, "usa pytest")
+    
+    assert response["message"] == "Continuando con la tarea..."
+
+
+async def test_tasks_are_listed(orchestrator, sample_task):
+    save(sample_task, TaskStatus.COMPLETED)
+    
+    response = await orchestrator.handle_message(USER, USER, "/list")
+    
+    assert response["action"] == "list"
+    assert [task["id"] for task in response["tasks"]] == [sample_task.id]
+
+
+async def test_status_of_active_task(orchestrator, sample_task):
+    assert (await orchestrator.handle_message(USER, USER, "/status"))["message"] == (
+        "Sin tareas activas."
+    )
+    
+    save(sample_task, TaskStatus.IN_PROGRESS)
+    response = await orchestrator.handle_message(USER, USER, "/status")
+    
+    assert sample_task.id in response["message"]
+
+
+async def test_abort_without_active_task(orchestrator):
+    response = await orchestrator.handle_message(USER, USER, "/abort")
+    
+    assert response["message"] == "No tienes tareas activas para cancelar."
+
+
+# ============================================================================
+# Execution
+# ============================================================================
+
+async def test_only_pending_tasks_are_approved(orchestrator, sample_task_with_plan):
+    assert await orchestrator.approve_task("task-missing") == {"error": "Task not found"}
+    
+    save(sample_task_with_plan, TaskStatus.COMPLETED)
+    
+    assert await orchestrator.approve_task(sample_task_with_plan.id) == {
+        "error": "Task is not pending approval",
+    }
+
+
+async def test_task_is_executed(orchestrator, sample_task_with_plan):
+    task = save(sample_task_with_plan, TaskStatus.APPROVED)
+    
+    result = await orchestrator.execute_task(task.id)
+    await orchestrator.task_writes.flush()
+    
+    assert result["action"] == "completed"
+    assert result["chat_id"] == task.telegram_chat_id
+    stored = db.get_task(task.id)
+    assert stored.status == TaskStatus.COMPLETED
+    assert stored.result == {"success": True, "steps_completed": 1}
+    assert await orchestrator.execute_task("task-missing") == {"error": "Task not found"}
+
+
+async def test_failed_execution_commits_partial_work(orchestrator, sample_task_with_plan):
+    task = save(sample_task_with_plan, TaskStatus.APPROVED)
+    orchestrator._executor = StubExecutor(error=RuntimeError("sin espacio"))
+    
+    result = await orchestrator.execute_task(task.id)
+    await orchestrator.task_writes.flush()
+    
+    assert result["action"] == "failed"
+    assert result["error"] == "sin espacio"
+    assert db.get_task(task.id).status == TaskStatus.FAILED
+    assert orchestrator.executor.partial_commits == 1
+
+
+async def test_partial_work_of_stopped_task_is_committed(orchestrator, sample_task_with_plan):
+    task = save(sample_task_with_plan, TaskStatus.ABORTED)
+    
+    await orchestrator.commit_partial_work(task.id)
+    await orchestrator.commit_partial_work("task-missing")
+    
+    assert orchestrator.executor.partial_commits == 1
+
+
+# ============================================================================
+# Components
+# ============================================================================
+
+async def test_components_are_created_on_first_use(config):
+    orchestrator = DevTaskOrchestrator(config)
+    try:
+        assert orchestrator.intent_classifier.cache is orchestrator.intent_cache
+        assert orchestrator.plan_generator.cache is orchestrator.plan_cache
+        assert orchestrator.executor.git is orchestrator.github_manager
+        assert orchestrator.workspace_gc.workspace_path == config.workspace_dir
+        assert orchestrator.task_writes.flush_interval == config.task_write_flush_interval
+        
+        stats = orchestrator.get_stats()
+    finally:
+        await orchestrator.shutdown()
+        await close_llm_clients()
+    
+    assert {"git", "repo_indexer", "executor", "gemini", "task_writes", "workspace_gc"} <= set(
+        stats
+    )
@@ -0,0 +1,146 @@
+"""Tests for applying model-generated patches."""
+
+import pytest
+
+from src.agents.patching import PatchError, apply_patch, apply_search_replace, apply_unified_diff
+
+
+SOURCE = """\
+def add(a, b):
+    return a + b
+
+
+def sub(a, b):
+    return a - b
+"""
+
+
+# ============================================================================
+# Search/replace blocks
+# ============================================================================
+
+def test_exact_block_is_replaced():
+    patched = apply_patch(SOURCE, edits=[
+        {"search": "return a + b", "replace": "return b + a"},
+    ])
+    
+    assert "return b + a" in patched
+    assert patched.count("\n") == SOURCE.count("\n")
+
+
+def test_empty_search_appends():
+    patched = apply_search_replace(SOURCE, [{"search": "", "replace": "\n\nX = 1\n"}])
+    
+    assert patched.endswith("X = 1\n")
+
+
+def test_ambiguous_block_is_rejected():
+    with pytest.raises(PatchError, match="ambiguous"):
+        apply_search_replace(SOURCE, [{"search": "(a, b):", "replace": "(x, y):"}])
+
+
+def test_missing_block_is_rejected():
+    with pytest.raises(PatchError, match="not found"):
+        apply_search_replace(SOURCE, [{"search": "import os", "replace": ""}])
+
+
+def test_block_with_trailing_whitespace_drift_matches():
+    patched = apply_search_replace(SOURCE, [
+        {"search": "def sub(a, b):   \n    return a - b", "replace": "def sub(a, b):\n    return b - a"},
+    ])
+    
+    assert "return b - a" in patched
+    assert patched.endswith("\n")
+
+
+def test_block_with_other_indentation_is_reindented():
+    source = "class Calc:\n    def add(self, a, b):\n        return a + b\n"
+    
+    patched = apply_search_replace(source, [{
+        "search": "def add(self, a, b):\n    return a + b",
+        "replace": "def add(self, a, b):\n    total = a + b\n    return total",
+    }])
+    
+    assert patched == (
+        "class Calc:\n    def add(self, a, b):\n        total = a + b\n        return total\n"
+    )
+
+
+def test_slightly_different_block_matches_fuzzily():
+    patched = apply_search_replace(SOURCE, [
+        {"search": "def sub(a, b):\n    return a-b", "replace": "def sub(a, b):\n    pass"},
+    ])
+    
+    assert "    pass\n" in patched
+    assert "return a - b" not in patched
+
+
+def test_block_can_be_deleted():
+    patched = apply_search_replace(SOURCE, [
+        {"search": "def sub(a, b):\n    return a - b ", "replace": ""},
+    ])
+    
+    assert "sub" not in patched
+
+
+def test_empty_patch_is_rejected():
+    with pytest.raises(PatchError):
+        apply_patch(SOURCE)
+
+
+# ============================================================================
+# Unified diffs
+# ============================================================================
+
+def test_unified_diff_is_applied():
+    diff = """\
+--- a/calc.py
++++ b/calc.py
+@@ -4,3 +4,3 @@
+
+
+ def sub(a, b):
+-    return a - b
++    return b - a
+"""
+
+    assert apply_patch(SOURCE, diff=diff) == SOURCE.replace("a - b", "b - a")
+
+
+def test_shifted_hunks_are_located():
+    shifted = "# header\n# more\n" + SOURCE
+    diff = """\
+@@ -1,2 +1,3 @@
+ def add(a, b):
++    \"\"\"Add.\"\"\"
+     return a + b
+@@ -5,2 +6,2 @@
+ def sub(a, b):
+-    return a - b
++    return b - a
+"""
+
+    patched = apply_unified_diff(shifted, diff)
+    
+    assert patched.startswith("# header\n# more\ndef add(a, b):\n    \"\"\"Add.\"\"\"\n")
+    assert patched.endswith("    return b - a\n")
+
+
+def test_pure_insertion_hunk():
+    diff = "@@ -2,0 +3,1 @@\n+    # done\n"
+    
+    patched = apply_unified_diff("a\nb", diff)
+    
+    assert patched == "a\nb\n    # done"
+
+
+def test_hunk_that_does_not_apply_is_rejected():
+    diff = "@@ -1,1 +1,1 @@\n-import os\n+import sys\n"
+    
+    with pytest.raises(PatchError, match="Hunk 1"):
+        apply_unified_diff(SOURCE, diff)
+
+
+def test_diff_without_hunks_is_rejected():
+    with pytest.raises(PatchError, match="No hunks"):
+        apply_unified_diff(SOURCE, "--- a/calc.py\n+++ b/calc.py\n")
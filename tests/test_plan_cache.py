@@ -0,0 +1,152 @@
+"""Tests for plan caching and the repository HEAD it is keyed by."""
+
+import asyncio
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.agents.plan_cache import PlanCache
+from src.agents.plan_generator import PlanGenerator
+from src.git import github_manager as gm
+from src.git.github_manager import GitHubManager
+from src.llm.fake import FakeLLMClient
+
+
+REPO = "https://github.com/test/repo"
+PLAN = {
+    "objetivo": "Agregar tests",
+    "archivos": ["tests/test_app.py"],
+    "pasos": [{"paso": 1, "descripcion": "Crear tests"}],
+    "estimacion": "5 minutos",
+}
+
+
+def git(*args: str, cwd: Path) -> str:
+    """Run a git command and return its output."""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.rstrip()
+
+
+def push_commit(git_repo: Path, bare: Path, name: str) -> str:
+    """Commit a file in ``git_repo`` and push it to the bare remote."""
+    (git_repo / name).write_text(f"{name}\n")
+    git("add", ".", cwd=git_repo)
+    git("commit", "-qm", f"Add {name}", cwd=git_repo)
+    git("push", "-q", str(bare), "HEAD", cwd=git_repo)
+    return git("rev-parse", "HEAD", cwd=git_repo)
+
+
+@pytest.fixture
+def manager(tmp_path: Path, github_remote: tuple[str, Path]) -> GitHubManager:
+    """GitHubManager cloning from the local remote."""
+    base_url, _ = github_remote
+    manager = GitHubManager(
+        token="unused",
+        workspace_path=tmp_path / "workspace",
+        git_base_url=base_url,
+    )
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def generator(database) -> PlanGenerator:
+    """Plan generator answering with ``PLAN`` from a fake provider."""
+    client = FakeLLMClient(text=json.dumps(PLAN), latency=0.0)
+    return PlanGenerator(client=client, cache=PlanCache())
+
+
+# ============================================================================
+# Repository HEAD
+# ============================================================================
+
+async def test_head_without_mirror_asks_the_remote(manager, git_repo):
+    sha = await manager.resolve_head_sha(REPO)
+    
+    assert sha == git("rev-parse", "HEAD", cwd=git_repo)
+    assert manager.get_stats()["head_lookups"] == {"local": 0, "remote": 1}
+
+
+async def test_head_of_mirrored_repo_skips_the_network(manager, git_repo, github_remote):
+    _, bare = github_remote
+    first = git("rev-parse", "HEAD", cwd=git_repo)
+    await manager.sync_repository(REPO, first)
+    second = push_commit(git_repo, bare, "new.py")
+    
+    # The mirror answers at once; the fetch runs in the background
+    assert await manager.resolve_head_sha(REPO) == first
+    await asyncio.gather(*manager._head_refreshes.values())
+    
+    assert await manager.resolve_head_sha(REPO) == second
+    assert manager.head_lookups_local == 2
+    assert manager.head_lookups_remote == 0
+
+
+async def test_mirror_is_fetched_at_most_once_per_interval(
+    manager, git_repo, github_remote, monkeypatch
+):
+    _, bare = github_remote
+    await manager.sync_repository(REPO, git("rev-parse", "HEAD", cwd=git_repo))
+    fetches = manager.mirrors.fetches
+    
+    await manager.resolve_head_sha(REPO)
+    await manager.resolve_head_sha(REPO)
+    await asyncio.gather(*manager._head_refreshes.values())
+    await manager.resolve_head_sha(REPO)
+    await asyncio.gather(*manager._head_refreshes.values())
+    
+    assert manager.mirrors.fetches == fetches + 1
+    
+    monkeypatch.setattr(gm, "HEAD_REFRESH_INTERVAL", 0.0)
+    latest = push_commit(git_repo, bare, "later.py")
+    await manager.resolve_head_sha(REPO)
+    await asyncio.gather(*manager._head_refreshes.values())
+    
+    assert await manager.resolve_head_sha(REPO) == latest
+
+
+async def test_failed_background_fetch_keeps_the_mirror_head(manager, git_repo, tmp_path):
+    sha = git("rev-parse", "HEAD", cwd=git_repo)
+    await manager.sync_repository(REPO, sha)
+    manager.git_base_url = f"file://{tmp_path / 'missing'}"
+    
+    assert await manager.resolve_head_sha(REPO) == sha
+    await asyncio.gather(*manager._head_refreshes.values())
+    
+    assert await manager.resolve_head_sha(REPO) == sha
+
+
+# ============================================================================
+# Plan generation
+# ============================================================================
+
+async def test_plan_is_cached_per_repository_snapshot(generator):
+    first = await generator.generate("Agrega tests", repo_url=REPO, repo_sha="a" * 40)
+    again = await generator.generate("Agrega tests", repo_url=REPO, repo_sha="a" * 40)
+    
+    assert first == again == PLAN
+    assert generator.cache.hits == 1
+    assert generator.cache.stores == 1
+
+
+async def test_plan_is_regenerated_when_head_moves(generator):
+    await generator.generate("Agrega tests", repo_url=REPO, repo_sha="a" * 40)
+    await generator.generate("Agrega tests", repo_url=REPO, repo_sha="b" * 40)
+    
+    assert generator.cache.hits == 0
+    assert generator.cache.invalidated == 1
+
+
+@pytest.mark.parametrize(("repo_url", "repo_sha"), [
+    (None, None),
+    ("", None),
+    (REPO, None),
+])
+async def test_plan_is_not_cached_without_snapshot(generator, repo_url, repo_sha):
+    await generator.generate("Agrega tests", repo_url=repo_url, repo_sha=repo_sha)
+    await generator.generate("Agrega tests", repo_url=repo_url, repo_sha=repo_sha)
+    
+    assert generator.cache.hits == generator.cache.misses == generator.cache.stores == 0
@@ -0,0 +1,74 @@
+"""Tests for incremental parsing of streamed plans."""
+
+import json
+
+import pytest
+
+from src.agents.plan_generator import PlanGenerator
+from src.agents.plan_stream import PlanStreamParser
+from src.llm.fake import FakeLLMClient
+
+
+PLAN = {
+    "objetivo": "Soportar \"comillas\" y \\ barras",
+    "archivos": ["src/app.py"],
+    "pasos": [
+        {"paso": 1, "descripcion": "Parsear {llaves} y [corchetes]", "depende_de": []},
+        {"paso": 2, "descripcion": "Escapar \"}\" en cadenas", "depende_de": [1]},
+    ],
+    "estimacion": "10 minutos",
+    "notas": "Un objeto {\"paso\": 9} después de los pasos no es un paso",
+}
+
+
+def feed(text: str, size: int) -> tuple[PlanStreamParser, list[dict]]:
+    """Feed ``text`` in chunks of ``size``, recording each reported snapshot."""
+    parser = PlanStreamParser()
+    snapshots = []
+    for i in range(0, len(text), size):
+        if parser.feed(text[i:i + size]):
+            snapshots.append(parser.snapshot())
+    return parser, snapshots
+
+
+@pytest.mark.parametrize("size", [1, 7, 10000])
+def test_steps_are_parsed_as_they_complete(size):
+    parser, snapshots = feed(json.dumps(PLAN, ensure_ascii=False, indent=2), size)
+    
+    assert parser.objective == PLAN["objetivo"]
+    assert parser.steps == PLAN["pasos"]
+    assert snapshots[-1] == {"objetivo": PLAN["objetivo"], "pasos": PLAN["pasos"]}
+    if size == 1:
+        assert [len(snapshot["pasos"]) for snapshot in snapshots] == [0, 1, 2]
+
+
+def test_partial_step_is_not_reported():
+    parser = PlanStreamParser()
+    
+    assert not parser.feed('{"pasos": [{"paso": 1, "descripcion": "a')
+    assert parser.snapshot() == {"objetivo": None, "pasos": []}
+    assert parser.feed('b"}, ')
+    assert parser.steps == [{"paso": 1, "descripcion": "ab"}]
+
+
+def test_invalid_step_is_skipped():
+    parser = PlanStreamParser()
+    
+    parser.feed('{"pasos": [{"paso": 1,}, {"paso": 2}]}')
+    
+    assert parser.steps == [{"paso": 2}]
+
+
+async def test_streamed_plan_reports_progress():
+    text = json.dumps(PLAN, ensure_ascii=False)
+    client = FakeLLMClient(text=text, latency=0.0, chunk_size=16)
+    generator = PlanGenerator(client=client)
+    snapshots = []
+    
+    async def on_progress(snapshot: dict) -> None:
+        snapshots.append(snapshot)
+    
+    plan = await generator.generate("Soportar comillas", on_progress=on_progress)
+    
+    assert plan == PLAN
+    assert [len(snapshot["pasos"]) for snapshot in snapshots] == [0, 1, 2]
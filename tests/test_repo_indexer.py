@@ -0,0 +1,128 @@
+"""Tests for repository indexing."""
+
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src.git.repo_indexer import INDEX_VERSION, RepoIndexer
+
+
+REPO_KEY = "test/repo"
+
+
+def commit(repo: Path, files: dict[str, str], message: str) -> str:
+    for name, content in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    subprocess.run(["git", "add", "."], cwd=repo, check=True, capture_output=True)
+    subprocess.run(["git", "commit", "-qm", message], cwd=repo, check=True, capture_output=True)
+    return subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def indexer(tmp_path: Path) -> RepoIndexer:
+    return RepoIndexer(tmp_path / "index")
+
+
+def test_full_build_parses_python_files(indexer, git_repo):
+    app = "import os\n\nclass App:\n    def run(self):\n        pass\n\ndef main():\n    pass\n"
+    sha = commit(git_repo, {"src/app.py": app, "src/broken.py": "def (:\n"}, "Add app")
+    
+    index = indexer.build(REPO_KEY, git_repo, sha)
+    
+    assert index["commit"] == sha
+    assert index["files"]["src/app.py"]["symbols"] == ["class App: run", "def main()"]
+    assert index["files"]["src/app.py"]["imports"] == ["os"]
+    assert index["files"]["src/broken.py"]["symbols"] == []
+    assert "symbols" not in index["files"]["README.md"]
+    assert index["stats"]["files"] == 3
+    assert indexer.full_builds == 1
+    assert indexer.files_parsed == 2
+
+
+def test_bare_mirror_is_indexed_like_a_checkout(indexer, git_repo, tmp_path):
+    sha = commit(git_repo, {"src/app.py": "def main():\n    pass\n"}, "Add app")
+    mirror = tmp_path / "repo.git"
+    subprocess.run(
+        ["git", "clone", "-q", "--bare", str(git_repo), str(mirror)],
+        check=True,
+        capture_output=True,
+    )
+    
+    index = indexer.build(REPO_KEY, mirror, sha)
+    
+    assert index["files"]["src/app.py"]["symbols"] == ["def main()"]
+    assert index["stats"]["files"] == 2
+
+
+def test_incremental_build_reuses_unchanged_files(indexer, git_repo):
+    first = commit(
+        git_repo, {"a.py": "def a():\n    pass\n", "b.py": "def b():\n    pass\n"}, "Add a, b"
+    )
+    indexer.build(REPO_KEY, git_repo, first)
+    
+    second = commit(git_repo, {"b.py": "def b2():\n    pass\n"}, "Change b")
+    index = indexer.build(REPO_KEY, git_repo, second)
+    
+    assert index["files"]["b.py"]["symbols"] == ["def b2()"]
+    assert indexer.incremental_builds == 1
+    assert indexer.files_reused == 2  # README.md and a.py
+    assert indexer.files_parsed == 3
+
+
+async def test_stored_index_is_loaded_not_rebuilt(indexer, git_repo):
+    sha = commit(git_repo, {"a.py": "x = 1\n"}, "Add a")
+    await indexer.index(REPO_KEY, git_repo, sha)
+    
+    assert (await indexer.get(REPO_KEY, sha))["commit"] == sha
+    assert (await indexer.latest(REPO_KEY))["commit"] == sha
+    assert indexer.build(REPO_KEY, git_repo, sha)["commit"] == sha
+    assert indexer.full_builds == 1
+
+
+def test_unreadable_or_outdated_index_is_ignored(indexer):
+    directory = indexer.index_path / REPO_KEY
+    directory.mkdir(parents=True)
+    (directory / "bad.json").write_text("{")
+    (directory / "old.json").write_text(json.dumps({"version": INDEX_VERSION - 1}))
+    
+    assert indexer.load(REPO_KEY, "bad") is None
+    assert indexer.load(REPO_KEY, "old") is None
+    assert indexer.load(REPO_KEY, "missing") is None
+
+
+def test_concurrent_stores_never_interleave(indexer):
+    shas = [f"{n:040x}" for n in range(16)]
+    
+    def store(sha: str) -> None:
+        files = {f"file_{n}.py": {"blob": sha, "size": n} for n in range(200)}
+        indexer._store(REPO_KEY, sha, {"version": INDEX_VERSION, "commit": sha, "files": files})
+    
+    # Every SHA twice, so writers of the same file overlap
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(store, shas + shas))
+    
+    directory = indexer.index_path / REPO_KEY
+    for sha in shas:
+        assert indexer.load(REPO_KEY, sha)["commit"] == sha
+    assert (directory / "LATEST").read_text() in shas
+    assert sorted(path.name for path in directory.iterdir() if path.name.endswith(".tmp")) == []
+
+
+def test_summary_fits_the_budget(indexer, git_repo):
+    files = {f"pkg/mod_{n}.py": f"def function_{n}():\n    pass\n" for n in range(50)}
+    sha = commit(git_repo, files, "Add modules")
+    index = indexer.build(REPO_KEY, git_repo, sha)
+    
+    small = indexer.summarize(index, max_tokens=200)
+    large = indexer.summarize(index, max_tokens=5000)
+    
+    assert small["archivos"] == 51
+    assert len(small["simbolos"]) < len(large["simbolos"]) == 50
+    assert "pkg/ (50 archivos)" in large["estructura"]
@@ -0,0 +1,182 @@
+"""Tests for whole-tree listings and cached repository reads."""
+
+import base64
+import subprocess
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.git.github_manager import GitHubManager
+from src.git.repo_tree import RepoTree, TreeEntry
+
+
+REPO = "https://github.com/test/repo"
+API_TREE = {
+    "sha": "f" * 40,
+    "truncated": False,
+    "tree": [
+        {"path": "src", "type": "tree"},
+        {"path": "src/app.py", "type": "blob", "size": 120},
+        {"path": "src/pkg/test_app.py", "type": "blob", "size": 30},
+        {"path": "README.md", "type": "blob", "size": 10},
+        {"path": "vendor/lib", "type": "commit"},
+    ],
+}
+
+
+class FakeApi:
+    """API cache answering from canned bodies per URL."""
+    
+    def __init__(self, bodies: dict[str, Any]) -> None:
+        self.bodies = bodies
+        self.requests: list[tuple[str, dict | None]] = []
+    
+    async def get(self, key: tuple, url: str, params: dict | None = None) -> Any:
+        self.requests.append((url, params))
+        return self.bodies[url]
+    
+    def get_stats(self) -> dict[str, Any]:
+        return {}
+
+
+def git(*args: str, cwd: Path) -> str:
+    """Run a git command and return its output."""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.rstrip()
+
+
+@pytest.fixture
+def manager(tmp_path: Path, github_remote: tuple[str, Path]) -> GitHubManager:
+    """GitHubManager cloning from the local remote, with canned API responses."""
+    base_url, _ = github_remote
+    manager = GitHubManager(
+        token="unused",
+        workspace_path=tmp_path / "workspace",
+        git_base_url=base_url,
+    )
+    manager.api = FakeApi({
+        "/repos/test/repo": {
+            "full_name": "test/repo",
+            "default_branch": "main",
+            "private": False,
+            "description": "Repositorio de prueba",
+            "language": "Python",
+        },
+        "/repos/test/repo/git/trees/main": API_TREE,
+        "/repos/test/repo/contents/src": [
+            {"name": "app.py", "path": "src/app.py", "type": "file", "size": 120},
+            {"name": "pkg", "path": "src/pkg", "type": "dir", "size": 0},
+        ],
+        "/repos/test/repo/contents/README.md": {
+            "name": "README.md",
+            "path": "README.md",
+            "type": "file",
+            "size": 10,
+            "content": base64.b64encode("# Hola\n".encode()).decode(),
+        },
+    })
+    yield manager
+    manager.close()
+
+
+# ============================================================================
+# Trees
+# ============================================================================
+
+def test_api_tree_is_sorted():
+    tree = RepoTree.from_api(API_TREE)
+    
+    assert [entry.path for entry in tree][:2] == ["README.md", "src"]
+    assert len(tree) == 5
+    assert tree.total_size() == 160
+    assert [entry.path for entry in tree.files()] == [
+        "README.md", "src/app.py", "src/pkg/test_app.py",
+    ]
+
+
+@pytest.mark.parametrize(("pattern", "object_type", "paths"), [
+    ("*.md", "blob", ["README.md"]),
+    ("src/*.py", "blob", ["src/app.py"]),
+    ("src/**/*.py", "blob", ["src/app.py", "src/pkg/test_app.py"]),
+    ("**/test_?pp.py", "blob", ["src/pkg/test_app.py"]),
+    ("src**", None, ["src", "src/app.py", "src/pkg/test_app.py"]),
+    ("vendor/*", "commit", ["vendor/lib"]),
+])
+def test_glob(pattern, object_type, paths):
+    tree = RepoTree.from_api(API_TREE)
+    
+    assert [entry.path for entry in tree.glob(pattern, object_type)] == paths
+
+
+def test_ls_tree_output_is_parsed():
+    output = "\0".join([
+        "040000 tree aaaa -\tsrc",
+        "100644 blob bbbb 42\tsrc/app.py",
+        "160000 commit cccc -\tvendor",
+        "",
+    ])
+    
+    tree = RepoTree.from_ls_tree("d" * 40, output)
+    
+    assert list(tree) == [
+        TreeEntry("src", "tree", 0),
+        TreeEntry("src/app.py", "blob", 42),
+        TreeEntry("vendor", "commit", 0),
+    ]
+
+
+async def test_mirrored_commit_is_listed_without_api(manager, git_repo):
+    head = git("rev-parse", "HEAD", cwd=git_repo)
+    await manager.sync_repository(REPO, head)
+    
+    tree = await manager.get_tree(REPO, head)
+    
+    assert [entry.path for entry in tree] == ["README.md"]
+    assert manager.api.requests == []
+
+
+async def test_default_branch_tree_comes_from_api(manager):
+    tree = await manager.get_tree(REPO)
+    
+    assert tree.sha == API_TREE["sha"]
+    assert manager.api.requests[-1] == ("/repos/test/repo/git/trees/main", {"recursive": "1"})
+
+
+async def test_truncated_tree_is_listed_from_mirror(manager, git_repo):
+    branch = git("symbolic-ref", "--short", "HEAD", cwd=git_repo)
+    head = git("rev-parse", "HEAD", cwd=git_repo)
+    manager.api.bodies[f"/repos/test/repo/git/trees/{branch}"] = {**API_TREE, "truncated": True}
+    
+    tree = await manager.get_tree(REPO, branch)
+    
+    assert tree.sha == head
+    assert not tree.truncated
+
+
+# ============================================================================
+# Repository reads
+# ============================================================================
+
+async def test_repository_info(manager):
+    info = await manager.get_repository_info(REPO)
+    
+    assert info["default_branch"] == "main"
+    assert info["topics"] == []
+
+
+async def test_file_content_is_decoded(manager):
+    assert await manager.get_file_content(REPO, "README.md") == "# Hola\n"
+    
+    with pytest.raises(ValueError):
+        await manager.get_file_content(REPO, "src")
+
+
+async def test_list_directory(manager):
+    entries = await manager.list_directory(REPO, "src", branch="main")
+    single = await manager.list_directory(REPO, "README.md")
+    
+    assert [entry["type"] for entry in entries] == ["file", "dir"]
+    assert single == [{"name": "README.md", "path": "README.md", "type": "file", "size": 10}]
+    assert ("/repos/test/repo/contents/src", {"ref": "main"}) in manager.api.requests
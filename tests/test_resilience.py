@@ -0,0 +1,375 @@
+"""Tests for retries, hedging and circuit breaking of LLM calls."""
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator
+
+import pytest
+
+from src.llm.fake import FakeLLMClient, FakeProviderError, FakeRateLimitError
+from src.llm.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientClient,
+    is_transient_error,
+)
+from src.llm.scheduler import LLMScheduler
+
+
+MESSAGES = [{"role": "user", "content": "agrega tests al módulo de pagos"}]
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self) -> None:
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class ScriptedLLMClient(FakeLLMClient):
+    """Fake provider failing its first ``failures`` requests, with scripted latencies."""
+    
+    def __init__(self, failures: int = 0, latencies: tuple[float, ...] = (), **kwargs) -> None:
+        kwargs.setdefault("latency", 0.0)
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.latencies = list(latencies)
+    
+    def _delay(self) -> float:
+        if self.failures:
+            self.failures -= 1
+            self.failed += 1
+            raise FakeProviderError("Service unavailable")
+        if self.latencies:
+            return self.latencies.pop(0)
+        return super()._delay()
+
+
+class BrokenStreamClient(FakeLLMClient):
+    """Fake provider whose streams fail after their first chunk."""
+    
+    async def _stream(self, **kwargs) -> AsyncIterator[str]:
+        yield "parcial"
+        raise FakeProviderError("Connection reset")
+
+
+class RateLimitedClient(FakeLLMClient):
+    """Fake provider answering every request with a 429."""
+    
+    def _check_quota(self) -> None:
+        self.rate_limited += 1
+        raise FakeRateLimitError(0.0)
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Record asyncio.sleep delays instead of waiting them out."""
+    recorded: list[float] = []
+    real_sleep = asyncio.sleep
+    
+    async def fake_sleep(delay: float, result=None):
+        recorded.append(delay)
+        await real_sleep(0)
+        return result
+    
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+def resilient(client, **kwargs) -> ResilientClient:
+    kwargs.setdefault("breaker", CircuitBreaker(client.provider, failure_threshold=100))
+    return ResilientClient(client, **kwargs)
+
+
+async def complete(client) -> str:
+    response = await client.complete(model="fake", messages=MESSAGES, max_tokens=100)
+    return response.text
+
+
+async def stream(client) -> str:
+    chunks = []
+    async for chunk in client.stream(model="fake", messages=MESSAGES, max_tokens=100):
+        chunks.append(chunk)
+    return "".join(chunks)
+
+
+# ============================================================================
+# Retries
+# ============================================================================
+
+async def test_retries_transient_errors_until_success(sleeps):
+    provider = ScriptedLLMClient(failures=2, text="ok", blocking=True)
+    client = resilient(provider, max_attempts=3)
+    
+    assert await complete(client) == "ok"
+    assert provider.failed == 2
+    assert client.retries == 2
+    assert client.breaker.state == CLOSED
+
+
+async def test_retry_backoff_is_capped(sleeps, monkeypatch):
+    # Take the top of every jitter range
+    monkeypatch.setattr(random, "uniform", lambda low, high: high)
+    provider = ScriptedLLMClient(failures=10, blocking=True)
+    client = resilient(provider, max_attempts=5, base_delay=1.0, max_delay=4.0)
+    
+    with pytest.raises(FakeProviderError):
+        await complete(client)
+    
+    assert provider.failed == 5
+    assert client.retries == 4
+    assert sleeps == [1.0, 2.0, 4.0, 4.0]
+
+
+async def test_retry_after_is_honoured_within_cap(sleeps, monkeypatch):
+    monkeypatch.setattr(random, "uniform", lambda low, high: low)
+    
+    class Overloaded(FakeLLMClient):
+        def _delay(self) -> float:
+            self.failed += 1
+            error = FakeProviderError("Overloaded")
+            error.retry_after = 3.0 if self.failed == 1 else 30.0
+            raise error
+    
+    client = resilient(Overloaded(blocking=True), max_attempts=3, max_delay=10.0)
+    
+    with pytest.raises(FakeProviderError):
+        await complete(client)
+    
+    assert sleeps == [3.0, 10.0]
+
+
+async def test_permanent_errors_are_not_retried(sleeps):
+    def reject(messages):
+        raise ValueError("bad request")
+    
+    provider = ScriptedLLMClient(responder=reject, blocking=True)
+    client = resilient(provider, max_attempts=3)
+    
+    with pytest.raises(ValueError):
+        await complete(client)
+    
+    assert provider.errors == 1
+    assert client.retries == 0
+    assert sleeps == []
+
+
+def test_rate_limits_are_left_to_the_scheduler():
+    assert not is_transient_error(FakeRateLimitError(1.0))
+    assert is_transient_error(FakeProviderError("down"))
+    assert is_transient_error(TimeoutError())
+    assert not is_transient_error(CircuitOpenError("fake", 1.0))
+
+
+async def test_attempt_timeout_abandons_slow_attempts():
+    provider = ScriptedLLMClient(latencies=(5.0,), text="ok")
+    client = resilient(provider, max_attempts=2, base_delay=0.0, attempt_timeout=0.05)
+    
+    start = time.perf_counter()
+    assert await complete(client) == "ok"
+    
+    assert time.perf_counter() - start < 1.0
+    assert client.timeouts == 1
+    assert client.retries == 1
+    assert provider.in_flight == 0
+
+
+# ============================================================================
+# Hedging
+# ============================================================================
+
+async def test_hedge_wins_and_cancels_slow_attempt():
+    provider = ScriptedLLMClient(latencies=(0.01,) * 5 + (5.0, 0.01), text="ok")
+    client = resilient(provider, hedge=True, hedge_min_samples=5)
+    
+    for _ in range(5):
+        await complete(client)
+    assert client.hedge_delay() is not None
+    
+    start = time.perf_counter()
+    assert await complete(client) == "ok"
+    await asyncio.sleep(0)
+    
+    assert time.perf_counter() - start < 1.0
+    assert client.hedges_sent == 1
+    assert client.hedges_won == 1
+    # The slow request was cancelled, not left running or counted
+    assert provider.in_flight == 0
+    assert provider.requests == 6
+    assert provider.errors == 0
+    assert client.breaker.state == CLOSED
+
+
+async def test_no_hedge_before_enough_samples():
+    provider = ScriptedLLMClient(latencies=(0.05,), text="ok")
+    client = resilient(provider, hedge=True, hedge_min_samples=5)
+    
+    assert client.hedge_delay() is None
+    assert await complete(client) == "ok"
+    assert client.hedges_sent == 0
+
+
+# ============================================================================
+# Circuit breaker
+# ============================================================================
+
+async def test_breaker_opens_fails_fast_and_recovers():
+    clock = Clock()
+    provider = ScriptedLLMClient(text="ok")
+    provider.down = True
+    breaker = CircuitBreaker("fake", failure_threshold=2, reset_timeout=10.0, clock=clock)
+    client = ResilientClient(provider, breaker=breaker, max_attempts=1)
+    
+    for _ in range(2):
+        with pytest.raises(FakeProviderError):
+            await complete(client)
+    assert breaker.state == OPEN
+    
+    # Open: fail without calling the provider
+    with pytest.raises(CircuitOpenError) as excinfo:
+        await complete(client)
+    assert excinfo.value.retry_in == 10.0
+    assert provider.failed == 2
+    assert client.fast_failures == 1
+    
+    # Half-open: one probe goes through and closes the circuit
+    clock.now = 10.0
+    provider.down = False
+    assert await complete(client) == "ok"
+    assert breaker.state == CLOSED
+    assert breaker.get_stats()["consecutive_failures"] == 0
+    assert breaker.opened == 1
+
+
+async def test_failed_probe_reopens_breaker():
+    clock = Clock()
+    provider = ScriptedLLMClient()
+    provider.down = True
+    breaker = CircuitBreaker("fake", failure_threshold=1, reset_timeout=10.0, clock=clock)
+    client = ResilientClient(provider, breaker=breaker, max_attempts=1)
+    
+    with pytest.raises(FakeProviderError):
+        await complete(client)
+    
+    clock.now = 10.0
+    with pytest.raises(FakeProviderError):
+        await complete(client)
+    assert breaker.state == OPEN
+    assert breaker.opened == 2
+    
+    clock.now = 15.0
+    with pytest.raises(CircuitOpenError):
+        await complete(client)
+    assert provider.failed == 2
+
+
+def test_half_open_lets_one_probe_through():
+    clock = Clock()
+    breaker = CircuitBreaker("fake", failure_threshold=1, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    
+    clock.now = 10.0
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    
+    # A probe that never reports back is replaced
+    clock.now = 20.0
+    assert breaker.allow()
+    assert breaker.rejected == 1
+
+
+async def test_retries_stop_once_breaker_opens(sleeps):
+    provider = ScriptedLLMClient(blocking=True)
+    provider.down = True
+    breaker = CircuitBreaker("fake", failure_threshold=2, reset_timeout=60.0)
+    client = ResilientClient(provider, breaker=breaker, max_attempts=5)
+    
+    with pytest.raises(CircuitOpenError):
+        await complete(client)
+    
+    assert provider.failed == 2
+    assert client.fast_failures == 1
+
+
+# ============================================================================
+# Streaming
+# ============================================================================
+
+async def test_stream_retries_before_first_chunk(sleeps):
+    provider = ScriptedLLMClient(failures=1, text="respuesta completa", chunk_size=4)
+    client = resilient(provider, max_attempts=2)
+    
+    assert await stream(client) == "respuesta completa"
+    assert provider.failed == 1
+    assert client.retries == 1
+    assert len(sleeps) >= 1
+
+
+async def test_stream_is_not_retried_after_first_chunk(sleeps):
+    provider = BrokenStreamClient()
+    client = resilient(provider, max_attempts=3)
+    chunks = []
+    
+    with pytest.raises(FakeProviderError):
+        async for chunk in client.stream(model="fake", messages=MESSAGES, max_tokens=100):
+            chunks.append(chunk)
+    
+    assert chunks == ["parcial"]
+    assert client.retries == 0
+    assert client.breaker.get_stats()["consecutive_failures"] == 1
+
+
+async def test_stream_fails_fast_when_breaker_open():
+    clock = Clock()
+    breaker = CircuitBreaker("fake", failure_threshold=1, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    provider = ScriptedLLMClient()
+    client = ResilientClient(provider, breaker=breaker)
+    
+    with pytest.raises(CircuitOpenError):
+        await stream(client)
+    assert provider.requests == 0
+
+
+# ============================================================================
+# Scheduler 429 re-queues
+# ============================================================================
+
+async def test_scheduler_requeues_429_a_bounded_number_of_times():
+    provider = RateLimitedClient()
+    scheduler = LLMScheduler(provider, requests_per_minute=6000, max_requeues=2)
+    client = resilient(scheduler.lane("interactive"), max_attempts=3)
+    
+    try:
+        with pytest.raises(FakeRateLimitError):
+            await complete(client)
+    finally:
+        await scheduler.aclose()
+    
+    # One attempt plus two re-queues, and no retries on top of them
+    assert provider.rate_limited == 3
+    assert client.retries == 0
+    assert scheduler.get_stats()["lanes"]["interactive"]["rate_limit_failures"] == 1
+    assert client.breaker.state == CLOSED
+
+
+async def test_scheduler_stream_requeues_429_a_bounded_number_of_times():
+    provider = RateLimitedClient()
+    scheduler = LLMScheduler(provider, requests_per_minute=6000, max_requeues=1)
+    
+    try:
+        with pytest.raises(FakeRateLimitError):
+            await stream(scheduler.lane("background"))
+    finally:
+        await scheduler.aclose()
+    
+    assert provider.rate_limited == 2
+    assert scheduler.get_stats()["lanes"]["background"]["rate_limit_failures"] == 1
@@ -0,0 +1,122 @@
+"""Tests for the deterministic intent fast path."""
+
+import pytest
+
+from src.agents.rule_classifier import (
+    COMMAND_CONFIDENCE,
+    KEYWORD_CONFIDENCE,
+    NEW_TASK_CONFIDENCE,
+    REPLY_CONFIDENCE,
+    RuleBasedClassifier,
+)
+from src.models.task import Intent
+
+
+REPO = "https://github.com/test/repo"
+TASK_MESSAGE = "✅ Tarea task-0123abcd creada. ¿Apruebas el plan?"
+
+
+@pytest.fixture
+def classifier() -> RuleBasedClassifier:
+    return RuleBasedClassifier(threshold=0.9)
+
+
+@pytest.mark.parametrize(("message", "intent", "confidence"), [
+    # Commands
+    ("/status", Intent.TASK_STATUS, COMMAND_CONFIDENCE),
+    ("/list@dev_task_bot", Intent.TASK_LIST, COMMAND_CONFIDENCE),
+    ("/abort", Intent.TASK_ABORT, COMMAND_CONFIDENCE),
+    ("/cancel", Intent.TASK_ABORT, COMMAND_CONFIDENCE),
+    (f"/task {REPO} agrega tests", Intent.TASK_NEW, COMMAND_CONFIDENCE),
+    # Keywords
+    ("Mis tareas", Intent.TASK_LIST, KEYWORD_CONFIDENCE),
+    ("show me my tasks", Intent.TASK_LIST, KEYWORD_CONFIDENCE),
+    ("¡Cancela la tarea, por favor!", Intent.TASK_ABORT, KEYWORD_CONFIDENCE),
+    ("stop", Intent.TASK_ABORT, KEYWORD_CONFIDENCE),
+    ("¿Cómo va?", Intent.TASK_STATUS, KEYWORD_CONFIDENCE),
+    ("progress", Intent.TASK_STATUS, KEYWORD_CONFIDENCE),
+    # Change requests naming a repository
+    (f"Agrega tests al módulo de pagos en {REPO}", Intent.TASK_NEW, NEW_TASK_CONFIDENCE),
+    (f"{REPO} fix the login redirect", Intent.TASK_NEW, NEW_TASK_CONFIDENCE),
+    (f"Por favor añade logging a {REPO}", Intent.TASK_NEW, NEW_TASK_CONFIDENCE),
+])
+def test_rule_table(classifier, message, intent, confidence):
+    result = classifier.classify(message)
+    
+    assert result is not None
+    assert result.intent == intent
+    assert result.confidence == confidence
+
+
+@pytest.mark.parametrize("message", [
+    "hola",
+    "¿qué puedes hacer?",
+    "/start",
+    f"/task {REPO}",
+    f"¿Por qué falla el build de {REPO}?",
+    f"Mira {REPO}, tiene buena pinta",
+    f"{REPO}",
+    "cancela el pedido de pizza",
+])
+def test_unmatched_messages_fall_back_to_llm(classifier, message):
+    assert classifier.classify(message) is None
+
+
+def test_every_rule_clears_the_threshold(classifier):
+    rules = (COMMAND_CONFIDENCE, REPLY_CONFIDENCE, KEYWORD_CONFIDENCE, NEW_TASK_CONFIDENCE)
+    
+    assert all(confidence >= classifier.threshold for confidence in rules)
+
+
+def test_new_task_extracts_repo_and_description(classifier):
+    result = classifier.classify(f"Agrega tests al módulo de pagos en {REPO}.")
+    
+    assert result.extracted_info == {
+        "repo": REPO,
+        "description": "Agrega tests al módulo de pagos en",
+    }
+
+
+def test_reply_to_task_message_continues_it(classifier):
+    result = classifier.classify("sí, pero usa pytest", reply_to_text=TASK_MESSAGE)
+    
+    assert result.intent == Intent.TASK_CONTINUE
+    assert result.confidence == REPLY_CONFIDENCE
+    assert result.extracted_info == {"task_id": "task-0123abcd"}
+
+
+@pytest.mark.parametrize(("message", "intent"), [
+    ("cancela", Intent.TASK_ABORT),
+    ("abort this task", Intent.TASK_ABORT),
+    ("¿cómo va?", Intent.TASK_STATUS),
+    ("mis tareas", Intent.TASK_LIST),
+])
+def test_keywords_win_over_reply(classifier, message, intent):
+    result = classifier.classify(message, reply_to_text=TASK_MESSAGE)
+    
+    assert result.intent == intent
+
+
+def test_reply_without_task_id_is_not_matched(classifier):
+    assert classifier.classify("sí, dale", reply_to_text="Hola, ¿en qué te ayudo?") is None
+
+
+def test_threshold_filters_rules():
+    classifier = RuleBasedClassifier(threshold=0.96)
+    
+    assert classifier.classify("cancela") is None
+    assert classifier.classify("/abort").intent == Intent.TASK_ABORT
+
+
+def test_stats_track_hits_and_misses(classifier):
+    classifier.classify("/status")
+    classifier.classify("/status")
+    classifier.classify("hola")
+    classifier.record_llm_latency(2.0)
+    
+    stats = classifier.get_stats()
+    assert stats["hits"] == {Intent.TASK_STATUS.value: 2}
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+    assert stats["llm_latency"] == pytest.approx(1.6)
+    assert stats["latency_saved"][Intent.TASK_STATUS.value] > 3.0
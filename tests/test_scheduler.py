@@ -0,0 +1,195 @@
+"""Tests for quota-aware scheduling of LLM requests."""
+
+import asyncio
+
+import pytest
+
+from src.llm.client import _get_scheduler, close_llm_clients, get_llm_client, quota_share
+from src.llm.fake import FakeLLMClient, FakeRateLimitError
+from src.llm.scheduler import LLMScheduler, QueueDeadlineExceeded, TokenBucket
+
+
+MESSAGES = [{"role": "user", "content": "hola"}]
+
+
+class Clock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self) -> None:
+        self.now = 0.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+# ============================================================================
+# Quotas shared between processes
+# ============================================================================
+
+def test_quota_share_splits_between_processes():
+    assert quota_share(0, 4) == 0
+    assert quota_share(1000, 1) == 1000
+    assert quota_share(1000, 4) == 250
+    assert quota_share(3, 4) == 1
+
+
+async def test_scheduler_uses_the_process_share(config):
+    config.llm_requests_per_minute = 300
+    config.llm_tokens_per_minute = 90_000
+    config.llm_quota_processes = 3
+    
+    try:
+        client = get_llm_client(config, "standard")
+        scheduler = client.client.scheduler
+        
+        assert scheduler.requests_per_minute == 100
+        assert scheduler.tokens_per_minute == 30_000
+    finally:
+        await close_llm_clients()
+
+
+async def test_scheduler_is_shared_per_provider():
+    provider = FakeLLMClient()
+    
+    try:
+        first = _get_scheduler(provider, 60, 0, 2)
+        assert _get_scheduler(provider, 60, 0, 2) is first
+        assert first.requests_per_minute == 30
+    finally:
+        await close_llm_clients()
+
+
+# ============================================================================
+# Token buckets
+# ============================================================================
+
+def test_token_bucket_refills_up_to_capacity():
+    clock = Clock()
+    bucket = TokenBucket(rate=2.0, capacity=10.0, clock=clock)
+    
+    bucket.consume(10)
+    assert bucket.delay(4) == 2.0
+    
+    clock.now = 1.0
+    assert bucket.delay(2) == 0.0
+    
+    clock.now = 100.0
+    assert bucket.delay(10) == 0.0
+    assert bucket.tokens == 10.0
+
+
+def test_token_bucket_may_go_into_debt():
+    clock = Clock()
+    bucket = TokenBucket(rate=1.0, capacity=5.0, clock=clock)
+    
+    bucket.consume(8)
+    assert bucket.tokens == -3.0
+    # Never asks for more than the capacity
+    assert bucket.delay(50) == 8.0
+    
+    bucket.refund(3)
+    assert bucket.tokens == 0.0
+
+
+# ============================================================================
+# Admission
+# ============================================================================
+
+async def test_interactive_lane_is_admitted_first():
+    scheduler = LLMScheduler(FakeLLMClient(), requests_per_minute=6000)
+    scheduler.on_rate_limited(FakeRateLimitError(0.05), scheduler.clock())
+    admitted = []
+    
+    async def acquire(lane: str) -> None:
+        await scheduler.acquire(lane, 10)
+        admitted.append(lane)
+    
+    try:
+        await asyncio.gather(
+            acquire("background"),
+            acquire("standard"),
+            acquire("interactive"),
+        )
+    finally:
+        await scheduler.aclose()
+    
+    assert admitted == ["interactive", "standard", "background"]
+
+
+async def test_request_fails_after_lane_deadline():
+    scheduler = LLMScheduler(
+        FakeLLMClient(), requests_per_minute=6000, deadlines={"interactive": 0.05}
+    )
+    scheduler.on_rate_limited(FakeRateLimitError(5.0), scheduler.clock())
+    
+    try:
+        with pytest.raises(QueueDeadlineExceeded):
+            await scheduler.lane("interactive").complete(
+                model="fake", messages=MESSAGES, max_tokens=10
+            )
+    finally:
+        await scheduler.aclose()
+    
+    assert scheduler.get_stats()["lanes"]["interactive"]["expired"] == 1
+
+
+def test_unknown_lane_is_rejected():
+    with pytest.raises(ValueError):
+        LLMScheduler(FakeLLMClient()).lane("urgent")
+
+
+async def test_usage_corrects_token_estimate():
+    provider = FakeLLMClient(text="ok", latency=0.0)
+    scheduler = LLMScheduler(provider, tokens_per_minute=60_000)
+    
+    try:
+        await scheduler.lane("standard").complete(model="fake", messages=MESSAGES, max_tokens=1000)
+    finally:
+        await scheduler.aclose()
+    
+    # max_tokens was reserved, and refunded once the response reported usage
+    assert scheduler._tokens.tokens > 60_000 - 100
+
+
+# ============================================================================
+# 429 backoff
+# ============================================================================
+
+async def test_rate_limit_burst_slows_down_once():
+    clock = Clock()
+    scheduler = LLMScheduler(FakeLLMClient(), requests_per_minute=600, clock=clock)
+    sent_at = clock()
+    
+    clock.now = 1.0
+    scheduler.on_rate_limited(FakeRateLimitError(2.0), sent_at)
+    scheduler.on_rate_limited(FakeRateLimitError(2.0), sent_at)
+    
+    assert scheduler.rate_factor == 0.5
+    assert scheduler.rate_limited == 2
+    assert scheduler._delay(1) == pytest.approx(2.0)
+    
+    # Successes recover the rate gradually
+    scheduler.settle(10, 10)
+    assert scheduler.rate_factor == pytest.approx(0.55)
+
+
+async def test_rate_limited_request_is_sent_again():
+    class LimitedOnce(FakeLLMClient):
+        def _check_quota(self) -> None:
+            if not self.rate_limited:
+                self.rate_limited += 1
+                raise FakeRateLimitError(0.01)
+    
+    provider = LimitedOnce(text="ok", latency=0.0)
+    scheduler = LLMScheduler(provider, requests_per_minute=6000)
+    
+    try:
+        response = await scheduler.lane("background").complete(
+            model="fake", messages=MESSAGES, max_tokens=10
+        )
+    finally:
+        await scheduler.aclose()
+    
+    assert response.text == "ok"
+    assert scheduler.rate_limited == 1
+    assert scheduler.get_stats()["lanes"]["background"]["rate_limit_failures"] == 0
@@ -0,0 +1,98 @@
+"""Tests for running plan steps as a dependency graph."""
+
+import asyncio
+
+from src.agents.step_scheduler import StepScheduler
+
+
+def step(number: int, *files: str, depende_de: list[int] | None = None) -> dict:
+    paso = {"paso": number, "descripcion": f"Paso {number}", "archivos": list(files)}
+    if depende_de is not None:
+        paso["depende_de"] = depende_de
+    return paso
+
+
+class Runner:
+    """Step runner recording concurrency, finishing later steps first."""
+    
+    def __init__(self, fail: set[int] | None = None, error: set[int] | None = None) -> None:
+        self.fail = fail or set()
+        self.error = error or set()
+        self.started: list[int] = []
+        self.running = 0
+        self.max_running = 0
+    
+    async def __call__(self, paso: dict) -> dict:
+        number = paso["paso"]
+        self.started.append(number)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(0.01 * (5 - number))
+        finally:
+            self.running -= 1
+        if number in self.error:
+            raise RuntimeError(f"step {number} crashed")
+        return {"success": number not in self.fail, "step": number}
+
+
+def test_dependencies_follow_files_and_declarations():
+    pasos = [
+        step(1, "a.py"),
+        step(2, "b.py"),
+        step(3, "a.py", "c.py"),
+        step(4, "d.py", depende_de=[2, 9]),
+        step(5),
+    ]
+    
+    deps = StepScheduler.build_dependencies(pasos, [{"paso": 2, "depende_de": [1]}, "nada"])
+    
+    assert deps == {1: set(), 2: {1}, 3: {1}, 4: {2}, 5: {1, 2, 3, 4}}
+
+
+async def test_independent_steps_run_in_parallel_and_complete_in_order():
+    runner = Runner()
+    completed = []
+    
+    async def on_complete(paso: dict, result: dict) -> None:
+        completed.append(paso["paso"])
+    
+    results = await StepScheduler(max_parallel=2).run(
+        [step(1, "a.py"), step(2, "b.py"), step(3, "c.py"), step(4, "a.py")],
+        runner,
+        on_complete,
+    )
+    
+    assert runner.max_running == 2
+    assert completed == [1, 2, 3, 4]
+    assert [result["step"] for result in results] == [1, 2, 3, 4]
+
+
+async def test_scheduling_stops_after_a_failed_step():
+    runner = Runner(error={2})
+    completed = []
+    
+    async def on_complete(paso: dict, result: dict) -> None:
+        completed.append((paso["paso"], result["success"]))
+    
+    results = await StepScheduler().run(
+        [step(1, "a.py"), step(2, "b.py"), step(3, "b.py"), step(4, "d.py")],
+        runner,
+        on_complete,
+    )
+    
+    # Step 3 waits for the failed step and is never started
+    assert 3 not in runner.started
+    assert results[1] == {"success": False, "step": 2, "error": "step 2 crashed"}
+    assert completed == [(1, True), (2, False), (4, True)]
+
+
+async def test_unsatisfiable_dependencies_run_in_plan_order():
+    scheduler = StepScheduler()
+    scheduler.build_dependencies = lambda pasos, extra=None: {1: {2}, 2: {1}}
+    runner = Runner()
+    
+    results = await scheduler.run([step(1, "a.py"), step(2, "b.py")], runner)
+    
+    assert runner.started == [1, 2]
+    assert len(results) == 2
@@ -0,0 +1,387 @@
+"""Tests for approving, aborting and running queued task jobs."""
+
+import asyncio
+
+from src.core.orchestrator import DevTaskOrchestrator
+from src.core.workers import TaskWorkerPool
+from src.models import database as db
+from src.models.task import Task, TaskStatus
+
+
+WORKER = "host:1:0"
+
+
+class StubExecutor:
+    """Executor running ``steps`` steps, calling ``between`` after the first."""
+    
+    def __init__(self, steps: int = 3, between=None) -> None:
+        self.steps = steps
+        self.between = between
+        self.steps_run = 0
+        self.partial_commits = 0
+    
+    async def execute(self, task: Task, on_progress=None) -> dict:
+        for step in range(1, self.steps + 1):
+            self.steps_run += 1
+            task.current_step = step
+            await on_progress(task)
+            if step == 1 and self.between is not None:
+                await self.between(task)
+        return {"success": True, "steps_completed": task.current_step}
+    
+    async def commit_partial_work(self, task: Task) -> str | None:
+        self.partial_commits += 1
+        return None
+
+
+def make_orchestrator(config, executor: StubExecutor | None = None) -> DevTaskOrchestrator:
+    orchestrator = DevTaskOrchestrator(config)
+    orchestrator._executor = executor or StubExecutor()
+    return orchestrator
+
+
+def save(task: Task, status: TaskStatus, current_step: int = 0) -> Task:
+    task.status = status
+    task.current_step = current_step
+    db.save_task(task)
+    return task
+
+
+def job_status(task_id: str) -> str | None:
+    with db.get_session() as session:
+        return (
+            session.query(db.JobModel.status)
+            .filter(db.JobModel.task_id == task_id)
+            .scalar()
+        )
+
+
+# ============================================================================
+# Jobs table
+# ============================================================================
+
+def test_cancelled_queued_job_is_never_claimed(database, sample_task):
+    db.enqueue_job(sample_task.id)
+    
+    assert db.cancel_job(sample_task.id) == "queued"
+    assert db.claim_job(WORKER, 60, 3) is None
+    assert db.is_job_cancelled(sample_task.id)
+
+
+def test_cancelled_running_job_loses_its_lease(database, sample_task):
+    db.enqueue_job(sample_task.id)
+    assert db.claim_job(WORKER, 60, 3) == sample_task.id
+    
+    assert db.cancel_job(sample_task.id) == "running"
+    assert not db.heartbeat_job(sample_task.id, WORKER, 60)
+    assert not db.finish_job(sample_task.id, WORKER, "done")
+    assert job_status(sample_task.id) == "cancelled"
+
+
+def test_finished_or_missing_jobs_are_not_cancelled(database, sample_task):
+    assert db.cancel_job(sample_task.id) is None
+    
+    db.enqueue_job(sample_task.id)
+    db.claim_job(WORKER, 60, 3)
+    db.finish_job(sample_task.id, WORKER, "done")
+    assert db.cancel_job(sample_task.id) is None
+    assert not db.is_job_cancelled(sample_task.id)
+
+
+def test_only_exhausted_jobs_are_failed_once(database):
+    for task_id in ("task-a", "task-b", "task-c"):
+        db.enqueue_job(task_id)
+    # Leases already expired on claim
+    claimed = [db.claim_job(WORKER, -1, 1) for _ in range(3)]
+    assert sorted(claimed) == ["task-a", "task-b", "task-c"]
+    db.finish_job("task-b", WORKER, "done")
+    db.enqueue_job("task-c")
+    
+    assert db.fail_exhausted_jobs(1) == ["task-a"]
+    assert db.fail_exhausted_jobs(1) == []
+    assert [job_status(task_id) for task_id in ("task-a", "task-b", "task-c")] == [
+        "failed", "done", "queued",
+    ]
+
+
+def test_aborted_status_is_not_overwritten(database, sample_task):
+    save(sample_task, TaskStatus.ABORTED)
+    
+    rows = db.apply_task_updates({
+        sample_task.id: {"status": TaskStatus.COMPLETED, "current_step": 3},
+    })
+    
+    assert rows == 0
+    assert db.get_task(sample_task.id).status == TaskStatus.ABORTED
+
+
+# ============================================================================
+# Orchestrator
+# ============================================================================
+
+async def test_approval_is_written_before_the_job_is_queued(config, sample_task_with_plan):
+    save(sample_task_with_plan, TaskStatus.PENDING_APPROVAL)
+    orchestrator = make_orchestrator(config)
+    
+    result = await orchestrator.approve_task(sample_task_with_plan.id)
+    
+    # Readable by any worker as soon as it can claim the job
+    assert result["action"] == "queued"
+    assert db.get_task(sample_task_with_plan.id).status == TaskStatus.APPROVED
+    assert job_status(sample_task_with_plan.id) == "queued"
+    await orchestrator.shutdown()
+
+
+async def test_abort_cancels_running_job(config, sample_task_with_plan):
+    task = save(sample_task_with_plan, TaskStatus.IN_PROGRESS, current_step=1)
+    db.enqueue_job(task.id)
+    db.claim_job(WORKER, 60, 3)
+    executor = StubExecutor()
+    orchestrator = make_orchestrator(config, executor)
+    
+    result = await orchestrator._handle_abort_task(task.telegram_user_id)
+    
+    assert result["message"] == f"Tarea {task.id} cancelada."
+    assert job_status(task.id) == "cancelled"
+    assert db.get_task(task.id).status == TaskStatus.ABORTED
+    # The worker pushes its own finished steps
+    assert executor.partial_commits == 0
+    await orchestrator.shutdown()
+
+
+async def test_abort_commits_partial_work_of_idle_task(config, sample_task_with_plan):
+    task = save(sample_task_with_plan, TaskStatus.PAUSED, current_step=2)
+    executor = StubExecutor()
+    orchestrator = make_orchestrator(config, executor)
+    
+    await orchestrator._handle_abort_task(task.telegram_user_id)
+    
+    assert executor.partial_commits == 1
+    assert db.get_task(task.id).status == TaskStatus.ABORTED
+    await orchestrator.shutdown()
+
+
+async def test_execution_stops_at_next_step_after_abort(config, sample_task_with_plan):
+    task = save(sample_task_with_plan, TaskStatus.APPROVED)
+    db.enqueue_job(task.id)
+    db.claim_job(WORKER, 60, 3)
+    
+    async def abort(task: Task) -> None:
+        db.cancel_job(task.id)
+        db.update_task_status(task.id, TaskStatus.ABORTED)
+    
+    executor = StubExecutor(steps=3, between=abort)
+    orchestrator = make_orchestrator(config, executor)
+    
+    result = await orchestrator.execute_task(task.id)
+    await orchestrator.task_writes.flush()
+    
+    assert result["action"] == "aborted"
+    assert executor.steps_run == 2
+    assert db.get_task(task.id).status == TaskStatus.ABORTED
+    await orchestrator.shutdown()
+
+
+# ============================================================================
+# Worker pool
+# ============================================================================
+
+class SlowOrchestrator:
+    """Orchestrator whose executions run until cancelled."""
+    
+    def __init__(self) -> None:
+        self.jobs_queued = asyncio.Event()
+        self.cancelled = False
+        self.partial_commits: list[str] = []
+    
+    async def execute_task(self, task_id: str) -> dict:
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"action": "completed", "task_id": task_id}
+    
+    async def commit_partial_work(self, task_id: str) -> None:
+        self.partial_commits.append(task_id)
+
+
+async def test_heartbeat_stops_cancelled_job(database, sample_task):
+    db.enqueue_job(sample_task.id)
+    db.claim_job(WORKER, 0.06, 3)
+    orchestrator = SlowOrchestrator()
+    pool = TaskWorkerPool(orchestrator, lease_seconds=0.06)
+    
+    running = asyncio.create_task(pool._run_job(WORKER, sample_task.id))
+    await asyncio.sleep(0.01)
+    db.cancel_job(sample_task.id)
+    await asyncio.wait_for(running, 5)
+    
+    assert orchestrator.cancelled
+    assert pool.aborted == 1
+    assert pool.lost_leases == 0
+    # Nobody else owns the aborted task, so its finished steps are pushed
+    assert orchestrator.partial_commits == [sample_task.id]
+    assert job_status(sample_task.id) == "cancelled"
+
+
+async def test_aborted_result_does_not_finish_job(database, sample_task):
+    db.enqueue_job(sample_task.id)
+    db.claim_job(WORKER, 60, 3)
+    db.cancel_job(sample_task.id)
+    
+    class AbortedOrchestrator(SlowOrchestrator):
+        async def execute_task(self, task_id: str) -> dict:
+            return {"action": "aborted", "task_id": task_id}
+    
+    finished = []
+    
+    async def on_finished(result: dict) -> None:
+        finished.append(result)
+    
+    pool = TaskWorkerPool(AbortedOrchestrator(), on_finished=on_finished)
+    await pool._run_job(WORKER, sample_task.id)
+    
+    assert pool.aborted == 1
+    assert pool.failed == 0
+    assert finished == []
+    assert job_status(sample_task.id) == "cancelled"
+
+
+async def test_heartbeat_stops_job_after_lost_lease(database, sample_task):
+    db.enqueue_job(sample_task.id)
+    db.claim_job(WORKER, 0.06, 3)
+    orchestrator = SlowOrchestrator()
+    pool = TaskWorkerPool(orchestrator, lease_seconds=0.06)
+    
+    running = asyncio.create_task(pool._run_job(WORKER, sample_task.id))
+    await asyncio.sleep(0.01)
+    # Another worker took the job over
+    db.finish_job(sample_task.id, WORKER, "queued")
+    db.claim_job("host:2:0", 60, 3)
+    await asyncio.wait_for(running, 5)
+    
+    assert orchestrator.cancelled
+    assert pool.lost_leases == 1
+    assert orchestrator.partial_commits == []
+    assert job_status(sample_task.id) == "running"
+
+
+class QuickOrchestrator(SlowOrchestrator):
+    """Orchestrator returning canned results at once."""
+    
+    def __init__(self, results: dict[str, dict]) -> None:
+        super().__init__()
+        self.results = results
+    
+    async def execute_task(self, task_id: str) -> dict:
+        return self.results[task_id]
+
+
+async def test_pool_runs_queued_jobs(database):
+    orchestrator = QuickOrchestrator({
+        "task-a": {"action": "completed", "task_id": "task-a"},
+        "task-b": {"action": "failed", "task_id": "task-b", "error": "boom"},
+    })
+    finished = []
+    
+    async def on_finished(result: dict) -> None:
+        finished.append(result["task_id"])
+        raise RuntimeError("notification failed")
+    
+    for task_id in orchestrator.results:
+        db.enqueue_job(task_id)
+    pool = TaskWorkerPool(orchestrator, workers=2, poll_interval=0.01, on_finished=on_finished)
+    
+    pool.start()
+    for _ in range(200):
+        if len(finished) == 2:
+            break
+        await asyncio.sleep(0.01)
+    await pool.stop()
+    
+    assert sorted(finished) == ["task-a", "task-b"]
+    assert (job_status("task-a"), job_status("task-b")) == ("done", "failed")
+    stats = pool.get_stats()
+    assert (stats["claimed"], stats["completed"], stats["failed"]) == (2, 1, 1)
+    assert stats["busy_workers"] == 0
+
+
+async def test_stop_releases_running_jobs(database, sample_task):
+    db.enqueue_job(sample_task.id)
+    orchestrator = SlowOrchestrator()
+    pool = TaskWorkerPool(orchestrator, workers=1, poll_interval=0.01)
+    
+    pool.start()
+    for _ in range(200):
+        if pool.busy_workers:
+            break
+        await asyncio.sleep(0.01)
+    await pool.stop()
+    
+    assert pool.released == 1
+    assert job_status(sample_task.id) == "queued"
+    # Released without counting an attempt, so it can be claimed again
+    assert db.claim_job(WORKER, 60, 1) == sample_task.id
+
+
+async def test_exhausted_jobs_fail_their_tasks(database, sample_task):
+    class Writes:
+        def __init__(self) -> None:
+            self.updates = []
+        
+        async def update(self, task: Task, columns: list[str]) -> None:
+            self.updates.append((task.id, task.status, columns))
+    
+    db.save_task(sample_task)
+    db.enqueue_job(sample_task.id)
+    db.claim_job(WORKER, 0.01, 1)
+    await asyncio.sleep(0.05)
+    orchestrator = SlowOrchestrator()
+    orchestrator.task_writes = Writes()
+    finished = []
+    
+    async def on_finished(result: dict) -> None:
+        finished.append(result)
+    
+    pool = TaskWorkerPool(orchestrator, max_attempts=1, on_finished=on_finished)
+    await pool._fail_exhausted()
+    
+    assert job_status(sample_task.id) == "failed"
+    assert orchestrator.task_writes.updates == [
+        (sample_task.id, TaskStatus.FAILED, ["status", "error"]),
+    ]
+    assert finished[0]["chat_id"] == sample_task.telegram_chat_id
+    assert pool.failed == 1
+
+
+async def test_worker_survives_failing_jobs_and_sweeps(database, monkeypatch):
+    from src.models import async_database
+    
+    class FailingOrchestrator(QuickOrchestrator):
+        async def execute_task(self, task_id: str) -> dict:
+            if task_id == "task-a":
+                raise TimeoutError()
+            return await super().execute_task(task_id)
+    
+    async def fail_exhausted_jobs(max_attempts: int) -> list[str]:
+        raise RuntimeError("database is locked")
+    
+    monkeypatch.setattr(async_database, "fail_exhausted_jobs", fail_exhausted_jobs)
+    orchestrator = FailingOrchestrator({"task-b": {"action": "completed", "task_id": "task-b"}})
+    db.enqueue_job("task-a")
+    db.enqueue_job("task-b")
+    pool = TaskWorkerPool(orchestrator, workers=1, poll_interval=0.01)
+    
+    pool.start()
+    for _ in range(200):
+        if pool.completed:
+            break
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    alive = not pool._tasks[0].done()
+    await pool.stop()
+    
+    assert alive
+    assert (job_status("task-a"), job_status("task-b")) == ("failed", "done")
+    assert (pool.failed, pool.completed) == (1, 1)
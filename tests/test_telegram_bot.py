@@ -0,0 +1,347 @@
+"""Tests for the Telegram bot and its progressive replies."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.agents.plan_generator import PlanGenerator
+from src.chat.telegram_bot import TelegramBot, ThrottledMessageEditor
+from src.llm.fake import FakeLLMClient
+
+
+PLAN = {
+    "objetivo": "Agregar tests",
+    "archivos": ["tests/test_app.py"],
+    "pasos": [{"paso": 1, "descripcion": "Crear tests"}],
+    "estimacion": "5 minutos",
+}
+
+
+class FakeMessage:
+    """Telegram message recording what was sent and edited."""
+    
+    def __init__(self, fail_edits: bool = False) -> None:
+        self.fail_edits = fail_edits
+        self.replies: list["FakeMessage"] = []
+        self.texts: list[str] = []
+        self.markups: list[object] = []
+        self.chat = SimpleNamespace(send_action=self._send_action)
+        self.reply_to_message = None
+    
+    async def _send_action(self, action: str) -> None:
+        pass
+    
+    async def reply_text(self, text: str, parse_mode=None, reply_markup=None) -> "FakeMessage":
+        reply = FakeMessage(self.fail_edits)
+        reply.texts.append(text)
+        reply.markups.append(reply_markup)
+        self.replies.append(reply)
+        return reply
+    
+    async def edit_text(self, text: str, parse_mode=None, reply_markup=None) -> None:
+        if self.fail_edits:
+            raise RuntimeError("Bad Request: can't parse entities")
+        self.texts.append(text)
+        self.markups.append(reply_markup)
+
+
+@pytest.fixture
+def message() -> FakeMessage:
+    return FakeMessage()
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list[float]:
+    """Record asyncio.sleep delays instead of waiting them out."""
+    recorded: list[float] = []
+    real_sleep = asyncio.sleep
+    
+    async def fake_sleep(delay: float, result=None):
+        recorded.append(delay)
+        return await real_sleep(0, result)
+    
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    return recorded
+
+
+# ============================================================================
+# Message editor
+# ============================================================================
+
+async def test_updates_are_coalesced_between_edits(message, sleeps):
+    editor = ThrottledMessageEditor(message, min_interval=60.0)
+    
+    await editor.update("paso 1")
+    await editor.update("paso 2")
+    await editor.update("paso 3")
+    
+    assert [reply.texts for reply in message.replies] == [["paso 1"]]
+    assert editor.coalesced == 1
+    
+    assert await editor.finish("plan")
+    assert message.replies[0].texts == ["paso 1", "plan"]
+    assert sleeps and sleeps[-1] == pytest.approx(60.0, abs=1.0)
+
+
+async def test_finish_without_progress_message_returns_false(message):
+    editor = ThrottledMessageEditor(message, min_interval=0.0)
+    
+    assert not await editor.finish("plan")
+    assert message.replies == []
+
+
+async def test_failed_final_edit_returns_false(sleeps):
+    message = FakeMessage(fail_edits=True)
+    editor = ThrottledMessageEditor(message, min_interval=0.0)
+    await editor.update("paso 1")
+    
+    assert not await editor.finish("plan")
+    assert editor.edits == 0
+
+
+async def test_unchanged_final_text_is_not_edited_again(message):
+    editor = ThrottledMessageEditor(message, min_interval=0.0)
+    await editor.update("plan")
+    
+    assert await editor.finish("plan")
+    assert message.replies[0].texts == ["plan"]
+
+
+# ============================================================================
+# Task requests
+# ============================================================================
+
+def make_bot() -> TelegramBot:
+    """Bot whose orchestrator streams one step and then proposes ``PLAN``."""
+    async def handle_message(on_progress, **kwargs) -> dict:
+        await on_progress({"objetivo": PLAN["objetivo"], "pasos": PLAN["pasos"]})
+        return {"action": "approve_plan", "task_id": "task-1", "plan": PLAN}
+    
+    orchestrator = SimpleNamespace(
+        plan_generator=PlanGenerator(client=FakeLLMClient()),
+        config=SimpleNamespace(telegram_edit_interval=0.0),
+        handle_message=handle_message,
+    )
+    return TelegramBot("123:TEST", allowed_users=[1], orchestrator=orchestrator)
+
+
+@pytest.mark.parametrize("fail_edits", [False, True])
+async def test_plan_is_always_shown_with_buttons(fail_edits):
+    bot = make_bot()
+    message = FakeMessage(fail_edits=fail_edits)
+    update = SimpleNamespace(
+        message=message,
+        effective_user=SimpleNamespace(id=1),
+        effective_chat=SimpleNamespace(id=1),
+    )
+    
+    await bot._process_task_request(update, "Agrega tests")
+    
+    # Either the progress message became the plan or the plan was sent anew
+    final = message.replies[-1]
+    assert len(message.replies) == (2 if fail_edits else 1)
+    assert final.markups[-1] is not None
+    assert "Agregar tests" in final.texts[-1]
+
+
+# ============================================================================
+# Commands and buttons
+# ============================================================================
+
+class FakeOrchestrator:
+    """Orchestrator answering every request with ``result``."""
+    
+    def __init__(self, result: dict | None = None) -> None:
+        self.result = result or {}
+        self.plan_generator = PlanGenerator(client=FakeLLMClient())
+        self.config = SimpleNamespace(telegram_edit_interval=0.0)
+        self.requests: list[tuple] = []
+    
+    async def handle_message(self, on_progress=None, **kwargs) -> dict:
+        self.requests.append(("message", kwargs["message"], kwargs.get("reply_to_text")))
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+    
+    async def _handle_list_tasks(self, user_id: int) -> dict:
+        return self.result
+    
+    async def _handle_abort_task(self, user_id: int) -> dict:
+        return self.result
+    
+    async def approve_task(self, task_id: str) -> dict:
+        self.requests.append(("approve", task_id))
+        return self.result
+
+
+def make_update(message: FakeMessage | None = None, user_id: int = 1) -> SimpleNamespace:
+    return SimpleNamespace(
+        message=message or FakeMessage(),
+        effective_user=SimpleNamespace(id=user_id),
+        effective_chat=SimpleNamespace(id=user_id),
+    )
+
+
+def replies(update: SimpleNamespace) -> list[str]:
+    return [reply.texts[-1] for reply in update.message.replies]
+
+
+@pytest.mark.parametrize("handler", [
+    "_handle_start", "_handle_help", "_handle_task", "_handle_status",
+    "_handle_list", "_handle_abort", "_handle_message",
+])
+async def test_unknown_users_are_rejected(handler):
+    orchestrator = FakeOrchestrator()
+    bot = TelegramBot("123:TEST", allowed_users=[1], orchestrator=orchestrator)
+    update = make_update(user_id=2)
+    
+    await getattr(bot, handler)(update, SimpleNamespace(args=["x"]))
+    
+    assert replies(update) == ["⛔ No tienes autorización para usar este bot."]
+    assert orchestrator.requests == []
+
+
+@pytest.mark.parametrize(("handler", "expected"), [
+    ("_handle_start", "¡Hola!"),
+    ("_handle_help", "Ayuda"),
+    ("_handle_task", "proporciona una descripción"),
+])
+async def test_help_commands(handler, expected):
+    bot = TelegramBot("123:TEST", allowed_users=[1], orchestrator=FakeOrchestrator())
+    update = make_update()
+    
+    await getattr(bot, handler)(update, SimpleNamespace(args=[]))
+    
+    assert expected in replies(update)[0]
+
+
+async def test_task_command_sends_description():
+    orchestrator = FakeOrchestrator({"action": "respond", "message": "Hecho."})
+    bot = TelegramBot("123:TEST", allowed_users=[1], orchestrator=orchestrator)
+    update = make_update()
+    
+    await bot._handle_task(update, SimpleNamespace(args=["Agrega", "tests"]))
+    
+    assert orchestrator.requests == [("message", "Agrega tests", None)]
+    assert replies(update) == ["Hecho."]
+
+
+@pytest.mark.parametrize(("result", "expected"), [
+    ({"action": "clarify", "message": "¿Qué repositorio?"}, "🤔 ¿Qué repositorio?"),
+    ({"action": "completed", "task_id": "task-1"}, "✅ **Tarea completada!**\n\nID: `task-1`"),
+    ({"action": "failed", "error": "sin red"}, "❌ **Tarea falló**\n\nError: sin red"),
+    ({"action": "list"}, "Procesado."),
+])
+async def test_message_results_are_answered(result, expected):
+    bot = TelegramBot("123:TEST", allowed_users=[1], orchestrator=FakeOrchestrator(result))
+    message = FakeMessage()
+    message.text = "continúa"
+    message.reply_to_message = SimpleNamespace(text="Tarea task-1")
+    update = make_update(message)
+    
+    await bot._handle_message(update, SimpleNamespace())
+    
+    assert replies(update) == [expected]
+    assert bot.orchestrator.requests == [("message", "continúa", "Tarea task-1")]
+
+
+async def test_failed_request_ends_the_progress_message():
+    bot = make_bot()
+    update = make_update()
+    
+    async def handle_message(on_progress, **kwargs) -> dict:
+        await on_progress({"objetivo": PLAN["objetivo"], "pasos": []})
+        raise RuntimeError("provider down")
+    
+    bot.orchestrator.handle_message = handle_message
+    
+    with pytest.raises(RuntimeError):
+        await bot._process_task_request(update, "Agrega tests")
+    
+    assert update.message.replies[0].texts[-1] == "❌ No pude generar el plan. Intenta de nuevo."
+
+
+async def test_status_list_and_abort_commands():
+    orchestrator = FakeOrchestrator({"message": "Tarea task-1 cancelada."})
+    bot = TelegramBot("123:TEST", allowed_users=[1], orchestrator=orchestrator)
+    update = make_update()
+    
+    await bot._handle_status(update, SimpleNamespace())
+    await bot._handle_abort(update, SimpleNamespace())
+    await bot._handle_list(update, SimpleNamespace())
+    orchestrator.result = {"tasks": [
+        {"id": "task-1", "status": "completed", "description": "Agregar tests"},
+        {"id": "task-2", "status": "paused", "description": "Migrar"},
+    ]}
+    await bot._handle_list(update, SimpleNamespace())
+    
+    assert replies(update) == [
+        "Tarea task-1 cancelada.",
+        "Tarea task-1 cancelada.",
+        "📭 No tienes tareas registradas.",
+        "📋 **Tus tareas:**\n\n✅ `task-1`: Agregar tests\n❓ `task-2`: Migrar",
+    ]
+
+
+class FakeQuery:
+    """Callback query recording the answer and message edits."""
+    
+    def __init__(self, data: str) -> None:
+        self.data = data
+        self.answered = False
+        self.edits: list[str] = []
+        self.message = FakeMessage()
+    
+    async def answer(self) -> None:
+        self.answered = True
+    
+    async def edit_message_text(self, text: str, parse_mode=None) -> None:
+        self.edits.append(text)
+
+
+@pytest.mark.parametrize(("data", "result", "expected"), [
+    ("approve:task-1", {"action": "queued"}, "✅ Plan aprobado."),
+    ("reject:task-1", {}, "❌ Plan rechazado."),
+    ("modify:task-1", {}, "✏️ Por favor, describe"),
+])
+async def test_plan_buttons(data, result, expected):
+    bot = TelegramBot("123:TEST", allowed_users=[1], orchestrator=FakeOrchestrator(result))
+    query = FakeQuery(data)
+    
+    await bot._handle_callback(SimpleNamespace(callback_query=query), SimpleNamespace())
+    
+    assert query.answered
+    assert query.edits[0].startswith(expected)
+
+
+async def test_failed_approval_is_reported():
+    orchestrator = FakeOrchestrator({"error": "Task not found"})
+    bot = TelegramBot("123:TEST", allowed_users=[1], orchestrator=orchestrator)
+    query = FakeQuery("approve:task-1")
+    
+    await bot._handle_callback(SimpleNamespace(callback_query=query), SimpleNamespace())
+    
+    assert orchestrator.requests == [("approve", "task-1")]
+    assert query.edits == []
+    assert query.message.replies[0].texts == ["❌ Error: Task not found"]
+
+
+async def test_finished_tasks_are_notified():
+    sent = []
+    
+    class Bot:
+        async def send_message(self, **kwargs) -> None:
+            sent.append(kwargs["text"])
+    
+    bot = TelegramBot("123:TEST", allowed_users=[1], orchestrator=FakeOrchestrator())
+    bot.app = SimpleNamespace(bot=Bot())
+    
+    await bot.notify_task_finished({"action": "completed", "task_id": "task-1", "chat_id": 1})
+    await bot.notify_task_finished({"action": "failed", "task_id": "task-2", "chat_id": 1})
+    await bot.notify_task_finished({"action": "failed", "task_id": "task-3"})
+    
+    assert sent == [
+        "✅ **Tarea `task-1` completada exitosamente!**",
+        "❌ Tarea `task-2` falló: error desconocido",
+    ]
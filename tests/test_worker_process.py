@@ -0,0 +1,260 @@
+"""Tests for executor processes and the entry points starting them."""
+
+import asyncio
+import logging
+import os
+import signal
+import sys
+from pathlib import Path
+
+import pytest
+
+from src import main as app
+from src.core import worker_process
+from src.core.config import get_config
+from src.core.worker_process import TelegramNotifier, WorkerProcessManager, worker_main
+from src.models import database as db
+
+
+class FakeProcess:
+    """Process that only records how it was started and stopped."""
+    
+    pid_counter = 1000
+    
+    def __init__(self, target, args, name: str, stubborn: bool = False) -> None:
+        self.target = target
+        self.args = args
+        self.name = name
+        self.stubborn = stubborn
+        self.alive = False
+        self.exitcode: int | None = None
+        self.killed = False
+        FakeProcess.pid_counter += 1
+        self.pid = FakeProcess.pid_counter
+    
+    def start(self) -> None:
+        self.alive = True
+    
+    def is_alive(self) -> bool:
+        return self.alive
+    
+    def terminate(self) -> None:
+        if not self.stubborn:
+            self.alive = False
+            self.exitcode = -signal.SIGTERM
+    
+    def kill(self) -> None:
+        self.killed = True
+        self.alive = False
+    
+    def join(self, timeout: float | None = None) -> None:
+        pass
+
+
+class FakeContext:
+    """Multiprocessing context creating FakeProcesses."""
+    
+    def __init__(self, stubborn: bool = False) -> None:
+        self.stubborn = stubborn
+        self.processes: list[FakeProcess] = []
+    
+    def Process(self, target, args, name: str) -> FakeProcess:
+        process = FakeProcess(target, args, name, self.stubborn)
+        self.processes.append(process)
+        return process
+
+
+@pytest.fixture
+def environment(tmp_path: Path, monkeypatch) -> Path:
+    """Environment configuring a worker against a temporary database."""
+    values = {
+        "TELEGRAM_BOT_TOKEN": "123:TEST",
+        "ANTHROPIC_API_KEY": "test-key",
+        "GOOGLE_AI_API_KEY": "test-key",
+        "GITHUB_TOKEN": "test-token",
+        "DATABASE_URL": f"sqlite:///{tmp_path / 'tasks.db'}",
+        "WORKSPACE_PATH": str(tmp_path / "workspace"),
+        "LOG_DIR": str(tmp_path / "logs"),
+        "TASK_WORKERS": "1",
+        "JOB_POLL_INTERVAL": "0.05",
+        "WORKER_STATS_INTERVAL": "0.05",
+    }
+    for name, value in values.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.chdir(tmp_path)
+    
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    get_config.cache_clear()
+    yield tmp_path
+    get_config.cache_clear()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+# ============================================================================
+# Process manager
+# ============================================================================
+
+async def test_processes_are_started_and_restarted():
+    manager = WorkerProcessManager(2, check_interval=0.01)
+    context = manager._context = FakeContext()
+    
+    manager.start()
+    assert [process.name for process in context.processes] == ["executor-0", "executor-1"]
+    assert context.processes[0].args == (0,)
+    
+    context.processes[1].alive = False
+    for _ in range(100):
+        if manager.restarts:
+            break
+        await asyncio.sleep(0.01)
+    await manager.stop()
+    
+    assert manager.restarts == 1
+    assert len(context.processes) == 3
+    assert not any(process.is_alive() for process in context.processes)
+
+
+async def test_stuck_process_is_killed_on_stop():
+    manager = WorkerProcessManager(1)
+    context = manager._context = FakeContext(stubborn=True)
+    manager.start()
+    
+    await manager.stop(timeout=0.01)
+    
+    assert context.processes[0].killed
+
+
+async def test_stats_include_reported_worker_metrics(database):
+    from datetime import datetime
+    
+    manager = WorkerProcessManager(1)
+    manager._context = FakeContext()
+    manager.start()
+    db.save_worker_stats("host:1", datetime.utcnow(), '{"completed": 2}')
+    
+    stats = await manager.get_stats()
+    await manager.stop()
+    
+    assert list(stats["processes"].values())[0]["alive"]
+    assert stats["workers"]["host:1"]["completed"] == 2
+
+
+# ============================================================================
+# Executor process
+# ============================================================================
+
+async def test_worker_reports_stats_until_terminated(environment):
+    worker = asyncio.create_task(worker_main(3))
+    
+    # Stats are first reported once the signal handlers are installed
+    reported = []
+    for _ in range(200):
+        if worker.done():
+            break
+        try:
+            stats = db.get_worker_stats(60)
+        except Exception:
+            stats = {}
+        reported = [entry for entry in stats.values() if entry.get("executor") == 3]
+        if reported:
+            break
+        await asyncio.sleep(0.02)
+    
+    assert reported, "the worker never reported its stats"
+    os.kill(os.getpid(), signal.SIGTERM)
+    await asyncio.wait_for(worker, 10)
+    
+    assert (environment / "logs" / "executor-3" / "orchestrator.log").exists()
+    assert reported[0]["workers"] == 1
+
+
+async def test_notifier_sends_results_to_the_chat():
+    sent = []
+    
+    class Bot:
+        async def send_message(self, **kwargs) -> None:
+            sent.append(kwargs)
+    
+    notifier = TelegramNotifier("123:TEST")
+    notifier.bot = Bot()
+    
+    await notifier.task_finished({"action": "completed", "task_id": "task-1", "chat_id": 7})
+    await notifier.task_finished({"action": "failed", "task_id": "task-2"})
+    
+    assert [message["chat_id"] for message in sent] == [7]
+    assert "task-1" in sent[0]["text"]
+
+
+# ============================================================================
+# Entry points
+# ============================================================================
+
+class FakeBot:
+    """Bot whose polling returns at once."""
+    
+    def __init__(self, token: str, allowed_users: list[int], orchestrator) -> None:
+        self.orchestrator = orchestrator
+    
+    async def run_polling(self) -> None:
+        # Long enough for the first stats report
+        await asyncio.sleep(0.1)
+    
+    async def notify_task_finished(self, result: dict) -> None:
+        pass
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+async def test_main_starts_and_stops_execution(environment, monkeypatch, workers):
+    started = []
+    
+    class Processes(WorkerProcessManager):
+        def start(self) -> None:
+            started.append(self.count)
+        
+        async def stop(self, timeout: float = 0) -> None:
+            started.append("stopped")
+    
+    # Set first, so the variable main() sets is removed after the test
+    monkeypatch.setenv("LLM_QUOTA_PROCESSES", "")
+    monkeypatch.delenv("LLM_QUOTA_PROCESSES")
+    monkeypatch.setattr("src.chat.telegram_bot.create_bot", FakeBot)
+    monkeypatch.setattr(worker_process, "WorkerProcessManager", Processes)
+    reports = []
+    
+    async def report_stats(name: str, started_at, stats: dict) -> None:
+        reports.append(stats)
+    
+    monkeypatch.setattr(worker_process, "report_stats", report_stats)
+    
+    await app.main(workers=workers)
+    
+    assert {"workers", "intent_cache", "workspace_gc"} <= set(reports[0])
+    
+    if workers:
+        assert started == [2, "stopped"]
+        assert os.environ["LLM_QUOTA_PROCESSES"] == "3"
+    else:
+        assert started == []
+        assert "LLM_QUOTA_PROCESSES" not in os.environ
+
+
+@pytest.mark.parametrize(("error", "code"), [(KeyboardInterrupt, 0), (RuntimeError, 1)])
+def test_cli_exit_codes(environment, monkeypatch, error, code):
+    calls = []
+    
+    async def main(workers: int = 0) -> None:
+        calls.append((workers, os.environ.get("LOG_LEVEL")))
+        raise error()
+    
+    monkeypatch.setattr(app, "main", main)
+    monkeypatch.setattr(sys, "argv", ["dev-tasks", "--debug", "--workers", "2"])
+    monkeypatch.setenv("LOG_LEVEL", "INFO")
+    monkeypatch.delenv("LOG_LEVEL")
+    
+    with pytest.raises(SystemExit) as exit_info:
+        app.cli_main()
+    
+    assert exit_info.value.code == code
+    assert calls == [(2, "DEBUG")]
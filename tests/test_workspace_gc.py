@@ -0,0 +1,144 @@
+"""Tests for garbage collection of task workspaces."""
+
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.core import workspace_gc
+from src.core.workspace_gc import WorkspaceGC, _measure_workspace
+from src.models import database as db
+from src.models.task import TaskStatus
+
+
+def make_workspace(root: Path, name: str, size: int = 8192, age: float = 0.0) -> Path:
+    """Create a workspace holding one file of ``size`` bytes, last used ``age`` seconds ago."""
+    path = root / name
+    path.mkdir(parents=True)
+    (path / "data.bin").write_bytes(os.urandom(size))
+    
+    used_at = time.time() - age
+    for item in (path / "data.bin", path):
+        os.utime(item, (used_at, used_at))
+    return path
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    return tmp_path / "workspace"
+
+
+def save(task, task_id: str, status: TaskStatus) -> None:
+    db.save_task(task.model_copy(update={"id": task_id, "status": status}))
+
+
+async def test_finished_workspaces_are_evicted_after_retention(database, root, sample_task):
+    save(sample_task, "task-done", TaskStatus.COMPLETED)
+    save(sample_task, "task-running", TaskStatus.IN_PROGRESS)
+    for name in ("task-done", "task-running", "task-unknown", ".mirrors"):
+        make_workspace(root, name, age=7200)
+    gc = WorkspaceGC(root, retention=0)
+    
+    reclaimed = await gc.sweep()
+    
+    assert sorted(path.name for path in root.iterdir()) == [".mirrors", "task-running"]
+    assert reclaimed >= 2 * 8192
+    stats = gc.get_stats()
+    assert stats["workspaces_evicted"] == 2
+    assert stats["task_workspaces"] == 1
+    assert stats["shared_bytes"] >= 8192
+
+
+async def test_recent_workspaces_are_kept_without_quota(database, root):
+    make_workspace(root, "task-recent", age=60)
+    gc = WorkspaceGC(root, retention=3600)
+    
+    assert await gc.sweep() == 0
+    assert (root / "task-recent").exists()
+
+
+async def test_least_recently_used_are_evicted_over_quota(database, root, sample_task):
+    save(sample_task, "task-active", TaskStatus.IN_PROGRESS)
+    make_workspace(root, "task-active", size=64 * 1024, age=9000)
+    make_workspace(root, "task-old", size=64 * 1024, age=3000)
+    make_workspace(root, "task-new", size=64 * 1024, age=1000)
+    usage = _measure_workspace(root)["total"]
+    gc = WorkspaceGC(root, retention=86400, quota_bytes=usage - 1)
+    
+    await gc.sweep()
+    
+    # Active tasks are never evicted, even if they are the oldest
+    assert sorted(path.name for path in root.iterdir()) == ["task-active", "task-new"]
+    assert gc.usage_bytes <= usage - 1
+
+
+async def test_quota_cannot_evict_active_tasks(database, root, sample_task):
+    save(sample_task, "task-active", TaskStatus.IN_PROGRESS)
+    make_workspace(root, "task-active")
+    gc = WorkspaceGC(root, quota_bytes=1)
+    
+    assert await gc.sweep() == 0
+    assert gc.usage_bytes > gc.quota_bytes
+
+
+async def test_recent_or_leased_workspaces_survive_the_quota(database, root):
+    for task_id, lease_seconds in (("task-leased", 60), ("task-expired", -1)):
+        db.enqueue_job(task_id)
+        db.claim_job("worker-1", lease_seconds, 3)
+        # Its worker may still push the finished steps after the abort
+        db.cancel_job(task_id)
+        make_workspace(root, task_id, age=9000)
+    make_workspace(root, "task-recent", age=60)
+    gc = WorkspaceGC(root, retention=3600, quota_bytes=1, min_retention=600)
+    
+    assert await gc.sweep() > 0
+    assert sorted(path.name for path in root.iterdir()) == ["task-leased", "task-recent"]
+    assert db.get_leased_tasks(["task-leased", "task-expired", "task-recent"]) == {"task-leased"}
+
+
+async def test_sweeps_walk_on_their_own_thread(database, root, monkeypatch):
+    threads = []
+    
+    def measure(workspace_path: Path) -> dict:
+        threads.append(threading.current_thread().name)
+        return _measure_workspace(workspace_path)
+    
+    monkeypatch.setattr(workspace_gc, "_measure_workspace", measure)
+    
+    await asyncio.gather(*(WorkspaceGC(root).sweep() for _ in range(3)))
+    
+    assert len(threads) == 3
+    assert all(name.startswith("workspace_gc") for name in threads)
+
+
+def test_hardlinked_files_count_as_shared(root):
+    shared = make_workspace(root, ".mirrors")
+    task = make_workspace(root, "task-1", size=4096)
+    os.link(shared / "data.bin", task / "object.bin")
+    
+    usage = _measure_workspace(root)
+    
+    assert usage["tasks"]["task-1"][0] == usage["total"] - usage["shared"]
+    assert usage["shared"] >= 8192
+
+
+def test_missing_workspace_measures_zero(tmp_path):
+    assert _measure_workspace(tmp_path / "missing") == {"total": 0, "shared": 0, "tasks": {}}
+
+
+async def test_periodic_sweeps_run_until_stopped(database, root):
+    make_workspace(root, "task-unknown")
+    gc = WorkspaceGC(root, interval=0.01, retention=0)
+    
+    gc.start()
+    for _ in range(100):
+        if gc.sweeps >= 2:
+            break
+        await asyncio.sleep(0.01)
+    await gc.stop()
+    
+    assert gc.sweeps >= 2
+    assert not (root / "task-unknown").exists()
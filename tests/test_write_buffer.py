@@ -0,0 +1,121 @@
+"""Tests for buffering and coalescing task state writes."""
+
+import pytest
+
+from src.models import database as db
+from src.models.task import Task, TaskStatus
+from src.models.write_buffer import TaskWriteBuffer
+
+
+@pytest.fixture
+async def buffer(database) -> TaskWriteBuffer:
+    """Buffer that only writes when flushed explicitly."""
+    buffer = TaskWriteBuffer(flush_interval=60.0)
+    yield buffer
+    await buffer.close()
+
+
+def running(task: Task, current_step: int = 0) -> Task:
+    task.status = TaskStatus.IN_PROGRESS
+    task.current_step = current_step
+    return task
+
+
+async def test_updates_are_coalesced_until_flushed(buffer, sample_task):
+    db.save_task(sample_task)
+    
+    for step in (1, 2, 3):
+        await buffer.update(running(sample_task, step), columns=["status", "current_step"])
+    
+    assert db.get_task(sample_task.id).current_step == 0
+    assert await buffer.flush() == 1
+    stored = db.get_task(sample_task.id)
+    assert (stored.status, stored.current_step) == (TaskStatus.IN_PROGRESS, 3)
+    stats = buffer.get_stats()
+    assert (stats["updates"], stats["coalesced"], stats["flushes"]) == (3, 2, 1)
+
+
+async def test_only_changed_columns_are_written(buffer, sample_task):
+    db.save_task(sample_task)
+    await buffer.update(running(sample_task, 1), columns=["status", "current_step"])
+    await buffer.flush()
+    
+    await buffer.update(sample_task, columns=["status", "current_step"])
+    assert await buffer.flush() == 0
+    
+    await buffer.update(running(sample_task, 2), columns=["status", "current_step"])
+    await buffer.flush()
+    
+    assert buffer.get_stats()["columns_written"] == 3
+    assert db.get_task(sample_task.id).current_step == 2
+
+
+async def test_terminal_status_is_written_at_once(buffer, sample_task):
+    db.save_task(sample_task)
+    await buffer.update(running(sample_task, 1), columns=["status", "current_step"])
+    await buffer.flush()
+    
+    sample_task.status = TaskStatus.COMPLETED
+    await buffer.update(sample_task, columns=["status"])
+    
+    assert db.get_task(sample_task.id).status == TaskStatus.COMPLETED
+    stats = buffer.get_stats()
+    assert (stats["forced_flushes"], stats["pending"], stats["tracked"]) == (1, 0, 0)
+
+
+async def test_aborted_task_is_not_overwritten(buffer, sample_task):
+    sample_task.status = TaskStatus.ABORTED
+    db.save_task(sample_task)
+    
+    sample_task.status = TaskStatus.COMPLETED
+    sample_task.current_step = 2
+    await buffer.update(sample_task, columns=["status", "current_step"])
+    
+    stored = db.get_task(sample_task.id)
+    assert (stored.status, stored.current_step) == (TaskStatus.ABORTED, 0)
+    assert buffer.get_stats()["rows_written"] == 0
+
+
+async def test_close_writes_pending_updates(database, sample_task):
+    db.save_task(sample_task)
+    buffer = TaskWriteBuffer(flush_interval=60.0)
+    
+    await buffer.update(running(sample_task, 2), columns=["status", "current_step"])
+    await buffer.close()
+    
+    assert db.get_task(sample_task.id).current_step == 2
+    assert buffer.get_stats()["pending"] == 0
+
+
+async def test_released_task_is_written_in_full_again(buffer, sample_task):
+    db.save_task(sample_task)
+    await buffer.update(running(sample_task, 1), columns=["status", "current_step"])
+    
+    assert await buffer.release(sample_task.id) == 1
+    # Another process moves the task on after it was handed over
+    db.update_task_status(sample_task.id, TaskStatus.APPROVED)
+    await buffer.update(sample_task, columns=["status", "current_step"])
+    await buffer.flush()
+    
+    assert db.get_task(sample_task.id).status == TaskStatus.IN_PROGRESS
+
+
+async def test_written_values_are_remembered_for_a_bounded_number_of_tasks(database):
+    buffer = TaskWriteBuffer(flush_interval=60.0, max_tracked=2)
+    tasks = [
+        Task(
+            id=f"task-{i}",
+            telegram_user_id=1,
+            telegram_chat_id=1,
+            description="Tarea",
+            repo_url="https://github.com/test/repo",
+        )
+        for i in range(3)
+    ]
+    
+    for task in tasks:
+        db.save_task(task)
+        await buffer.update(running(task, 1), columns=["status", "current_step"])
+    await buffer.close()
+    
+    assert list(buffer._persisted) == ["task-1", "task-2"]